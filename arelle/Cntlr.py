@@ -26,6 +26,7 @@ if TYPE_CHECKING:
 
 osPrcs: Any = None
 LOG_TEXT_MAX_LENGTH = 32767
+LOG_MESSAGE_CODE_LIMIT_SAMPLES = 10
 cxFrozen = getattr(sys, 'frozen', False)
 
 
@@ -373,6 +374,8 @@ class Cntlr:
                               level=logging.ERROR, messageCode="arelle:logLevel")
             setattr(self.logger, "messageCodeFilter", None)
             setattr(self.logger, "messageLevelFilter", None)
+            setattr(self.logger, "messageCodeLimit", None)
+            setattr(self.logger, "messageCodeLimitSamples", LOG_MESSAGE_CODE_LIMIT_SAMPLES)
             setattr(self.logHandler, "logTextMaxLength", (logTextMaxLength or LOG_TEXT_MAX_LENGTH))
 
     def setLogLevelFilter(self, logLevelFilter: str) -> None:
@@ -383,6 +386,21 @@ class Cntlr:
         if self.logger:
             setattr(self.logger, "messageCodeFilter", re.compile(logCodeFilter) if logCodeFilter else None)
 
+    def setLogMessageCodeLimit(self, messageCodeLimit: int | str | None, messageCodeLimitSamples: int | str | None = None) -> None:
+        """Limits the messages (above info level) logged individually per message code, further messages of
+        a code are counted and logged as a summary with up to messageCodeLimitSamples sampled refs.
+        A messageCodeLimit of None or 0 logs all messages.
+        """
+        if self.logger:
+            try:
+                setattr(self.logger, "messageCodeLimit", int(messageCodeLimit) if messageCodeLimit else None)
+                setattr(self.logger, "messageCodeLimitSamples",
+                        LOG_MESSAGE_CODE_LIMIT_SAMPLES if messageCodeLimitSamples is None or messageCodeLimitSamples == "" else int(messageCodeLimitSamples))
+            except ValueError:
+                self.addToLog(_("Message code limit and samples must be integers: {0}, {1}").format(
+                    messageCodeLimit, messageCodeLimitSamples),
+                              level=logging.ERROR, messageCode="arelle:logMessageCodeLimit")
+
     def addToLog(
         self,
         message: str,
@@ -200,6 +200,17 @@ def parseAndRun(args):
     parser.add_option("--rssReportCols", action="store", dest="rssReportCols",
                       help=_("Columns for RSS report file"))
     parser.add_option("--rssreportcols", action="store", dest="rssReportCols", help=SUPPRESS_HELP)
+    parser.add_option("--rssWorkers", action="store", dest="rssWorkers", type="int",
+                      help=_("Validate RSS feed items in this number of worker processes, with item archives "
+                             "downloaded ahead of the workers and results collected in feed order.  "
+                             "Plugin methods of validated items run in the workers.  Not available on Windows."))
+    parser.add_option("--rssworkers", action="store", dest="rssWorkers", type="int", help=SUPPRESS_HELP)
+    parser.add_option("--rssPrefetch", action="store", dest="rssPrefetch", type="int",
+                      help=_("Number of RSS item archives to download ahead of the RSS workers (default 2)."))
+    parser.add_option("--rssprefetch", action="store", dest="rssPrefetch", type="int", help=SUPPRESS_HELP)
+    parser.add_option("--rssItemTimeout", action="store", dest="rssItemTimeout", type="float",
+                      help=_("Seconds after which the RSS worker validating an item is terminated."))
+    parser.add_option("--rssitemtimeout", action="store", dest="rssItemTimeout", type="float", help=SUPPRESS_HELP)
     parser.add_option("--skipDTS", action="store_true", dest="skipDTS",
                       help=_("Skip DTS activities (loading, discovery, validation), useful when an instance needs only to be parsed."))
     parser.add_option("--skipdts", action="store_true", dest="skipDTS", help=SUPPRESS_HELP)
@@ -224,6 +235,13 @@ def parseAndRun(args):
     parser.add_option("--logCodeFilter", action="store", dest="logCodeFilter",
                       help=_("Regular expression filter for log message code."))
     parser.add_option("--logcodefilter", action="store", dest="logCodeFilter", help=SUPPRESS_HELP)
+    parser.add_option("--logMessageCodeLimit", action="store", dest="logMessageCodeLimit", type="int",
+                      help=_("Maximum number of messages of each message code to log individually (above info level).  "
+                             "Further messages of the code are counted and logged as one summary message with sampled references."))
+    parser.add_option("--logmessagecodelimit", action="store", dest="logMessageCodeLimit", type="int", help=SUPPRESS_HELP)
+    parser.add_option("--logMessageCodeLimitSamples", action="store", dest="logMessageCodeLimitSamples", type="int",
+                      help=_("Maximum number of sampled references in a logMessageCodeLimit summary message (default 10)."))
+    parser.add_option("--logmessagecodelimitsamples", action="store", dest="logMessageCodeLimitSamples", type="int", help=SUPPRESS_HELP)
     parser.add_option("--logTextMaxLength", action="store", dest="logTextMaxLength", type="int",
                       help=_("Log file text field max length override."))
     parser.add_option("--logtextmaxlength", action="store", dest="logTextMaxLength", type="int", help=SUPPRESS_HELP)
@@ -291,6 +309,12 @@ def parseAndRun(args):
     parser.add_option("--formulavarfilterwinnowing", action="store_true", dest="formulaVarFilterWinnowing", help=SUPPRESS_HELP)
     parser.add_option("--formulaVarFiltersResult", action="store_true", dest="formulaVarFiltersResult", help=_("Specify formula tracing."))
     parser.add_option("--formulavarfiltersresult", action="store_true", dest="formulaVarFiltersResult", help=SUPPRESS_HELP)
+    parser.add_option("--formulaVarFilterPlan", action="store_true", dest="formulaVarFilterPlan", help=_("Specify formula tracing."))
+    parser.add_option("--formulavarfilterplan", action="store_true", dest="formulaVarFilterPlan", help=SUPPRESS_HELP)
+    parser.add_option("--formulaVarSetProfile", action="store", dest="formulaVarSetProfile",
+                      help=_("Specify a file for a report of each variable set compile time, evaluation time, evaluation counts "
+                             "and filter facts in and out, most costly first (.json, otherwise .csv)."))
+    parser.add_option("--formulavarsetprofile", action="store", dest="formulaVarSetProfile", help=SUPPRESS_HELP)
     parser.add_option("--testcaseResultsCaptureWarnings", action="store_true", dest="testcaseResultsCaptureWarnings",
                       help=_("For testcase variations capture warning results, default is inconsistency or warning if there is any warning expected result.  "))
     parser.add_option("--testcaseresultscapturewarnings", action="store_true", dest="testcaseResultsCaptureWarnings", help=SUPPRESS_HELP)
@@ -359,6 +383,11 @@ def parseAndRun(args):
     parser.add_option("--showEnvironment", action="store_true", dest="showEnvironment", help=_("Show Arelle's config and cache directory and host OS environment parameters."))
     parser.add_option("--showenvironment", action="store_true", dest="showEnvironment", help=SUPPRESS_HELP)
     parser.add_option("--collectProfileStats", action="store_true", dest="collectProfileStats", help=_("Collect profile statistics, such as timing of validation activities and formulae."))
+    parser.add_option("--traceSpans", action="store", dest="traceSpans",
+                      help=_("Trace nested timings and memory of loading, validation and plugin activities to file(s), '|' separated.  "
+                             "A .json file is saved in Chrome trace-event format (for chrome://tracing or Perfetto), "
+                             "other files as folded stacks for flame graph tools. "))
+    parser.add_option("--tracespans", action="store", dest="traceSpans", help=SUPPRESS_HELP)
     if hasWebServer:
         parser.add_option("--webserver", action="store", dest="webserver",
                           help=_("start web server on host:port[:server] for REST and web access, e.g., --webserver locahost:8080, "
@@ -792,6 +821,7 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.setLogLevelFilter(options.logLevelFilter)
         if options.logCodeFilter:
             self.setLogCodeFilter(options.logCodeFilter)
+        self.setLogMessageCodeLimit(options.logMessageCodeLimit, options.logMessageCodeLimitSamples)
         if options.calcDecimals:
             if options.calcPrecision:
                 self.addToLog(_("both --calcDecimals and --calcPrecision validation are requested, proceeding with --calcDecimals only"),
@@ -811,9 +841,18 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.modelManager.abortOnMajorError = True
         if options.collectProfileStats:
             self.modelManager.collectProfileStats = True
+        if options.traceSpans:
+            from arelle.SpanTracer import SpanTracer
+            self.modelManager.spanTracer = SpanTracer(memoryUsed=lambda: self.memoryUsed)
         if options.outputAttribution:
             self.modelManager.outputAttribution = options.outputAttribution
         self.modelManager.validateTestcaseSchema = options.validateTestcaseSchema
+        if options.rssWorkers:
+            self.modelManager.rssWorkers = options.rssWorkers
+        if options.rssPrefetch is not None:
+            self.modelManager.rssPrefetch = options.rssPrefetch
+        if options.rssItemTimeout:
+            self.modelManager.rssItemTimeout = options.rssItemTimeout
         if options.internetConnectivity == "offline":
             self.webCache.workOffline = True
         elif options.internetConnectivity == "online":
@@ -874,6 +913,10 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.traceVariableFilterWinnowing = True
         if options.formulaVarFiltersResult:
             fo.traceVariableFiltersResult = True
+        if options.formulaVarFilterPlan:
+            fo.traceVariableFilterPlan = True
+        if options.formulaVarSetProfile:
+            fo.variableSetProfileReport = options.formulaVarSetProfile
         if options.testcaseResultsCaptureWarnings:
             fo.testcaseResultsCaptureWarnings = True
         if options.testcaseResultOptions:
@@ -1120,6 +1163,10 @@ class CntlrCmdLine(Cntlr.Cntlr):
                     pluginXbrlMethod(self, options, filesource, _entrypointFiles, sourceZipStream=sourceZipStream, responseZipStream=responseZipStream)
             for pluginXbrlMethod in pluginClassMethods("CntlrCmdLine.Filing.End"):
                 pluginXbrlMethod(self, options, filesource, _entrypointFiles, sourceZipStream=sourceZipStream, responseZipStream=responseZipStream)
+        if options.traceSpans and self.modelManager.spanTracer is not None:
+            for traceFile in options.traceSpans.split("|"):
+                self.modelManager.spanTracer.save(traceFile)
+            self.modelManager.spanTracer = None
         self.username = self.password = None #dereference password
 
         if options.statusPipe and getattr(self, "statusPipe", None) is not None:
@@ -620,8 +620,10 @@ or label linkbases.  Multiple file names are separated by a '|' character.</td><
 <tr><td style="text-indent: 1em;">{other}</td><td>Other detailed formula trace parameters:<br/>
 formulaParamExprResult, formulaParamInputValue, formulaCallExprSource, formulaCallExprCode, formulaCallExprEval,
 formulaCallExprResult, formulaVarSetExprEval, formulaFormulaRules, formulaVarsOrder,
-formulaVarExpressionSource, formulaVarExpressionCode, formulaVarExpressionEvaluation, formulaVarExpressionResult, formulaVarFiltersResult, and formulaRunIDs.
+formulaVarExpressionSource, formulaVarExpressionCode, formulaVarExpressionEvaluation, formulaVarExpressionResult, formulaVarFiltersResult, formulaVarFilterPlan, and formulaRunIDs.
 </td></tr>
+<tr><td style="text-indent: 1em;">logMessageCodeLimit</td><td>Maximum number of messages of each message code to log individually (above info level), e.g., <code>&logMessageCodeLimit=100</code>.  Further messages of the code are counted and logged as one summary message with sampled references.</td></tr>
+<tr><td style="text-indent: 1em;">logMessageCodeLimitSamples</td><td>Maximum number of sampled references in a logMessageCodeLimit summary message (default 10).</td></tr>
 <tr><td style="text-indent: 1em;">abortOnMajorError</td><td>Abort process on major error, such as when load is unable to find an entry or discovered file.</td></tr>
 <tr><td style="text-indent: 1em;">saveOIMinstance</td><td>Specify output instance filename to save (name.json, name.xml), for example if loading from xBRL-JSON.one would save to .xml otherwise to .json.  Media must be zip.  Returns a zip of instance and logFile.</td></tr>
 <tr><td style="text-indent: 1em;">collectProfileStats</td><td>Collect profile statistics, such as timing of validation activities and formulae.</td></tr>
@@ -0,0 +1,101 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Columnar store of instance item facts, for bulk consumers (such as calculation validation, OIM saving and
+databases) to iterate typed columns, and work once per distinct concept, context or unit, instead of
+reading the properties of each fact proxy.
+'''
+from __future__ import annotations
+from array import array
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from arelle.ModelDtsObject import ModelConcept
+    from arelle.ModelInstanceObject import ModelContext, ModelFact, ModelUnit
+
+NO_ROW = -1 # concept, context or unit column value of a fact without one
+
+class ColumnarFactStore:
+    """Item facts as columns, with the fact of each row in facts, in the order of the facts given (with the item
+    facts of tuples following their tuple, in document order when given modelXbrl.facts):
+
+    - conceptIds, contextIds, unitIds: index into concepts, contexts and units (NO_ROW if absent)
+    - decimals: inferred decimals (inf for INF, nan if not determinable or not numeric)
+    - numericValues: parsed value of numeric facts as float (nan if nil, not numeric or invalid)
+    - isNil: nil flag
+
+    Numeric values are floats, consumers needing decimal precision use the fact's xValue.
+    """
+    __slots__ = ("facts", "factRows", "concepts", "contexts", "units", "_conceptIds", "_contextIds", "_unitIds",
+                 "conceptIds", "contextIds", "unitIds", "decimals", "numericValues", "isNil")
+
+    def __init__(self, facts: Iterable[ModelFact]) -> None:
+        self.facts: list[ModelFact] = []
+        self.factRows: dict[ModelFact, int] = {}
+        self.concepts: list[ModelConcept] = []
+        self.contexts: list[ModelContext] = []
+        self.units: list[ModelUnit] = []
+        self._conceptIds: dict[ModelConcept, int] = {}
+        self._contextIds: dict[ModelContext, int] = {}
+        self._unitIds: dict[ModelUnit, int] = {}
+        self.conceptIds = array("i")
+        self.contextIds = array("i")
+        self.unitIds = array("i")
+        self.decimals = array("d")
+        self.numericValues = array("d")
+        self.isNil = array("b")
+        self.extend(facts)
+
+    def __len__(self) -> int:
+        return len(self.facts)
+
+    @staticmethod
+    def _id(obj: Any, ids: dict[Any, int], objs: list[Any]) -> int:
+        if obj is None:
+            return NO_ROW
+        try:
+            return ids[obj]
+        except KeyError:
+            ids[obj] = i = len(objs)
+            objs.append(obj)
+            return i
+
+    def extend(self, facts: Iterable[ModelFact]) -> None:
+        for fact in facts:
+            if fact.isItem:
+                self.append(fact)
+            elif fact.isTuple:
+                self.extend(fact.modelTupleFacts)
+
+    def append(self, fact: ModelFact) -> None:
+        from arelle.ValidateXbrlCalcs import inferredDecimals
+        self.factRows[fact] = len(self.facts)
+        self.facts.append(fact)
+        self.conceptIds.append(self._id(fact.concept, self._conceptIds, self.concepts))
+        self.contextIds.append(self._id(fact.context, self._contextIds, self.contexts))
+        self.unitIds.append(self._id(fact.unit, self._unitIds, self.units))
+        isNil = fact.isNil
+        self.isNil.append(isNil)
+        numericValue = decimals = float("nan")
+        if fact.isNumeric:
+            decimals = float(inferredDecimals(fact))
+            if not isNil:
+                try:
+                    numericValue = float(getattr(fact, "xValue", None))
+                except (TypeError, ValueError):
+                    pass
+        self.decimals.append(decimals)
+        self.numericValues.append(numericValue)
+
+    def rowsByContext(self) -> dict[int, list[int]]:
+        """Rows of each context id, in document order"""
+        rows = defaultdict(list)
+        for row, contextId in enumerate(self.contextIds):
+            rows[contextId].append(row)
+        return rows
+
+    def numericRows(self) -> Iterator[int]:
+        """Rows of non-nil numeric facts with a valid value"""
+        numericValues = self.numericValues
+        return (row for row, value in enumerate(numericValues) if value == value)
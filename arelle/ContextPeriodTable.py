@@ -0,0 +1,73 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Columnar table of instance context periods, for filtering facts by period once per context
+instead of once per fact.
+'''
+from __future__ import annotations
+from array import array
+import datetime
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from arelle.ModelInstanceObject import ModelContext
+
+NO_DATETIME = -2 ** 63 # column value of a context without this period date
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+def epochMicroseconds(value: datetime.datetime) -> tuple[int, bool]:
+    """(microseconds since epoch, has timezone) of datetime value.
+
+    Naive and timezone aware datetimes never compare equal, so awareness is kept alongside the
+    epoch value; aware values are converted to UTC as they compare by instant.  The datetime
+    subtraction is used, as ModelValue.DateTime subtraction is of xs:dayTimeDuration without microseconds.
+    """
+    if value.utcoffset() is None:
+        return datetime.datetime.__sub__(value, _EPOCH) // _MICROSECOND, False
+    return datetime.datetime.__sub__(value, _EPOCH_UTC) // _MICROSECOND, True
+
+class ContextPeriodTable:
+    """Period dates of contexts as int64 epoch microsecond columns, with the context of each row
+    in contexts.  Start and end columns are of start-end periods, instant column of instant periods,
+    end and instant dates with the end-of-day adjustment of ModelContext endDatetime and instantDatetime.
+    """
+    __slots__ = ("contexts", "columns", "timezones", "forever")
+
+    def __init__(self, contexts: Iterable[ModelContext]) -> None:
+        self.contexts: list[ModelContext] = []
+        self.columns = {"start": array("q"), "end": array("q"), "instant": array("q")}
+        self.timezones = {"start": array("b"), "end": array("b"), "instant": array("b")}
+        self.forever = array("b")
+        for cntx in contexts:
+            self.append(cntx)
+
+    def append(self, cntx: ModelContext) -> None:
+        self.contexts.append(cntx)
+        isStartEndPeriod = cntx.isStartEndPeriod
+        for column, value in (("start", cntx.startDatetime if isStartEndPeriod else None),
+                              ("end", cntx.endDatetime if isStartEndPeriod else None),
+                              ("instant", cntx.instantDatetime if cntx.isInstantPeriod else None)):
+            if isinstance(value, datetime.datetime):
+                epoch, hasTimezone = epochMicroseconds(value)
+            else:
+                epoch, hasTimezone = NO_DATETIME, False
+            self.columns[column].append(epoch)
+            self.timezones[column].append(hasTimezone)
+        self.forever.append(cntx.isForeverPeriod)
+
+    def contextsWithDatetime(self, column: str, value: datetime.datetime) -> set[ModelContext]:
+        """Contexts whose period date in column ("start", "end" or "instant") equals value"""
+        epoch, hasTimezone = epochMicroseconds(value)
+        timezones = self.timezones[column]
+        contexts = self.contexts
+        return set(contexts[i]
+                   for i, rowEpoch in enumerate(self.columns[column])
+                   if rowEpoch == epoch and timezones[i] == hasTimezone)
+
+    @property
+    def foreverContexts(self) -> set[ModelContext]:
+        contexts = self.contexts
+        return set(contexts[i] for i, isForever in enumerate(self.forever) if isForever)
@@ -0,0 +1,95 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Canonical table of equal instance contexts and units, for consumers (such as calculation validation,
+formula output and OIM duplicate detection) to compare contexts and units by canonical id instead of
+each rebuilding its own hash buckets and isEqualTo checks.
+'''
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from arelle.ModelInstanceObject import ModelContext, ModelUnit
+    from arelle.ModelValue import QName
+
+NON_DIMENSION_AWARE = 0 # index of the s-equal segment and scenario variant
+DIMENSION_AWARE = 1 # index of the dimensional and non-dimensional values variant
+
+class ContextUnitCanonicalTable:
+    """Canonical id of each context and unit, the first of its equal contexts or units being canonical.
+
+    Contexts have a dimension-aware variant (contextDimAwareHash, equal dimensions and non-dimensional
+    values) and a non-dimension-aware variant (contextNonDimAwareHash, s-equal segment and scenario),
+    as isEqualTo's dimensionalAspectModel; units are equal by measures.
+    """
+    __slots__ = ("canonicalContexts", "canonicalUnits", "_contextIds", "_contextHashIds", "_contextsByEntity",
+                 "_unitIds", "_unitHashIds")
+
+    def __init__(self, contexts: Iterable[ModelContext] = (), units: Iterable[ModelUnit] = ()) -> None:
+        self.canonicalContexts: tuple[list[ModelContext], list[ModelContext]] = ([], [])
+        self.canonicalUnits: list[ModelUnit] = []
+        self._contextIds: tuple[dict[ModelContext, int], dict[ModelContext, int]] = ({}, {})
+        self._contextHashIds: tuple[dict[int, list[int]], dict[int, list[int]]] = ({}, {})
+        self._contextsByEntity: tuple[dict[tuple[str, str], list[ModelContext]], dict[tuple[str, str], list[ModelContext]]] = ({}, {})
+        self._unitIds: dict[ModelUnit, int] = {}
+        self._unitHashIds: dict[int, list[int]] = {}
+        for cntx in contexts:
+            self.appendContext(cntx)
+        for unit in units:
+            self.appendUnit(unit)
+
+    def appendContext(self, cntx: ModelContext) -> None:
+        for variant, h in ((NON_DIMENSION_AWARE, cntx.contextNonDimAwareHash),
+                           (DIMENSION_AWARE, cntx.contextDimAwareHash)):
+            canonicalContexts = self.canonicalContexts[variant]
+            hashIds = self._contextHashIds[variant].setdefault(h, [])
+            for id in hashIds:
+                if cntx.isEqualTo(canonicalContexts[id], dimensionalAspectModel=variant == DIMENSION_AWARE):
+                    break
+            else:
+                id = len(canonicalContexts)
+                canonicalContexts.append(cntx)
+                hashIds.append(id)
+                self._contextsByEntity[variant].setdefault(cntx.entityIdentifier, []).append(cntx)
+            self._contextIds[variant][cntx] = id
+
+    def appendUnit(self, unit: ModelUnit) -> None:
+        canonicalUnits = self.canonicalUnits
+        hashIds = self._unitHashIds.setdefault(unit.hash, [])
+        for id in hashIds:
+            if unit.isEqualTo(canonicalUnits[id]):
+                break
+        else:
+            id = len(canonicalUnits)
+            canonicalUnits.append(unit)
+            hashIds.append(id)
+        self._unitIds[unit] = id
+
+    def contextId(self, cntx: ModelContext, dimensionAware: bool = True) -> int:
+        """Canonical id of context, equal for equal contexts"""
+        return self._contextIds[DIMENSION_AWARE if dimensionAware else NON_DIMENSION_AWARE][cntx]
+
+    def canonicalContext(self, cntx: ModelContext, dimensionAware: bool = True) -> ModelContext:
+        """First context in the table equal to cntx"""
+        variant = DIMENSION_AWARE if dimensionAware else NON_DIMENSION_AWARE
+        return self.canonicalContexts[variant][self._contextIds[variant][cntx]]
+
+    def canonicalContextsOfEntity(self, entityIdentifier: tuple[str, str], dimensionAware: bool = True) -> list[ModelContext]:
+        """Canonical contexts with (scheme, identifier) entityIdentifier, in table order"""
+        return self._contextsByEntity[DIMENSION_AWARE if dimensionAware else NON_DIMENSION_AWARE].get(entityIdentifier, [])
+
+    def unitId(self, unit: ModelUnit) -> int:
+        """Canonical id of unit, equal for equal units"""
+        return self._unitIds[unit]
+
+    def canonicalUnit(self, unit: ModelUnit) -> ModelUnit:
+        """First unit in the table equal to unit"""
+        return self.canonicalUnits[self._unitIds[unit]]
+
+    def unitWithMeasures(self, measures: tuple[tuple[QName, ...], tuple[QName, ...]]) -> ModelUnit | None:
+        """Canonical unit with (sorted multiply-by, sorted divide-by) measures, if any"""
+        canonicalUnits = self.canonicalUnits
+        for id in self._unitHashIds.get(hash(measures), ()):
+            if canonicalUnits[id].measures == measures:
+                return canonicalUnits[id]
+        return None
@@ -161,7 +161,10 @@ class DialogFormulaParameters(Toplevel):
                     "traceVariableFilterWinnowing"),
            checkbox(frame, 3, y + 8,
                     "Filters Result",
-                    "traceVariableFiltersResult")
+                    "traceVariableFiltersResult"),
+           checkbox(frame, 3, y + 9,
+                    "Filter Plan",
+                    "traceVariableFilterPlan")
 
            # Note: if adding to this list keep ModelFormulaObject.FormulaOptions in sync
 
@@ -8,7 +8,8 @@ from arelle.ModelFormulaObject import (aspectModels, Aspect, aspectModelAspect,
                                  ModelFormula, ModelTuple, ModelExistenceAssertion,
                                  ModelValueAssertion,
                                  ModelFactVariable, ModelGeneralVariable, ModelVariable,
-                                 ModelParameter, ModelFilter, ModelAspectCover, ModelBooleanFilter, ModelTypedDimension)
+                                 ModelParameter, ModelFilter, ModelAspectCover, ModelBooleanFilter, ModelTypedDimension,
+                                 ModelTestFilter, ModelRelativeFilter, filterIndexedFacts)
 from arelle.PrototypeInstanceObject import DimValuePrototype
 from arelle.PythonUtil import OrderedSet
 from arelle.ModelValue import (QName)
@@ -38,6 +39,8 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
         uncoveredAspectFacts = {}
     xpCtx.evaluations = []  # list of evaluations
     xpCtx.evaluationHashDicts = {} # hash indexs of evaluations
+    if xpCtx.formulaProfiler is not None:
+        profileEvaluationStarted = time.time()
     try:
         xpCtx.variableSet = varSet
         if isinstance(varSet, ModelExistenceAssertion):
@@ -118,6 +121,8 @@ def evaluate(xpCtx, varSet, variablesInScope=False, uncoveredAspectFacts=None):
                              modelObject=varSet, xlinkLabel=varSet.xlinkLabel,
                              evaluations=len(xpCtx.evaluations),
                              variables=max(len(e) for e in xpCtx.evaluations) if xpCtx.evaluations else 0)
+    if xpCtx.formulaProfiler is not None:
+        xpCtx.formulaProfiler.variableSetProfile(varSet).evaluationTime += time.time() - profileEvaluationStarted
     del xpCtx.evaluations[:]  # dereference
     xpCtx.evaluationHashDicts.clear()
     if variablesInScope:
@@ -142,6 +147,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 xpCtx.modelXbrl.info("formula:trace",
                      _("Variable set %(xlinkLabel)s skipped evaluation, all fact variables have fallen back"),
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel)
+            if xpCtx.formulaProfiler is not None:
+                xpCtx.formulaProfiler.variableSetProfile(varSet).skippedEvaluations += 1
             return
         # record completed evaluation, for fallback blocking purposes
         fbVars = set(vb.qname for vb in xpCtx.varBindings.values() if vb.isFallback)
@@ -154,6 +161,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                     _("Variable set %(xlinkLabel)s skipped non-different or fallback evaluation, duplicates another evaluation"),
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel)
             varSet.evaluationNumber += 1
+            if xpCtx.formulaProfiler is not None:
+                xpCtx.formulaProfiler.variableSetProfile(varSet).skippedEvaluations += 1
             if xpCtx.formulaOptions.timeVariableSetEvaluation:
                 now = time.time()
                 xpCtx.modelXbrl.info("formula:time",
@@ -178,6 +187,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                      _("Variable set %(xlinkLabel)s \nPrecondition %(precondition)s \nResult: %(result)s"),
                      modelObject=varSet, xlinkLabel=varSet.xlinkLabel, precondition=precondition.xlinkLabel, result=result)
             if not result: # precondition blocks evaluation
+                if xpCtx.formulaProfiler is not None:
+                    xpCtx.formulaProfiler.variableSetProfile(varSet).skippedEvaluations += 1
                 if xpCtx.formulaOptions.timeVariableSetEvaluation:
                     varSet.evaluationNumber += 1
                     now = time.time()
@@ -190,6 +201,8 @@ def evaluateVar(xpCtx, varSet, varIndex, cachedFilteredFacts, uncoveredAspectFac
                 return
 
         # evaluate variable set
+        if xpCtx.formulaProfiler is not None:
+            xpCtx.formulaProfiler.variableSetProfile(varSet).evaluations += 1
         if isinstance(varSet, ModelExistenceAssertion):
             varSet.evaluationsCount += 1
         else:
@@ -561,13 +574,34 @@ def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None
             if len(facts) == 0:
                 return facts
 
-    for varFilterRel in filterRelationships:
+    if orFilter:
+        plan = [(varFilterRel, None, None) for varFilterRel in filterRelationships]
+    else:
+        plan = filterPlan(xpCtx, vb, facts, filterRelationships)
+        if xpCtx.formulaOptions.traceVariableFilterPlan and plan:
+            xpCtx.modelXbrl.info("formula:trace",
+                _("Fact Variable %(variable)s %(filterType)sfilter plan: %(plan)s"),
+                modelObject=vb.var, variable=vb.qname, filterType=typeLbl,
+                plan=", ".join("{} {} ({})".format(
+                                    varFilterRel.toModelObject.localName, varFilterRel.toModelObject.xlinkLabel, step)
+                               for varFilterRel, indexedFactSets, step in plan))
+
+    profiler = xpCtx.formulaProfiler
+    for varFilterRel, indexedFactSets, step in plan:
         _filter = varFilterRel.toModelObject
         if isinstance(_filter,ModelFilter):  # relationship not constrained to real filters
             if filterType is None and len(facts) == 0:
                 pass # still continue to do the aspects covered thing
             else:
-                result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+                if profiler is not None:
+                    filterStarted = time.time()
+                if indexedFactSets is not None: # pushed down to instance fact indexes
+                    result = filterIndexedFacts(facts, indexedFactSets, varFilterRel.isComplemented)
+                else:
+                    result = _filter.filter(xpCtx, vb, facts, varFilterRel.isComplemented)
+                if profiler is not None and xpCtx.variableSet is not None:
+                    profiler.variableSetProfile(xpCtx.variableSet).filterApplied(
+                        vb.qname, _filter, len(facts), len(result), time.time() - filterStarted)
 
                 if xpCtx.formulaOptions.traceVariableFilterWinnowing:
                     allFacts = ""
@@ -604,6 +638,44 @@ def trialFilterFacts(xpCtx, vb, facts, filterRelationships, filterType, var=None
             facts = outFacts
     return facts
 
+def filterPlan(xpCtx, vb, facts, filterRelationships):
+    # order and-combined filters for execution: filters answerable from instance fact indexes first, most
+    # selective first by index cardinality, then other filters, then test expression filters, the latter
+    # two in their original order.  Relative and boolean filters depend on aspects covered by preceding
+    # filters, so filters are not moved across them.  Indexed filters are planned with the instance fact index
+    # sets answering them, which are only intersected with the facts when the filter is applied.
+    plan = []
+    indexed = []
+    scanned = []
+    tested = []
+    def planSegment():
+        indexed.sort(key=lambda planStep: planStep[2])
+        plan.extend((varFilterRel, indexedFactSets, "index, {} facts estimated".format(estimate))
+                    for varFilterRel, indexedFactSets, estimate in indexed)
+        plan.extend(scanned)
+        plan.extend(tested)
+        del indexed[:], scanned[:], tested[:]
+    for varFilterRel in filterRelationships:
+        _filter = varFilterRel.toModelObject
+        if not isinstance(_filter, ModelFilter):
+            scanned.append((varFilterRel, None, "scan"))
+        elif isinstance(_filter, (ModelRelativeFilter, ModelBooleanFilter)):
+            planSegment()
+            plan.append((varFilterRel, None, "ordered"))
+        else:
+            indexedFactSets = _filter.indexedFactSets(xpCtx, vb)
+            if indexedFactSets is not None:
+                estimate = min(sum(len(factSet) for factSet in indexedFactSets), len(facts))
+                if varFilterRel.isComplemented:
+                    estimate = len(facts) - estimate
+                indexed.append((varFilterRel, indexedFactSets, estimate))
+            elif isinstance(_filter, ModelTestFilter):
+                tested.append((varFilterRel, None, "test"))
+            else:
+                scanned.append((varFilterRel, None, "scan"))
+    planSegment()
+    return plan
+
 def filterFacts(xpCtx, vb, facts, filterRelationships, filterType):
     typeLbl = filterType + " " if filterType else ""
     orFilter = filterType == "or"
@@ -813,8 +885,99 @@ def aspectMatches(xpCtx, fact1, fact2, aspect):
             # else if both are None, matches True for single and multiple instance
     return True
 
+UNKEYABLE = object() # aspect value of fact (or fact prototype) can't be keyed for aspectMatches
+
+def periodMatchKey(cntx):
+    # key of context (or context prototype) period, as compared by isPeriodEqualTo
+    periodTypes = (bool(cntx.isForeverPeriod), bool(cntx.isStartEndPeriod), bool(cntx.isInstantPeriod))
+    if sum(periodTypes) > 1:
+        return UNKEYABLE # prototype of several period types
+    try:
+        if periodTypes[0]:
+            key = ("forever",)
+        elif periodTypes[1]:
+            key = ("duration", cntx.startDatetime, cntx.endDatetime)
+        elif periodTypes[2]:
+            key = ("instant", cntx.instantDatetime)
+        else:
+            return None
+        hash(key)
+    except (AttributeError, TypeError): # prototype without (hashable) period dates
+        return UNKEYABLE
+    return key
+
+def aspectMatchKey(xpCtx, fact, aspect):
+    # hashable key of fact's (or fact prototype's) aspect value, equal for facts matching on aspect (facts which
+    # don't match may share a key), None for aspects not keyed, UNKEYABLE if aspectMatches can't be keyed for the fact
+    if aspect == 2: # Aspect.CONCEPT:
+        return fact.qname
+    if aspect in (1, 6, 7, 8, 9, 10): # location, segment, scenario and dimensions aspects not keyed
+        return None
+    if fact.isTuple:
+        return True # tuples match other tuples
+    if aspect == 5: # Aspect.UNIT:
+        unit = fact.unit
+        return unit.hash if unit is not None else None
+    cntx = fact.context
+    if cntx is None:
+        return UNKEYABLE # context aspects of a fact without context don't match symmetrically
+    if aspect == 4: # Aspect.PERIOD:
+        return periodMatchKey(cntx)
+    if aspect == 3: # Aspect.ENTITY_IDENTIFIER:
+        return cntx.entityIdentifierHash
+    if isinstance(aspect, QName):
+        dimValue = cntx.dimValue(aspect)
+        if isinstance(dimValue, (ModelDimensionValue, DimValuePrototype)): # fact or fact prototype dimension value
+            if dimValue.isExplicit:
+                return dimValue.memberQname
+            if dimValue.dimension is None or dimValue.dimension.typedDomainElement in getattr(xpCtx.modelXbrl, "modelFormulaEqualityDefinitions", EMPTYSET):
+                return True # compared by equality definition
+            # typed member values are xpath equal when corresponding
+            typedMember = dimValue.typedMember
+            if not isinstance(typedMember, ModelObject):
+                return UNKEYABLE
+            if not hasattr(typedMember, "xValid"):
+                XmlValidate.validate(fact.modelXbrl, typedMember)
+            try:
+                return hash(getattr(typedMember, "xValue", None))
+            except TypeError:
+                return None
+        return dimValue # default member QName or None for absent dimension
+    return None
+
+def aspectsMatchKey(xpCtx, fact, aspects):
+    # key of fact's aspects values, equal for facts matching on aspects, None if not keyable for the fact
+    key = tuple(aspectMatchKey(xpCtx, fact, aspect) for aspect in aspects)
+    if any(aspectKey is UNKEYABLE for aspectKey in key):
+        return None
+    return key
+
 def factsPartitions(xpCtx, facts, aspects):
     factsPartitions = []
+    if facts:
+        # partitions are compared only with those of equal aspects key, when facts are of a single instance
+        # (default and absent dimension values may match across instances)
+        keyedAspects = sorted(aspects, key=lambda aspect: (isinstance(aspect, QName), str(aspect)))
+        modelXbrl = None
+        partitionsByKey = defaultdict(list)
+        for fact in facts:
+            if modelXbrl is None:
+                modelXbrl = fact.modelXbrl
+            key = aspectsMatchKey(xpCtx, fact, keyedAspects) if fact.modelXbrl == modelXbrl else None
+            if key is None:
+                break
+            keyPartitions = partitionsByKey[key]
+            for partition in keyPartitions:
+                if aspectsMatch(xpCtx, fact, partition[0], aspects):
+                    partition.append(fact)
+                    break
+            else:
+                partition = [fact]
+                keyPartitions.append(partition)
+                factsPartitions.append(partition)
+        else:
+            return factsPartitions
+        factsPartitions = [] # not keyable, compare with all partitions
     for fact in facts:
         matched = False
         for partition in factsPartitions:
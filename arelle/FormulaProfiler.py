@@ -0,0 +1,103 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Per variable set cost profile of formula compilation and evaluation, collected by ValidateFormula and
+FormulaEvaluator when formula options variableSetProfileReport names a report file (.json, otherwise .csv).
+'''
+from __future__ import annotations
+import csv, json
+from typing import Any
+
+class FilterProfile:
+    __slots__ = ("variable", "filter", "calls", "time", "factsIn", "factsOut")
+
+    def __init__(self, variable: Any, _filter: Any) -> None:
+        self.variable = variable
+        self.filter = _filter
+        self.calls = 0
+        self.time = 0.0
+        self.factsIn = 0
+        self.factsOut = 0
+
+class VariableSetProfile:
+    __slots__ = ("variableSet", "compileTime", "evaluationTime", "evaluations", "skippedEvaluations", "filterProfiles")
+
+    def __init__(self, variableSet: Any) -> None:
+        self.variableSet = variableSet
+        self.compileTime = 0.0
+        self.evaluationTime = 0.0 # includes variable sets evaluated in its variables-scope
+        self.evaluations = 0
+        self.skippedEvaluations = 0 # all fact variables fallen back, duplicate evaluation or precondition not met
+        self.filterProfiles: dict[tuple[Any, Any], FilterProfile] = {}
+
+    def filterApplied(self, variable: Any, _filter: Any, factsIn: int, factsOut: int, duration: float) -> None:
+        try:
+            filterProfile = self.filterProfiles[variable, _filter]
+        except KeyError:
+            filterProfile = self.filterProfiles[variable, _filter] = FilterProfile(variable, _filter)
+        filterProfile.calls += 1
+        filterProfile.time += duration
+        filterProfile.factsIn += factsIn
+        filterProfile.factsOut += factsOut
+
+    @property
+    def filterTime(self) -> float:
+        return sum(filterProfile.time for filterProfile in self.filterProfiles.values())
+
+    def row(self) -> dict[str, Any]:
+        variableSet = self.variableSet
+        filterProfiles = self.filterProfiles.values()
+        return {"variableSet": variableSet.id or variableSet.xlinkLabel,
+                "type": variableSet.localName,
+                "compileTime": round(self.compileTime, 6),
+                "evaluationTime": round(self.evaluationTime, 6),
+                "evaluations": self.evaluations,
+                "skippedEvaluations": self.skippedEvaluations,
+                "filterCalls": sum(f.calls for f in filterProfiles),
+                "filterTime": round(self.filterTime, 6),
+                "factsIn": sum(f.factsIn for f in filterProfiles),
+                "factsOut": sum(f.factsOut for f in filterProfiles)}
+
+class FormulaProfiler:
+    reportColumns = ("variableSet", "type", "compileTime", "evaluationTime", "evaluations", "skippedEvaluations",
+                     "filterCalls", "filterTime", "factsIn", "factsOut")
+
+    def __init__(self) -> None:
+        self.variableSetProfiles: dict[Any, VariableSetProfile] = {}
+
+    def variableSetProfile(self, variableSet: Any) -> VariableSetProfile:
+        try:
+            return self.variableSetProfiles[variableSet]
+        except KeyError:
+            profile = self.variableSetProfiles[variableSet] = VariableSetProfile(variableSet)
+            return profile
+
+    def sortedProfiles(self, sortBy: str = "evaluationTime") -> list[VariableSetProfile]:
+        return sorted(self.variableSetProfiles.values(),
+                      key=lambda profile: (-(getattr(profile, sortBy) or 0), profile.variableSet.objectIndex))
+
+    def report(self, sortBy: str = "evaluationTime") -> list[dict[str, Any]]:
+        """Rows of variable set profiles, most costly first, with filter profiles of each"""
+        rows = []
+        for profile in self.sortedProfiles(sortBy):
+            row = profile.row()
+            row["filters"] = [{"variable": str(f.variable),
+                               "filter": "{} {}".format(f.filter.localName, f.filter.xlinkLabel),
+                               "calls": f.calls,
+                               "time": round(f.time, 6),
+                               "factsIn": f.factsIn,
+                               "factsOut": f.factsOut}
+                              for f in sorted(profile.filterProfiles.values(), key=lambda f: -f.time)]
+            rows.append(row)
+        return rows
+
+    def save(self, filename: str, sortBy: str = "evaluationTime") -> None:
+        """Saves the report as JSON if filename ends with .json, otherwise as CSV (without filter details)"""
+        rows = self.report(sortBy)
+        with open(filename, "w", encoding="utf-8", newline="") as fh:
+            if filename.endswith(".json"):
+                json.dump({"variableSets": rows}, fh, indent=1)
+            else:
+                writer = csv.DictWriter(fh, self.reportColumns, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
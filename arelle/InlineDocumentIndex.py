@@ -0,0 +1,94 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Index of the elements of an inline XBRL (or xhtml) document, built by a single traversal of its html
+element, for discovery (inlineXbrlDiscover, inlineIxdsDiscover) and filing validation (ESEF, EFM and
+ValidateFilingText) to look up inline and styled elements instead of each re-walking the document.
+'''
+from __future__ import annotations
+from typing import Any
+
+from arelle import XbrlConst
+from arelle.ModelObject import ModelObject
+
+xhtmlNStag = "{" + XbrlConst.xhtml + "}"
+xhtmlBaseTag = xhtmlNStag + "base"
+referencingTags = frozenset((xhtmlNStag + "a", xhtmlNStag + "img"))
+ixNStags = frozenset("{" + ns + "}" for ns in XbrlConst.ixbrlAll)
+
+class InlineDocumentIndex:
+    """Elements of the html element's document, by kind, each in document order:
+
+    - eltsById: descendant elements with an id attribute, by id (as iterfind(".//*[@id]"))
+    - ixEltsByTag: inline XBRL descendant elements (of any ix namespace), by clark tag
+    - styledElts: descendant xhtml elements with a style attribute
+    - referencingElts: xhtml a and img elements, whose href and src reference files
+    - ixNS: namespace of the first inline XBRL element, None if there are none
+    - conflictingIxNSElts: inline XBRL elements of an ix namespace other than ixNS
+    - htmlBase: href of the last xhtml base element, None if there is none
+
+    The index holds its elements, so the lxml proxies of id'd and inline elements (and, once
+    used, of styled, a and img elements) stay in memory with the document rather than being
+    released between walks.  Discovery needs the id'd and inline elements; the styled and
+    referencing elements, only wanted by filing validation, are indexed on first use.
+    """
+    __slots__ = ("htmlElement", "eltsById", "ixElts", "ixEltsByTag", "_styledElts", "_referencingElts",
+                 "ixNS", "conflictingIxNSElts", "htmlBase")
+
+    def __init__(self, htmlElement: Any) -> None:
+        self.htmlElement = htmlElement
+        self.eltsById: dict[str, list[Any]] = {}
+        self.ixElts: list[Any] = []
+        self.ixEltsByTag: dict[str, list[Any]] = {}
+        self._styledElts: list[Any] | None = None
+        self._referencingElts: list[Any] | None = None
+        self.ixNS: str | None = None
+        self.conflictingIxNSElts: list[ModelObject] = []
+        self.htmlBase: str | None = None
+        for elt in htmlElement.iterdescendants():
+            tag = elt.tag
+            if not isinstance(tag, str): # comment or processing instruction
+                continue
+            id = elt.get("id")
+            if id is not None:
+                self.eltsById.setdefault(id, []).append(elt)
+            nsTag = tag[:tag.find("}") + 1]
+            if nsTag in ixNStags:
+                self.ixElts.append(elt)
+                self.ixEltsByTag.setdefault(tag, []).append(elt)
+                if isinstance(elt, ModelObject):
+                    if self.ixNS is None:
+                        self.ixNS = nsTag[1:-1]
+                    elif nsTag[1:-1] != self.ixNS:
+                        self.conflictingIxNSElts.append(elt)
+            elif tag == xhtmlBaseTag:
+                self.htmlBase = elt.get("href")
+
+    def _indexXhtmlElts(self) -> None:
+        self._styledElts = []
+        self._referencingElts = []
+        for elt in self.htmlElement.iterdescendants(xhtmlNStag + "*"):
+            if elt.get("style") is not None:
+                self._styledElts.append(elt)
+            if elt.tag in referencingTags:
+                self._referencingElts.append(elt)
+
+    @property
+    def styledElts(self) -> list[Any]:
+        if self._styledElts is None:
+            self._indexXhtmlElts()
+        assert self._styledElts is not None
+        return self._styledElts
+
+    @property
+    def referencingElts(self) -> list[Any]:
+        if self._referencingElts is None:
+            self._indexXhtmlElts()
+        assert self._referencingElts is not None
+        return self._referencingElts
+
+    def ixElements(self, *tags: str) -> list[Any]:
+        """Inline XBRL elements with any of the clark tags, in document order"""
+        if len(tags) == 1:
+            return self.ixEltsByTag.get(tags[0], [])
+        return [elt for elt in self.ixElts if elt.tag in tags]
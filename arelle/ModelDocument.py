@@ -10,6 +10,7 @@ from xml.sax import SAXParseException
 from arelle import (PackageManager, XbrlConst, XmlUtil, UrlUtil, ValidateFilingText,
                     XhtmlValidate, XmlValidateSchema)
 from arelle.FileSource import FileSource
+from arelle.InlineDocumentIndex import InlineDocumentIndex
 from arelle.ModelObject import ModelObject
 from arelle.ModelValue import qname
 from arelle.ModelDtsObject import ModelLink
@@ -18,12 +19,14 @@ from arelle.ModelObjectFactory import parser
 from arelle.PrototypeDtsObject import LinkPrototype, LocPrototype, ArcPrototype, DocumentPrototype, PrototypeElementTree
 from arelle.PluginManager import pluginClassMethods
 from arelle.PythonUtil import OrderedDefaultDict, normalizeSpace
+from arelle.SpanTracer import traceSpan
 from arelle.XhtmlValidate import ixMsgCode
 from arelle.XmlValidate import VALID, validate as xmlValidate, lxmlSchemaValidate
 from arelle.ModelTestcaseObject import ModelTestcaseVariation
 
 creationSoftwareNames = None
 
+@traceSpan("ModelDocument.load")
 def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDiscovered=False, isIncluded=None, isSupplemental=False, namespace=None, reloadCache=False, **kwargs) -> ModelDocument | None:
     """Returns a new modelDocument, performing DTS discovery for instance, inline XBRL, schema,
     linkbase, and versioning report entry urls.
@@ -147,29 +150,36 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
                 return None
             if modelDocument is not None:
                 return modelDocument
-        if (modelXbrl.modelManager.validateDisclosureSystem and (
-            (isEntry and modelXbrl.modelManager.disclosureSystem.validateEntryText) or
-            (modelXbrl.modelManager.disclosureSystem.validateFileText and
-             not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict))):
-            file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
-        else:
-            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
         xmlDocument = None
-        isPluginParserDocument = False
-        for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
-            modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
-            if modelDocument is not None:
-                file.close()
-                return modelDocument
-        _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,normalizedUri)
-        xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
-        for error in _parser.error_log:
-            modelXbrl.error("xmlSchema:syntax",
-                    _("%(error)s, %(fileName)s, line %(line)s, column %(column)s"),
-                    modelObject=(referringElement, os.path.basename(uri)),
-                    fileName=os.path.basename(uri),
-                    error=error.message, line=error.line, column=error.column)
-        file.close()
+        for pluginMethod in pluginClassMethods("ModelDocument.CustomParser"):
+            # returns (document parsed from filepath, such as pruned while parsed by a streaming parser, its encoding) or None
+            parsedDocument = pluginMethod(modelXbrl, normalizedUri, filepath)
+            if parsedDocument is not None:
+                xmlDocument, _encoding = parsedDocument
+                _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,normalizedUri)
+                break
+        if xmlDocument is None:
+            if (modelXbrl.modelManager.validateDisclosureSystem and (
+                (isEntry and modelXbrl.modelManager.disclosureSystem.validateEntryText) or
+                (modelXbrl.modelManager.disclosureSystem.validateFileText and
+                 not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict))):
+                file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
+            else:
+                file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
+                modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
+                if modelDocument is not None:
+                    file.close()
+                    return modelDocument
+            _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,normalizedUri)
+            xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
+            for error in _parser.error_log:
+                modelXbrl.error("xmlSchema:syntax",
+                        _("%(error)s, %(fileName)s, line %(line)s, column %(column)s"),
+                        modelObject=(referringElement, os.path.basename(uri)),
+                        fileName=os.path.basename(uri),
+                        error=error.message, line=error.line, column=error.column)
+            file.close()
     except (EnvironmentError, KeyError, UnicodeDecodeError) as err:  # missing zip file raises KeyError
         if file:
             file.close()
@@ -697,6 +707,15 @@ class ModelDocument:
             self._xmlRootElementQname = qname(self.xmlRootElement)
             return self._xmlRootElementQname
 
+    @property
+    def inlineIndex(self) -> InlineDocumentIndex:
+        """Index of the elements of an inline XBRL document, built on discovery (or on first use for other xhtml)"""
+        try:
+            return self._inlineIndex
+        except AttributeError:
+            self._inlineIndex = InlineDocumentIndex(self.xmlRootElement)
+            return self._inlineIndex
+
     def relativeUri(self, uri): # return uri relative to this modelDocument uri
         return UrlUtil.relativeUri(self.uri, uri)
 
@@ -892,6 +911,7 @@ class ModelDocument:
                     self._processingInstructions.append(node)
             return self._processingInstructions
 
+    @traceSpan("ModelDocument.schemaDiscover")
     def schemaDiscover(self, rootElement, isIncluded, isSupplemental, namespace):
         targetNamespace = rootElement.get("targetNamespace")
         if targetNamespace:
@@ -1099,6 +1119,7 @@ class ModelDocument:
             if isinstance(linkbaseElement,ModelObject):
                 self.linkbaseDiscover(self, linkbaseElement)
 
+    @traceSpan("ModelDocument.linkbaseDiscover")
     def linkbaseDiscover(self, linkbaseElement, inInstance=False):
         # sequence linkbase elements for elementPointer efficiency
         lbElementSequence = 0
@@ -1226,6 +1247,7 @@ class ModelDocument:
             return href
         return None
 
+    @traceSpan("ModelDocument.instanceDiscover")
     def instanceDiscover(self, xbrlElement):
         self.schemaLinkbaseRefsDiscover(xbrlElement)
         if not self.skipDTS:
@@ -1290,19 +1312,14 @@ class ModelDocument:
             xmlValidate(self.modelXbrl, unitElement) # validation may have not completed due to errors elsewhere
         self.modelXbrl.units[unitElement.id] = unitElement
 
+    @traceSpan("ModelDocument.inlineXbrlDiscover")
     def inlineXbrlDiscover(self, htmlElement):
-        ixNS = None
-        htmlBase = None
-        conflictingNSelts = []
+        # index elements in one pass, for discovery and validation to not re-walk the document
+        self._inlineIndex = inlineIndex = InlineDocumentIndex(htmlElement)
         # find namespace, only 1 namespace
-        for inlineElement in htmlElement.iterdescendants():
-            if isinstance(inlineElement,ModelObject) and inlineElement.namespaceURI in XbrlConst.ixbrlAll:
-                if ixNS is None:
-                    ixNS = inlineElement.namespaceURI
-                elif ixNS != inlineElement.namespaceURI:
-                    conflictingNSelts.append(inlineElement)
-            elif inlineElement.tag == "{http://www.w3.org/1999/xhtml}base":
-                htmlBase = inlineElement.get("href")
+        ixNS = inlineIndex.ixNS
+        htmlBase = inlineIndex.htmlBase
+        conflictingNSelts = inlineIndex.conflictingIxNSElts
         if ixNS is None: # no inline element, look for xmlns namespaces on htmlElement:
             for _ns in htmlElement.nsmap.values():
                 if _ns in XbrlConst.ixbrlAll:
@@ -1321,14 +1338,14 @@ class ModelDocument:
         self.htmlBase = htmlBase
         ixdsTarget = getattr(self.modelXbrl, "ixdsTarget", None)
         # load referenced schemas and linkbases (before validating inline HTML
-        for inlineElement in htmlElement.iterdescendants(tag=ixNStag + "references"):
+        for inlineElement in inlineIndex.ixElements(ixNStag + "references"):
             if inlineElement.get("target") == ixdsTarget:
                 self.schemaLinkbaseRefsDiscover(inlineElement)
                 xmlValidate(self.modelXbrl, inlineElement) # validate instance elements
         # with DTS loaded, now validate inline HTML (so schema definition of facts is available)
         if htmlElement.namespaceURI == XbrlConst.xhtml:  # must validate xhtml
             XhtmlValidate.xhtmlValidate(self.modelXbrl, htmlElement)  # fails on prefixed content
-        for inlineElement in htmlElement.iterdescendants(tag=ixNStag + "resources"):
+        for inlineElement in inlineIndex.ixElements(ixNStag + "resources"):
             xmlValidate(self.modelXbrl, inlineElement) # validate instance elements
 
         # subsequent inline elements have to be processed after all of the document set is loaded
@@ -1440,9 +1457,10 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
     # compile inline result set
     ixdsEltById = defaultdict(list)
     for htmlElement in modelXbrl.ixdsHtmlElements:
-        for elt in htmlElement.iterfind(".//*[@id]"):
-            if isinstance(elt,ModelObject) and elt.id:
-                ixdsEltById[elt.id].append(elt)
+        for elts in htmlElement.modelDocument.inlineIndex.eltsById.values():
+            for elt in elts:
+                if isinstance(elt,ModelObject) and elt.id:
+                    ixdsEltById[elt.id].append(elt)
 
     # TODO: ixdsEltById duplication should be tested here and removed from ValidateXbrlDTS (about line 346 after if name == "id" and attrValue in val.elementIDs)
     footnoteRefs = defaultdict(list)
@@ -1468,7 +1486,8 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
     for htmlElement in modelXbrl.ixdsHtmlElements:
         mdlDoc = htmlElement.modelDocument
         ixNStag = mdlDoc.ixNStag
-        for modelInlineTuple in htmlElement.iterdescendants(tag=ixNStag + "tuple"):
+        inlineIndex = mdlDoc.inlineIndex
+        for modelInlineTuple in inlineIndex.ixElements(ixNStag + "tuple"):
             if isinstance(modelInlineTuple,ModelObject):
                 modelInlineTuple.unorderedTupleFacts = defaultdict(list)
                 if modelInlineTuple.qname is not None:
@@ -1487,20 +1506,20 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                     if modelInlineTuple.id:
                         factsByFactID[modelInlineTuple.id] = modelInlineTuple
                 factTargetIDs.add(modelInlineTuple.get("target"))
-        for modelInlineFact in htmlElement.iterdescendants(ixNStag + "nonNumeric", ixNStag + "nonFraction", ixNStag + "fraction"):
+        for modelInlineFact in inlineIndex.ixElements(ixNStag + "nonNumeric", ixNStag + "nonFraction", ixNStag + "fraction"):
             if isinstance(modelInlineFact,ModelObject):
                 _target = modelInlineFact.get("target")
                 factTargetContextRefs[_target].add(modelInlineFact.get("contextRef"))
                 factTargetUnitRefs[_target].add(modelInlineFact.get("unitRef"))
                 if modelInlineFact.id:
                     factsByFactID[modelInlineFact.id] = modelInlineFact
-        for elt in htmlElement.iterdescendants(tag=ixNStag + "continuation"):
+        for elt in inlineIndex.ixElements(ixNStag + "continuation"):
             if isinstance(elt,ModelObject) and elt.id:
                 continuationElements[elt.id] = elt
-        for elt in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Footnote.clarkNotation):
+        for elt in inlineIndex.ixElements(XbrlConst.qnIXbrl11Footnote.clarkNotation):
             if isinstance(elt,ModelObject):
                 modelInlineFootnotesById[elt.footnoteID] = elt
-        for elt in htmlElement.iterdescendants(tag=ixNStag + "references"):
+        for elt in inlineIndex.ixElements(ixNStag + "references"):
             if isinstance(elt,ModelObject):
                 target = elt.get("target")
                 targetReferenceAttrsDict = targetReferenceAttrElts[target]
@@ -1533,7 +1552,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                     else:
                         targetReferencePrefixNsDict[_prefix] = (_ns, elt)
 
-        for hdrElt in htmlElement.iterdescendants(tag=ixNStag + "header"):
+        for hdrElt in inlineIndex.ixElements(ixNStag + "header"):
             hasHeader = True
             for elt in hdrElt.iterchildren(tag=ixNStag + "resources"):
                 hasResources = True
@@ -1557,7 +1576,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
 
     # discovery of relationships which are used by target documents
     for htmlElement in modelXbrl.ixdsHtmlElements:
-        for modelInlineRel in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Relationship.clarkNotation):
+        for modelInlineRel in htmlElement.modelDocument.inlineIndex.ixElements(XbrlConst.qnIXbrl11Relationship.clarkNotation):
             if isinstance(modelInlineRel,ModelObject):
                 linkrole = modelInlineRel.get("linkRole", XbrlConst.defaultLinkRole)
                 arcrole = modelInlineRel.get("arcrole", XbrlConst.factFootnote)
@@ -1584,7 +1603,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
         mdlDoc = htmlElement.modelDocument
         ixNStag = mdlDoc.ixNStag
 
-        for inlineElement in htmlElement.iterdescendants(tag=ixNStag + "resources"):
+        for inlineElement in mdlDoc.inlineIndex.ixElements(ixNStag + "resources"):
             contextRefs = factTargetContextRefs[ixdsTarget]
             allContextRefs = set.union(*factTargetContextRefs.values())
             unitRefs = factTargetUnitRefs[ixdsTarget]
@@ -1744,7 +1763,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                     addItemFactToTarget(tupleFact) # needs to be in factsInInstance
 
 
-        for modelInlineFact in htmlElement.iterdescendants(ixNStag + "nonNumeric", ixNStag + "nonFraction", ixNStag + "fraction"):
+        for modelInlineFact in mdlDoc.inlineIndex.ixElements(ixNStag + "nonNumeric", ixNStag + "nonFraction", ixNStag + "fraction"):
             _target = modelInlineFact.get("target")
             factTargetIDs.add(_target)
             if modelInlineFact.qname is not None: # must have a qname to be in facts
@@ -1790,7 +1809,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
         for tupleFact in tupleElements:
             checkForTupleCycle(tupleFact, [tupleFact])
 
-        for modelInlineFootnote in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Footnote.clarkNotation):
+        for modelInlineFootnote in mdlDoc.inlineIndex.ixElements(XbrlConst.qnIXbrl11Footnote.clarkNotation):
             if isinstance(modelInlineFootnote,ModelObject):
                 locateContinuation(modelInlineFootnote)
 
@@ -1838,7 +1857,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
     for htmlElement in modelXbrl.ixdsHtmlElements:
         mdlDoc = htmlElement.modelDocument
         # inline 1.0 ixFootnotes, build resources (with ixContinuation)
-        for modelInlineFootnote in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrlFootnote.clarkNotation):
+        for modelInlineFootnote in mdlDoc.inlineIndex.ixElements(XbrlConst.qnIXbrlFootnote.clarkNotation):
             if isinstance(modelInlineFootnote,ModelObject):
                 # link
                 linkrole = modelInlineFootnote.get("footnoteLinkRole", XbrlConst.defaultLinkRole)
@@ -1872,7 +1891,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
                                                                 footnoteLocLabel, footnoteID,
                                                                 linkrole, arcrole, sourceElement=modelInlineFootnote))
 
-        for modelInlineRel in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Relationship.clarkNotation):
+        for modelInlineRel in mdlDoc.inlineIndex.ixElements(XbrlConst.qnIXbrl11Relationship.clarkNotation):
             if isinstance(modelInlineRel,ModelObject):
                 linkrole = modelInlineRel.get("linkRole", XbrlConst.defaultLinkRole)
                 if linkrole not in linkPrototypes:
@@ -1881,7 +1900,7 @@ def inlineIxdsDiscover(modelXbrl, modelIxdsDocument):
 
     for htmlElement in modelXbrl.ixdsHtmlElements:
         mdlDoc = htmlElement.modelDocument
-        for modelInlineRel in htmlElement.iterdescendants(tag=XbrlConst.qnIXbrl11Relationship.clarkNotation):
+        for modelInlineRel in mdlDoc.inlineIndex.ixElements(XbrlConst.qnIXbrl11Relationship.clarkNotation):
             if isinstance(modelInlineRel,ModelObject):
                 fromLabels = set()
                 relHasFromFactsInTarget = relHasToObjectsInTarget = False
@@ -297,6 +297,8 @@ class ModelParticle():
         return str(self.minOccurs)
 
 anonymousTypeSuffix = "@anonymousType"
+DERIVEDFROMNOTHING = sys.intern("derived-from-nothing") # in derivation closures of types not derived from anything
+_derivedFromNothing = frozenset((DERIVEDFROMNOTHING,))
 
 class ModelConcept(ModelNamableTerm, ModelParticle):
     """
@@ -445,19 +447,49 @@ class ModelConcept(ModelNamableTerm, ModelParticle):
 
     def instanceOfType(self, typeqname) -> bool:
         """(bool) -- True if element is declared by, or derived from type of given qname or list of qnames"""
-        if isinstance(typeqname, (tuple,list,set)): # union
-            if self.typeQname in typeqname:
-                return True
-        else: # not union, single type
-            if self.typeQname == typeqname:
-                return True
+        typeQnames = self.instanceOfTypeQnames
+        if isinstance(typeqname, (tuple,list,set,frozenset)): # union
+            if not typeqname: # empty union matches only a type derived from nothing
+                return DERIVEDFROMNOTHING in typeQnames
+            return not typeQnames.isdisjoint(typeqname)
+        return typeqname in typeQnames or (typeqname is None and DERIVEDFROMNOTHING in typeQnames)
+
+    @property
+    def instanceOfTypeQnames(self):
+        """(frozenset) -- QNames of element's type, of all types it is derived from, and of types of
+        its substitution group chain (None for an element of the chain without type, DERIVEDFROMNOTHING
+        if a type chain ends in a type derived from nothing).
+        Cached once the type and substitution group chains are fully resolved in the DTS."""
+        try:
+            return self._instanceOfTypeQnames
+        except AttributeError:
+            typeQnames, isResolved = self._instanceOfTypeClosure(set())
+            if isResolved:
+                self._instanceOfTypeQnames = typeQnames
+            return typeQnames
+
+    def _instanceOfTypeClosure(self, visited):
+        visited.add(self)
+        typeQname = self.typeQname
+        typeQnames = {typeQname}
         type = self.type
-        if type is not None and type.isDerivedFrom(typeqname): # allows list or single type name
-            return True
+        if type is not None:
+            derivedFromQnames, isResolved = type._derivedFromClosure(set())
+            typeQnames |= derivedFromQnames
+        else:
+            isResolved = typeQname is None or typeQname.namespaceURI == XbrlConst.xsd
         subs = self.substitutionGroup
         if subs is not None:
-            return subs.instanceOfType(typeqname)
-        return False
+            if subs not in visited: # ignore (invalid) substitution group loops
+                try:
+                    typeQnames |= subs._instanceOfTypeQnames
+                except AttributeError:
+                    subsTypeQnames, subsIsResolved = subs._instanceOfTypeClosure(visited)
+                    typeQnames |= subsTypeQnames
+                    isResolved &= subsIsResolved
+        elif self.substitutionGroupQname is not None:
+            isResolved = False # substitution group head not (yet) discovered
+        return frozenset(typeQnames), isResolved
 
     @property
     def isNumeric(self):
@@ -549,14 +581,40 @@ class ModelConcept(ModelNamableTerm, ModelParticle):
     @property
     def substitutionGroupQnames(self):   # ordered list of all substitution group qnames
         """([QName]) -- Ordered list of QNames of substitution groups (recursively)"""
-        qnames = []
-        subs = self
-        subNext = subs.substitutionGroup
-        while subNext is not None:
-            qnames.append(subNext.qname)
-            subs = subNext
+        return list(self.substitutionGroupQnameChain)
+
+    @property
+    def substitutionGroupQnameChain(self):
+        """(tuple) -- Ordered tuple of QNames of substitution groups (recursively), cached once the chain
+        is resolved to its head element"""
+        try:
+            return self._substitutionGroupQnameChain
+        except AttributeError:
+            qnames = []
+            visited = {self}
+            subs = self
             subNext = subs.substitutionGroup
-        return qnames
+            while subNext is not None and subNext not in visited: # ignore (invalid) substitution group loops
+                qnames.append(subNext.qname)
+                visited.add(subNext)
+                subs = subNext
+                subNext = subs.substitutionGroup
+            qnameChain = tuple(qnames)
+            if subNext is not None or subs.substitutionGroupQname is None: # resolved to head (or loop)
+                self._substitutionGroupQnameChain = qnameChain
+            return qnameChain
+
+    @property
+    def substitutionGroupQnameSet(self):
+        """(frozenset) -- Set of QNames of substitution groups (recursively)"""
+        try:
+            return self._substitutionGroupQnameSet
+        except AttributeError:
+            qnameChain = self.substitutionGroupQnameChain
+            qnameSet = frozenset(qnameChain)
+            if hasattr(self, "_substitutionGroupQnameChain"): # chain is resolved
+                self._substitutionGroupQnameSet = qnameSet
+            return qnameSet
 
     @property
     def isQualifiedForm(self): # used only in determining qname, which itself is cached
@@ -787,14 +845,7 @@ class ModelConcept(ModelNamableTerm, ModelParticle):
 
     def substitutesForQname(self, subsQname):
         """(bool) -- True if element substitutes for specified qname"""
-        subs = self
-        subNext = subs.substitutionGroup
-        while subNext is not None:
-            if subsQname == subs.substitutionGroupQname:
-                return True
-            subs = subNext
-            subNext = subs.substitutionGroup
-        return False
+        return subsQname in self.substitutionGroupQnameSet
 
     @property
     def subGroupHeadQname(self):
@@ -1257,29 +1308,52 @@ class ModelType(ModelNamableTerm):
 
     def isDerivedFrom(self, typeqname):
         """(bool) -- True if type is derived from type specified by QName.  Type can be a single type QName or list of QNames"""
+        qnamesDerivedFrom = self.qnamesDerivedFromClosure
+        if isinstance(typeqname, (tuple,list,set,frozenset)):
+            if not typeqname: # empty list matches only a type derived from nothing
+                return DERIVEDFROMNOTHING in qnamesDerivedFrom
+            return not qnamesDerivedFrom.isdisjoint(typeqname)
+        return typeqname in qnamesDerivedFrom or (typeqname is None and DERIVEDFROMNOTHING in qnamesDerivedFrom)
+
+    @property
+    def qnamesDerivedFromClosure(self):
+        """(frozenset) -- QNames of all types this type is derived from (recursively, including union member
+        types), DERIVEDFROMNOTHING is included if derivation ends in a type derived from nothing.
+        Cached once all base types are resolved in the DTS."""
+        try:
+            return self._qnamesDerivedFromClosure
+        except AttributeError:
+            qnamesDerivedFrom, isResolved = self._derivedFromClosure(set())
+            if isResolved:
+                self._qnamesDerivedFromClosure = qnamesDerivedFrom
+            return qnamesDerivedFrom
+
+    def _derivedFromClosure(self, visited):
+        try:
+            return self._qnamesDerivedFromClosure, True
+        except AttributeError:
+            pass
         qnamesDerivedFrom = self.qnameDerivedFrom # can be single qname or list of qnames if union
         if qnamesDerivedFrom is None:    # not derived from anything
-            return typeqname is None or not typeqname # may be none or empty list
-        if isinstance(qnamesDerivedFrom, (tuple,list)): # union
-            if isinstance(typeqname, (tuple,list,set)):
-                if any(t in qnamesDerivedFrom for t in typeqname):
-                    return True
-            else:
-                if typeqname in qnamesDerivedFrom:
-                    return True
-        else: # not union, single type
-            if isinstance(typeqname, (tuple,list,set)):
-                if qnamesDerivedFrom in typeqname:
-                    return True
-            else:
-                if qnamesDerivedFrom == typeqname:
-                    return True
+            return _derivedFromNothing, True
+        if not isinstance(qnamesDerivedFrom, (tuple,list)):
             qnamesDerivedFrom = (qnamesDerivedFrom,)
+        visited.add(self)
+        closure = set(qnamesDerivedFrom)
+        isResolved = True
         for qnameDerivedFrom in qnamesDerivedFrom:
             typeDerivedFrom = self.modelXbrl.qnameTypes.get(qnameDerivedFrom)
-            if typeDerivedFrom is not None and typeDerivedFrom.isDerivedFrom(typeqname):
-                return True
-        return False
+            if typeDerivedFrom is not None:
+                if typeDerivedFrom not in visited: # ignore (invalid) derivation loops
+                    baseClosure, baseIsResolved = typeDerivedFrom._derivedFromClosure(visited)
+                    closure |= baseClosure
+                    isResolved &= baseIsResolved
+            elif qnameDerivedFrom is not None and qnameDerivedFrom.namespaceURI != XbrlConst.xsd:
+                isResolved = False # base type not (yet) discovered
+        closure = frozenset(closure)
+        if isResolved:
+            self._qnamesDerivedFromClosure = closure
+        return closure, isResolved
 
 
     @property
@@ -1682,6 +1756,10 @@ class RelationStatus:
 
 arcCustAttrsExclusions = {XbrlConst.xlink, "use","priority","order","weight","preferredLabel"}
 
+def internedRole(role):
+    """Interned role or arcrole string (or other attribute value shared by many arcs), None if absent"""
+    return sys.intern(role) if role else role
+
 class ModelRelationship(ModelObject):
     """
     .. class:: ModelRelationship(modelDocument, arcElement, fromModelObject, toModelObject)
@@ -1712,16 +1790,82 @@ class ModelRelationship(ModelObject):
         .. attribute:: toModelObject
 
         ModelObject of the xlink:to (dereferenced if via xlink:locator)
+
+        .. attribute:: arcrole
+
+        (str) -- Value of xlink:arcrole attribute
+
+        .. attribute:: linkrole
+
+        (str) -- Value of xlink:role attribute of parent extended link element
+
+        .. attribute:: order
+
+        (float) -- Value of xlink:order attribute, or 1.0 if not specified
+
+        .. attribute:: priority
+
+        (int) -- Value of xlink:priority attribute, or 0 if not specified
+
+        .. attribute:: weight
+
+        (float) -- Value of xlink:weight attribute, NaN if not convertable to float, or None if not specified
+
+        .. attribute:: preferredLabel
+
+        (str) -- preferredLabel attribute or None if absent
+
+        .. attribute:: isProhibited
+
+        (bool) -- True if use is prohibited
+
+    Relationships are numerous in large DTSes (and created anew for each relationship set), so the attributes
+    used to build and traverse relationship sets are slots, assigned from the arc when the relationship is
+    created, with role strings interned to be shared by all relationships of the role.
     """
+    __slots__ = ("arcElement", "fromModelObject", "toModelObject", "modelDocument", "objectIndex",
+                 "arcrole", "linkrole", "order", "priority", "weight", "preferredLabel", "isProhibited")
+
     def __init__(self, modelDocument, arcElement, fromModelObject, toModelObject):
         # copy model object properties from arcElement
         self.arcElement = arcElement
         self.init(modelDocument)
         self.fromModelObject = fromModelObject
         self.toModelObject = toModelObject
+        self.arcrole = internedRole(arcElement.get("{http://www.w3.org/1999/xlink}arcrole"))
+        self.linkrole = internedRole(arcElement.getparent().get("{http://www.w3.org/1999/xlink}role"))
+        o = arcElement.get("order")
+        if o is None:
+            self.order = 1.0
+        else:
+            try:
+                self.order = float(o)
+            except (TypeError,ValueError) :
+                self.order = float("nan")
+        p = arcElement.get("priority")
+        if p is None:
+            self.priority = 0
+        else:
+            try:
+                self.priority = int(p)
+            except (TypeError,ValueError) :
+                # XBRL validation error needed
+                self.priority = 0
+        w = arcElement.get("weight")
+        if w is None:
+            self.weight = None
+        else:
+            try:
+                self.weight = float(w)
+            except (TypeError,ValueError) :
+                # XBRL validation error needed
+                self.weight = float("nan")
+        self.preferredLabel = internedRole(arcElement.get("preferredLabel"))
+        self.isProhibited = arcElement.get("use") == "prohibited"
 
     def clear(self):
         self.__dict__.clear() # dereference here, not an lxml object, don't use superclass clear()
+        self.arcElement = self.fromModelObject = self.toModelObject = self.modelDocument = None
 
     # simulate etree operations
     def get(self, attrname):
@@ -1808,28 +1952,6 @@ class ModelRelationship(ModelObject):
             return toLocator
         return None
 
-    @property
-    def arcrole(self):
-        """(str) -- Value of xlink:arcrole attribute"""
-        return self.arcElement.get("{http://www.w3.org/1999/xlink}arcrole")
-
-    @property
-    def order(self):
-        """(float) -- Value of xlink:order attribute, or 1.0 if not specified"""
-        try:
-            return self.arcElement._order
-        except AttributeError:
-            o = self.arcElement.get("order")
-            if o is None:
-                order = 1.0
-            else:
-                try:
-                    order = float(o)
-                except (TypeError,ValueError) :
-                    order = float("nan")
-            self.arcElement._order = order
-            return order
-
     @property
     def orderDecimal(self):
         """(decimal) -- Value of xlink:order attribute, NaN if not convertable to float, or None if not specified"""
@@ -1838,42 +1960,6 @@ class ModelRelationship(ModelObject):
         except decimal.InvalidOperation:
             return decimal.Decimal("NaN")
 
-    @property
-    def priority(self):
-        """(int) -- Value of xlink:order attribute, or 0 if not specified"""
-        try:
-            return self.arcElement._priority
-        except AttributeError:
-            p = self.arcElement.get("priority")
-            if p is None:
-                priority = 0
-            else:
-                try:
-                    priority = int(p)
-                except (TypeError,ValueError) :
-                    # XBRL validation error needed
-                    priority = 0
-            self.arcElement._priority = priority
-            return priority
-
-    @property
-    def weight(self):
-        """(float) -- Value of xlink:weight attribute, NaN if not convertable to float, or None if not specified"""
-        try:
-            return self.arcElement._weight
-        except AttributeError:
-            w = self.arcElement.get("weight")
-            if w is None:
-                weight = None
-            else:
-                try:
-                    weight = float(w)
-                except (TypeError,ValueError) :
-                    # XBRL validation error needed
-                    weight = float("nan")
-            self.arcElement._weight = weight
-            return weight
-
     @property
     def weightDecimal(self):
         """(decimal) -- Value of xlink:weight attribute, NaN if not convertable to float, or None if not specified"""
@@ -1897,21 +1983,11 @@ class ModelRelationship(ModelObject):
         """(str) -- Value of use attribute"""
         return self.get("use")
 
-    @property
-    def isProhibited(self):
-        """(bool) -- True if use is prohibited"""
-        return self.use == "prohibited"
-
     @property
     def prohibitedUseSortKey(self):
         """(int) -- 2 if use is prohibited, else 1, for use in sorting effective arcs before prohibited arcs"""
         return 2 if self.isProhibited else 1
 
-    @property
-    def preferredLabel(self):
-        """(str) -- preferredLabel attribute or None if absent"""
-        return self.get("preferredLabel")
-
     @property
     def variablename(self):
         """(str) -- name attribute"""
@@ -1923,11 +1999,6 @@ class ModelRelationship(ModelObject):
         varName = self.variablename
         return ModelValue.qname(self.arcElement, varName, noPrefixIsNoNamespace=True) if varName else None
 
-    @property
-    def linkrole(self):
-        """(str) -- Value of xlink:role attribute of parent extended link element"""
-        return self.arcElement.getparent().get("{http://www.w3.org/1999/xlink}role")
-
     @property
     def linkQname(self):
         """(QName) -- qname of the parent extended link element"""
@@ -44,10 +44,12 @@ class FormulaOptions():
         self.traceVariablesOrder = False
         self.traceVariableFilterWinnowing = False
         self.traceVariableFiltersResult = False
+        self.traceVariableFilterPlan = False
         self.traceVariableExpressionSource = False
         self.traceVariableExpressionCode = False
         self.traceVariableExpressionEvaluation = False
         self.traceVariableExpressionResult = False
+        self.variableSetProfileReport = None # file for report of variable set compile and evaluation costs (.json or .csv)
         self.testcaseResultsCaptureWarnings = False
         self.testcaseResultOptions = None
         if isinstance(savedValues, dict):
@@ -74,6 +76,27 @@ class FormulaOptions():
         else:
             return False
 
+xpathStringLiteralPattern = re.compile(r"""^\s*(?:'((?:[^']|'')*)'|"((?:[^"]|"")*)")\s*$""")
+
+def filterIndexedFacts(facts, indexedFactSets, cmplmt):
+    # facts passing a filter (not passing if cmplmt) whose passing facts are the union of instance fact index
+    # sets, the sets are only intersected with facts, their union isn't built
+    if cmplmt:
+        return facts.difference(*indexedFactSets)
+    return set().union(*(facts & factSet for factSet in indexedFactSets))
+
+def xpathStringLiteral(expression):
+    # value of an expression which is only a string literal, else None
+    if expression:
+        m = xpathStringLiteralPattern.match(expression)
+        if m:
+            if m.group(1) is not None:
+                return m.group(1).replace("''", "'")
+            return m.group(2).replace('""', '"')
+    return None
+
+xpathConstantDatetimePattern = re.compile(r"""^\s*(?:'[^']*'|"[^"]*"|xs:(?:date|dateTime|time)\(\s*(?:'[^']*'|"[^"]*")\s*\))\s*$""")
+
 class Trace():
     PARAMETER = 1
     VARIABLE_SET = 2
@@ -792,6 +815,11 @@ class ModelFilter(ModelFormulaResource):
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         return facts
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        # instance fact index sets whose union is the facts of the variable binding instances passing this filter,
+        # when obtainable from instance fact indexes without evaluating expressions per fact, else None
+        return None
+
     def hasNoFilterVariableDependencies(self, xpCtx):
         try:
             return self._hasNoVariableDependencies
@@ -1049,12 +1077,17 @@ class ModelConceptName(ModelFilter):
         except AttributeError:
             return set()
 
-    def filter(self, xpCtx, varBinding, facts, cmplmt):
+    def indexedFactSets(self, xpCtx, varBinding):
         if not self.qnameExpressionProgs: # optimize if simple
-            qnamedFacts = set.union(*[inst.factsByQname[qn]
-                                      for inst in varBinding.instances
-                                      for qn in self.conceptQnames])
-            return (facts - qnamedFacts) if cmplmt else (facts & qnamedFacts)
+            return [inst.factsByQname[qn]
+                    for inst in varBinding.instances
+                    for qn in self.conceptQnames]
+        return None
+
+    def filter(self, xpCtx, varBinding, facts, cmplmt):
+        qnamedFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if qnamedFactSets is not None:
+            return filterIndexedFacts(facts, qnamedFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.qname in self.conceptQnames | self.evalQnames(xpCtx,fact)))
 
@@ -1081,10 +1114,12 @@ class ModelConceptPeriodType(ModelFilter):
     def periodType(self):
         return self.get("periodType")
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        return [inst.factsByPeriodType(self.periodType)
+                for inst in varBinding.instances]
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        factsOfPeriodType = set.union(*[inst.factsByPeriodType(self.periodType)
-                                        for inst in varBinding.instances])
-        return (facts - factsOfPeriodType) if cmplmt else (facts & factsOfPeriodType)
+        return filterIndexedFacts(facts, self.indexedFactSets(xpCtx, varBinding), cmplmt)
 
     @property
     def propertyView(self):
@@ -1223,12 +1258,18 @@ class ModelConceptDataType(ModelConceptFilterWithQnameExpression):
     def strict(self):
         return self.get("strict")
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        if self.filterQname: # optimize if simple without a formula
+            notStrict = self.strict != "true"
+            return [inst.factsByDatatype(notStrict, self.filterQname)
+                    for inst in varBinding.instances]
+        return None
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        factSetsOfType = self.indexedFactSets(xpCtx, varBinding)
+        if factSetsOfType is not None:
+            return filterIndexedFacts(facts, factSetsOfType, cmplmt)
         notStrict = self.strict != "true"
-        if self.filterQname: # optimize if simple without a formula
-            factsOfType = set.union(*[inst.factsByDatatype(notStrict, self.filterQname)
-                                      for inst in varBinding.instances])
-            return (facts - factsOfType) if cmplmt else (facts & factsOfType)
         return set(fact for fact in facts
                    for qn in (self.evalQname(xpCtx,fact),)
                    for c in (fact.concept,)
@@ -1537,7 +1578,18 @@ class ModelEntitySpecificIdentifier(ModelFilter):
     def variableRefs(self, progs=[], varRefSet=None):
         return super(ModelEntitySpecificIdentifier, self).variableRefs((self.schemeProg or []) + (self.valueProg or []), varRefSet)
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        scheme = xpathStringLiteral(self.scheme)
+        value = xpathStringLiteral(self.value)
+        if scheme is not None and value is not None: # optimize if both are constant strings
+            return [inst.factsByEntityIdentifier(scheme, value)
+                    for inst in varBinding.instances]
+        return None
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        identifiedFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if identifiedFactSets is not None:
+            return filterIndexedFacts(facts, identifiedFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and (
                                                  fact.context.entityIdentifier[0] == xpCtx.evaluateAtomicValue(self.schemeProg, 'xs:string', fact) and
@@ -1579,7 +1631,17 @@ class ModelEntityScheme(ModelFilter):
     def variableRefs(self, progs=[], varRefSet=None):
         return super(ModelEntityScheme, self).variableRefs(self.schemeProg, varRefSet)
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        scheme = xpathStringLiteral(self.scheme)
+        if scheme is not None: # optimize if a constant string
+            return [inst.factsByEntityIdentifier(scheme)
+                    for inst in varBinding.instances]
+        return None
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        schemeFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if schemeFactSets is not None:
+            return filterIndexedFacts(facts, schemeFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and
                                 fact.context.entityIdentifier[0] == xpCtx.evaluateAtomicValue(self.schemeProg, 'xs:string', fact)))
@@ -1743,9 +1805,16 @@ class ModelPeriod(ModelTestFilter):
         return {Aspect.PERIOD}
 
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        contextsPassing = {} # test only depends on the period, evaluate once per context
+        def contextPasses(cntx):
+            try:
+                return contextsPassing[cntx]
+            except KeyError:
+                passes = contextsPassing[cntx] = self.evalTest(xpCtx, cntx.period)
+                return passes
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and
-                                self.evalTest(xpCtx, fact.context.period)))
+                                contextPasses(fact.context)))
 
 class ModelDateTimeFilter(ModelFilter):
     def init(self, modelDocument):
@@ -1777,6 +1846,30 @@ class ModelDateTimeFilter(ModelFilter):
     def variableRefs(self, progs=[], varRefSet=None): # no subclasses super to this
         return super(ModelDateTimeFilter, self).variableRefs((self.dateProg or []) + (getattr(self, "timeProg", None) or []), varRefSet)
 
+    @property
+    def isDatetimeConstant(self):
+        try:
+            return self._isDatetimeConstant
+        except AttributeError:
+            self._isDatetimeConstant = all(expr is None or xpathConstantDatetimePattern.match(expr)
+                                           for expr in (self.date, self.time))
+            return self._isDatetimeConstant
+
+    def periodIndexedFactSets(self, xpCtx, varBinding, column, addOneDay):
+        # fact sets of the contexts with the period date column equal to a constant date/time, matched once per context
+        if self.isDatetimeConstant:
+            try:
+                value = self.evalDatetime(xpCtx, None, addOneDay=addOneDay)
+            except XPathContext.XPathException:
+                return None # report the error when evaluated per fact
+            if isinstance(value, datetime.datetime):
+                return [factsByContext[cntx]
+                        for inst in varBinding.instances
+                        for factsByContext in (inst.factsByContext,)
+                        for cntx in inst.contextPeriodTable.contextsWithDatetime(column, value)
+                        if cntx in factsByContext]
+        return None
+
     def evalDatetime(self, xpCtx, fact, addOneDay=False):
         date = xpCtx.evaluateAtomicValue(self.dateProg, 'xs:date', fact)
         if hasattr(self,"timeProg"):
@@ -1804,7 +1897,13 @@ class ModelPeriodStart(ModelDateTimeFilter):
     def init(self, modelDocument):
         super(ModelPeriodStart, self).init(modelDocument)
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        return self.periodIndexedFactSets(xpCtx, varBinding, "start", False)
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        startFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if startFactSets is not None:
+            return filterIndexedFacts(facts, startFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and
                                 fact.context.startDatetime == self.evalDatetime(xpCtx, fact, addOneDay=False)))
@@ -1813,7 +1912,13 @@ class ModelPeriodEnd(ModelDateTimeFilter):
     def init(self, modelDocument):
         super(ModelPeriodEnd, self).init(modelDocument)
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        return self.periodIndexedFactSets(xpCtx, varBinding, "end", True)
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        endFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if endFactSets is not None:
+            return filterIndexedFacts(facts, endFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and (fact.context.isStartEndPeriod
                                                  and fact.context.endDatetime == self.evalDatetime(xpCtx, fact, addOneDay=True))))
@@ -1822,7 +1927,13 @@ class ModelPeriodInstant(ModelDateTimeFilter):
     def init(self, modelDocument):
         super(ModelPeriodInstant, self).init(modelDocument)
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        return self.periodIndexedFactSets(xpCtx, varBinding, "instant", True)
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        instantFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if instantFactSets is not None:
+            return filterIndexedFacts(facts, instantFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isItem and
                                 fact.context.instantDatetime == self.evalDatetime(xpCtx, fact, addOneDay=True)))
@@ -1831,9 +1942,15 @@ class ModelForever(ModelFilter):
     def init(self, modelDocument):
         super(ModelForever, self).init(modelDocument)
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        return [factsByContext[cntx]
+                for inst in varBinding.instances
+                for factsByContext in (inst.factsByContext,)
+                for cntx in inst.contextPeriodTable.foreverContexts
+                if cntx in factsByContext]
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
-        return set(fact for fact in facts
-                   if cmplmt ^ (fact.isItem and fact.context.isForeverPeriod))
+        return filterIndexedFacts(facts, self.indexedFactSets(xpCtx, varBinding), cmplmt)
 
     def aspectsCovered(self, varBinding):
         return {Aspect.PERIOD}
@@ -1975,20 +2092,23 @@ class ModelExplicitDimension(ModelFilter):
         except:
             return None
 
-    def filter(self, xpCtx, varBinding, facts, cmplmt):
-        if not facts: # if an empty winnowing fact set return it
-            return facts
+    def indexedFactSets(self, xpCtx, varBinding):
         if self.isFilterStatic:
             dimQname = self.dimQname
             memQnames = self.staticMemberQnames
             if memQnames:
-                dimedFacts = set.union(*[inst.factsByDimMemQname(dimQname, memQname)
-                                         for inst in varBinding.instances
-                                         for memQname in memQnames])
-            else:
-                dimedFacts = set.union(*[inst.factsByDimMemQname(dimQname)
-                                         for inst in varBinding.instances])
-            return (facts - dimedFacts) if cmplmt else (facts & dimedFacts)
+                return [inst.factsByDimMemQname(dimQname, memQname)
+                        for inst in varBinding.instances
+                        for memQname in memQnames]
+            return [inst.factsByDimMemQname(dimQname)
+                    for inst in varBinding.instances]
+        return None
+
+    def filter(self, xpCtx, varBinding, facts, cmplmt):
+        if not facts: # if an empty winnowing fact set return it
+            return facts
+        if self.isFilterStatic:
+            return filterIndexedFacts(facts, self.indexedFactSets(xpCtx, varBinding), cmplmt)
 
         else:
             outFacts = set()
@@ -2497,7 +2617,17 @@ class ModelSingleMeasure(ModelFilter):
             print ("filter exception {}".format(ex))
             return None
 
+    def indexedFactSets(self, xpCtx, varBinding):
+        measureQname = self.measureQname
+        if measureQname: # optimize if simple without a formula
+            return [inst.factsBySingleMeasure(measureQname)
+                    for inst in varBinding.instances]
+        return None
+
     def filter(self, xpCtx, varBinding, facts, cmplmt):
+        measuredFactSets = self.indexedFactSets(xpCtx, varBinding)
+        if measuredFactSets is not None:
+            return filterIndexedFacts(facts, measuredFactSets, cmplmt)
         return set(fact for fact in facts
                    if cmplmt ^ (fact.isNumeric and
                                 fact.unit.isSingleMeasure and
@@ -72,6 +72,10 @@ class ModelManager:
         self.skipLoading = None
         self.abortOnMajorError = False
         self.collectProfileStats = False
+        self.spanTracer = None # SpanTracer when tracing spans
+        self.rssWorkers = 0 # RSS feed items validated by this many worker processes, 0 to validate in this process
+        self.rssPrefetch = 2 # RSS item archives downloaded ahead of the workers
+        self.rssItemTimeout = None # seconds after which an RSS item worker is terminated
         self.loadedModelXbrls = []
         self.customTransforms = None
         self.isLocaleSet = False
@@ -194,6 +198,7 @@ class ModelManager:
         try:
             if self.modelXbrl:
                 Validate.validate(self.modelXbrl)
+                self.modelXbrl.logMessageCodeLimitSummaries()
         except Exception as err:
             self.addToLog(_("[exception] Validation exception: {0} at {1}").format(
                            err,
@@ -227,6 +232,8 @@ class ModelManager:
         """
         if modelXbrl is None: modelXbrl = self.modelXbrl
         if modelXbrl:
+            modelXbrl.logMessageCodeLimitSummaries()
+            modelXbrl.resolveDeferredLogRecords() # while modelManager.modelXbrl is still available to lazy loaders
             while modelXbrl in self.loadedModelXbrls:
                 self.loadedModelXbrls.remove(modelXbrl)
             if (modelXbrl == self.modelXbrl): # dereference modelXbrl from this instance
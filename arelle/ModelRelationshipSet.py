@@ -101,7 +101,7 @@ def baseSetRelationship(arcElement):
 class ModelRelationshipSet:
     __slots__ = ("isChanged", "modelXbrl", "arcrole", "linkrole", "linkqname", "arcqname",
                  "modelRelationshipsFrom", "modelRelationshipsTo", "modelConceptRoots", "modellinkRoleUris",
-                 "modelRelationships", "_testHintedLabelLinkrole")
+                 "modelRelationships", "modelLabelIndex", "_testHintedLabelLinkrole")
 
     # arcrole can either be a single string or a tuple or frozenset of strings
     def __init__(self, modelXbrl, arcrole, linkrole=None, linkqname=None, arcqname=None, includeProhibits=False):
@@ -182,6 +182,7 @@ class ModelRelationshipSet:
         self.modelRelationshipsTo = None
         self.modelConceptRoots = None
         self.modellinkRoleUris = None
+        self.modelLabelIndex = None
         orderRels = defaultdict(list)
         for modelRel in relationships.values():
             if (modelRel is not USING_EQUIVALENCE_KEY and
@@ -202,6 +203,8 @@ class ModelRelationshipSet:
             self.modelRelationshipsFrom.clear()
         if self.modelConceptRoots is not None:
             del self.modelConceptRoots[:]
+        if self.modelLabelIndex is not None:
+            self.modelLabelIndex.clear()
         self.linkqname = self.arcqname = None
 
     def __bool__(self):  # some modelRelationships exist
@@ -314,7 +317,25 @@ class ModelRelationshipSet:
         return False
 
     def label(self, modelFrom, role, lang, returnMultiple=False, returnText=True, linkroleHint=None):
+        # label index resolves each (concept, role, lang, linkroleHint) request once, including lang fallback
         _lang = lang.lower() if lang else lang # lang processing is case insensitive
+        labelKey = (modelFrom, role, _lang, linkroleHint, returnMultiple, returnText)
+        if self.modelLabelIndex is None:
+            self.modelLabelIndex = {}
+        else:
+            try:
+                labels = self.modelLabelIndex[labelKey]
+                if returnMultiple and labels is not None:
+                    return labels[:] # caller may modify returned list
+                return labels
+            except KeyError:
+                pass
+        labels = self.modelLabelIndex[labelKey] = self._label(modelFrom, role, _lang, returnMultiple, returnText, linkroleHint)
+        if returnMultiple and labels is not None:
+            return labels[:]
+        return labels
+
+    def _label(self, modelFrom, role, _lang, returnMultiple, returnText, linkroleHint):
         shorterLangInLabel = longerLangInLabel = None
         shorterLangLabels = longerLangLabels = None
         langLabels = []
@@ -360,7 +381,7 @@ class ModelRelationshipSet:
                             longerLangLabels = [text,]
                         else:
                             longerLangLabels.append(text)
-                    elif lang.startswith(labelLang):
+                    elif _lang.startswith(labelLang):
                         if not shorterLangInLabel or len(shorterLangInLabel) < len(labelLang):
                             shorterLangInLabel = labelLang
                             shorterLangLabels = [text,]
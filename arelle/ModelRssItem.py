@@ -191,8 +191,8 @@ class ModelRssItem(ModelObject):
         for error in modelXbrl.errors:
             if isinstance(error,dict):  # assertion results
                 self.assertions = error
-                for countSuccessful, countNotsuccessful in error.items():
-                    if countNotsuccessful > 0:
+                for counts in error.values(): # (satisfied, not satisfied, ok, warning, error message counts)
+                    if counts[1] > 0:
                         self.assertionUnsuccessful = True
                         self.status = "unsuccessful"
             else:   # error code results
@@ -37,6 +37,12 @@ relationshipSetArcAttributesExclusion = {
     "id", "use","priority","order"
     }
 
+conceptDetailAttributes = {"abstract","block","default","final","fixed","form","id","maxOccurs",
+                           "minOccurs","name","nillable","ref","substitutionGroup","type"}
+
+conceptResourceEvents = (("vercd:conceptLabel", (XbrlConst.conceptLabel, XbrlConst.elementLabel)),
+                         ("vercd:conceptReference", (XbrlConst.conceptReference, XbrlConst.elementReference)))
+
 authoritiesEquivalence = {
     "http://xbrl.iasb.org": "IFRS", "http://xbrl.ifrs.org": "IFRS",
     "http://xbrl.us": "XBRL-US", "http://fasb.org": "XBRL-US", "http://xbrl.sec.gov": "XBRL-US",
@@ -127,6 +133,7 @@ class ModelVersReport(ModelDocument.ModelDocument):
         self.relationshipSetChanges = []
         self.instanceAspectChanges = []
         self.typedDomainsCorrespond = {}
+        self.DRSdiffs = {}
 
     def close(self, *args, **kwargs):
         """Closes any views, formula output instances, modelDocument(s), and dereferences all memory used
@@ -352,21 +359,26 @@ class ModelVersReport(ModelDocument.ModelDocument):
             self.xmlRootElement = self.reportElement
         self.actionNum = 1
 
+        self.modelXbrl.profileStat(None)
         self.modelXbrl.modelManager.showStatus(_("Comparing namespaces"))
         self.diffNamespaces()
         self.modelXbrl.modelManager.showStatus(_("Comparing roles"))
         self.diffRoles()
+        self.modelXbrl.profileStat(_("diffNamespacesAndRoles"))
         self.modelXbrl.modelManager.showStatus(_("Comparing concepts"))
         self.diffConcepts()
+        self.modelXbrl.profileStat(_("diffConcepts"))
         for arcroleUri in (XbrlConst.parentChild, XbrlConst.summationItem, XbrlConst.essenceAlias, XbrlConst.requiresElement, XbrlConst.generalSpecial):
             self.modelXbrl.modelManager.showStatus(_("Comparing {0} relationships").format(os.path.basename(arcroleUri)))
             self.diffRelationshipSet(arcroleUri)
+        self.modelXbrl.profileStat(_("diffRelationshipSets"))
 
         self.modelXbrl.modelManager.showStatus(_("Comparing dimension defaults"))
         self.diffDimensionDefaults()
 
         self.modelXbrl.modelManager.showStatus(_("Comparing explicit dimensions"))
         self.diffDimensions()
+        self.modelXbrl.profileStat(_("diffDimensions"))
 
         # determine namespaces
         schemaLocations = []
@@ -489,112 +501,164 @@ class ModelVersReport(ModelDocument.ModelDocument):
         return UrlUtil.authority(role) + ((sep + lastpart) if lastpart else "")
 
     def diffConcepts(self):
-        toConceptsMatched = set()
         vercu = XbrlConst.vercu
-        vercd = XbrlConst.vercd
+        # match item and tuple concepts by set algebra on their toDTS qnames
+        fromConcepts = {self.toDTSqname(fromConceptQname): fromConcept
+                        for fromConceptQname, fromConcept in self.fromDTS.qnameConcepts.items()
+                        if fromConcept.isItem or fromConcept.isTuple}
+        toConceptQnames = {toConceptQname
+                           for toConceptQname, toConcept in self.toDTS.qnameConcepts.items()
+                           if toConcept.isItem or toConcept.isTuple}
+        matchedQnames = fromConcepts.keys() & self.toDTS.qnameConcepts.keys()
+        addedQnames = toConceptQnames - matchedQnames
+        # detailed comparison only of matched concepts whose content signatures differ
+        changedQnames = set()
+        for toConceptQname in matchedQnames:
+            fromConcept = fromConcepts[toConceptQname]
+            toConcept = self.toDTS.qnameConcepts[toConceptQname]
+            if (fromConcept.isTuple or toConcept.isTuple or # tuple content models always compared in detail
+                self.conceptSignature(self.fromDTS, fromConcept) !=
+                self.conceptSignature(self.toDTS, toConcept, self.fromDTSqname)):
+                changedQnames.add(toConceptQname)
+        # events are created in DTS order
         for fromConceptQname, fromConcept in self.fromDTS.qnameConcepts.items():
             if not fromConcept.isItem and not fromConcept.isTuple:
                 continue
             toConceptQname = self.toDTSqname(fromConceptQname)
-            if toConceptQname in self.toDTS.qnameConcepts:
-                toConcept = self.toDTS.qnameConcepts[toConceptQname]
-                toConceptsMatched.add(toConceptQname)
-                # compare concepts
-                action = None # keep same action for all of same concept's changes
-                if fromConcept.id != toConcept.id:
-                    action = self.createConceptEvent(vercd, "vercd:conceptIDChange", fromConcept, toConcept, action, fromValue=fromConcept.id, toValue=toConcept.id)
-                if fromConcept.substitutionGroupQname != self.fromDTSqname(toConcept.substitutionGroupQname):
-                    action = self.createConceptEvent(vercd, "vercd:conceptSubstitutionGroupChange", fromConcept, toConcept, action, fromValue=fromConcept.substitutionGroupQname, toValue=self.toDTSqname(toConcept.substitutionGroupQname))
-                if fromConcept.isItem and toConcept.isItem:
-                    if fromConcept.typeQname != self.fromDTSqname(toConcept.typeQname):
-                        action = self.createConceptEvent(vercd, "vercd:conceptTypeChange", fromConcept, toConcept, action, fromValue=fromConcept.typeQname, toValue=toConcept.typeQname)
-                if fromConcept.nillable != toConcept.nillable:
-                    action = self.createConceptEvent(vercd, "vercd:conceptNillableChange", fromConcept, toConcept, action, fromValue=fromConcept.nillable, toValue=toConcept.nillable)
-                if fromConcept.abstract != toConcept.abstract:
-                    action = self.createConceptEvent(vercd, "vercd:conceptAbstractChange", fromConcept, toConcept, action, fromValue=fromConcept.abstract, toValue=toConcept.abstract)
-                if fromConcept.isItem and toConcept.isItem:
-                    if fromConcept.block != toConcept.block:
-                        action = self.createConceptEvent(vercd, "vercd:conceptBlockChange", fromConcept, toConcept, action, fromValue=fromConcept.block, toValue=toConcept.block)
-                    if fromConcept.default != toConcept.default:
-                        action = self.createConceptEvent(vercd, "vercd:conceptDefaultChange", fromConcept, toConcept, action, fromValue=fromConcept.default, toValue=toConcept.default)
-                    if fromConcept.fixed != toConcept.fixed:
-                        action = self.createConceptEvent(vercd, "vercd:conceptFixedChange", fromConcept, toConcept, action, fromValue=fromConcept.fixed, toValue=toConcept.fixed)
-                    if fromConcept.final != toConcept.final:
-                        action = self.createConceptEvent(vercd, "vercd:conceptFinalChange", fromConcept, toConcept, action, fromValue=fromConcept.final, toValue=toConcept.final)
-                    if fromConcept.periodType != toConcept.periodType:
-                        action = self.createConceptEvent(vercd, "vercd:conceptPeriodTypeChange", fromConcept, toConcept, action, fromValue=fromConcept.periodType, toValue=toConcept.periodType)
-                    if fromConcept.balance != toConcept.balance:
-                        action = self.createConceptEvent(vercd, "vercd:conceptBalanceChange", fromConcept, toConcept, action, fromValue=fromConcept.balance, toValue=toConcept.balance)
-                if fromConcept.isTuple and toConcept.isTuple:
-                    fromType = fromConcept.type # it is null for xsd:anyType
-                    toType = toConcept.type
-                    # TBD change to xml comparison with namespaceURI mappings, prefixes ignored
-                    if (fromType is not None and toType is not None and
-                        not XbrlUtil.nodesCorrespond(self.fromDTS, fromType, toType, self.toDTS)):
-                        action = self.createConceptEvent(vercd, "vercd:tupleContentModelChange", fromConcept, toConcept, action)
-                # custom attributes in from Concept
-                fromCustAttrs = {}
-                toCustAttrs = {}
-                for concept, attrs in ((fromConcept,fromCustAttrs),(toConcept,toCustAttrs)):
-                    for attrName, attrValue in concept.items():
-                        attrQname = qname(attrName)
-                        if (attrName not in ("abstract","block","default","final","fixed","form","id","maxOccurs",
-                                             "minOccurs","name","nillable","ref","substitutionGroup","type") and
-                            attrQname.namespaceURI != XbrlConst.xbrli and
-                            attrQname.namespaceURI != XbrlConst.xbrldt):
-                            attrs[concept.prefixedNameQname(attrQname)] = attrValue
-                for attr in fromCustAttrs.keys():
-                    if attr not in toCustAttrs:
-                        action = self.createConceptEvent(vercd, "vercd:conceptAttributeDelete", fromConcept, None, action, fromCustomAttribute=attr, fromValue=fromCustAttrs[attr])
-                    elif fromCustAttrs[attr] != toCustAttrs[attr]:
-                        action = self.createConceptEvent(vercd, "vercd:conceptAttributeChange", fromConcept, toConcept, action, fromCustomAttribute=attr, toCustomAttribute=attr, fromValue=fromCustAttrs[attr], toValue=toCustAttrs[attr])
-                for attr in toCustAttrs.keys():
-                    if attr not in fromCustAttrs:
-                        action = self.createConceptEvent(vercd, "vercd:conceptAttributeAdd", None, toConcept, action, toCustomAttribute=attr, toValue=toCustAttrs[attr])
-
-                # labels, references from each concept
-                for event, arcroles in (("vercd:conceptLabel", (XbrlConst.conceptLabel, XbrlConst.elementLabel)),
-                                        ("vercd:conceptReference", (XbrlConst.conceptReference, XbrlConst.elementReference))):
-                    fromResources = {}
-                    toResources = {}
-                    for dts, concept, resources in ((self.fromDTS, fromConcept, fromResources),
-                                                    (self.toDTS, toConcept, toResources)):
-                        for arcrole in arcroles:
-                            resourcesRelationshipSet = dts.relationshipSet(arcrole)
-                            if resourcesRelationshipSet:
-                                for rel in resourcesRelationshipSet.fromModelObject(concept):
-                                    resource = rel.toModelObject
-                                    key = (rel.linkrole, arcrole, resource.role, resource.xmlLang,
-                                           rel.linkQname, rel.qname, resource.qname) + \
-                                           XbrlUtil.attributes(dts, rel.arcElement,
-                                                exclusions=(XbrlConst.xlink, "use","priority","order","id")) + \
-                                           XbrlUtil.attributes(dts, resource,
-                                                exclusions=(XbrlConst.xlink))
-                                    resources[key] = resource
-                    for key,label in fromResources.items():
-                        fromText = XmlUtil.innerText(label)
-                        if key not in toResources:
-                            action = self.createConceptEvent(vercd, event + "Delete", fromConcept, None, action, fromResource=label, fromResourceText=fromText)
-                        else:
-                            toLabel = toResources[key]
-                            toText = XmlUtil.innerText(toLabel)
-                            if not XbrlUtil.sEqual(self.fromDTS, label, toLabel, excludeIDs=XbrlUtil.ALL_IDs_EXCLUDED, dts2=self.toDTS, ns2ns1Tbl=self.namespaceRenameToURI):
-                                action = self.createConceptEvent(vercd, event + "Change", fromConcept, toConcept, action, fromResource=label, toResource=toResources[key], fromResourceText=fromText, toResourceText=toText)
-                    for key,label in toResources.items():
-                        toText = XmlUtil.innerText(label)
-                        if key not in fromResources:
-                            action = self.createConceptEvent(vercd, event + "Add", None, toConcept, action, toResource=label, toResourceText=toText)
-
-
-
-                #
-            else:
+            if toConceptQname in changedQnames:
+                self.diffConcept(fromConcept, self.toDTS.qnameConcepts[toConceptQname])
+            elif toConceptQname not in matchedQnames:
                 self.createConceptEvent(vercu, "vercu:conceptDelete", fromConcept=fromConcept)
         for toConceptQname, toConcept in self.toDTS.qnameConcepts.items():
-            if ((toConcept.isItem or toConcept.isTuple) and
-                 toConceptQname not in toConceptsMatched):
+            if toConceptQname in addedQnames:
                 self.createConceptEvent(vercu, "vercu:conceptAdd", toConcept=toConcept)
 
+    def diffConcept(self, fromConcept, toConcept):
+        vercd = XbrlConst.vercd
+        action = None # keep same action for all of same concept's changes
+        if fromConcept.id != toConcept.id:
+            action = self.createConceptEvent(vercd, "vercd:conceptIDChange", fromConcept, toConcept, action, fromValue=fromConcept.id, toValue=toConcept.id)
+        if fromConcept.substitutionGroupQname != self.fromDTSqname(toConcept.substitutionGroupQname):
+            action = self.createConceptEvent(vercd, "vercd:conceptSubstitutionGroupChange", fromConcept, toConcept, action, fromValue=fromConcept.substitutionGroupQname, toValue=self.toDTSqname(toConcept.substitutionGroupQname))
+        if fromConcept.isItem and toConcept.isItem:
+            if fromConcept.typeQname != self.fromDTSqname(toConcept.typeQname):
+                action = self.createConceptEvent(vercd, "vercd:conceptTypeChange", fromConcept, toConcept, action, fromValue=fromConcept.typeQname, toValue=toConcept.typeQname)
+        if fromConcept.nillable != toConcept.nillable:
+            action = self.createConceptEvent(vercd, "vercd:conceptNillableChange", fromConcept, toConcept, action, fromValue=fromConcept.nillable, toValue=toConcept.nillable)
+        if fromConcept.abstract != toConcept.abstract:
+            action = self.createConceptEvent(vercd, "vercd:conceptAbstractChange", fromConcept, toConcept, action, fromValue=fromConcept.abstract, toValue=toConcept.abstract)
+        if fromConcept.isItem and toConcept.isItem:
+            if fromConcept.block != toConcept.block:
+                action = self.createConceptEvent(vercd, "vercd:conceptBlockChange", fromConcept, toConcept, action, fromValue=fromConcept.block, toValue=toConcept.block)
+            if fromConcept.default != toConcept.default:
+                action = self.createConceptEvent(vercd, "vercd:conceptDefaultChange", fromConcept, toConcept, action, fromValue=fromConcept.default, toValue=toConcept.default)
+            if fromConcept.fixed != toConcept.fixed:
+                action = self.createConceptEvent(vercd, "vercd:conceptFixedChange", fromConcept, toConcept, action, fromValue=fromConcept.fixed, toValue=toConcept.fixed)
+            if fromConcept.final != toConcept.final:
+                action = self.createConceptEvent(vercd, "vercd:conceptFinalChange", fromConcept, toConcept, action, fromValue=fromConcept.final, toValue=toConcept.final)
+            if fromConcept.periodType != toConcept.periodType:
+                action = self.createConceptEvent(vercd, "vercd:conceptPeriodTypeChange", fromConcept, toConcept, action, fromValue=fromConcept.periodType, toValue=toConcept.periodType)
+            if fromConcept.balance != toConcept.balance:
+                action = self.createConceptEvent(vercd, "vercd:conceptBalanceChange", fromConcept, toConcept, action, fromValue=fromConcept.balance, toValue=toConcept.balance)
+        if fromConcept.isTuple and toConcept.isTuple:
+            fromType = fromConcept.type # it is null for xsd:anyType
+            toType = toConcept.type
+            # TBD change to xml comparison with namespaceURI mappings, prefixes ignored
+            if (fromType is not None and toType is not None and
+                not XbrlUtil.nodesCorrespond(self.fromDTS, fromType, toType, self.toDTS)):
+                action = self.createConceptEvent(vercd, "vercd:tupleContentModelChange", fromConcept, toConcept, action)
+        # custom attributes in from Concept
+        fromCustAttrs = self.conceptCustomAttributes(fromConcept)
+        toCustAttrs = self.conceptCustomAttributes(toConcept)
+        for attr in fromCustAttrs.keys():
+            if attr not in toCustAttrs:
+                action = self.createConceptEvent(vercd, "vercd:conceptAttributeDelete", fromConcept, None, action, fromCustomAttribute=attr, fromValue=fromCustAttrs[attr])
+            elif fromCustAttrs[attr] != toCustAttrs[attr]:
+                action = self.createConceptEvent(vercd, "vercd:conceptAttributeChange", fromConcept, toConcept, action, fromCustomAttribute=attr, toCustomAttribute=attr, fromValue=fromCustAttrs[attr], toValue=toCustAttrs[attr])
+        for attr in toCustAttrs.keys():
+            if attr not in fromCustAttrs:
+                action = self.createConceptEvent(vercd, "vercd:conceptAttributeAdd", None, toConcept, action, toCustomAttribute=attr, toValue=toCustAttrs[attr])
+
+        # labels, references from each concept
+        for event, arcroles in conceptResourceEvents:
+            fromResources = self.conceptResources(self.fromDTS, fromConcept, arcroles)
+            toResources = self.conceptResources(self.toDTS, toConcept, arcroles)
+            for key,label in fromResources.items():
+                fromText = XmlUtil.innerText(label)
+                if key not in toResources:
+                    action = self.createConceptEvent(vercd, event + "Delete", fromConcept, None, action, fromResource=label, fromResourceText=fromText)
+                else:
+                    toLabel = toResources[key]
+                    toText = XmlUtil.innerText(toLabel)
+                    if not XbrlUtil.sEqual(self.fromDTS, label, toLabel, excludeIDs=XbrlUtil.ALL_IDs_EXCLUDED, dts2=self.toDTS, ns2ns1Tbl=self.namespaceRenameToURI):
+                        action = self.createConceptEvent(vercd, event + "Change", fromConcept, toConcept, action, fromResource=label, toResource=toResources[key], fromResourceText=fromText, toResourceText=toText)
+            for key,label in toResources.items():
+                toText = XmlUtil.innerText(label)
+                if key not in fromResources:
+                    action = self.createConceptEvent(vercd, event + "Add", None, toConcept, action, toResource=label, toResourceText=toText)
+
+    def conceptCustomAttributes(self, concept):
+        custAttrs = {}
+        for attrName, attrValue in concept.items():
+            attrQname = qname(attrName)
+            if (attrName not in conceptDetailAttributes and
+                attrQname.namespaceURI != XbrlConst.xbrli and
+                attrQname.namespaceURI != XbrlConst.xbrldt):
+                custAttrs[concept.prefixedNameQname(attrQname)] = attrValue
+        return custAttrs
+
+    def conceptResources(self, dts, concept, arcroles):
+        resources = {}
+        for arcrole in arcroles:
+            resourcesRelationshipSet = dts.relationshipSet(arcrole)
+            if resourcesRelationshipSet:
+                for rel in resourcesRelationshipSet.fromModelObject(concept):
+                    resource = rel.toModelObject
+                    key = (rel.linkrole, arcrole, resource.role, resource.xmlLang,
+                           rel.linkQname, rel.qname, resource.qname) + \
+                           XbrlUtil.attributes(dts, rel.arcElement,
+                                exclusions=(XbrlConst.xlink, "use","priority","order","id")) + \
+                           XbrlUtil.attributes(dts, resource,
+                                exclusions=(XbrlConst.xlink))
+                    resources[key] = resource
+        return resources
+
+    def conceptSignature(self, dts, concept, dtsQname=None):
+        # concepts with equal signatures (qnames in fromDTS namespaces) produce no concept details events
+        if dtsQname is None:
+            dtsQname = lambda qn: qn
+        return (concept.id, dtsQname(concept.substitutionGroupQname), concept.isItem, concept.isTuple,
+                dtsQname(concept.typeQname), concept.nillable, concept.abstract, concept.block,
+                concept.default, concept.fixed, concept.final, concept.periodType, concept.balance,
+                frozenset(self.conceptCustomAttributes(concept).items()),
+                tuple(frozenset((key, self.resourceSignature(resource))
+                                for key, resource in self.conceptResources(dts, concept, arcroles).items())
+                      for event, arcroles in conceptResourceEvents))
+
+    def resourceSignature(self, resource):
+        # raw content of resource and its descendants, ids excluded, equal signatures are sEqual
+        return tuple((elt.tag, elt.text, elt.tail if elt is not resource else None,
+                      tuple(sorted((name, value) for name, value in elt.items() if name != "id"))
+                      if isinstance(elt.tag, str) else ())
+                     for elt in resource.iter())
+
+    def relationshipSetSignature(self, relationshipSet, dtsQname=None, ns2ns1Tbl=None):
+        # ordered target qnames and arc attributes by source qname (in toDTS namespaces),
+        # relationship sets with equal signatures produce no relationship set events
+        if dtsQname is None:
+            dtsQname = lambda qn: qn
+        edges = defaultdict(list)
+        for modelRel in relationshipSet.modelRelationships:
+            fromModelObject = modelRel.fromModelObject
+            toModelObject = modelRel.toModelObject
+            if fromModelObject is None:
+                continue
+            edges[dtsQname(fromModelObject.qname) if isinstance(fromModelObject, ModelConcept) else object()].append(
+                (dtsQname(toModelObject.qname) if isinstance(toModelObject, ModelConcept) else object(), # non-concepts never match
+                 XbrlUtil.attributes(self.modelXbrl, modelRel.arcElement,
+                                     exclusions=relationshipSetArcAttributesExclusion, ns2ns1Tbl=ns2ns1Tbl)))
+        return edges
+
     def diffRelationshipSet(self, arcrole):
         # compare ELRs for new/removed
         fromLinkRoleUris = set()
@@ -624,6 +688,9 @@ class ModelVersReport(ModelDocument.ModelDocument):
                     otherLinkRoleUri = roleChanges[linkRoleUri] if linkRoleUri in roleChanges else linkRoleUri
                     fromRelationshipSet = dts.relationshipSet(arcrole, linkRoleUri)
                     toRelationshipSet = self.toDTS.relationshipSet(arcrole, otherLinkRoleUri)
+                    if (self.relationshipSetSignature(fromRelationshipSet, self.toDTSqname) ==
+                        self.relationshipSetSignature(toRelationshipSet, ns2ns1Tbl=self.namespaceRenameToURI)):
+                        continue # unchanged relationship set
                     fromRoots = fromRelationshipSet.rootConcepts
                     toRoots = toRelationshipSet.rootConcepts
                     for fromRoot in fromRoots:
@@ -880,7 +947,12 @@ class ModelVersReport(ModelDocument.ModelDocument):
         return dts.relationshipSet(XbrlConst.dimensionDomain, dimRel.consecutiveLinkrole).fromModelObject(dimRel.toModelObject)
 
     def DRSdiff(self, fromConcept, fromLinkrole, toConcept, toLinkrole, arcrole, diffs=None):
-        if diffs is None: diffs = []
+        if diffs is None: # top level networks (shared by many primary items) are only diffed once
+            DRSkey = (fromConcept, fromLinkrole, toConcept, toLinkrole, arcrole)
+            try:
+                return self.DRSdiffs[DRSkey]
+            except KeyError:
+                diffs = self.DRSdiffs[DRSkey] = []
         fromRels = self.fromDTS.relationshipSet(arcrole, fromLinkrole).fromModelObject(fromConcept)
         toRels = self.toDTS.relationshipSet(arcrole, toLinkrole).fromModelObject(toConcept)
         if arcrole == XbrlConst.dimensionDomain: arcrole = XbrlConst.domainMember #consec rel set
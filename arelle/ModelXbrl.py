@@ -3,14 +3,18 @@ See COPYRIGHT.md for copyright information.
 '''
 from __future__ import annotations
 
-import os, sys, traceback, uuid
+import os, sys, traceback, uuid, weakref
 import regex as re
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
 from typing import TYPE_CHECKING, Any, cast, Optional
 import logging
 from decimal import Decimal
 from arelle import UrlUtil, XmlUtil, ModelValue, XbrlConst, XmlValidate
+from arelle.ColumnarFactStore import ColumnarFactStore
+from arelle.ContextPeriodTable import ContextPeriodTable
+from arelle.ContextUnitCanonicalTable import ContextUnitCanonicalTable
+from arelle.SpanTracer import NULL_SPAN, NullSpan, Span
 from arelle.FileSource import FileNamedStringIO
 from arelle.ModelObject import ModelObject, ObjectPropertyViewWrapper
 from arelle.Locale import format_string
@@ -47,6 +51,85 @@ DEFAULT = sys.intern("default")
 NONDEFAULT = sys.intern("non-default")
 DEFAULTorNONDEFAULT = sys.intern("default-or-non-default")
 EMPTY_TUPLE = ()
+# lazily built indexes of the instance facts, and of its contexts and units, deleted when those are reset or removed
+FACT_INDEXES = ("_factsByDimQname", "_factsByQname", "_factsByDatatype", "_factsByLocalName", "_factsByPeriodType",
+                "_factsByEntityIdentifier", "_factsBySingleMeasure", "_factsByContext", "_factStore",
+                "_nonNilFactsInInstance")
+CONTEXT_UNIT_INDEXES = ("_contextPeriodTable", "_contextUnitCanonicalTable")
+
+
+class DeferredLogRecord(logging.LogRecord):
+    """Log record of a ModelXbrl message, retaining the model objects and arguments of the message.
+
+    The message arguments, refs and message text are only prepared by ModelXbrl.logArguments when first
+    used, usually by a log handler serializing the record, or by ModelXbrl.close before the model objects
+    it references are closed.
+    """
+    def __init__(self, modelXbrl: ModelXbrl, level: int, messageCode: str, msg: str, codedArgs: dict[str, Any]) -> None:
+        self._isDeferred = False
+        self._msg: Any = msg
+        self._args: Any = None
+        self._refs: list[dict[str, Any]] = []
+        exc_info = codedArgs.get("exc_info")
+        if isinstance(exc_info, BaseException):
+            exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+        elif exc_info and not isinstance(exc_info, tuple):
+            exc_info = sys.exc_info()
+        super(DeferredLogRecord, self).__init__(modelXbrl.logger.name, level, __file__, 0, msg, None, exc_info or None, "log")
+        self.messageCode = messageCode
+        sourceLine = codedArgs.get("sourceLine")
+        if isinstance(sourceLine, int): # must be sortable with int's in logger
+            self.sourceLine = sourceLine
+        self._modelXbrl: ModelXbrl | None = modelXbrl
+        self._codedArgs: dict[str, Any] | None = codedArgs
+        self._isDeferred = True
+        modelXbrl.deferredLogRecords.add(self)
+
+    def resolve(self) -> None:
+        if self._isDeferred:
+            self._isDeferred = False
+            modelXbrl = cast(ModelXbrl, self._modelXbrl)
+            # note that plugin Logging.Message.Parameters may rewrite msg
+            messageCode, logArgs, extras = modelXbrl.logArguments(self.messageCode, self._msg, cast('dict[str, Any]', self._codedArgs))
+            self._msg = logArgs[0]
+            self._args = logArgs[1] if len(logArgs) > 1 else ()
+            self._refs = extras["refs"]
+            self._modelXbrl = self._codedArgs = None
+            modelXbrl.deferredLogRecords.discard(self)
+
+    @property
+    def msg(self) -> Any:
+        self.resolve()
+        return self._msg
+
+    @msg.setter
+    def msg(self, value: Any) -> None:
+        self.resolve()
+        self._msg = value
+
+    @property
+    def args(self) -> Any:
+        self.resolve()
+        return self._args
+
+    @args.setter
+    def args(self, value: Any) -> None:
+        self.resolve()
+        self._args = value
+
+    @property
+    def refs(self) -> list[dict[str, Any]]:
+        self.resolve()
+        return self._refs
+
+    @refs.setter
+    def refs(self, value: list[dict[str, Any]]) -> None:
+        self.resolve()
+        self._refs = value
+
+    def __getstate__(self) -> dict[str, Any]:
+        self.resolve()
+        return self.__dict__
 
 
 def load(modelManager: ModelManager, url: str, nextaction: str | None = None, base: str | None = None, useFileSource: FileSourceClass | None = None, errorCaptureLevel: str | None = None, **kwargs: str) -> ModelXbrl:
@@ -296,6 +379,12 @@ class ModelXbrl:
     _factsByDatatype: dict[bool | tuple[bool, QName], set[ModelFact]]
     _factsByLocalName: dict[str, set[ModelFact]]
     _factsByPeriodType: dict[str, set[ModelFact]]
+    _factsByEntityIdentifier: dict[tuple[str, str | None], set[ModelFact]]
+    _factsBySingleMeasure: dict[QName, set[ModelFact]]
+    _factsByContext: dict[ModelContext, set[ModelFact]]
+    _contextPeriodTable: ContextPeriodTable
+    _contextUnitCanonicalTable: ContextUnitCanonicalTable
+    _factStore: ColumnarFactStore
     _nonNilFactsInInstance: set[ModelFact]
     _startedProfiledActivity: float
     _startedTimeStat: float
@@ -351,6 +440,9 @@ class ModelXbrl:
         self.logRefHasPluginAttrs: bool = any(True for m in pluginClassMethods("Logging.Ref.Attributes"))
         self.logRefHasPluginProperties: bool = any(True for m in pluginClassMethods("Logging.Ref.Properties"))
         self.logRefFileRelUris: defaultdict[Any, dict[str, str]] = defaultdict(dict)
+        self.deferredLogRecords: weakref.WeakSet[DeferredLogRecord] = weakref.WeakSet()  # log records with unresolved arguments
+        self.messageCodeCounts: defaultdict[str, int] = defaultdict(int)  # for logger messageCodeLimit
+        self.messageCodeLimitExcess: dict[str, list[Any]] = {}  # messageCode: [count, highest level, sampled modelObjects]
         self.profileStats: dict[str, tuple[int, float, float | int]] = {}
         self.schemaDocsToValidate: set[ModelDocumentClass] = set()
         self.modelXbrl = self  # for consistency in addressing modelXbrl
@@ -362,6 +454,8 @@ class ModelXbrl:
         """Closes any views, formula output instances, modelDocument(s), and dereferences all memory used
         """
         if not self.isClosed:
+            self.logMessageCodeLimitSummaries()
+            self.resolveDeferredLogRecords() # snapshot log records before their model objects are closed
             self.closeViews()
             if self.formulaOutputInstance:
                 self.formulaOutputInstance.close()
@@ -389,6 +483,8 @@ class ModelXbrl:
         :param reloadCache: True to force clearing and reloading of web cache, if working online.
         """
         from arelle import ModelDocument
+        self.logMessageCodeLimitSummaries()
+        self.resolveDeferredLogRecords()
         self.init(keepViews=True)
         self.modelDocument = ModelDocument.load(self, self.fileSource.url, isEntry=True, reloadCache=reloadCache)
         self.modelManager.showStatus(_("xbrl loading finished, {0}...").format(nextaction),5000)
@@ -463,12 +559,9 @@ class ModelXbrl:
             return subsGrpMatchTable[elementQname] # head of substitution group
         elementMdlObj = self.qnameConcepts.get(elementQname)
         if elementMdlObj is not None:
-            subsGrpMdlObj = elementMdlObj.substitutionGroup
-            while subsGrpMdlObj is not None:
-                subsGrpQname = subsGrpMdlObj.qname
+            for subsGrpQname in elementMdlObj.substitutionGroupQnameChain:
                 if subsGrpQname in subsGrpMatchTable:
                     return subsGrpMatchTable[subsGrpQname]
-                subsGrpMdlObj = subsGrpMdlObj.substitutionGroup
         return subsGrpMatchTable.get(None)
 
     def isInSubstitutionGroup(self, elementQname: QName, subsGrpQnames: QName | Iterable[QName] | None) -> bool:
@@ -478,16 +571,17 @@ class ModelXbrl:
         :param elementQname: Element/Concept QName to determine if in substitution group(s)
         :param subsGrpQnames: QName or iterable of QNames
         """
-        qnames: Iterable[QName | None]
-        if isinstance(subsGrpQnames, Iterable):
+        qnames: Collection[QName | None]
+        if isinstance(subsGrpQnames, Collection):
             qnames = subsGrpQnames
+        elif isinstance(subsGrpQnames, Iterable):
+            qnames = set(subsGrpQnames)
         else:
             qnames = [subsGrpQnames]
-        matchingSubstitutionGroup = cast(
-            Optional[bool],
-            self.matchSubstitutionGroup(elementQname, {qn: (qn is not None) for qn in qnames})
-        )
-        return matchingSubstitutionGroup is not None and matchingSubstitutionGroup
+        if elementQname is not None and elementQname in qnames:
+            return True
+        elementMdlObj = self.qnameConcepts.get(elementQname)
+        return elementMdlObj is not None and not elementMdlObj.substitutionGroupQnameSet.isdisjoint(qnames)
 
     def createInstance(self, url: str) -> None:
         """ Creates an instance document for a DTS which didn't have an instance document, such as
@@ -503,6 +597,7 @@ class ModelXbrl:
             del self.undefinedFacts[:]
             self.contexts.clear()
             self.units.clear()
+            self.clearIndexes(FACT_INDEXES + CONTEXT_UNIT_INDEXES)
             self.modelDocument.idObjects.clear
             del self.modelDocument.hrefObjects[:]
             self.modelDocument.schemaLocationElements.clear()
@@ -552,6 +647,16 @@ class ModelXbrl:
                         prefixedNamespaces[prefix] = ns
         return prefixedNamespaces
 
+    def clearIndexes(self, indexes: tuple[str, ...]) -> None:
+        """Deletes cached indexes (such as FACT_INDEXES or CONTEXT_UNIT_INDEXES), rebuilt from the remaining
+        facts, contexts and units if used again
+
+        :param indexes: Attribute names of the indexes
+        """
+        for index in indexes:
+            if index in self.__dict__:
+                delattr(self, index)
+
     def matchContext(
             self, entityIdentScheme: str, entityIdentValue: str, periodType: str, periodStart: date | datetime, periodEndInstant: date | datetime,
             dims: dict[ModelDimensionValue, QName], segOCCs: ModelObject, scenOCCs: ModelObject
@@ -574,9 +679,9 @@ class ModelXbrl:
             segAspect, scenAspect = (Aspect.NON_XDT_SEGMENT, Aspect.NON_XDT_SCENARIO)
         else:
             segAspect, scenAspect = (Aspect.COMPLETE_SEGMENT, Aspect.COMPLETE_SCENARIO)
-        for c in self.contexts.values():
-            if (c.entityIdentifier == (entityIdentScheme, entityIdentValue) and
-                ((c.isInstantPeriod and periodType == "instant" and dateUnionEqual(c.instantDatetime, periodEndInstant, instantEndDate=True)) or
+        # equal contexts match alike, so only the first of each is checked
+        for c in self.contextUnitCanonicalTable.canonicalContextsOfEntity((entityIdentScheme, entityIdentValue), dimensionAware=dims is not None):
+            if (((c.isInstantPeriod and periodType == "instant" and dateUnionEqual(c.instantDatetime, periodEndInstant, instantEndDate=True)) or
                  (c.isStartEndPeriod and periodType == "duration" and dateUnionEqual(c.startDatetime, periodStart) and dateUnionEqual(c.endDatetime, periodEndInstant, instantEndDate=True)) or
                  (c.isForeverPeriod and periodType == "forever")) and
                  # dimensions match if dimensional model
@@ -590,7 +695,7 @@ class ModelXbrl:
                         for cOCCs,mOCCs in ((c.nonDimValues(segAspect),segOCCs),
                                             (c.nonDimValues(scenAspect),scenOCCs)))
                 ):
-                    return cast('ModelContext', c)
+                    return c
         return None
 
     def createContext(
@@ -697,6 +802,10 @@ class ModelXbrl:
 
         XmlValidate.validate(self, newCntxElt)
         self.modelDocument.contextDiscover(newCntxElt)
+        if hasattr(self, "_contextPeriodTable"):
+            self._contextPeriodTable.append(newCntxElt)
+        if hasattr(self, "_contextUnitCanonicalTable"):
+            self._contextUnitCanonicalTable.appendContext(newCntxElt)
         if hasattr(self, "_dimensionsInUse"):
             for dim in newCntxElt.qnameDims.values():
                 self._dimensionsInUse.add(dim.dimension)
@@ -710,10 +819,7 @@ class ModelXbrl:
         """
         _multiplyBy = tuple(sorted(multiplyBy))
         _divideBy = tuple(sorted(divideBy))
-        for u in self.units.values():
-            if u.measures == (_multiplyBy,_divideBy):
-                return u
-        return None
+        return self.contextUnitCanonicalTable.unitWithMeasures((_multiplyBy,_divideBy))
 
     def createUnit(self, multiplyBy: list[QName], divideBy: list[QName], afterSibling: ModelObject | None = None, beforeSibling: ModelObject | None = None, id: str | None = None) -> ModelObject:
         """Creates new unit, by measures, as in formula usage, if any
@@ -744,6 +850,8 @@ class ModelXbrl:
                 XmlUtil.addChild(denElt, XbrlConst.xbrli, "measure", text=XmlUtil.addQnameValue(xbrlElt, divide))
         XmlValidate.validate(self, newUnitElt)
         self.modelDocument.unitDiscover(newUnitElt)
+        if hasattr(self, "_contextUnitCanonicalTable"):
+            self._contextUnitCanonicalTable.appendUnit(cast('ModelUnit', newUnitElt))
         return newUnitElt
 
     @property
@@ -852,6 +960,81 @@ class ModelXbrl:
                         fbdq[DEFAULT].add(fact)
             return fbdq[memQname]
 
+    def factsByEntityIdentifier(self, scheme: str, identifier: str | None = None) -> set[ModelFact]:  # indexed by entity scheme and identifier
+        """Item facts in the instance indexed by their context entity scheme and identifier, cached
+
+        :param identifier: if None, returns facts of any identifier in the scheme
+        """
+        try:
+            return self._factsByEntityIdentifier.get((scheme, identifier), set())
+        except AttributeError:
+            fbei: defaultdict[tuple[str, str | None], set[ModelFact]]
+            self._factsByEntityIdentifier = fbei = defaultdict(set)
+            for f in self.factsInInstance:
+                if f.isItem and f.context is not None:
+                    _scheme, _identifier = f.context.entityIdentifier
+                    fbei[_scheme, _identifier].add(f)
+                    fbei[_scheme, None].add(f)
+            return self.factsByEntityIdentifier(scheme, identifier)
+
+    def factsBySingleMeasure(self, measureQname: QName) -> set[ModelFact]:  # indexed by single measure unit
+        """Numeric facts in the instance indexed by the measure of their single measure unit, cached
+        """
+        try:
+            return self._factsBySingleMeasure.get(measureQname, set())
+        except AttributeError:
+            fbsm: defaultdict[QName, set[ModelFact]]
+            self._factsBySingleMeasure = fbsm = defaultdict(set)
+            for f in self.factsInInstance:
+                if f.isNumeric and f.unit is not None and f.unit.isSingleMeasure:
+                    fbsm[f.unit.measures[0][0]].add(f)
+            return self.factsBySingleMeasure(measureQname)
+
+    @property
+    def factsByContext(self) -> dict[ModelContext, set[ModelFact]]:  # indexed by item fact context
+        """Item facts in the instance indexed by their context, cached
+        """
+        try:
+            return self._factsByContext
+        except AttributeError:
+            fbc: defaultdict[ModelContext, set[ModelFact]]
+            self._factsByContext = fbc = defaultdict(set)
+            for f in self.factsInInstance:
+                if f.isItem and f.context is not None:
+                    fbc[f.context].add(f)
+            return fbc
+
+    @property
+    def contextPeriodTable(self) -> ContextPeriodTable:
+        """Columnar period dates of the instance contexts, cached
+        """
+        try:
+            return self._contextPeriodTable
+        except AttributeError:
+            self._contextPeriodTable = ContextPeriodTable(self.contexts.values())
+            return self._contextPeriodTable
+
+    @property
+    def contextUnitCanonicalTable(self) -> ContextUnitCanonicalTable:
+        """Canonical ids of equal contexts (dimension-aware and non-dimension-aware) and equal units, cached
+        """
+        try:
+            return self._contextUnitCanonicalTable
+        except AttributeError:
+            self._contextUnitCanonicalTable = ContextUnitCanonicalTable(self.contexts.values(), self.units.values())
+            return self._contextUnitCanonicalTable
+
+    @property
+    def factStore(self) -> ColumnarFactStore:
+        """Columnar concept, context, unit, decimals, numeric value and nil columns of the instance item facts,
+        in document order, cached (until facts are removed), for bulk consumers of facts
+        """
+        try:
+            return self._factStore
+        except AttributeError:
+            self._factStore = ColumnarFactStore(self.facts)
+            return self._factStore
+
     @property
     def contextsInUse(self) -> Any:
         try:
@@ -938,6 +1121,10 @@ class ModelXbrl:
         # update cached sets
         if not newFact.isNil and hasattr(self, "_nonNilFactsInInstance"):
             self._nonNilFactsInInstance.add(newFact)
+        if newFact.isItem and newFact.context is not None and hasattr(self, "_factsByContext"):
+            self._factsByContext[newFact.context].add(newFact)
+        if newFact.isItem and hasattr(self, "_factStore"):
+            self._factStore.append(newFact)
         if newFact.concept is not None:
             if hasattr(self, "_factsByDatatype"):
                 del self._factsByDatatype # would need to iterate derived type ancestry to populate
@@ -945,6 +1132,10 @@ class ModelXbrl:
                 self._factsByPeriodType[newFact.concept.periodType].add(newFact)
             if hasattr(self, "_factsByDimQname"):
                 del self._factsByDimQname
+            if hasattr(self, "_factsByEntityIdentifier"):
+                del self._factsByEntityIdentifier
+            if hasattr(self, "_factsBySingleMeasure"):
+                del self._factsBySingleMeasure
         self.setIsModified()
         return newFact
 
@@ -1160,6 +1351,46 @@ class ModelXbrl:
                 (msg, fmtArgs) if fmtArgs else (msg,),
                 extras)
 
+    def resolveDeferredLogRecords(self) -> None:
+        """Prepares the arguments and refs of log records not yet serialized by a log handler,
+        so they no longer depend on model objects
+        """
+        for logRecord in list(self.deferredLogRecords):
+            logRecord.resolve()
+
+    def aggregateMessage(self, numericLevel: int, messageCode: str, args: dict[str, Any]) -> None:
+        """Counts a message beyond the logger messageCodeLimit of its message code, instead of logging it.
+
+        The model objects of the counted messages are sampled at the 1st, 2nd, 4th, 8th, ... counted
+        occurrence, up to the logger messageCodeLimitSamples, so samples span large message counts.
+        """
+        excess = self.messageCodeLimitExcess.get(messageCode)
+        if excess is None:
+            excess = self.messageCodeLimitExcess[messageCode] = [0, numericLevel, []]
+        excess[0] += 1
+        if numericLevel > excess[1]:
+            excess[1] = numericLevel
+        count = excess[0]
+        samples = excess[2]
+        if count & (count - 1) == 0 and len(samples) < getattr(self.logger, "messageCodeLimitSamples", 0):
+            modelObject = args.get("modelObject")
+            if modelObject is not None:
+                samples.append(modelObject)
+
+    def logMessageCodeLimitSummaries(self) -> None:
+        """Logs a summary record for each message code with messages counted by aggregateMessage
+        since the last summary, with the sampled model objects as its refs.
+        """
+        if self.messageCodeLimitExcess:
+            logger = self.logger
+            messageCodeLimit = getattr(logger, "messageCodeLimit", None)
+            for messageCode, (count, numericLevel, samples) in sorted(self.messageCodeLimitExcess.items()):
+                """@messageCatalog=[]"""
+                logger.handle(DeferredLogRecord(self, numericLevel, messageCode,
+                    _("%(count)s further %(messageCode)s messages not logged individually, exceeding the limit of %(messageCodeLimit)s messages per message code"),
+                    {"modelObject": samples, "count": count, "messageCode": messageCode, "messageCodeLimit": messageCodeLimit}))
+            self.messageCodeLimitExcess.clear()
+
     def loggableValue(self, argValue: Any) -> str | dict[Any, Any]:  # must be dereferenced and not related to object lifetimes
         if isinstance(argValue, (ModelValue.QName, ModelObject, FileNamedStringIO, tuple, list, set)):  # might be a set of lxml objects not dereferencable at shutdown
             return str(argValue)
@@ -1208,17 +1439,23 @@ class ModelXbrl:
         if (messageCode and
               (not logger.messageCodeFilter or logger.messageCodeFilter.match(messageCode)) and
               (not logger.messageLevelFilter or logger.messageLevelFilter.match(level.lower()))):
-            # note that plugin Logging.Message.Parameters may rewrite messageCode which now occurs after filtering on messageCode
-            messageCode, logArgs, extras = self.logArguments(messageCode, msg, args)
             numericLevel = logging._checkLevel(level)  #type: ignore[attr-defined]
             self.logCount[numericLevel] = self.logCount.get(numericLevel, 0) + 1
             if numericLevel >= self.errorCaptureLevel:
                 try: # if there's a numeric errorCount arg, extend messages codes by count
-                    self.errors.extend([messageCode] * int(logArgs[1]["errorCount"]))
-                except (IndexError, KeyError, ValueError): # no msgArgs, no errorCount, or not int
+                    self.errors.extend([messageCode] * int(args["errorCount"]))
+                except (KeyError, TypeError, ValueError): # no errorCount, or not int
                     self.errors.append(messageCode) # assume one error occurence
-            """@messageCatalog=[]"""
-            logger.log(numericLevel, *logArgs, exc_info=args.get("exc_info"), extra=extras)
+            if logger.isEnabledFor(numericLevel):
+                messageCodeLimit = getattr(logger, "messageCodeLimit", None)
+                if messageCodeLimit and numericLevel > logging.INFO:
+                    self.messageCodeCounts[messageCode] += 1
+                    if self.messageCodeCounts[messageCode] > messageCodeLimit:
+                        self.aggregateMessage(numericLevel, messageCode, args)
+                        return
+                # arguments and refs are prepared by logArguments when the record is serialized by a handler
+                """@messageCatalog=[]"""
+                logger.handle(DeferredLogRecord(self, numericLevel, messageCode, msg, args))
 
     def error(self, codes: str | tuple[str, ...], msg: str, **args: Any) -> None:
         """Logs a message as info, by code, logging-system message text (using %(name)s named arguments
@@ -1269,21 +1506,34 @@ class ModelXbrl:
         5xx validation
         6xx formula
         '''
-        if self.modelManager.collectProfileStats:
+        tracer = self.modelManager.spanTracer
+        if self.modelManager.collectProfileStats or tracer is not None:
             import time
             global profileStatNumber
             try:
                 if name:
                     thisTime = stat if stat is not None else time.time() - self._startedTimeStat
-                    mem = self.modelXbrl.modelManager.cntlr.memoryUsed
-                    prevTime = self.profileStats.get(name, (0,0,0))[1]
-                    self.profileStats[name] = (profileStatNumber, thisTime + prevTime, mem)
-                    profileStatNumber += 1
+                    if tracer is not None and stat is None:
+                        tracer.completed(name, thisTime)
+                    if self.modelManager.collectProfileStats:
+                        mem = self.modelXbrl.modelManager.cntlr.memoryUsed
+                        prevTime = self.profileStats.get(name, (0,0,0))[1]
+                        self.profileStats[name] = (profileStatNumber, thisTime + prevTime, mem)
+                        profileStatNumber += 1
             except AttributeError:
                 pass
             if stat is None:
                 self._startedTimeStat = time.time()
 
+    def span(self, name: str, **args: Any) -> Span | NullSpan:
+        """Context manager tracing the activity within it as a span of name (with args for its trace event),
+        nested in the current span, when modelManager.spanTracer is set (see SpanTracer).
+        """
+        tracer = self.modelManager.spanTracer
+        if tracer is None:
+            return NULL_SPAN
+        return tracer.span(name, **args)
+
     def profileActivity(self, activityCompleted: str | None = None, minTimeToShow: float = 0) -> None:
         """Used to provide interactive GUI messages of long-running processes.
 
@@ -1298,6 +1548,9 @@ class ModelXbrl:
         try:
             if activityCompleted:
                 timeTaken = time.time() - self._startedProfiledActivity
+                tracer = self.modelManager.spanTracer
+                if tracer is not None:
+                    tracer.completed(activityCompleted.lstrip(". "), timeTaken)
                 if timeTaken > minTimeToShow:
                     self.info("info:profileActivity",
                             _("%(activity)s %(time)s secs\n"),
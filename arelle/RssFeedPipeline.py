@@ -0,0 +1,310 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Pipelined processing of RSS feed items: a prefetch process downloading item archives into the web cache,
+worker processes loading and validating items, and a collector applying the results in feed order.
+
+Workers are forked, so that they share the feed, options and plugins of the controller without reloading
+them.  The controller starts no threads of its own while forking: the prefetch process, forked first, runs
+the download threads, so that no worker is forked while a download thread holds a lock (of logging, the
+web cache or SSL).  Plugin hooks which need the loaded filing (RssItem.Xbrl.Loaded, Validate.RssItem) run in
+the worker; log records of the worker, and the error codes and log counts it adds to the feed's model, are
+returned to the collector, which applies them in feed order, so the log and errors of a pipelined feed are
+those of a feed validated item by item.
+'''
+from __future__ import annotations
+import logging
+import multiprocessing
+import pickle
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from arelle.FileSource import archiveFilenameParts
+
+if TYPE_CHECKING:
+    from arelle.ModelRssItem import ModelRssItem
+    from arelle.ModelXbrl import ModelXbrl
+
+PROCESSED = "processed"
+NOT_PROCESSED = "not processed" # skipped by plugin criteria, not loadable or raised an exception (which it logged)
+TIMEOUT = "timeout"
+WORKER_FAILED = "worker failed" # worker process exited without a result
+
+def isSupported() -> bool:
+    """Worker processes are forked, which is not available on all platforms (such as Windows)"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+# log arguments kept as they are, so that numeric conversions (such as %d or %.2f) format as in the worker
+picklableArgTypes = (str, int, float, Decimal, bool, type(None))
+
+def picklableLogArg(arg: Any) -> Any:
+    return arg if isinstance(arg, picklableArgTypes) else str(arg)
+
+def picklableLogRecord(record: logging.LogRecord) -> dict[str, Any]:
+    """Attributes of record needed by the log handlers, for logging.makeLogRecord, without model object references"""
+    args = record.args
+    if isinstance(args, dict):
+        args = {name: picklableLogArg(value) for name, value in args.items()}
+    elif args:
+        args = tuple(picklableLogArg(arg) for arg in args)
+    recordDict = {"name": record.name, "levelno": record.levelno, "levelname": record.levelname,
+                  "msg": str(record.msg), "args": args, "created": record.created}
+    for attr in ("messageCode", "refs", "sourceLine"):
+        if hasattr(record, attr):
+            recordDict[attr] = getattr(record, attr)
+    if record.exc_info:
+        recordDict["exc_text"] = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+    elif record.exc_text:
+        recordDict["exc_text"] = record.exc_text
+    try:
+        pickle.dumps(recordDict.get("refs"))
+    except Exception:
+        recordDict["refs"] = []
+    return recordDict
+
+class LogCaptureHandler(logging.Handler):
+    """Log handler of a worker process, keeping picklable log records for the collector"""
+    def __init__(self) -> None:
+        super(LogCaptureHandler, self).__init__()
+        self.records: list[dict[str, Any]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(picklableLogRecord(record))
+
+class RssItemResult:
+    """Outcome of processing an RSS item in a worker.
+
+    errors are those of the item's model (message codes and assertion results dicts), as read by
+    ModelRssItem.setResults, None unless status is PROCESSED.  feedErrors and feedLogCount are the
+    error codes and counts by level of messages the worker logged to the feed's model.
+    """
+    __slots__ = ("status", "errors", "logRecords", "feedErrors", "feedLogCount")
+
+    def __init__(self, status: str, errors: list[Any] | None = None, logRecords: list[dict[str, Any]] | None = None,
+                 feedErrors: list[Any] | None = None, feedLogCount: dict[int, int] | None = None) -> None:
+        self.status = status
+        self.errors = errors
+        self.logRecords = logRecords or []
+        self.feedErrors = feedErrors or []
+        self.feedLogCount = feedLogCount or {}
+
+    def emitLogRecords(self, modelXbrl: ModelXbrl) -> None:
+        """Emits the worker's log records to the feed's logger and adds its error codes and log counts
+        to the feed's model, as if logged there"""
+        for recordDict in self.logRecords:
+            modelXbrl.logger.handle(logging.makeLogRecord(recordDict))
+        modelXbrl.errors.extend(self.feedErrors)
+        for level, count in self.feedLogCount.items():
+            modelXbrl.logCount[level] = modelXbrl.logCount.get(level, 0) + count
+        self.logRecords = []
+        self.feedErrors = []
+        self.feedLogCount = {}
+
+def _runWorker(processItem: Callable[[ModelRssItem], list[Any] | None], rssItem: ModelRssItem,
+               modelXbrl: ModelXbrl, conn: Any) -> None:
+    # in the forked process, handlers of the controller (such as log files) are not to be written
+    handler = LogCaptureHandler()
+    logger = modelXbrl.logger
+    for parentHandler in logger.handlers[:]:
+        logger.removeHandler(parentHandler)
+    logger.addHandler(handler)
+    priorErrors = len(modelXbrl.errors)
+    priorLogCount = dict(modelXbrl.logCount)
+    try:
+        errors = processItem(rssItem)
+        status = PROCESSED if errors is not None else NOT_PROCESSED
+    except BaseException: # processItem logs its exceptions, the collector reports those escaping it
+        errors = None
+        status = WORKER_FAILED
+    feedLogCount = {level: count - priorLogCount.get(level, 0)
+                    for level, count in modelXbrl.logCount.items() if count != priorLogCount.get(level, 0)}
+    conn.send(RssItemResult(status, errors, handler.records, modelXbrl.errors[priorErrors:], feedLogCount))
+    conn.close()
+
+def _runPrefetch(download: Callable[[ModelRssItem], None], items: list[ModelRssItem], threads: int,
+                 logger: logging.Logger, conn: Any) -> None:
+    # downloads items by index received from the controller, returning the index of each downloaded item;
+    # download errors are not logged here, but by the worker loading the item
+    for parentHandler in logger.handlers[:]:
+        logger.removeHandler(parentHandler)
+    sendLock = threading.Lock()
+    downloads: list[Future[None]] = []
+
+    def downloaded(i: int, future: Future[None]) -> None:
+        if not future.cancelled():
+            with sendLock:
+                try:
+                    conn.send(i)
+                except OSError: # controller no longer waiting
+                    pass
+    with ThreadPoolExecutor(max_workers=threads) as downloader:
+        while True:
+            try:
+                i = conn.recv()
+            except (EOFError, OSError):
+                i = None
+            if i is None: # pipeline finished, downloads not started are not needed
+                for future in downloads:
+                    future.cancel()
+                break
+            future = downloader.submit(download, items[i])
+            future.add_done_callback(lambda future, i=i: downloaded(i, future))
+            downloads.append(future)
+    conn.close()
+
+class Prefetcher:
+    """Controller side of the prefetch process, which must be started before any worker is forked"""
+    def __init__(self, ctx: Any, download: Callable[[ModelRssItem], None], items: list[ModelRssItem], threads: int,
+                 logger: logging.Logger) -> None:
+        self.conn, childConn = ctx.Pipe()
+        self.process = ctx.Process(target=_runPrefetch, args=(download, items, threads, logger, childConn), daemon=True)
+        self.process.start()
+        childConn.close()
+        self.requested: set[int] = set()
+        self.downloaded: set[int] = set()
+
+    def request(self, i: int) -> None:
+        if i not in self.requested:
+            self.requested.add(i)
+            if self.conn is not None:
+                try:
+                    self.conn.send(i)
+                except OSError:
+                    self.lost()
+
+    def isDownloaded(self, i: int, timeout: Callable[[], float | None]) -> bool:
+        """Waits for item i, if requested, no longer than timeout() seconds, returns True if no longer to be waited for"""
+        while i in self.requested and i not in self.downloaded and self.conn is not None:
+            try:
+                if not self.conn.poll(timeout()):
+                    return False
+                self.downloaded.add(self.conn.recv())
+            except (EOFError, OSError):
+                self.lost()
+        self.requested.discard(i)
+        self.downloaded.discard(i)
+        return True
+
+    def lost(self) -> None:
+        # prefetch process ended, workers download their items
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def close(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join()
+        self.lost()
+
+class RssFeedPipeline:
+    """Processes RSS items with workers worker processes, each item in its own process, with:
+
+    - prefetch: number of item archives downloaded ahead of the workers, by as many download threads of a
+      prefetch process (0 for workers to download their items)
+    - timeout: seconds after which an item's worker is terminated (None for no limit)
+    - maxPending: items started but not yet collected, bounding results buffered behind a slow item
+      (default twice workers)
+
+    processItem(rssItem) runs in the worker, returning errors of the item's model (or None if not processed);
+    collectItem(rssItem, result) runs in the controller process in feed order, with a None result for items
+    whose skipRssItem is set.
+    """
+    def __init__(self, modelXbrl: ModelXbrl,
+                 processItem: Callable[[ModelRssItem], list[Any] | None],
+                 collectItem: Callable[[ModelRssItem, RssItemResult | None], None],
+                 workers: int, prefetch: int = 2, timeout: float | None = None,
+                 maxPending: int | None = None, reloadCache: bool = False) -> None:
+        self.modelXbrl = modelXbrl
+        self.processItem = processItem
+        self.collectItem = collectItem
+        self.workers = max(1, workers)
+        self.prefetch = max(0, prefetch)
+        self.timeout = timeout or None
+        self.maxPending = max(self.workers, maxPending or 2 * self.workers)
+        self.reloadCache = reloadCache
+
+    def download(self, rssItem: ModelRssItem) -> None:
+        url = rssItem.zippedUrl
+        archiveParts = archiveFilenameParts(url)
+        try:
+            self.modelXbrl.modelManager.cntlr.webCache.getfilename(archiveParts[0] if archiveParts else url,
+                                                                   reload=self.reloadCache)
+        except Exception:
+            pass # the worker reports the file error when it loads the item
+
+    def waitTime(self, running: dict[int, tuple[Any, Any, float | None]]) -> float | None:
+        """Seconds until the earliest deadline of the running workers, None if none has a deadline"""
+        deadlines = [deadline for _process, _conn, deadline in running.values() if deadline is not None]
+        return max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+    def run(self, rssItems: Iterable[ModelRssItem]) -> None:
+        items = list(rssItems)
+        ctx = multiprocessing.get_context("fork")
+        running: dict[int, tuple[Any, Any, float | None]] = {} # item index: (process, connection, deadline)
+        results: dict[int, RssItemResult | None] = {}
+        nextToStart = nextToCollect = 0
+        # forked while the controller has no pipeline threads, as are the workers
+        prefetcher = Prefetcher(ctx, self.download, items, self.prefetch, self.modelXbrl.logger) if self.prefetch else None
+        try:
+            while nextToCollect < len(items):
+                # start workers, while within the back-pressure bound of uncollected items
+                while (nextToStart < len(items) and len(running) < self.workers and
+                       nextToStart - nextToCollect < self.maxPending):
+                    if prefetcher is not None:
+                        for i in range(nextToStart, min(len(items), nextToStart + self.workers + self.prefetch)):
+                            if not getattr(items[i], "skipRssItem", False):
+                                prefetcher.request(i)
+                    rssItem = items[nextToStart]
+                    if getattr(rssItem, "skipRssItem", False):
+                        results[nextToStart] = None
+                    else:
+                        # wait no later than the deadline of a running worker, which is then terminated
+                        # before the download is waited for again
+                        if prefetcher is not None and not prefetcher.isDownloaded(nextToStart, lambda: self.waitTime(running)):
+                            break
+                        parentConn, childConn = ctx.Pipe(duplex=False)
+                        process = ctx.Process(target=_runWorker, args=(self.processItem, rssItem, self.modelXbrl, childConn), daemon=True)
+                        process.start()
+                        childConn.close()
+                        running[nextToStart] = (process, parentConn,
+                                                time.monotonic() + self.timeout if self.timeout else None)
+                    nextToStart += 1
+                # wait for a worker result or the earliest deadline
+                if running:
+                    readyConns = wait([conn for _process, conn, _deadline in running.values()],
+                                      timeout=self.waitTime(running))
+                    now = time.monotonic()
+                    for i, (process, conn, deadline) in list(running.items()):
+                        if conn in readyConns:
+                            try:
+                                results[i] = conn.recv()
+                            except (EOFError, OSError):
+                                results[i] = RssItemResult(WORKER_FAILED)
+                        elif deadline is not None and now >= deadline:
+                            process.terminate()
+                            results[i] = RssItemResult(TIMEOUT)
+                        else:
+                            continue
+                        conn.close()
+                        process.join()
+                        del running[i]
+                # collect in feed order
+                while nextToCollect in results:
+                    self.collectItem(items[nextToCollect], results.pop(nextToCollect))
+                    nextToCollect += 1
+        finally:
+            for process, conn, _deadline in running.values():
+                process.terminate()
+                process.join()
+                conn.close()
+            if prefetcher is not None:
+                prefetcher.close()
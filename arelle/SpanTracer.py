@@ -0,0 +1,154 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Hierarchical span tracing of loading, validation and plugin activities, exported as Chrome trace-event
+JSON (chrome://tracing, Perfetto) or as folded stacks for flame graph tools.
+
+Tracing is enabled by setting a SpanTracer as modelManager.spanTracer, such as by the command line
+--traceSpans option.  Spans are begun by ModelXbrl.span(name) as a context manager, by the traceSpan
+decorator of methods of objects with a modelXbrl, and profileStat and profileActivity add completed spans
+for the activity since their previous call.  When modelManager.spanTracer is None each of these is a
+single attribute check.
+'''
+from __future__ import annotations
+from collections import defaultdict
+from functools import wraps
+import json, os, threading, time
+from typing import Any, Callable, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+class NullSpan:
+    """Context manager used in place of a Span when tracing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self) -> NullSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start", "childTime", "childIntervals", "memoryStart")
+
+    def __init__(self, tracer: SpanTracer, name: str, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.childTime = 0.0
+        self.childIntervals: list[tuple[float, float]] = []
+
+    def __enter__(self) -> Span:
+        self.tracer.begin(self)
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        self.tracer.end(self)
+        return False
+
+class SpanTracer:
+    """Records nested spans with wall clock duration, memory delta (KB, if memoryUsed is provided) and
+    args (such as counts of objects processed), and self times summed per stack of span names.
+    """
+
+    def __init__(self, memoryUsed: Callable[[], float] | None = None) -> None:
+        self.memoryUsed = memoryUsed
+        self.events: list[dict[str, Any]] = [] # Chrome complete ("X") trace events
+        self.stackSelfTimes: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self.threadStacks = threading.local()
+        self.rootIntervals: list[tuple[float, float]] = []
+        self.pid = os.getpid()
+        self.startTime = time.perf_counter()
+
+    def span(self, name: str, **args: Any) -> Span:
+        return Span(self, name, args)
+
+    @property
+    def stack(self) -> list[Span]:
+        try:
+            return cast('list[Span]', self.threadStacks.stack)
+        except AttributeError:
+            self.threadStacks.stack = []
+            return cast('list[Span]', self.threadStacks.stack)
+
+    def begin(self, span: Span) -> None:
+        self.stack.append(span)
+        span.memoryStart = self.memoryUsed() if self.memoryUsed is not None else 0
+        span.start = time.perf_counter()
+
+    def end(self, span: Span) -> None:
+        end = time.perf_counter()
+        stack = self.stack
+        while stack and stack.pop() is not span: # spans not ended (by exception) end with their parent
+            pass
+        if self.memoryUsed is not None:
+            span.args["memoryDeltaKB"] = self.memoryUsed() - span.memoryStart
+        self.record(span.name, span.start, end, span.childTime, span.args)
+
+    def completed(self, name: str, duration: float, **args: Any) -> None:
+        """Records a span ending now, of the duration (secs) measured by the caller, as child of the current span
+        (starting no earlier than the current span).  Sibling spans recorded within its duration (such as spans of
+        other profileStat or profileActivity marks) remain siblings, their time is not also self time of this span.
+        """
+        end = time.perf_counter()
+        start = end - duration
+        stack = self.stack
+        if stack and start < stack[-1].start:
+            start = stack[-1].start
+        siblingIntervals = stack[-1].childIntervals if stack else self.rootIntervals
+        overlap = sum(min(e, end) - max(s, start) for s, e in siblingIntervals if e > start and s < end)
+        self.record(name, start, end, overlap, args, overlap)
+
+    def record(self, name: str, start: float, end: float, childTime: float, args: dict[str, Any], siblingOverlap: float = 0.0) -> None:
+        stack = self.stack
+        duration = end - start
+        if stack:
+            stack[-1].childTime += duration - siblingOverlap
+            stack[-1].childIntervals.append((start, end))
+        else:
+            self.rootIntervals.append((start, end))
+        names = tuple(s.name for s in stack) + (name,)
+        self.stackSelfTimes[names] += max(duration - childTime, 0.0)
+        event = {"name": name, "cat": "arelle", "ph": "X",
+                 "ts": round((start - self.startTime) * 1e6, 1), "dur": round(duration * 1e6, 1),
+                 "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = dict((k, v if isinstance(v, (int, float, bool)) else str(v)) for k, v in args.items())
+        self.events.append(event)
+
+    def chromeTrace(self) -> dict[str, Any]:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def foldedStacks(self) -> list[str]:
+        """Lines of semicolon separated span names, and self time in microseconds, summed over calls"""
+        return ["{} {}".format(";".join(n.replace(";", ",").replace(" ", "_") for n in names), round(selfTime * 1e6))
+                for names, selfTime in sorted(self.stackSelfTimes.items())]
+
+    def save(self, filename: str) -> None:
+        """Saves Chrome trace-event JSON if filename ends with .json, otherwise folded stacks"""
+        with open(filename, "w", encoding="utf-8") as fh:
+            if filename.endswith(".json"):
+                json.dump(self.chromeTrace(), fh, indent=0)
+            else:
+                fh.write("\n".join(self.foldedStacks()) + "\n")
+
+def traceSpan(name: str) -> Callable[[F], F]:
+    """Decorator tracing each call of a function whose first argument has a modelXbrl attribute
+    (ModelXbrl, ModelDocument, validation objects) as a span of name.
+    """
+    def decorator(function: F) -> F:
+        @wraps(function)
+        def spanned(obj: Any, *args: Any, **kwargs: Any) -> Any:
+            tracer = obj.modelXbrl.modelManager.spanTracer
+            if tracer is None:
+                return function(obj, *args, **kwargs)
+            with tracer.span(name):
+                return function(obj, *args, **kwargs)
+        return cast(F, spanned)
+    return decorator
+
+def pluginSpanName(hookName: str, pluginMethod: Callable[..., Any]) -> str:
+    """Span name of a plugin method called for a plugin hook, e.g., "Validate.XBRL.Finally validate/EFM" """
+    return "{} {}".format(hookName, getattr(pluginMethod, "__module__", pluginMethod))
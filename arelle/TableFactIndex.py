@@ -0,0 +1,75 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+Index of the facts of a rendered table by keys of their aspect values, for the file and GUI table views
+(ViewFileRenderedGrid, ViewWinRenderedGrid) to find the facts of each body cell by a hash probe instead of
+testing the facts of the cell's concept and dimension members.
+'''
+from __future__ import annotations
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Iterable
+
+from arelle.ModelFormulaObject import Aspect # before FormulaEvaluator, which it imports
+from arelle.FormulaEvaluator import UNKEYABLE, aspectMatchKey
+from arelle.ModelValue import QName
+
+if TYPE_CHECKING:
+    from arelle.ModelInstanceObject import ModelFact
+    from arelle.PrototypeInstanceObject import FactPrototype
+    from arelle.XPathContext import XPathContext
+
+keyedAspects = frozenset((Aspect.CONCEPT, Aspect.ENTITY_IDENTIFIER, Aspect.PERIOD, Aspect.UNIT))
+
+def aspectSortKey(aspect: int | QName) -> tuple[bool, str]:
+    return (isinstance(aspect, QName), str(aspect))
+
+class TableFactIndex:
+    """Facts of a table, indexed by their keys of the concept, entity identifier, period, unit and dimension
+    aspects of a cell (an index for each combination of aspects, built on first use).
+
+    A cell's candidate facts are those whose keys equal those of the cell's fact prototype, for the aspects
+    the fact prototype has keyable values of; candidates are still to be tested by aspectMatches.  Facts
+    matched to cells are recorded (by factMatched), for coverage of the table's facts by its cells.
+    """
+    __slots__ = ("xpCtx", "facts", "matchedFacts", "_indexes")
+
+    def __init__(self, xpCtx: XPathContext, facts: Iterable[ModelFact]) -> None:
+        self.xpCtx = xpCtx
+        self.facts: list[ModelFact] = list(facts)
+        self.matchedFacts: set[ModelFact] = set()
+        self._indexes: dict[tuple[int | QName, ...], dict[tuple[Any, ...], list[ModelFact]]] = {}
+
+    def cellFacts(self, fp: FactPrototype, aspects: Iterable[int | QName]) -> list[ModelFact]:
+        """Facts which may match cell fact prototype fp on aspects, in table facts order"""
+        cellAspects = []
+        cellKey = []
+        for aspect in sorted(aspects, key=aspectSortKey):
+            if isinstance(aspect, QName) or aspect in keyedAspects:
+                key = aspectMatchKey(self.xpCtx, fp, aspect)
+                if key is not UNKEYABLE:
+                    cellAspects.append(aspect)
+                    cellKey.append(key)
+        indexAspects = tuple(cellAspects)
+        try:
+            index = self._indexes[indexAspects]
+        except KeyError:
+            index = self._indexes[indexAspects] = defaultdict(list)
+            for fact in self.facts:
+                key = tuple(aspectMatchKey(self.xpCtx, fact, aspect) for aspect in indexAspects)
+                # a fact not keyable on an aspect (such as without context) doesn't match the cell's keyed value
+                if not any(aspectKey is UNKEYABLE for aspectKey in key):
+                    index[key].append(fact)
+        return index.get(tuple(cellKey), [])
+
+    def factMatched(self, fact: ModelFact) -> None:
+        self.matchedFacts.add(fact)
+
+    @property
+    def unmatchedFacts(self) -> list[ModelFact]:
+        """Facts of the table not matched to any cell, in table facts order"""
+        return [fact for fact in self.facts if fact not in self.matchedFacts]
+
+    @property
+    def coverage(self) -> tuple[int, int]:
+        """(number of facts of the table, number of them matched to cells)"""
+        return (len(self.facts), len(self.matchedFacts))
@@ -3,9 +3,10 @@ See COPYRIGHT.md for copyright information.
 '''
 import regex as re
 from collections import defaultdict
-import os, io, json
+import os, io, json, weakref
 from datetime import datetime, timedelta
 from arelle import XbrlConst
+from arelle.ModelDocument import Type
 from arelle.ModelDtsObject import ModelConcept
 from arelle.XmlValidate import VALID
 
@@ -32,6 +33,8 @@ notPAR = "(?!.*" + rePARENTHETICAL + ")"
 isPAR = "(?=.*" + rePARENTHETICAL + ")"
 
 UGT_TOPICS = None
+# base taxonomy role structures shared by the open DTSes, each released when no open DTS holds it:
+BASE_ROLE_STRUCTURES = weakref.WeakValueDictionary() # by (roleURI, frozenset of uris of its presentation linkbases)
 
 def RE(*args):
     return re.compile(''.join(args), re.IGNORECASE)
@@ -118,14 +121,14 @@ def evaluateRoleTypesTableCodes(modelXbrl):
     if disclosureSystem.validationType in ("EFM", "HMRC"):
         detectMultipleOfCode = False
         if disclosureSystem.validationType == "EFM":
-            tableCodes = list( EFMtableCodes ) # separate copy of list so entries can be deleted
+            tableCodes = EFMtableCodes
             # for Registration and resubmission allow detecting multiple of code
             detectMultipleOfCode = any(v and any(v.startswith(dt) for dt in ('S-', 'F-', '8-K', '6-K'))
                                        for docTypeConcept in modelXbrl.nameConcepts.get('DocumentType', ())
                                        for docTypeFact in modelXbrl.factsByQname.get(docTypeConcept.qname, ())
                                        for v in (docTypeFact.value,))
         elif disclosureSystem.validationType == "HMRC":
-            tableCodes = list( HMRCtableCodes ) # separate copy of list so entries can be deleted
+            tableCodes = HMRCtableCodes
 
         codeRoleURI = {}  # lookup by code for roleURI
         roleURICode = {}  # lookup by roleURI
@@ -136,20 +139,19 @@ def evaluateRoleTypesTableCodes(modelXbrl):
                      for roleType in modelXbrl.roleTypes.get(roleURI,())]
         roleTypes.sort(key=lambda roleType: roleType.definition)
         # assign code to table link roles (Presentation ELRs)
+        roleStructures = linkRoleStructures(modelXbrl)
+        doneTableCodes = set() # indexes of table codes done with looking at
         for roleType in roleTypes:
             definition = roleType.definition
-            rootConcepts = None
-            for i, tableCode in enumerate(tableCodes):
-                code, pattern, rootConceptNames = tableCode
-                if (detectMultipleOfCode or code not in codeRoleURI) and pattern.match(definition):
-                    if rootConceptNames and rootConcepts is None:
-                        rootConcepts = modelXbrl.relationshipSet(XbrlConst.parentChild, roleType.roleURI).rootConcepts
+            for i in definitionTableCodes(tableCodes, definition):
+                code, pattern, rootConceptNames = tableCodes[i]
+                if i not in doneTableCodes and (detectMultipleOfCode or code not in codeRoleURI):
                     if (not rootConceptNames or
-                        any(rootConcept.name in rootConceptNames for rootConcept in rootConcepts)):
+                        not rootConceptNames.isdisjoint(roleStructures[roleType.roleURI].rootConceptNames)):
                         codeRoleURI[code] = roleType.roleURI
                         roleURICode[roleType.roleURI] = code
                         if not detectMultipleOfCode:
-                            del tableCodes[i] # done with looking at this code
+                            doneTableCodes.add(i) # done with looking at this code
                         break
         # find defined non-default axes in pre hierarchy for table
         for roleTypes in modelXbrl.roleTypes.values():
@@ -311,6 +313,7 @@ def evaluateTableIndex(modelXbrl, lang=None):
                 elif (cntx.isInstantPeriod and not cntx.qnameDims and thisEnd == cntx.endDatetime):
                     reportingPeriods.add((None, cntx.endDatetime))
         stmtReportingPeriods = set(reportingPeriods)
+        roleStructures = linkRoleStructures(modelXbrl)
 
         sortedRoleTypes.reverse() # now in descending order
         for i, roleTypes in enumerate(sortedRoleTypes):
@@ -318,7 +321,8 @@ def evaluateTableIndex(modelXbrl, lang=None):
             # find defined non-default axes in pre hierarchy for table
             tableFacts = set()
             tableGroup, tableSeq, tableName = roleType._tableIndex
-            roleURIdims, priItemQNames = EFMlinkRoleURIstructure(modelXbrl, roleType.roleURI)
+            roleStructure = roleStructures[roleType.roleURI]
+            roleURIdims, priItemQNames = roleStructure.dimMems, roleStructure.priItems
             for priItemQName in priItemQNames:
                 for fact in factsByQname.get(priItemQName,()):
                     cntx = fact.context
@@ -396,12 +400,7 @@ def evaluateTableIndex(modelXbrl, lang=None):
 
         if UGT_TOPICS is not None:
             def roleUgtConcepts(roleType):
-                roleConcepts = set()
-                for rel in modelXbrl.relationshipSet(XbrlConst.parentChild, roleType.roleURI).modelRelationships:
-                    if isinstance(rel.toModelObject, ModelConcept):
-                        roleConcepts.add(rel.toModelObject.name)
-                    if isinstance(rel.fromModelObject, ModelConcept):
-                        roleConcepts.add(rel.fromModelObject.name)
+                roleConcepts = set(roleStructures[roleType.roleURI].conceptNames)
                 if hasattr(roleType, "_tableChildren"):
                     for _tableChild in roleType._tableChildren:
                         roleConcepts |= roleUgtConcepts(_tableChild)
@@ -496,6 +495,74 @@ def parentNameMatchLen(tableName, parentRoleType):
         lengthOfMatch += 1
     return fullWordFound and lengthOfMatch
 
+def definitionTableCodes(tableCodes, definition):
+    """Indexes of the tableCodes whose pattern matches the role definition, in table codes order"""
+    return tuple(i for i, (_code, pattern, _rootConceptNames) in enumerate(tableCodes) if pattern.match(definition))
+
+class RoleStructure:
+    """Presentation structure of a link role, by concept names and qnames (no model objects, so it may be
+    shared by DTSes including the same linkbases):
+
+    - rootConceptNames: names of the root concepts
+    - dimMems: by dimension qname, member qnames (as EFMlinkRoleURIstructure)
+    - priItems: qnames of the primary items (as EFMlinkRoleURIstructure)
+    - conceptNames: names of the concepts of its relationships
+    """
+    __slots__ = ("rootConceptNames", "dimMems", "priItems", "conceptNames", "__weakref__")
+
+    def __init__(self, modelXbrl, roleURI):
+        relSet = modelXbrl.relationshipSet(XbrlConst.parentChild, roleURI)
+        self.rootConceptNames = frozenset(rootConcept.name for rootConcept in relSet.rootConcepts)
+        dimMems, priItems = EFMlinkRoleURIstructure(modelXbrl, roleURI)
+        self.dimMems = {dimQn: frozenset(memQns) for dimQn, memQns in dimMems.items()}
+        self.priItems = frozenset(priItems)
+        self.conceptNames = frozenset(concept.name
+                                      for rel in relSet.modelRelationships
+                                      for concept in (rel.fromModelObject, rel.toModelObject)
+                                      if isinstance(concept, ModelConcept))
+
+class LinkRoleStructures(dict):
+    """RoleStructure of each presentation link role of a DTS, by roleURI, determined on first use and held by
+    the DTS until it is closed (linkRoleStructures).
+
+    The structures of base taxonomy roles, whose presentation links are all in documents of the disclosure
+    system's standard taxonomies (or linkbases referenced by its standard schemas), are shared with the other
+    open DTSes including the same linkbases, so only extension roles are walked for each of them.
+    """
+    __slots__ = ("modelXbrl", "baseTaxonomyUris")
+
+    def __init__(self, modelXbrl):
+        super().__init__()
+        self.modelXbrl = modelXbrl
+        standardTaxonomiesDict = modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict
+        self.baseTaxonomyUris = set()
+        for doc in modelXbrl.urlDocs.values():
+            if doc.uri in standardTaxonomiesDict or (doc.type == Type.SCHEMA and doc.targetNamespace in standardTaxonomiesDict):
+                self.baseTaxonomyUris.add(doc.uri)
+                self.baseTaxonomyUris.update(referencedDoc.uri for referencedDoc in doc.referencesDocument
+                                             if referencedDoc.type == Type.LINKBASE)
+
+    def __missing__(self, roleURI):
+        docUris = frozenset(link.modelDocument.uri
+                            for link in self.modelXbrl.baseSets.get((XbrlConst.parentChild, roleURI, None, None), ()))
+        if docUris and docUris <= self.baseTaxonomyUris:
+            key = (roleURI, docUris)
+            roleStructure = BASE_ROLE_STRUCTURES.get(key)
+            if roleStructure is None:
+                roleStructure = BASE_ROLE_STRUCTURES[key] = RoleStructure(self.modelXbrl, roleURI)
+        else:
+            roleStructure = RoleStructure(self.modelXbrl, roleURI)
+        self[roleURI] = roleStructure
+        return roleStructure
+
+def linkRoleStructures(modelXbrl):
+    """LinkRoleStructures of the DTS, released with the other attributes of modelXbrl when it is closed"""
+    try:
+        return modelXbrl._linkRoleStructures
+    except AttributeError:
+        roleStructures = modelXbrl._linkRoleStructures = LinkRoleStructures(modelXbrl)
+        return roleStructures
+
 def EFMlinkRoleURIstructure(modelXbrl, roleURI):
     relSet = modelXbrl.relationshipSet(XbrlConst.parentChild, roleURI)
     dimMems = {} # by dimension qname, set of member qnames
@@ -4,7 +4,7 @@ See COPYRIGHT.md for copyright information.
 import os, sys, traceback, logging
 import regex as re
 from collections import defaultdict, OrderedDict
-from arelle import (FileSource, ModelXbrl, ModelDocument, ModelVersReport, XbrlConst,
+from arelle import (FileSource, ModelXbrl, ModelDocument, ModelVersReport, XbrlConst, RssFeedPipeline,
                ValidateXbrl, ValidateVersReport, ValidateFormula,
                ValidateInfoset, RenderingEvaluator, ViewFileRenderedGrid, UrlUtil)
 from arelle.ModelDocument import Type, ModelDocumentReference, load as modelDocumentLoad
@@ -15,6 +15,7 @@ from arelle.ModelRelationshipSet import ModelRelationshipSet
 from arelle.ModelTestcaseObject import testcaseVariationsByTarget
 from arelle.ModelValue import (qname, QName)
 from arelle.PluginManager import pluginClassMethods
+from arelle.SpanTracer import traceSpan
 from arelle.XmlUtil import collapseWhitespace, xmlstring
 
 def validate(modelXbrl):
@@ -56,6 +57,7 @@ class Validate:
         self.formulaValidator.close(reusable=False)
         self.__dict__.clear()   # dereference variables
 
+    @traceSpan("Validate.validate")
     def validate(self):
         if not self.modelXbrl.modelDocument:
             self.modelXbrl.info("arelle:notValidated",
@@ -118,45 +120,93 @@ class Validate:
 
     def validateRssFeed(self):
         self.modelXbrl.info("info", "RSS Feed", modelDocument=self.modelXbrl)
-        from arelle.FileSource import openFileSource
+        modelManager = self.modelXbrl.modelManager
         reloadCache = getattr(self.modelXbrl, "reloadCache", False)
+        if modelManager.rssWorkers > 0 and RssFeedPipeline.isSupported():
+            # grammar is initialized once, before workers are forked, instead of in each worker
+            from arelle import XPathParser
+            XPathParser.initializeParser(modelManager)
+            # archives are reloaded by the pipeline's prefetch stage, before workers load them
+            RssFeedPipeline.RssFeedPipeline(self.modelXbrl, self.validateRssItem, self.collectRssItem,
+                                            workers=modelManager.rssWorkers, prefetch=modelManager.rssPrefetch,
+                                            timeout=modelManager.rssItemTimeout, reloadCache=reloadCache
+                                            ).run(self.modelXbrl.modelDocument.rssItems)
+            return
+        if modelManager.rssWorkers > 0:
+            self.modelXbrl.warning("arelle:rssWorkersNotSupported",
+                _("RSS feed items are validated in this process, worker processes (%(rssWorkers)s) are not supported on this platform"),
+                modelXbrl=self.modelXbrl, rssWorkers=modelManager.rssWorkers)
         for rssItem in self.modelXbrl.modelDocument.rssItems:
-            if getattr(rssItem, "skipRssItem", False):
-                self.modelXbrl.info("info", _("skipping RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
-                    modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
-                continue
-            self.modelXbrl.info("info", _("RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
+            if self.logRssItem(rssItem):
+                self.validateRssItem(rssItem, reloadCache)
+
+    def logRssItem(self, rssItem):
+        """Logs rssItem being validated or skipped, returns False if skipped"""
+        if getattr(rssItem, "skipRssItem", False):
+            self.modelXbrl.info("info", _("skipping RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
                 modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
-            modelXbrl = None
+            return False
+        self.modelXbrl.info("info", _("RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
+            modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
+        return True
+
+    def validateRssItem(self, rssItem, reloadCache=False):
+        """Loads and validates rssItem, with the RSS item plugin methods, returns errors of the item's model,
+        or None if it was not processed
+        """
+        from arelle.FileSource import openFileSource
+        modelXbrl = None
+        errors = None
+        try:
+            modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager,
+                                       openFileSource(rssItem.zippedUrl, self.modelXbrl.modelManager.cntlr, reloadCache=reloadCache),
+                                       _("validating"), rssItem=rssItem)
+            for pluginXbrlMethod in pluginClassMethods("RssItem.Xbrl.Loaded"):
+                pluginXbrlMethod(modelXbrl, {}, rssItem)
+            if getattr(rssItem, "doNotProcessRSSitem", False) or modelXbrl.modelDocument is None:
+                modelXbrl.close()
+                return None # skip entry based on processing criteria
+            self.instValidator.validate(modelXbrl, self.modelXbrl.modelManager.formulaOptions.typedParameters(self.modelXbrl.prefixedNamespaces))
+            self.instValidator.close()
+            rssItem.setResults(modelXbrl)
+            self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, rssItem.objectId())
+            for pluginXbrlMethod in pluginClassMethods("Validate.RssItem"):
+                pluginXbrlMethod(self, modelXbrl, rssItem)
+            errors = list(modelXbrl.errors)
+            modelXbrl.close()
+        except Exception as err:
+            self.modelXbrl.error("exception:" + type(err).__name__,
+                _("RSS item validation exception: %(error)s, instance: %(instance)s"),
+                modelXbrl=(self.modelXbrl, modelXbrl),
+                instance=rssItem.zippedUrl, error=err,
+                exc_info=True)
+            errors = None
             try:
-                modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager,
-                                           openFileSource(rssItem.zippedUrl, self.modelXbrl.modelManager.cntlr, reloadCache=reloadCache),
-                                           _("validating"), rssItem=rssItem)
-                for pluginXbrlMethod in pluginClassMethods("RssItem.Xbrl.Loaded"):
-                    pluginXbrlMethod(modelXbrl, {}, rssItem)
-                if getattr(rssItem, "doNotProcessRSSitem", False) or modelXbrl.modelDocument is None:
-                    modelXbrl.close()
-                    continue # skip entry based on processing criteria
-                self.instValidator.validate(modelXbrl, self.modelXbrl.modelManager.formulaOptions.typedParameters(self.modelXbrl.prefixedNamespaces))
                 self.instValidator.close()
-                rssItem.setResults(modelXbrl)
-                self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, rssItem.objectId())
-                for pluginXbrlMethod in pluginClassMethods("Validate.RssItem"):
-                    pluginXbrlMethod(self, modelXbrl, rssItem)
-                modelXbrl.close()
+                if modelXbrl is not None:
+                    modelXbrl.close()
             except Exception as err:
-                self.modelXbrl.error("exception:" + type(err).__name__,
-                    _("RSS item validation exception: %(error)s, instance: %(instance)s"),
-                    modelXbrl=(self.modelXbrl, modelXbrl),
-                    instance=rssItem.zippedUrl, error=err,
-                    exc_info=True)
-                try:
-                    self.instValidator.close()
-                    if modelXbrl is not None:
-                        modelXbrl.close()
-                except Exception as err:
-                    pass
-            del modelXbrl  # completely dereference
+                pass
+        del modelXbrl  # completely dereference
+        return errors
+
+    def collectRssItem(self, rssItem, result):
+        """Applies, in feed order, the result of an rssItem validated by a RssFeedPipeline worker"""
+        if not self.logRssItem(rssItem):
+            return
+        result.emitLogRecords(self.modelXbrl)
+        if result.status == RssFeedPipeline.PROCESSED:
+            rssItem.setResults(result)
+            self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, rssItem.objectId())
+        elif result.status == RssFeedPipeline.TIMEOUT:
+            rssItem.status = "timeout"
+            self.modelXbrl.error("arelle:rssItemTimeout",
+                _("RSS item validation exceeded %(timeout)s seconds, instance: %(instance)s"),
+                modelXbrl=self.modelXbrl, timeout=self.modelXbrl.modelManager.rssItemTimeout, instance=rssItem.zippedUrl)
+        elif result.status == RssFeedPipeline.WORKER_FAILED:
+            self.modelXbrl.error("arelle:rssItemWorkerFailed",
+                _("RSS item validation worker ended without a result, instance: %(instance)s"),
+                modelXbrl=self.modelXbrl, instance=rssItem.zippedUrl)
 
     def validateTestcase(self, testcase):
         self.modelXbrl.info("info", "Testcase", modelDocument=testcase)
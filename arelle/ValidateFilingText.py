@@ -990,10 +990,10 @@ def referencedFiles(modelXbrl, localFilesOnly=True):
                     pass  # TODO: Why ignore UnicodeDecodeError?
     # footnote or other elements
     if modelXbrl.modelDocument.type == ModelDocumentTypeINLINEXBRLDOCUMENTSET:
-        xbrlInstRoots = modelXbrl.ixdsHtmlElements
+        for xbrlInstRoot in modelXbrl.ixdsHtmlElements:
+            for elt in xbrlInstRoot.modelDocument.inlineIndex.referencingElts:
+                addReferencedFile(elt, elt)
     else:
-        xbrlInstRoots = [modelXbrl.modelDocument.xmlRootElement]
-    for xbrlInstRoot in xbrlInstRoots:
-        for elt in xbrlInstRoot.iter("{http://www.w3.org/1999/xhtml}a", "{http://www.w3.org/1999/xhtml}img"):
+        for elt in modelXbrl.modelDocument.xmlRootElement.iter("{http://www.w3.org/1999/xhtml}a", "{http://www.w3.org/1999/xhtml}img"):
             addReferencedFile(elt, elt)
     return referencedFiles
@@ -18,6 +18,7 @@ from arelle.ModelObject import (ModelObject)
 from arelle.ModelValue import (qname,QName)
 from arelle.PluginManager import pluginClassMethods
 from arelle.PythonUtil import normalizeSpace
+from arelle.SpanTracer import traceSpan
 from arelle.XmlValidate import validate as xml_validate
 from arelle import (XbrlConst, XmlUtil, ModelXbrl, ModelDocument, XPathParser, XPathContext, FunctionXs, ValidateXbrlDimensions)
 
@@ -283,6 +284,7 @@ def executeCallTest(val, name, callTuple, testTuple) -> None:
 
         val.modelXbrl.modelManager.showStatus(_("ready"), 2000)
 
+@traceSpan("ValidateFormula.validate")
 def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compileOnly=False) -> None:
     for e in ("xbrl.5.1.4.3:cycles", "xbrlgene:violatedCyclesConstraint"):
         if e in val.modelXbrl.errors:
@@ -385,6 +387,9 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
 
     if xpathContext is None:
         xpathContext = XPathContext.create(val.modelXbrl)
+    if formulaOptions.variableSetProfileReport and not parametersOnly:
+        from arelle.FormulaProfiler import FormulaProfiler
+        xpathContext.formulaProfiler = FormulaProfiler()
     xpathContext.parameterQnames = parameterQnames  # needed for formula filters to determine variable dependencies
     for paramQname in orderedParameters:
         modelParameter = val.modelXbrl.qnameParameters[paramQname]
@@ -455,6 +460,8 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
                     _("Standard input instance resource parameter has multiple XBRL instances"),
                     modelObject=modelParameter)
         '''
+    if not parametersOnly: # function calls only depending on parameter values are evaluated once per run
+        xpathContext.memoizeInvariantFunctionCalls(parameterQnames - instanceQnames)
     val.modelXbrl.profileActivity("... parameter checks and select evaluation", minTimeToShow=1.0)
 
     val.modelXbrl.profileStat(_("parametersProcessing"))
@@ -477,8 +484,14 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     if parametersOnly:
         return
 
+    formulaProfiler = xpathContext.formulaProfiler
     for modelVariableSet in val.modelXbrl.modelVariableSets:
-        modelVariableSet.compile()
+        if formulaProfiler is not None:
+            compileStarted = time.time()
+            modelVariableSet.compile()
+            formulaProfiler.variableSetProfile(modelVariableSet).compileTime += time.time() - compileStarted
+        else:
+            modelVariableSet.compile()
     val.modelXbrl.profileStat(_("formulaCompilation"))
 
     produceOutputXbrlInstance = False
@@ -969,6 +982,18 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     if asserTests: # pass assertion results to validation if appropriate
         val.modelXbrl.log(None, "asrtNoLog", None, assertionResults=asserTests);
 
+    if formulaProfiler is not None:
+        try:
+            formulaProfiler.save(formulaOptions.variableSetProfileReport)
+            val.modelXbrl.info("formula:profile",
+                _("Formula variable set profile saved to %(file)s"),
+                modelXbrl=val.modelXbrl, file=formulaOptions.variableSetProfileReport)
+        except OSError as err:
+            val.modelXbrl.error("formula:profileError",
+                _("Formula variable set profile %(file)s could not be saved: %(error)s"),
+                modelXbrl=val.modelXbrl, file=formulaOptions.variableSetProfileReport, error=err)
+        xpathContext.formulaProfiler = None
+
     # display output instance
     if outputXbrlInstance:
         if val.modelXbrl.formulaOutputInstance:
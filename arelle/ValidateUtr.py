@@ -91,9 +91,9 @@ def loadUtr(modelXbrl, statusFilters=None): # Build a dictionary of item types t
                                         modelObject=modelXbrl, id=u.id, unitId=u.unitId, nsUnit=u.nsUnit, status=u.status)
     except (EnvironmentError,
             etree.LxmlError) as err:
-        modelManager.modelXbrl.error("arelleUtrLoader:error",
-                                     "Unit Type Registry Import error: %(error)s",
-                                     modelObject=modelXbrl, error=err)
+        modelXbrl.error("arelleUtrLoader:error",
+                        "Unit Type Registry Import error: %(error)s",
+                        modelObject=modelXbrl, error=err)
         etree.clear_error_log()
     if file:
         file.close()
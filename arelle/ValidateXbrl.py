@@ -14,6 +14,7 @@ from arelle.ModelInstanceObject import ModelContext, ModelDimensionValue, ModelF
 from arelle.ModelValue import qname
 from arelle.ModelXbrl import ModelXbrl
 from arelle.PluginManager import pluginClassMethods
+from arelle.SpanTracer import pluginSpanName
 from arelle.ValidateXbrlCalcs import inferredDecimals
 from arelle.XbrlConst import (ixbrlAll, dtrNoDecimalsItemTypes, dtrPrefixedContentItemTypes, dtrPrefixedContentTypes,
                               dtrSQNameItemTypes, dtrSQNameTypes,  dtrSQNamesItemTypes, dtrSQNamesTypes)
@@ -119,7 +120,8 @@ class ValidateXbrl:
         self.validateEnum = bool(XbrlConst.enums & modelXbrl.namespaceDocs.keys())
 
         for pluginXbrlMethod in pluginClassMethods("Validate.XBRL.Start"):
-            pluginXbrlMethod(self, parameters)
+            with modelXbrl.span(pluginSpanName("Validate.XBRL.Start", pluginXbrlMethod)):
+                pluginXbrlMethod(self, parameters)
 
         # xlink validation
         modelXbrl.profileStat(None)
@@ -205,7 +207,7 @@ class ValidateXbrl:
                                 source=fromConcept.qname, target=toConcept.qname, linkrole=ELR),
                         fromBalance = fromConcept.balance
                         toBalance = toConcept.balance
-                        if fromBalance and toBalance:
+                        if fromBalance and toBalance and weight is not None: # weight is required by the arc schema
                             if (fromBalance == toBalance and weight < 0) or \
                                (fromBalance != toBalance and weight > 0):
                                 modelXbrl.error("xbrl.5.1.1.2:balanceCalcWeightIllegal" +
@@ -292,6 +294,11 @@ class ValidateXbrl:
                 self.checkFactsDimensions(modelXbrl.facts) # check fact dimensions in document order
                 self.checkContextsDimensions(modelXbrl.contexts.values())
                 modelXbrl.profileStat(_("validateDimensions"))
+                cacheHitRate = ValidateXbrlDimensions.factsDimensionalValidityCacheHitRate(self)
+                if cacheHitRate is not None and modelXbrl.modelManager.collectProfileStats:
+                    modelXbrl.info("info:profileStats",
+                        _("Fact dimensional validity cache hits %(hitRate)s percent of lookups"),
+                        modelObject=modelXbrl.modelDocument, hitRate="{:.1f}".format(cacheHitRate))
 
         # dimensional validity
         #concepts checks
@@ -398,7 +405,8 @@ class ValidateXbrl:
         modelXbrl.profileStat(_("validateConcepts"))
 
         for pluginXbrlMethod in pluginClassMethods("Validate.XBRL.Finally"):
-            pluginXbrlMethod(self)
+            with modelXbrl.span(pluginSpanName("Validate.XBRL.Finally", pluginXbrlMethod)):
+                pluginXbrlMethod(self)
 
         modelXbrl.profileStat() # reset after plugins
 
@@ -561,7 +569,8 @@ class ValidateXbrl:
                                      compileOnly=modelXbrl.modelRenderingTables and not modelXbrl.hasFormulae)
 
         for pluginXbrlMethod in pluginClassMethods("Validate.Finally"):
-            pluginXbrlMethod(self)
+            with modelXbrl.span(pluginSpanName("Validate.Finally", pluginXbrlMethod)):
+                pluginXbrlMethod(self)
 
         modelXbrl.modelManager.showStatus(_("ready"), 2000)
 
@@ -55,27 +55,19 @@ class ValidateXbrlCalcs:
 
         # identify equal contexts
         self.modelXbrl.profileActivity()
-        uniqueContextHashes = {}
+        canonicalTable = self.modelXbrl.contextUnitCanonicalTable
+        dimensionAware = self.modelXbrl.hasXDT # as context.isEqualTo
         for context in self.modelXbrl.contexts.values():
-            h = context.contextDimAwareHash
-            if h in uniqueContextHashes:
-                if context.isEqualTo(uniqueContextHashes[h]):
-                    self.mapContext[context] = uniqueContextHashes[h]
-            else:
-                uniqueContextHashes[h] = context
-        del uniqueContextHashes
+            canonicalContext = canonicalTable.canonicalContext(context, dimensionAware)
+            if canonicalContext is not context:
+                self.mapContext[context] = canonicalContext
         self.modelXbrl.profileActivity("... identify equal contexts", minTimeToShow=1.0)
 
         # identify equal units
-        uniqueUnitHashes = {}
         for unit in self.modelXbrl.units.values():
-            h = unit.hash
-            if h in uniqueUnitHashes:
-                if unit.isEqualTo(uniqueUnitHashes[h]):
-                    self.mapUnit[unit] = uniqueUnitHashes[h]
-            else:
-                uniqueUnitHashes[h] = unit
-        del uniqueUnitHashes
+            canonicalUnit = canonicalTable.canonicalUnit(unit)
+            if canonicalUnit is not unit:
+                self.mapUnit[unit] = canonicalUnit
         self.modelXbrl.profileActivity("... identify equal units", minTimeToShow=1.0)
 
         # identify concepts participating in essence-alias relationships
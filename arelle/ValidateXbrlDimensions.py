@@ -1,13 +1,17 @@
 '''
 See COPYRIGHT.md for copyright information.
 '''
+from __future__ import annotations
 import os, sys
 from collections import defaultdict
 from arelle import (UrlUtil, XbrlConst)
 from arelle.ModelObject import ModelObject
 from arelle.ModelDtsObject import ModelConcept
 from arelle.PrototypeInstanceObject import ContextPrototype, DimValuePrototype
-from typing import cast
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from arelle.ValidateXbrl import ValidateXbrl
 
 NONDEFAULT = sys.intern(str("non-default"))
 
@@ -345,6 +349,52 @@ def checkFact(val, f, otherFacts=None) -> None:
             modelObject=f, fact=f.qname, contextID=f.context.id)
 
 def isFactDimensionallyValid(val, f, setPrototypeContextElements=False, otherFacts=None) -> bool:
+    context = f.context
+    if setPrototypeContextElements or isinstance(context, ContextPrototype):
+        # prototype contexts are modified by the validity check, don't cache them
+        return findFactDimensionalValidity(val, f, setPrototypeContextElements, otherFacts)
+    # validity only depends on the primary item and the dimensional contents of the context
+    key = (f.concept, contextDimensionalSignature(val, context))
+    try:
+        factsDimensionalValidity = val.factsDimensionalValidity
+    except AttributeError:
+        factsDimensionalValidity = val.factsDimensionalValidity = {}
+        val.factsDimensionalValidityCacheHits = 0
+    try:
+        isValid = factsDimensionalValidity[key]
+        val.factsDimensionalValidityCacheHits += 1
+        return isValid
+    except KeyError:
+        isValid = factsDimensionalValidity[key] = findFactDimensionalValidity(val, f, False, otherFacts)
+        return isValid
+
+def factsDimensionalValidityCacheHitRate(val: ValidateXbrl) -> float | None:
+    # percent of isFactDimensionallyValid lookups satisfied from the validity cache
+    try:
+        hits = val.factsDimensionalValidityCacheHits
+        lookups = hits + len(val.factsDimensionalValidity)
+    except AttributeError:
+        return None
+    return 100.0 * hits / lookups
+
+def contextDimensionalSignature(val, context):
+    # dimension/member pairs and presence of non-dimensional content per context element,
+    # typed dimension values do not affect validity so only their dimension is represented
+    try:
+        contextDimensionalSignatures = val.contextDimensionalSignatures
+    except AttributeError:
+        contextDimensionalSignatures = val.contextDimensionalSignatures = {}
+    try:
+        return contextDimensionalSignatures[context]
+    except KeyError:
+        signature = contextDimensionalSignatures[context] = tuple(
+            (frozenset((dimConcept, None if dimValue.isTyped else dimValue.member)
+                       for dimConcept, dimValue in context.dimValues(contextElement).items()),
+             len(context.nonDimValues(contextElement)) > 0)
+            for contextElement in ("segment", "scenario"))
+        return signature
+
+def findFactDimensionalValidity(val, f, setPrototypeContextElements=False, otherFacts=None) -> bool:
     hasElrHc = False
     for ELR, hcRels in priItemElrHcRels(val, f.concept).items():
         hasElrHc = True
@@ -406,6 +456,23 @@ def priItemsOfElrHc(val, priItem, hcELR, relELR, priItems=None):
         priItemsOfElrHc(val, toPriItem, hcELR, linkrole, priItems)
     return priItems
 
+def hypercubeDimensions(val, hcConcept, dimELR):
+    # (dimension concept, domain ELR) pairs of a hypercube in its dimension ELR
+    key = (hcConcept, dimELR)
+    try:
+        hypercubesDimensions = val.hypercubesDimensions
+    except AttributeError:
+        hypercubesDimensions = val.hypercubesDimensions = {}
+    try:
+        return hypercubesDimensions[key]
+    except KeyError:
+        dims = hypercubesDimensions[key] = tuple(
+            (hcDimRel.toModelObject, hcDimRel.targetRole or dimELR)
+            for hcDimRel in val.modelXbrl.relationshipSet(
+                                XbrlConst.hypercubeDimension, dimELR).fromModelObject(hcConcept)
+            if isinstance(hcDimRel.toModelObject, ModelConcept))
+        return dims
+
 NOT_FOUND = 0
 MEMBER_USABLE = 1
 MEMBER_NOT_USABLE = 2
@@ -431,30 +498,26 @@ def checkFactElrHcs(val, f, ELR, hcRels, setPrototypeContextElements=False):
             hcValid = False
         else:
             dimELR = (hasHcRel.targetRole or ELR)
-            for hcDimRel in val.modelXbrl.relationshipSet(
-                                XbrlConst.hypercubeDimension, dimELR).fromModelObject(hcConcept):
-                dimConcept = hcDimRel.toModelObject
-                if isinstance(dimConcept, ModelConcept):
-                    domELR = (hcDimRel.targetRole or dimELR)
-                    if dimConcept in modelDimValues:
-                        memModelDimension = modelDimValues[dimConcept]
-                        contextElementDimSet.discard(dimConcept)
-                        memConcept = memModelDimension.member
-                    elif dimConcept in val.modelXbrl.dimensionDefaultConcepts:
-                        memConcept = val.modelXbrl.dimensionDefaultConcepts[dimConcept]
-                        memModelDimension = None
-                    elif setPrototypeContextElements and isinstance(context,ContextPrototype) and dimConcept in oppositeContextDimValues:
-                        memModelDimension = oppositeContextDimValues[dimConcept]
-                        memConcept = memModelDimension.member
-                    else:
+            for dimConcept, domELR in hypercubeDimensions(val, hcConcept, dimELR):
+                if dimConcept in modelDimValues:
+                    memModelDimension = modelDimValues[dimConcept]
+                    contextElementDimSet.discard(dimConcept)
+                    memConcept = memModelDimension.member
+                elif dimConcept in val.modelXbrl.dimensionDefaultConcepts:
+                    memConcept = val.modelXbrl.dimensionDefaultConcepts[dimConcept]
+                    memModelDimension = None
+                elif setPrototypeContextElements and isinstance(context,ContextPrototype) and dimConcept in oppositeContextDimValues:
+                    memModelDimension = oppositeContextDimValues[dimConcept]
+                    memConcept = memModelDimension.member
+                else:
+                    hcValid = False
+                    continue
+                if not dimConcept.isTypedDimension:
+                    # change to cache all member concepts usability per domain: if dimensionMemberState(val, dimConcept, memConcept, domELR) != MEMBER_USABLE:
+                    if not dimensionMemberUsable(val, dimConcept, memConcept, domELR):
                         hcValid = False
-                        continue
-                    if not dimConcept.isTypedDimension:
-                        # change to cache all member concepts usability per domain: if dimensionMemberState(val, dimConcept, memConcept, domELR) != MEMBER_USABLE:
-                        if not dimensionMemberUsable(val, dimConcept, memConcept, domELR):
-                            hcValid = False
-                    if hcValid and setPrototypeContextElements and isinstance(memModelDimension,DimValuePrototype) and not hcNegating:
-                        memModelDimension.contextElement = hcContextElement
+                if hcValid and setPrototypeContextElements and isinstance(memModelDimension,DimValuePrototype) and not hcNegating:
+                    memModelDimension.contextElement = hcContextElement
         if hcIsClosed:
             if len(contextElementDimSet) > 0:
                 hcValid = False # has extra stuff in the context element
@@ -599,9 +662,7 @@ def checkPriItemDimValueElrHcs(val, priItemConcept, matchDim, matchMem, srcCntxE
             cntxElt = hasHcRel.contextElement
 
             dimELR = (hasHcRel.targetRole or hasHcRel.linkrole)
-            for hcDimRel in val.modelXbrl.relationshipSet(
-                                XbrlConst.hypercubeDimension, dimELR).fromModelObject(hcConcept):
-                dimConcept = hcDimRel.toModelObject
+            for dimConcept, domELR in hypercubeDimensions(val, hcConcept, dimELR):
                 if dimConcept != matchDim:
                     continue
                 if matchMem is None and not openOnly:
@@ -610,7 +671,6 @@ def checkPriItemDimValueElrHcs(val, priItemConcept, matchDim, matchMem, srcCntxE
                     else:
                         hcCntxElt = cntxElt
                         continue
-                domELR = (hcDimRel.targetRole or dimELR)
                 state = dimensionMemberState(val, dimConcept, matchMem, domELR)
                 if state == MEMBER_USABLE and not openOnly:
                     if cntxElt == srcCntxEltName:
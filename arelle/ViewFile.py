@@ -1,7 +1,7 @@
 '''
 See COPYRIGHT.md for copyright information.
 '''
-import csv, io, json, sys
+import csv, io, json, os, sys, weakref
 import regex as re
 from lxml import etree
 from decimal import Decimal
@@ -21,6 +21,14 @@ JSON  = 5
 TYPENAMES = ["NOOUT", "CSV", "XLSX", "HTML", "XML", "JSON"] # null means no output
 nonNameCharPattern =  re.compile(r"[^\w\-\.:]")
 
+def removeIncompleteOutput(fh, outfile):
+    # streamed output of a view which was not closed, such as when the view raised an exception
+    fh.close()
+    try:
+        os.remove(outfile)
+    except OSError:
+        pass
+
 class View:
     # note that cssExtras override any css entries provided by this module if they have the same name
     def __init__(self, modelXbrl, outfile, rootElementName, lang=None, style="table", cssExtras=""):
@@ -58,6 +66,9 @@ class View:
         else:
             self.type = CSV
         self.outfile = outfile
+        # rows of table style views are streamed to the output as they are added, rendering
+        # style views build their own element tree for output at close
+        self.streaming = style != "rendering" and self.type in (HTML, XML, JSON)
         if style == "rendering": # for rendering, preserve root element name
             self.rootElementName = rootElementName
         else: # root element is formed from words in title or description
@@ -159,6 +170,63 @@ class View:
             self.entries = []
             self.entryLevels = [self.entries]
             self.jsonObject = {self.rootElementName: self.entries}
+        if self.streaming:
+            self.openStream()
+
+    def openStream(self):
+        # streamed output: document start is written now, completed rows by addRow and document end by close
+        from arelle import XmlUtil
+        self.streamFinalizer = None
+        try:
+            if isinstance(self.outfile, FileNamedStringIO):
+                self.fh = self.outfile
+            else:
+                self.fh = open(self.outfile, "w", encoding="utf-8")
+                self.streamFinalizer = weakref.finalize(self, removeIncompleteOutput, self.fh, self.outfile)
+        except (IOError, EnvironmentError) as err:
+            self.modelXbrl.exception("arelle:htmlIOError", _("Failed to save output %(type)s to %(file)s: %(error)s"),
+                                     file=self.outfile, type=TYPENAMES[self.type], error=err)
+            self.type = NOOUT
+            self.streaming = False
+            return
+        self.hasStreamedRows = False
+        if self.type == HTML:
+            # serialize html template around a placeholder row to obtain document start and end
+            placeholderElt = etree.SubElement(self.tblElt, "{http://www.w3.org/1999/xhtml}tr", attrib={"id": "streamedRows"})
+            html = io.StringIO()
+            XmlUtil.writexml(html, self.xmlDoc, encoding="utf-8", xmlcharrefreplace=True)
+            self.streamStart, sep, self.streamEnd = html.getvalue().partition('<tr id="streamedRows"/>')
+            html.close()
+            self.tblElt.remove(placeholderElt)
+            self.fh.write(self.streamStart)
+        elif self.type == XML:
+            self.fh.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        elif self.type == JSON:
+            self.fh.write('{' + json.dumps(self.rootElementName, ensure_ascii=False) + ': [')
+
+    def writeStreamedRows(self):
+        # write completed top level rows (with any nested rows) and release them
+        from arelle import XmlUtil
+        if self.type == HTML:
+            for rowElt in list(self.tblElt):
+                XmlUtil.writexml(self.fh, rowElt, xmlcharrefreplace=True, parentNsmap=self.tblElt.nsmap)
+                self.tblElt.remove(rowElt)
+        elif self.type == XML:
+            for rowElt in list(self.tblElt):
+                if not self.hasStreamedRows:
+                    self.fh.write("<{0}>\n".format(self.rootElementName))
+                    self.hasStreamedRows = True
+                XmlUtil.writexml(self.fh, rowElt, indent="    ", parentNsmap=self.tblElt.nsmap)
+                self.tblElt.remove(rowElt)
+            del self.docEltLevels[1:]
+        elif self.type == JSON:
+            for entry in self.entries:
+                if self.hasStreamedRows:
+                    self.fh.write(", ")
+                self.fh.write(json.dumps(entry, ensure_ascii=False))
+                self.hasStreamedRows = True
+            del self.entries[:]
+            del self.entryLevels[1:]
 
     def setColWidths(self, colWidths):
         # widths in monospace character counts (as with xlsx files)
@@ -228,6 +296,8 @@ class View:
                 td.text = str(col) if col else '\u00A0'  # produces &nbsp;
             if lastColSpan and td is not None:
                 td.set("colspan", str(lastColSpan))
+            if self.streaming:
+                self.writeStreamedRows()
         elif self.type == XML:
             if asHeader:
                 # save column element names
@@ -240,6 +310,8 @@ class View:
                 else:
                     # problem, error message? unexpected indent
                     parentElt = self.docEltLevels[0]
+                if self.streaming and parentElt is self.tblElt: # prior top level row is complete
+                    self.writeStreamedRows()
                 # escape attributes content
                 escapedRowEltAttr = dict(((k, v.replace("&","&amp;").replace("<","&lt;"))
                                           for k,v in xmlRowEltAttr.items())
@@ -285,6 +357,8 @@ class View:
                 else:
                     # problem, error message? unexpected indent
                     entries = self.entryLevels[0]
+                if self.streaming and entries is self.entries: # prior top level entry is complete
+                    self.writeStreamedRows()
                 entry = []
                 if xmlRowElementName:
                     entry.append(xmlRowElementName)
@@ -324,6 +398,30 @@ class View:
             # add filtering
             self.xlsxWs.auto_filter.ref = 'A1:{}{}'.format(utils.get_column_letter(self.xlsxWs.max_column), len(self.xlsxWs['A']))
             self.xlsxWb.save(self.outfile)
+        elif self.streaming and noWrite:
+            if self.streamFinalizer is not None: # the partly written output is removed
+                self.streamFinalizer()
+        elif self.streaming:
+            fileType = TYPENAMES[self.type]
+            try:
+                self.writeStreamedRows()
+                if self.type == HTML:
+                    self.fh.write(self.streamEnd)
+                elif self.type == XML:
+                    if self.hasStreamedRows:
+                        self.fh.write("</{0}>\n".format(self.rootElementName))
+                    else:
+                        self.fh.write("<{0}/>\n".format(self.rootElementName))
+                elif self.type == JSON:
+                    self.fh.write(']}')
+                if self.streamFinalizer is not None:
+                    self.streamFinalizer.detach()
+                    self.fh.close()
+                self.modelXbrl.info("info", _("Saved output %(type)s to %(file)s"), file=self.outfile, type=fileType)
+            except (IOError, EnvironmentError) as err:
+                if self.streamFinalizer is not None:
+                    self.streamFinalizer()
+                self.modelXbrl.exception("arelle:htmlIOError", _("Failed to save output %(type)s to %(file)s: %(error)s"), file=self.outfile, type=fileType, error=err)
         elif self.type != NOOUT and not noWrite:
             fileType = TYPENAMES[self.type]
             try:
@@ -10,12 +10,11 @@ from arelle.ModelObject import ModelObject
 from arelle.ModelFormulaObject import Aspect, aspectModels, aspectRuleAspects, aspectModelAspect, aspectStr
 from arelle.FormulaEvaluator import aspectMatches
 from arelle.FunctionXs import xsString
-from arelle.ModelInstanceObject import ModelDimensionValue
 from arelle.ModelValue import QName
-from arelle.ModelXbrl import DEFAULT
 from arelle.ModelRenderingObject import (ModelClosedDefinitionNode, ModelEuAxisCoord, ModelFilterDefinitionNode,
                                          OPEN_ASPECT_ENTRY_SURROGATE)
 from arelle.PrototypeInstanceObject import FactPrototype
+from arelle.TableFactIndex import TableFactIndex
 # change tableModel for namespace needed for consistency suite
 '''
 from arelle.XbrlConst import (tableModelMMDD as tableModelNamespace,
@@ -30,7 +29,8 @@ emptyList = []
 
 def viewRenderedGrid(modelXbrl, outfile, lang=None, viewTblELR=None, sourceView=None, diffToFile=False, cssExtras=""):
     modelXbrl.modelManager.showStatus(_("saving rendering"))
-    view = ViewRenderedGrid(modelXbrl, outfile, lang, cssExtras)
+    # the rendering compared to outfile is not streamed, which would overwrite outfile and release its rows
+    view = ViewRenderedGrid(modelXbrl, outfile, lang, cssExtras, streaming=not diffToFile)
 
     if sourceView is not None:
         viewTblELR = sourceView.tblELR
@@ -47,7 +47,7 @@ def viewRenderedGrid(modelXbrl, outfile, lang=None, viewTblELR=None, sourceView=
     modelXbrl.modelManager.showStatus(_("rendering saved to {0}").format(outfile), clearAfter=5000)
 
 class ViewRenderedGrid(ViewFile.View):
-    def __init__(self, modelXbrl, outfile, lang, cssExtras):
+    def __init__(self, modelXbrl, outfile, lang, cssExtras, streaming=True):
         # find table model namespace based on table namespace
         self.tableModelNamespace = XbrlConst.tableModel
         for xsdNs in modelXbrl.namespaceDocs.keys():
@@ -70,6 +70,10 @@ class ViewRenderedGrid(ViewFile.View):
         self.ignoreDimValidity = nonTkBooleanVar(value=True)
         self.xAxisChildrenFirst = nonTkBooleanVar(value=True)
         self.yAxisChildrenFirst = nonTkBooleanVar(value=False)
+        self.tableFactIndexes = {} # by table ELR, for coverage of facts by table cells
+        if streaming and self.type == HTML: # each z table is written when completed, instead of holding all tables' rows
+            self.streaming = True
+            self.openStream()
 
 
     def tableModelQName(self, localName):
@@ -95,6 +99,12 @@ class ViewRenderedGrid(ViewFile.View):
                 # each table z production
                 tblAxisRelSet, xTopStructuralNode, yTopStructuralNode, zTopStructuralNode = resolveAxesStructure(self, tblELR)
                 self.hasTableFilters = bool(self.modelTable.filterRelationships)
+                if discriminator == 1: # table filtered facts index serves each z production
+                    if self.hasTableFilters:
+                        tableFacts = self.modelTable.filteredFacts(self.rendrCntx, self.modelXbrl.factsInInstance)
+                    else:
+                        tableFacts = self.modelXbrl.factsInInstance
+                    self.tableFactIndex = self.tableFactIndexes[tblELR] = TableFactIndex(self.rendrCntx, tableFacts)
 
                 self.zStrNodesWithChoices = []
                 if tblAxisRelSet and self.tblElt is not None:
@@ -194,6 +204,8 @@ class ViewRenderedGrid(ViewFile.View):
                                 if headerElt.getparent() is not None:
                                     headerElt.getparent().remove(headerElt)
                     self.bodyCells(self.dataFirstRow, yTopStructuralNode, xStructuralNodes, zAspectStructuralNodes, self.yAxisChildrenFirst.get())
+                    if self.streaming: # release rows of this z table
+                        self.writeStreamedRows()
                 # find next choice structural node
                 moreDiscriminators = False
                 for zStrNodeWithChoices in self.zStrNodesWithChoices:
@@ -701,26 +713,8 @@ class ViewRenderedGrid(ViewFile.View):
                         justify = None
                         fp = FactPrototype(self, cellAspectValues)
                         if conceptNotAbstract:
-                            # reduce set of matchable facts to those with pri item qname and have dimension aspects
-                            facts = self.modelXbrl.factsByQname[priItemQname] if priItemQname else self.modelXbrl.factsInInstance
-                            if self.hasTableFilters:
-                                facts = self.modelTable.filterFacts(self.rendrCntx, facts)
-                            for aspect in matchableAspects:  # trim down facts with explicit dimensions match or just present
-                                if isinstance(aspect, QName):
-                                    aspectValue = cellAspectValues.get(aspect, None)
-                                    if isinstance(aspectValue, ModelDimensionValue):
-                                        if aspectValue.isExplicit:
-                                            dimMemQname = aspectValue.memberQname # match facts with this explicit value
-                                        else:
-                                            dimMemQname = None  # match facts that report this dimension
-                                    elif isinstance(aspectValue, QName):
-                                        dimMemQname = aspectValue  # match facts that have this explicit value
-                                    elif aspectValue is None: # match typed dims that don't report this value
-                                        dimMemQname = DEFAULT
-                                    else:
-                                        dimMemQname = None # match facts that report this dimension
-                                    facts = facts & self.modelXbrl.factsByDimMemQname(aspect, dimMemQname)
-                            for fact in facts:
+                            # reduce set of matchable facts to those with the cell's aspects values keys
+                            for fact in self.tableFactIndex.cellFacts(fp, matchableAspects):
                                 if (all(aspectMatches(self.rendrCntx, fact, fp, aspect)
                                         for aspect in matchableAspects) and
                                     all(fact.context.dimMemberQname(dim,includeDefaults=True) in (dimDefaults[dim], None)
@@ -730,6 +724,7 @@ class ViewRenderedGrid(ViewFile.View):
                                         value = yStructuralNode.evalValueExpression(fact, xStructuralNode)
                                     else:
                                         value = fact.effectiveValue
+                                    self.tableFactIndex.factMatched(fact)
                                     justify = "right" if fact.isNumeric else "left"
                                     break
                         if justify is None:
@@ -9,13 +9,13 @@ from arelle import (ViewWinTkTable, ModelDocument, ModelDtsObject, ModelInstance
 from arelle.ModelValue import qname, QName
 from arelle.RenderingResolver import resolveAxesStructure, RENDER_UNITS_PER_CHAR
 from arelle.ModelFormulaObject import Aspect, aspectModels, aspectModelAspect
-from arelle.ModelInstanceObject import ModelDimensionValue
 from arelle.ModelRenderingObject import (ModelClosedDefinitionNode, ModelEuAxisCoord,
                                          ModelFilterDefinitionNode,
                                          OPEN_ASPECT_ENTRY_SURROGATE)
 from arelle.FormulaEvaluator import init as formulaEvaluatorInit, aspectMatches
 
 from arelle.PrototypeInstanceObject import FactPrototype
+from arelle.TableFactIndex import TableFactIndex
 from arelle.UITkTable import XbrlTable
 from arelle.DialogNewFactItem import getNewFactItemOptions
 from collections import defaultdict
@@ -213,6 +213,11 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
         colAdjustment = 1 if zTopStructuralNode is not None else 0
         self.table.resizeTable(self.dataFirstRow+self.dataRows-1, self.dataFirstCol+self.dataCols+colAdjustment-1, titleRows=self.dataFirstRow-1, titleColumns=self.dataFirstCol-1)
         self.hasTableFilters = bool(self.modelTable.filterRelationships)
+        if self.hasTableFilters:
+            tableFacts = self.modelTable.filteredFacts(self.rendrCntx, self.modelXbrl.factsInInstance)
+        else:
+            tableFacts = self.modelXbrl.factsInInstance
+        self.tableFactIndex = TableFactIndex(self.rendrCntx, tableFacts)
 
         if tblAxisRelSet:
             # review row header wrap widths and limit to 2/3 of the frame width (all are screen units)
@@ -642,28 +647,8 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                         justify = None
                         fp = FactPrototype(self, cellAspectValues)
                         if conceptNotAbstract:
-                            # reduce set of matchable facts to those with pri item qname and have dimension aspects
-                            facts = self.modelXbrl.factsByQname[priItemQname] if priItemQname else self.modelXbrl.factsInInstance
-                            if self.hasTableFilters:
-                                facts = self.modelTable.filterFacts(self.rendrCntx, facts)
-                            for aspect in matchableAspects:  # trim down facts with explicit dimensions match or just present
-                                if isinstance(aspect, QName):
-                                    aspectValue = cellAspectValues.get(aspect, None)
-                                    if isinstance(aspectValue, ModelDimensionValue):
-                                        if aspectValue.isExplicit:
-                                            dimMemQname = aspectValue.memberQname # match facts with this explicit value
-                                        else:
-                                            dimMemQname = None  # match facts that report this dimension
-                                    elif isinstance(aspectValue, QName):
-                                        dimMemQname = aspectValue  # match facts that have this explicit value
-                                    elif aspectValue is None: # match typed dims that don't report this value
-                                        dimMemQname = ModelXbrl.DEFAULT
-                                    else:
-                                        dimMemQname = None # match facts that report this dimension
-                                    facts = facts & self.modelXbrl.factsByDimMemQname(aspect, dimMemQname)
-                                    if len(facts)==0:
-                                        break;
-                            for fact in facts:
+                            # reduce set of matchable facts to those with the cell's aspects values keys
+                            for fact in self.tableFactIndex.cellFacts(fp, matchableAspects):
                                 if (all(aspectMatches(self.rendrCntx, fact, fp, aspect)
                                         for aspect in matchableAspects) and
                                     all(fact.context.dimMemberQname(dim,includeDefaults=True) in (dimDefaults[dim], None)
@@ -674,6 +659,7 @@ class ViewRenderedGrid(ViewWinTkTable.ViewTkTable):
                                     else:
                                         value = fact.effectiveValue
                                     objectId = fact.objectId()
+                                    self.tableFactIndex.factMatched(fact)
                                     # we can now remove that fact if we picked up from the computed partition entry
                                     if factsPartition is not None:
                                         factsPartition.remove(fact)
@@ -1,7 +1,7 @@
 '''
 See COPYRIGHT.md for copyright information.
 '''
-from arelle.XPathParser import (VariableRef, QNameDef, OperationDef, RangeDecl, Expr, ProgHeader,
+from arelle.XPathParser import (VariableRef, QNameDef, OperationDef, RangeDecl, Expr, ProgHeader, invariantFunctionCalls,
                           exceptionErrorIndication)
 from arelle import (ModelXbrl, XbrlConst, XmlUtil)
 from arelle.ModelObject import ModelObject, ModelAttribute
@@ -100,6 +100,9 @@ UNARY_OPS = {'u+', 'u-'}
 FORSOMEEVERY_OPS = {'for','some','every'}
 PATH_OPS = {'/', '//', 'rootChild', 'rootDescendant'}
 SEQUENCE_TYPES = (tuple,list,set)
+CONTEXT_DEPENDENT_FN_FUNCTIONS = {'id', 'idref', 'lang', 'last', 'position', 'trace', 'attribute', 'comment', 'document-node',
+                                  'element', 'item', 'node', 'processing-instruction', 'schema-attribute', 'schema-element', 'text'}
+CONSTANT_FN_FUNCTIONS = {'true', 'false', 'current-date', 'current-dateTime', 'current-time', 'implicit-timezone'}
 GREGORIAN_TYPES = (gYearMonth, gYear, gMonthDay, gDay, gMonth)
 
 class XPathContext:
@@ -118,6 +121,11 @@ class XPathContext:
         self.variableSet = None
         self.inScopeVars = {} if inScopeVars is None else inScopeVars
         self.cachedFilterResults = {}
+        self.formulaProfiler = None # FormulaProfiler when profiling formula variable sets
+        self.invariantVarValues = None # variable values, as bound when memoizing invariant function calls
+        self.invariantFunctionCalls = {} # function call OperationDef: ((varQname, value), ...) of its arguments
+        self.invariantResults = {} # memoized function call OperationDef results
+        self.invariantProgHeaders = set() # programs analyzed for invariant function calls
         if inputXbrlInstance:
             self.inScopeVars[XbrlConst.qnStandardInputInstance] = inputXbrlInstance.modelXbrl
         self.customFunctions = {}
@@ -137,6 +145,9 @@ class XPathContext:
         self.outputFirstFact.clear()
         self.inScopeVars.clear()
         self.cachedFilterResults.clear()
+        self.invariantFunctionCalls.clear()
+        self.invariantResults.clear()
+        self.invariantProgHeaders.clear()
         self.__dict__.clear() # dereference everything
 
     def runTimeExceededCallback(self):
@@ -169,7 +180,9 @@ class XPathContext:
                         result = []  # subsequent processing discards None results
             elif isinstance(p,OperationDef):
                 op = p.name
-                if isinstance(op, QNameDef): # function call
+                if isinstance(op, QNameDef) and p in self.invariantResults and self.invariantVarsBound(p):
+                    result = self.invariantResults[p] # memoized invariant function call
+                elif isinstance(op, QNameDef): # function call
                     args = self.evaluate(p.args, contextItem=contextItem)
                     ns = op.namespaceURI; localname = op.localName
                     try:
@@ -206,6 +219,8 @@ class XPathContext:
                                              .format(err.argNum, err.expectedType, op, err.foundObject))
                     except FunctionNotAvailable:
                         raise XPathException(p, 'err:XPST0017', _('Function named {0} does not have a custom or built-in implementation.').format(op))
+                    if p in self.invariantFunctionCalls and self.invariantVarsBound(p):
+                        self.invariantResults[p] = result
                 elif op in VALUE_OPS:
                     # binary arithmetic operations and value comparisons
                     s1 = self.atomize( p, resultStack.pop() ) if len(resultStack) > 0 else []
@@ -428,6 +443,8 @@ class XPathContext:
                         navSequence += self.evaluate(p.args, contextItem=innerFocusNode, parentOp=op)
                     result = self.documentOrderedNodes(self.flattenSequence(navSequence))
             elif isinstance(p,ProgHeader):
+                if self.invariantVarValues is not None and p not in self.invariantProgHeaders:
+                    self.analyzeInvariantFunctionCalls(p, exprStack)
                 self.progHeader = p
                 if p.traceType not in (Trace.MESSAGE, Trace.CUSTOM_FUNCTION):
                     self.traceType = p.traceType
@@ -438,6 +455,43 @@ class XPathContext:
             self.progHeader = None
         return resultStack
 
+    def memoizeInvariantFunctionCalls(self, varQnames):
+        """Memoizes results of function calls whose arguments only depend on literals and variables of varQnames
+        (such as formula parameters), for as long as these variables remain bound to their current values."""
+        self.invariantVarValues = dict((varQname, self.inScopeVars[varQname])
+                                       for varQname in varQnames
+                                       if varQname in self.inScopeVars)
+
+    def analyzeInvariantFunctionCalls(self, progHeader, exprStack):
+        invariantCalls = {}
+        invariantFunctionCalls(exprStack, self.invariantVarValues, self.isInvariantFunction, invariantCalls)
+        for opDef, varQnames in invariantCalls.items():
+            self.invariantFunctionCalls[opDef] = tuple((varQname, self.invariantVarValues[varQname])
+                                                       for varQname in varQnames)
+        self.invariantProgHeaders.add(progHeader)
+
+    def isInvariantFunction(self, op, hasArgs):
+        # result depends only on arguments (not on context item, focus, variable set evaluation or side effects)
+        from arelle import FunctionIxt
+        if op in self.modelXbrl.modelCustomFunctionSignatures:
+            return True # custom function implementations only reference their inputs
+        if op in self.customFunctions: # plug in methods may depend on evaluation state
+            return False
+        ns = op.namespaceURI
+        if op.unprefixed or ns == XbrlConst.fn:
+            if hasArgs:
+                return op.localName not in CONTEXT_DEPENDENT_FN_FUNCTIONS
+            return op.localName in CONSTANT_FN_FUNCTIONS
+        return (ns == XbrlConst.xfi or ns == XbrlConst.xsd or
+                ns in FunctionIxt.ixtNamespaceFunctions or op in self.modelXbrl.modelManager.customTransforms)
+
+    def invariantVarsBound(self, opDef):
+        inScopeVars = self.inScopeVars
+        for varQname, value in self.invariantFunctionCalls[opDef]:
+            if inScopeVars.get(varQname) is not value:
+                return False
+        return True
+
     def evaluateBooleanValue(self, exprStack, contextItem=None):
         if len(exprStack) > 0 and isinstance(exprStack[0], ProgHeader):
             progHeader = exprStack[0]
@@ -828,6 +828,59 @@ def variableReferences(exprStack, varRefSet, element, rangeVars=None):
         if localRangeVar in rangeVars:
             rangeVars.remove(localRangeVar)
 
+CONTEXT_DEPENDENT_OPS = {'.', '..', '/', '//', 'rootChild', 'rootDescendant', 'predicate', 'for', 'some', 'every'}
+
+def invariantFunctionCalls(exprStack, invariantVars, isInvariantFunction, invariantCalls):
+    '''Dependency analysis of invariant sub-expressions: returns the set of invariantVars referenced by exprStack
+    if its result only depends on them and literals (no path step, context item, range variable or other variable),
+    otherwise None.  Function calls with invariant arguments, for which isInvariantFunction(qname, hasArgs) is true,
+    are added to invariantCalls with the set of invariantVars their arguments reference.
+    '''
+    varRefs = set()
+    isInvariant = True
+    for p in exprStack:
+        if isinstance(p, (ProgHeader, OpDef, str, Number)):
+            pass
+        elif isinstance(p, QNameDef): # path step or type name
+            isInvariant = False
+        elif isinstance(p,VariableRef):
+            if p.name in invariantVars:
+                varRefs.add(p.name)
+            else:
+                isInvariant = False
+        elif isinstance(p,OperationDef):
+            argVarRefs = invariantFunctionCalls(p.args, invariantVars, isInvariantFunction, invariantCalls)
+            op = p.name
+            if isinstance(op, QNameDef): # function call
+                if argVarRefs is not None and isInvariantFunction(op, len(p.args) > 0):
+                    invariantCalls[p] = argVarRefs
+                else:
+                    isInvariant = False
+            elif op in CONTEXT_DEPENDENT_OPS:
+                isInvariant = False
+            if argVarRefs is None:
+                isInvariant = False
+            elif isInvariant:
+                varRefs |= argVarRefs
+        elif isinstance(p,Expr):
+            exprVarRefs = invariantFunctionCalls(p.expr, invariantVars, isInvariantFunction, invariantCalls)
+            if exprVarRefs is None:
+                isInvariant = False
+            elif isInvariant:
+                varRefs |= exprVarRefs
+        elif isinstance(p,RangeDecl):
+            invariantFunctionCalls(p.bindingSeq, invariantVars, isInvariantFunction, invariantCalls)
+            isInvariant = False
+        elif hasattr(p, '__iter__'):
+            seqVarRefs = invariantFunctionCalls(p, invariantVars, isInvariantFunction, invariantCalls)
+            if seqVarRefs is None:
+                isInvariant = False
+            elif isInvariant:
+                varRefs |= seqVarRefs
+        else:
+            isInvariant = False
+    return varRefs if isInvariant else None
+
 def prefixDeclarations(exprStack, xmlnsDict, element):
     from arelle.ModelValue import qname
     for p in exprStack:
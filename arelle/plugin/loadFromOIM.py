@@ -659,20 +659,16 @@ def checkForDuplicates(modelXbrl, allowedDups, footnoteIDs):
                 factForConceptContextUnitHash[f.conceptContextUnitHash].append(f)
         aspectEqualFacts = defaultdict(dict) # dict [(qname,lang)] of dict(cntx,unit) of [fact, fact]
         decVals = {}
+        canonicalTable = modelXbrl.contextUnitCanonicalTable
+        dimensionAware = modelXbrl.hasXDT # as context.isEqualTo
         for hashEquivalentFacts in factForConceptContextUnitHash.values():
             if len(hashEquivalentFacts) > 1:
-                for f in hashEquivalentFacts: # check for hash collision by value checks on context and unit
+                for f in hashEquivalentFacts: # check for hash collision by canonical context and unit
                     cuDict = aspectEqualFacts[(f.qname,
                                                (f.xmlLang or "").lower() if f.concept.type.isWgnStringFactType else None)]
-                    _matched = False
-                    for (_cntx,_unit),fList in cuDict.items():
-                        if (((_cntx is None and f.context is None) or (f.context is not None and f.context.isEqualTo(_cntx))) and
-                            ((_unit is None and f.unit is None) or (f.unit is not None and f.unit.isEqualTo(_unit)))):
-                            _matched = True
-                            fList.append(f)
-                            break
-                    if not _matched:
-                        cuDict[(f.context,f.unit)] = [f]
+                    _cuKey = (canonicalTable.contextId(f.context, dimensionAware) if f.context is not None else None,
+                              canonicalTable.unitId(f.unit) if f.unit is not None else None)
+                    cuDict.setdefault(_cuKey, []).append(f)
                 for cuDict in aspectEqualFacts.values(): # dups by qname, lang
                     for fList in cuDict.values():  # dups by equal-context equal-unit
                         if len(fList) > 1:
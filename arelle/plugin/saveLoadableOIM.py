@@ -29,13 +29,13 @@ from decimal import Decimal
 from math import isinf, isnan
 from collections import defaultdict, OrderedDict
 from arelle import ModelDocument, XbrlConst
+from arelle.ColumnarFactStore import NO_ROW
 from arelle.ModelInstanceObject import ModelFact
 from arelle.ModelValue import (qname, QName, DateTime, YearMonthDuration, tzinfoStr,
                                dayTimeDuration, DayTimeDuration, yearMonthDayTimeDuration, Time,
                                gYearMonth, gMonthDay, gYear, gMonth, gDay, IsoDuration)
 from arelle.ModelRelationshipSet import ModelRelationshipSet
 from arelle.UrlUtil import relativeUri
-from arelle.ValidateXbrlCalcs import inferredDecimals
 from arelle.Version import authorLabel, copyrightLabel
 from arelle.XmlUtil import dateunionValue, elementIndex, xmlstring
 from collections import defaultdict
@@ -284,6 +284,10 @@ def saveLoadableOIM(modelXbrl, oimFile, outputZip=None,
 
         return footnotes
 
+    factStore = modelXbrl.factStore
+    contextAspects = {} # aspects of each context id of factStore, computed once per context
+    unitAspects = {}
+
     def factAspects(fact):
         oimFact = OrderedDict()
         aspects = OrderedDict()
@@ -295,59 +299,64 @@ def saveLoadableOIM(modelXbrl, oimFile, outputZip=None,
         if concept is not None:
             if concept.type.isOimTextFactType and fact.xmlLang:
                 aspects[str(qnOimLangAspect)] = fact.xmlLang
-        if fact.isItem:
-            if fact.isNil:
+        row = factStore.factRows.get(fact) # None if not an item
+        if row is not None:
+            if factStore.isNil[row]:
                 _value = None
             else:
-                _inferredDecimals = inferredDecimals(fact)
+                _inferredDecimals = factStore.decimals[row]
+                if not isinf(_inferredDecimals) and not isnan(_inferredDecimals):
+                    _inferredDecimals = int(_inferredDecimals)
                 _value = oimValue(fact.xValue, _inferredDecimals)
             oimFact["value"] = _value
-            if fact.concept is not None and fact.concept.isNumeric:
-                _numValue = fact.xValue
-                if isinstance(_numValue, Decimal) and not isinf(_numValue) and not isnan(_numValue):
-                    if _numValue == _numValue.to_integral():
-                        _numValue = int(_numValue)
-                    else:
-                        _numValue = float(_numValue)
-                if not fact.isNil:
+            if concept is not None and concept.isNumeric:
+                if not factStore.isNil[row]:
                     if not isinf(_inferredDecimals): # accuracy omitted if infinite
                         oimFact["decimals"] = _inferredDecimals
         oimFact["dimensions"] = aspects
-        cntx = fact.context
-        if cntx is not None:
-            if cntx.entityIdentifierElement is not None and cntx.entityIdentifier != ENTITY_NA_QNAME:
-                aspects[str(qnOimEntityAspect)] = oimValue(qname(*cntx.entityIdentifier))
-            if cntx.period is not None and not cntx.isForeverPeriod:
-                aspects.update(oimPeriodValue(cntx))
-            for _qn, dim in sorted(cntx.qnameDims.items(), key=lambda item: item[0]):
-                if dim.isExplicit:
-                    dimVal = oimValue(dim.memberQname)
-                else: # typed
-                    if dim.typedMember.get("{http://www.w3.org/2001/XMLSchema-instance}nil") in ("true", "1"):
-                        dimVal = None
-                    else:
-                        dimVal = dim.typedMember.stringValue
-                aspects[str(dim.dimensionQname)] = dimVal
-        unit = fact.unit
-        if unit is not None:
-            _mMul, _mDiv = unit.measures
-            _sMul = '*'.join(oimValue(m) for m in sorted(_mMul, key=lambda m: oimValue(m)))
-            if _mDiv:
-                _sDiv = '*'.join(oimValue(m) for m in sorted(_mDiv, key=lambda m: oimValue(m)))
-                if len(_mDiv) > 1:
-                    if len(_mMul) > 1:
-                        _sUnit = "({})/({})".format(_sMul,_sDiv)
+        contextId = factStore.contextIds[row] if row is not None else NO_ROW
+        if contextId not in contextAspects:
+            contextAspects[contextId] = cntxAspects = OrderedDict()
+            if contextId != NO_ROW:
+                cntx = factStore.contexts[contextId]
+                if cntx.entityIdentifierElement is not None and cntx.entityIdentifier != ENTITY_NA_QNAME:
+                    cntxAspects[str(qnOimEntityAspect)] = oimValue(qname(*cntx.entityIdentifier))
+                if cntx.period is not None and not cntx.isForeverPeriod:
+                    cntxAspects.update(oimPeriodValue(cntx))
+                for _qn, dim in sorted(cntx.qnameDims.items(), key=lambda item: item[0]):
+                    if dim.isExplicit:
+                        dimVal = oimValue(dim.memberQname)
+                    else: # typed
+                        if dim.typedMember.get("{http://www.w3.org/2001/XMLSchema-instance}nil") in ("true", "1"):
+                            dimVal = None
+                        else:
+                            dimVal = dim.typedMember.stringValue
+                    cntxAspects[str(dim.dimensionQname)] = dimVal
+        aspects.update(contextAspects[contextId])
+        unitId = factStore.unitIds[row] if row is not None else NO_ROW
+        if unitId not in unitAspects:
+            unitAspects[unitId] = None
+            if unitId != NO_ROW:
+                _mMul, _mDiv = factStore.units[unitId].measures
+                _sMul = '*'.join(oimValue(m) for m in sorted(_mMul, key=lambda m: oimValue(m)))
+                if _mDiv:
+                    _sDiv = '*'.join(oimValue(m) for m in sorted(_mDiv, key=lambda m: oimValue(m)))
+                    if len(_mDiv) > 1:
+                        if len(_mMul) > 1:
+                            _sUnit = "({})/({})".format(_sMul,_sDiv)
+                        else:
+                            _sUnit = "{}/({})".format(_sMul,_sDiv)
                     else:
-                        _sUnit = "{}/({})".format(_sMul,_sDiv)
+                        if len(_mMul) > 1:
+                            _sUnit = "({})/{}".format(_sMul,_sDiv)
+                        else:
+                            _sUnit = "{}/{}".format(_sMul,_sDiv)
                 else:
-                    if len(_mMul) > 1:
-                        _sUnit = "({})/{}".format(_sMul,_sDiv)
-                    else:
-                        _sUnit = "{}/{}".format(_sMul,_sDiv)
-            else:
-                _sUnit = _sMul
-            if _sUnit != "xbrli:pure":
-                aspects[str(qnOimUnitAspect)] = _sUnit
+                    _sUnit = _sMul
+                if _sUnit != "xbrli:pure":
+                    unitAspects[unitId] = _sUnit
+        if unitAspects[unitId] is not None:
+            aspects[str(qnOimUnitAspect)] = unitAspects[unitId]
         # Tuples removed from xBRL-JSON
         #if parent.qname != XbrlConst.qnXbrliXbrl:
         #    aspects[str(qnOimTupleParentAspect)] = parent.id if parent.id else "f{}".format(parent.objectIndex)
@@ -1,21 +1,33 @@
 '''
 StreamingExtensions is a plug-in to both GUI menu and command line/web service
 that provides an alternative approach to big instance documents without building a DOM, to save
-memory footprint.  lxml iterparse is used to parse the big instance.  ModelObjects are specialized by features
-for efficiency and to avoid dependency on an underlying DOM.
+memory footprint.  lxml XMLPullParser is fed the big instance in blocks, in a single pass of the file,
+and root children are removed from the tree as they are processed, so an instance may be larger than
+memory.  ModelObjects are specialized by features for efficiency and to avoid dependency on an underlying DOM.
 
-(Note that this module is based on a parser target, an alternate based on iterparse is under examples/plugin.)
+(An earlier alternate based on iterparse is under examples/plugin.)
 
 See COPYRIGHT.md for copyright information.
 
 Calls these plug-in classes:
-   Streaming.BlockingPlugin(modelXbrl):  returns name of plug in blocking streaming if it is being blocked, else None
+   Streaming.BlockStreaming(modelXbrl):  returns name of plug in blocking streaming if it is being blocked, else None
    Streaming.Start(modelXbrl): notifies that streaming is starting for modelXbrl; simulated modelDocument is established
-   Streaming.ValidateFacts(modelXbrl, modelFacts) modelFacts are available for streaming processing
+   Streaming.ValidateFacts(instValidator, modelFacts): batch of modelFacts is available for streaming validation
+   Streaming.ValidateFinish(instValidator): notifies that streaming validation is finished
+   Streaming.Facts(modelXbrl, modelFacts): batch of modelFacts is available for streaming processing
    Streaming.Finish(modelXbrl): notifies that streaming is finished
+
+Batches have --streamingFactsBatchSize facts (default 1000), after which the facts, and contexts, units and
+footnote links dropped from their buffers, are freed.
+
+With --streamingInline, inline XBRL documents are parsed in a single pass retaining only their inline XBRL
+elements (ix:header resources, facts, continuations, footnotes and their content), the ancestors of those
+elements and the xhtml head; other xhtml elements, such as embedded base64 images, are pruned as they are
+parsed.  The retained document is then discovered and validated as a loaded inline XBRL document.  Documents
+which are not well formed are left to be parsed as loaded, which reports their syntax errors.
 '''
 
-import io, os, time, sys, gc
+import io, os, time
 import regex as re
 from decimal import Decimal, InvalidOperation
 from lxml import etree
@@ -24,35 +36,24 @@ from arelle.ModelDocument import ModelDocument, Type
 from arelle.ModelObjectFactory import parser
 from arelle.ModelObject import ModelObject
 from arelle.ModelInstanceObject import ModelFact
+from arelle.ModelXbrl import CONTEXT_UNIT_INDEXES, FACT_INDEXES
 from arelle.PluginManager import pluginClassMethods
 from arelle.Validate import Validate
 from arelle.Version import authorLabel, copyrightLabel
-from arelle.HashUtil import md5hash, Md5Sum
+from arelle.HashUtil import Md5Sum
 
 _streamingExtensionsCheck = True  # check streaming if enabled except for CmdLine, then only when requested
 _streamingExtensionsValidate = False
 _streamingValidatePlugin = False
+_streamingFactsBatchSize = 1000 # facts given to Streaming.ValidateFacts and Streaming.Facts plugins at a time
+_streamingReadSize = 65536 # bytes of the instance fed to the parser at a time
+_streamingInline = False # inline XBRL documents are parsed pruning xhtml outside of inline XBRL elements
 
-class NotInstanceDocumentException(Exception):
-    def __init__(self):
-        pass
-
-def precedingProcessingInstruction(elt, target):
-    pi = elt.getprevious()
-    while pi is not None:
-        if isinstance(pi, etree._ProcessingInstruction) and pi.target == target:
-            return pi
-        pi = pi.getprevious()
-    return None
-
-def childProcessingInstruction(elt, target, reversed=False):
-    for pi in elt.iterchildren(reversed=reversed):
-        if isinstance(pi, etree._ProcessingInstruction):
-            if pi.target == target:
-                return pi
-        else:
-            break
-    return None
+ixNStags = tuple("{" + ns + "}" for ns in sorted(XbrlConst.ixbrlAll))
+xhtmlRootTags = ("{http://www.w3.org/1999/xhtml}html", "{http://www.w3.org/1999/xhtml}xhtml")
+xhtmlHeadTag = "{http://www.w3.org/1999/xhtml}head"
+xhtmlBaseTag = "{http://www.w3.org/1999/xhtml}base"
+xhtmlImgTag = "{http://www.w3.org/1999/xhtml}img"
 
 def precedingComment(elt):
     c = elt.getprevious()
@@ -64,500 +65,192 @@ def precedingComment(elt):
     return comment or None
 
 def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
-    # check if big instance and has header with an initial incomplete tree walk (just 2 elements
+    # the instance is streamed in a single pass of its file, if its xbrli:xbrl element is followed by the streaming
+    # header before any other element, otherwise it's left to be loaded as a DOM
     if not _streamingExtensionsCheck:
         return None
 
     # track whether modelXbrl has been validated by this streaming extension
     modelXbrl._streamingExtensionValidated = False
 
-    def logSyntaxErrors(parsercontext):
-        for error in parsercontext.error_log:
-            modelXbrl.error("xmlSchema:syntax",
-                    _("%(error)s, %(fileName)s, line %(line)s, column %(column)s, %(sourceAction)s source element"),
-                    modelObject=modelXbrl, fileName=os.path.basename(filepath),
-                    error=error.message, line=error.line, column=error.column, sourceAction="streaming")
-    #### note: written for iterparse of lxml prior to version 3.3, otherwise rewrite to use XmlPullParser ###
-    #### note: iterparse wants a binary file, but file is text mode
     _file, = modelXbrl.fileSource.file(filepath, binary=True)
     startedAt = time.time()
     modelXbrl.profileActivity()
-    ''' this seems twice as slow as iterparse
-    class instInfoTarget():
-        def __init__(self, element_factory=None, parser=None):
-            self.newTree = True
-            self.streamingAspects = None
-            self.foundInstance = False
-            self.creationSoftwareComment = ''
-            self.currentEltTag = "(before xbrli:xbrl)"
-            self.numRootFacts = 0
-        def start(self, tag, attrib, nsmap=None):
-            if self.newTree:
-                if tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    self.foundInstance = True
-                    self.newTree = False
-                else: # break
-                    raise NotInstanceDocumentException()
-            elif not tag.startswith("{http://www.xbrl.org/"):
-                self.numRootFacts += 1
-                if self.numRootFacts % 1000 == 0:
-                    modelXbrl.profileActivity("... streaming tree check", minTimeToShow=20.0)
-            self.currentEltTag = tag
-        def end(self, tag):
-            pass
-        def data(self, data):
-            pass
-        def comment(self, text):
-            if not self.foundInstance: # accumulate comments before xbrli:xbrl
-                self.creationSoftwareComment += ('\n' if self.creationSoftwareComment else '') + text
-            elif not self.creationSoftwareComment:
-                self.creationSoftwareComment = text # or first comment after xbrli:xbrl
-        def pi(self, target, data):
-            if target == "xbrl-streamable-instance":
-                if self.currentEltTag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    self.streamingAspects = dict(etree.PI(target,data).attrib.copy()) # dereference target results
-                else:
-                    modelXbrl.error("streamingExtensions:headerMisplaced",
-                            _("Header is misplaced: %(target)s, must follow xbrli:xbrl element but was found at %(element)s"),
-                            modelObject=modelXbrl, target=target, element=self.currentEltTag)
-        def close(self):
-            if not self.creationSoftwareComment:
-                self.creationSoftwareComment = None
-            return True
-    instInfo = instInfoTarget()
-    infoParser = etree.XMLParser(recover=True, huge_tree=True, target=instInfo)
-    try:
-        etree.parse(_file, parser=infoParser, base_url=filepath)
-    except NotInstanceDocumentException:
-        pass
-    '''
-    foundErrors = False
-    foundInstance = False
-    streamingAspects = None
-    creationSoftwareComment = None
-    instInfoNumRootFacts = 0
-    numElts = 0
-    elt = None
-    instInfoContext = etree.iterparse(_file, events=("start","end"), huge_tree=True)
-    try:
-        for event, elt in instInfoContext:
-            if event == "start":
-                if elt.getparent() is not None:
-                    if elt.getparent().tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                        if not foundInstance:
-                            foundInstance = True
-                            pi = precedingProcessingInstruction(elt, "xbrl-streamable-instance")
-                            if pi is None:
-                                break
-                            else:
-                                streamingAspects = dict(pi.attrib.copy())
-                                if creationSoftwareComment is None:
-                                    creationSoftwareComment = precedingComment(elt)
-                        if not elt.tag.startswith("{http://www.xbrl.org/"):
-                            instInfoNumRootFacts += 1
-                            if instInfoNumRootFacts % 1000 == 0:
-                                modelXbrl.profileActivity("... streaming tree check", minTimeToShow=20.0)
-                    elif not foundInstance:
-                        break
-                elif elt.tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    creationSoftwareComment = precedingComment(elt)
-                    if precedingProcessingInstruction(elt, "xbrl-streamable-instance") is not None:
-                        modelXbrl.error("streamingExtensions:headerMisplaced",
-                                _("Header is misplaced: %(error)s, must follow xbrli:xbrl element"),
-                                modelObject=elt)
-            elif event == "end":
-                elt.clear()
-                numElts += 1
-                if numElts % 1000 == 0 and elt.getparent() is not None:
-                    while elt.getprevious() is not None and elt.getparent() is not None:
-                        del elt.getparent()[0]
-    except etree.XMLSyntaxError as err:
-        modelXbrl.error("xmlSchema:syntax",
-                _("Unrecoverable error: %(error)s"),
-                error=err)
-        _file.close()
-        return err
+    _encoding = XmlUtil.encoding(_file.read(512))
+    _file.seek(0,io.SEEK_SET)
 
-    _file.seek(0,io.SEEK_SET) # allow reparsing
-    if not foundInstance or streamingAspects is None:
-        del elt
-        _file.close()
-        return None
-    modelXbrl.profileStat(_("streaming tree check"), time.time() - startedAt)
-    startedAt = time.time()
-    try:
-        version = Decimal(streamingAspects.get("version"))
-        if int(version) != 1:
-            modelXbrl.error("streamingExtensions:unsupportedVersion",
-                    _("Streaming version %(version)s, major version number must be 1"),
-                    modelObject=elt, version=version)
-            foundErrors = True
-    except (InvalidOperation, OverflowError):
-        modelXbrl.error("streamingExtensions:versionError",
-                _("Version %(version)s, number must be 1.n"),
-                modelObject=elt, version=streamingAspects.get("version", "(none)"))
-        foundErrors = True
-    for bufAspect in ("contextBuffer", "unitBuffer", "footnoteBuffer"):
-        try:
-            bufLimit = Decimal(streamingAspects.get(bufAspect, "INF"))
-            if bufLimit < 1 or (bufLimit.is_finite() and bufLimit % 1 != 0):
-                raise InvalidOperation
-            elif bufAspect == "contextBuffer":
-                contextBufferLimit = bufLimit
-            elif bufAspect == "unitBuffer":
-                unitBufferLimit = bufLimit
-            elif bufAspect == "footnoteBuffer":
-                footnoteBufferLimit = bufLimit
-        except InvalidOperation:
-            modelXbrl.error("streamingExtensions:valueError",
-                    _("Streaming %(attrib)s %(value)s, number must be a positive integer or INF"),
-                    modelObject=elt, attrib=bufAspect, value=streamingAspects.get(bufAspect))
-            foundErrors = True
-    if _streamingExtensionsValidate:
-        incompatibleValidations = []
-        _validateDisclosureSystem = modelXbrl.modelManager.validateDisclosureSystem
-        _disclosureSystem = modelXbrl.modelManager.disclosureSystem
-        if _validateDisclosureSystem and _disclosureSystem.validationType == "EFM":
-            incompatibleValidations.append("EFM")
-        if _validateDisclosureSystem and _disclosureSystem.validationType == "GFM":
-            incompatibleValidations.append("GFM")
-        if _validateDisclosureSystem and _disclosureSystem.validationType == "HMRC":
-            incompatibleValidations.append("HMRC")
-        if modelXbrl.modelManager.validateCalcLB:
-            incompatibleValidations.append("calculation LB")
-        if incompatibleValidations:
-            modelXbrl.error("streamingExtensions:incompatibleValidation",
-                    _("Streaming instance validation does not support %(incompatibleValidations)s validation"),
-                    modelObject=modelXbrl, incompatibleValidations=', '.join(incompatibleValidations))
-            foundErrors = True
-    if instInfoContext.error_log:
-        foundErrors = True
-    logSyntaxErrors(instInfoContext)
-    del instInfoContext # dereference
-
-    for pluginMethod in pluginClassMethods("Streaming.BlockStreaming"):
-        _blockingPluginName = pluginMethod(modelXbrl)
-        if _blockingPluginName: # name of blocking plugin is returned
-            modelXbrl.error("streamingExtensions:incompatiblePlugIn",
-                    _("Streaming instance not supported by plugin %(blockingPlugin)s"),
-                    modelObject=modelXbrl, blockingPlugin=_blockingPluginName)
-            foundErrors = True
+    streamingParser = etree.XMLPullParser(events=("start","end","pi"), huge_tree=True, base_url=filepath)
+    from arelle.ModelObjectFactory import setParserElementClassLookup
+    modelXbrl.isStreamingMode = True # must be set before setting element class lookup
+    (_parser, _parserLookupName, _parserLookupClass) = setParserElementClassLookup(streamingParser, modelXbrl)
+
+    def streamingEvents():
+        # feed the parser blocks of the file, so the parser's buffer is bounded by the block size
+        while True:
+            data = _file.read(_streamingReadSize)
+            if data:
+                streamingParser.feed(data)
+            else:
+                streamingParser.close()
+            yield from streamingParser.read_events()
+            if not data:
+                break
 
-    if foundErrors:
+    def notStreamed():
         _file.close()
+        del modelXbrl.isStreamingMode
         return None
 
-    _encoding = XmlUtil.encoding(_file.read(512))
-    _file.seek(0,io.SEEK_SET) # allow reparsing
+    def streamingHeaderErrors():
+        foundErrors = False
+        try:
+            version = Decimal(streamingAspects.get("version"))
+            if int(version) != 1:
+                modelXbrl.error("streamingExtensions:unsupportedVersion",
+                        _("Streaming version %(version)s, major version number must be 1"),
+                        modelObject=modelXbrl, version=version)
+                foundErrors = True
+        except (InvalidOperation, OverflowError, TypeError):
+            modelXbrl.error("streamingExtensions:versionError",
+                    _("Version %(version)s, number must be 1.n"),
+                    modelObject=modelXbrl, version=streamingAspects.get("version", "(none)"))
+            foundErrors = True
+        for bufAspect in ("contextBuffer", "unitBuffer", "footnoteBuffer"):
+            try:
+                bufLimit = Decimal(streamingAspects.get(bufAspect, "INF"))
+                if bufLimit < 1 or (bufLimit.is_finite() and bufLimit % 1 != 0):
+                    raise InvalidOperation
+                bufferLimits[bufAspect] = bufLimit
+            except InvalidOperation:
+                modelXbrl.error("streamingExtensions:valueError",
+                        _("Streaming %(attrib)s %(value)s, number must be a positive integer or INF"),
+                        modelObject=modelXbrl, attrib=bufAspect, value=streamingAspects.get(bufAspect))
+                foundErrors = True
+        if _streamingExtensionsValidate:
+            incompatibleValidations = []
+            _validateDisclosureSystem = modelXbrl.modelManager.validateDisclosureSystem
+            _disclosureSystem = modelXbrl.modelManager.disclosureSystem
+            if _validateDisclosureSystem and _disclosureSystem.validationType == "EFM":
+                incompatibleValidations.append("EFM")
+            if _validateDisclosureSystem and _disclosureSystem.validationType == "GFM":
+                incompatibleValidations.append("GFM")
+            if _validateDisclosureSystem and _disclosureSystem.validationType == "HMRC":
+                incompatibleValidations.append("HMRC")
+            if modelXbrl.modelManager.validateCalcLB:
+                incompatibleValidations.append("calculation LB")
+            if incompatibleValidations:
+                modelXbrl.error("streamingExtensions:incompatibleValidation",
+                        _("Streaming instance validation does not support %(incompatibleValidations)s validation"),
+                        modelObject=modelXbrl, incompatibleValidations=', '.join(incompatibleValidations))
+                foundErrors = True
+        for pluginMethod in pluginClassMethods("Streaming.BlockStreaming"):
+            _blockingPluginName = pluginMethod(modelXbrl)
+            if _blockingPluginName: # name of blocking plugin is returned
+                modelXbrl.error("streamingExtensions:incompatiblePlugIn",
+                        _("Streaming instance not supported by plugin %(blockingPlugin)s"),
+                        modelObject=modelXbrl, blockingPlugin=_blockingPluginName)
+                foundErrors = True
+        return foundErrors
+
+    def processFactsBatch():
+        # plugins process the batch of all root facts not yet processed (not just current one)
+        factsToCheck = modelXbrl.facts.copy()
+        if _streamingValidateFactsPlugin:
+            for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
+                pluginMethod(instValidator, factsToCheck)
+        if _streamingFactsPlugin:
+            for pluginMethod in pluginClassMethods("Streaming.Facts"):
+                pluginMethod(modelXbrl, factsToCheck)
+        for fact in factsToCheck:
+            dropFact(modelXbrl, fact)
+        del modelXbrl.facts[:]
+        for cntx in contextsToDrop:
+            dropContext(modelXbrl, cntx)
+        for unit in unitsToDrop:
+            dropUnit(modelXbrl, unit)
+        for footnoteLink in footnoteLinksToDrop:
+            dropFootnoteLink(modelXbrl, footnoteLink)
+        droppedElts.extend(factsToCheck)
+        droppedElts.extend(contextsToDrop)
+        droppedElts.extend(unitsToDrop)
+        droppedElts.extend(footnoteLinksToDrop)
+        del contextsToDrop[:]
+        del unitsToDrop[:]
+        del footnoteLinksToDrop[:]
 
-    if _streamingExtensionsValidate:
-        validator = Validate(modelXbrl)
-        instValidator = validator.instValidator
+    def factCheckFact(fact):
+        modelDocument._factsCheckMd5s += fact.md5sum
+        for _tupleFact in fact.modelTupleFacts:
+            factCheckFact(_tupleFact)
 
+    rootElt = modelDocument = streamingAspects = factsCheckVersion = factsCheckSum = None
+    bufferLimits = {}
+    beforeInstanceStream = beforeStartStreamingPlugin = True
     contextBuffer = []
     contextsToDrop = []
     unitBuffer = []
     unitsToDrop = []
     footnoteBuffer = []
     footnoteLinksToDrop = []
-
-    _streamingFactsPlugin = any(True for pluginMethod in pluginClassMethods("Streaming.Facts"))
-    _streamingValidateFactsPlugin = (_streamingExtensionsValidate and
-                                     any(True for pluginMethod in pluginClassMethods("Streaming.ValidateFacts")))
-
-    ''' this is very much slower than iterparse
-    class modelLoaderTarget():
-        def __init__(self, element_factory=None, parser=None):
-            self.newTree = True
-            self.currentMdlObj = None
-            self.beforeInstanceStream = True
-            self.beforeStartStreamingPlugin = True
-            self.numRootFacts = 1
-            modelXbrl.makeelementParentModelObject = None
-            modelXbrl.isStreamingMode = True
-            self.factsCheckVersion = None
-            self.factsCheckMd5s = Md5Sum()
-        def start(self, tag, attrib, nsmap=None):
-            modelXbrl.makeelementParentModelObject = self.currentMdlObj # pass parent to makeelement for ModelObjectFactory
-            mdlObj = _parser.makeelement(tag, attrib=attrib, nsmap=nsmap)
-            mdlObj.sourceline = 1
-            if self.newTree:
-                self.newTree = False
-                self.currentMdlObj = mdlObj
-                modelDocument = ModelDocument(modelXbrl, Type.INSTANCE, mappedUri, filepath, mdlObj.getroottree())
-                modelXbrl.modelDocument = modelDocument # needed for incremental validation
-                mdlObj.init(modelDocument)
-                modelDocument.parser = _parser # needed for XmlUtil addChild's makeelement
-                modelDocument.parserLookupName = _parserLookupName
-                modelDocument.parserLookupClass = _parserLookupClass
-                modelDocument.xmlRootElement = mdlObj
-                modelDocument.schemaLocationElements.add(mdlObj)
-                modelDocument.documentEncoding = _encoding
-                modelDocument._creationSoftwareComment = creationSoftwareComment
-                modelXbrl.info("streamingExtensions:streaming",
-                               _("Stream processing this instance."),
-                               modelObject = modelDocument)
-            else:
-                self.currentMdlObj.append(mdlObj)
-                self.currentMdlObj = mdlObj
-                mdlObj._init()
-                ns = mdlObj.namespaceURI
-                ln = mdlObj.localName
-                if (self.beforeInstanceStream and (
-                    (ns == XbrlConst.link and ln not in ("schemaRef", "linkbaseRef")) or
-                    (ns == XbrlConst.xbrli and ln in ("context", "unit")) or
-                    (ns not in (XbrlConst.link, XbrlConst.xbrli)))):
-                    self.beforeInstanceStream = False
-                    if _streamingExtensionsValidate:
-                        instValidator.validate(modelXbrl, modelXbrl.modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces))
-                    else: # need default dimensions
-                        ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
-                elif not self.beforeInstanceStream and self.beforeStartStreamingPlugin:
-                    for pluginMethod in pluginClassMethods("Streaming.Start"):
-                        pluginMethod(modelXbrl)
-                    self.beforeStartStreamingPlugin = False
-            return mdlObj
-        def end(self, tag):
-            modelDocument = modelXbrl.modelDocument
-            mdlObj = self.currentMdlObj
-            parentMdlObj = mdlObj.getparent()
-            self.currentMdlObj = parentMdlObj
-            ns = mdlObj.namespaceURI
-            ln = mdlObj.localName
-            if ns == XbrlConst.xbrli:
-                if ln == "context":
-                    if mdlObj.get("sticky"):
-                        del mdlObj.attrib["sticky"]
-                        XmlValidate.validate(modelXbrl, mdlObj)
-                        modelDocument.contextDiscover(mdlObj)
-                    else:
-                        if _streamingExtensionsValidate and len(contextBuffer) >= contextBufferLimit:
-                            # drop before adding as dropped may have same id as added
-                            cntx = contextBuffer.pop(0)
-                            if _streamingValidateFactsPlugin:
-                                contextsToDrop.append(cntx)
-                            else:
-                                dropContext(modelXbrl, cntx)
-                                del parentMdlObj[parentMdlObj.index(cntx)]
-                            cntx = None
-                        #>>XmlValidate.validate(modelXbrl, mdlObj)
-                        #>>modelDocument.contextDiscover(mdlObj)
-                        if contextBufferLimit.is_finite():
-                            contextBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        contextsToCheck = (mdlObj,)
-                        instValidator.checkContexts(contextsToCheck)
-                        if modelXbrl.hasXDT:
-                            instValidator.checkContextsDimensions(contextsToCheck)
-                        del contextsToCheck # dereference
-                elif ln == "unit":
-                    if _streamingExtensionsValidate and len(unitBuffer) >= unitBufferLimit:
-                        # drop before adding as dropped may have same id as added
-                        unit = unitBuffer.pop(0)
-                        if _streamingValidateFactsPlugin:
-                            unitsToDrop.append(unit)
-                        else:
-                            dropUnit(modelXbrl, unit)
-                            del parentMdlObj[parentMdlObj.index(unit)]
-                        unit = None
-                    #>>XmlValidate.validate(modelXbrl, mdlObj)
-                    #>>modelDocument.unitDiscover(mdlObj)
-                    if unitBufferLimit.is_finite():
-                        unitBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        instValidator.checkUnits( (mdlObj,) )
-                elif ln == "xbrl": # end of document
-                    # check remaining batched facts if any
-                    if _streamingValidateFactsPlugin:
-                        # plugin attempts to process batch of all root facts not yet processed (not just current one)
-                        # finish any final batch of facts
-                        if len(modelXbrl.facts) > 0:
-                            factsToCheck = modelXbrl.facts.copy()
-                            factsHaveBeenProcessed = True
-                            # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
-                            for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
-                                if not pluginMethod(modelXbrl, factsToCheck):
-                                    factsHaveBeenProcessed = False
-                            if factsHaveBeenProcessed:
-                                for fact in factsToCheck:
-                                    dropFact(modelXbrl, fact, modelXbrl.facts)
-                                    del parentMdlObj[parentMdlObj.index(fact)]
-                                for cntx in contextsToDrop:
-                                    dropContext(modelXbrl, cntx)
-                                    del parentMdlObj[parentMdlObj.index(cntx)]
-                                for unit in unitsToDrop:
-                                    dropUnit(modelXbrl, unit)
-                                    del parentMdlObj[parentMdlObj.index(unit)]
-                                for footnoteLink in footnoteLinksToDrop:
-                                    dropFootnoteLink(modelXbrl, footnoteLink)
-                                    del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                                fact = cntx = unit = footnoteLink = None
-                                del contextsToDrop[:]
-                                del unitsToDrop[:]
-                                del footnoteLinksToDrop[:]
-                            del factsToCheck
-                    # check remaining footnote refs
-                    for footnoteLink in footnoteBuffer:
-                        checkFootnoteHrefs(modelXbrl, footnoteLink)
-                    for pluginMethod in pluginClassMethods("Streaming.Finish"):
-                        pluginMethod(modelXbrl)
-            elif ns == XbrlConst.link:
-                if ln == "footnoteLink":
-                    XmlValidate.validate(modelXbrl, mdlObj)
-                    footnoteLinks = (mdlObj,)
-                    modelDocument.linkbaseDiscover(footnoteLinks, inInstance=True)
-                    if footnoteBufferLimit.is_finite():
-                        footnoteBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        instValidator.checkLinks(footnoteLinks)
-                        if len(footnoteBuffer) > footnoteBufferLimit:
-                            # check that hrefObjects for locators were all satisfied
-                                # drop before addition as dropped may have same id as added
-                            footnoteLink = footnoteBuffer.pop(0)
-                            checkFootnoteHrefs(modelXbrl, footnoteLink)
-                            if _streamingValidateFactsPlugin:
-                                footnoteLinksToDrop.append(footnoteLink)
-                            else:
-                                dropFootnoteLink(modelXbrl, footnoteLink)
-                                del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                            footnoteLink = None
-                    footnoteLinks = None
-                elif ln in ("schemaRef", "linkbaseRef"):
-                    modelDocument.discoverHref(mdlObj)
-                elif not modelXbrl.skipDTS:
-                    if ln in ("roleRef", "arcroleRef"):
-                        modelDocument.linkbaseDiscover((mdlObj,), inInstance=True)
-            elif parentMdlObj.qname == XbrlConst.qnXbrliXbrl:
-                self.numRootFacts += 1
-                #>>XmlValidate.validate(modelXbrl, mdlObj)
-                #>>modelDocument.factDiscover(mdlObj, modelXbrl.facts)
-                if self.factsCheckVersion:
-                    self.factCheckFact(mdlObj)
-                if _streamingExtensionsValidate or _streamingValidateFactsPlugin:
-                    factsToCheck = (mdlObj,)  # validate current fact by itself
+    droppedElts = [] # dropped root children, removed from the tree when the next root child starts
+    mdlObj = None
+    try:
+        for event, mdlObj in streamingEvents():
+            if event == "pi":
+                if mdlObj.target == "xbrl-streamable-instance":
+                    if rootElt is None:
+                        modelXbrl.error("streamingExtensions:headerMisplaced",
+                                _("Header is misplaced: %(target)s, must follow xbrli:xbrl element"),
+                                modelObject=modelXbrl, target=mdlObj.target)
+                    elif modelDocument is None:
+                        streamingAspects = dict(mdlObj.attrib)
+                elif mdlObj.target == "xbrl-facts-check" and rootElt is not None:
+                    if modelDocument is None:
+                        factsCheckVersion = mdlObj.get("version")
+                    else: # sum of md5s follows the last root child
+                        factsCheckSum = mdlObj.text
+            elif event == "start":
+                if rootElt is None:
+                    if mdlObj.tag != "{http://www.xbrl.org/2003/instance}xbrl":
+                        return notStreamed()
+                    rootElt = mdlObj
+                    continue
+                parentMdlObj = mdlObj.getparent()
+                if modelDocument is None: # first root child, streaming header has been read
+                    if streamingAspects is None or streamingHeaderErrors():
+                        return notStreamed()
+                    contextBufferLimit = bufferLimits["contextBuffer"]
+                    unitBufferLimit = bufferLimits["unitBuffer"]
+                    footnoteBufferLimit = bufferLimits["footnoteBuffer"]
                     if _streamingExtensionsValidate:
-                        instValidator.checkFacts(factsToCheck)
-                        if modelXbrl.hasXDT:
-                            instValidator.checkFactsDimensions(factsToCheck)
-                    if _streamingValidateFactsPlugin:
-                        # plugin attempts to process batch of all root facts not yet processed (not just current one)
-                        # use batches of 1000 facts
-                        if len(modelXbrl.facts) > 1000:
-                            factsToCheck = modelXbrl.facts.copy()
-                            factsHaveBeenProcessed = True
-                            # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
-                            for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
-                                if not pluginMethod(modelXbrl, factsToCheck):
-                                    factsHaveBeenProcessed = False
-                            if factsHaveBeenProcessed:
-                                for fact in factsToCheck:
-                                    dropFact(modelXbrl, fact, modelXbrl.facts)
-                                    del parentMdlObj[parentMdlObj.index(fact)]
-                                for cntx in contextsToDrop:
-                                    dropContext(modelXbrl, cntx)
-                                    del parentMdlObj[parentMdlObj.index(cntx)]
-                                for unit in unitsToDrop:
-                                    dropUnit(modelXbrl, unit)
-                                    del parentMdlObj[parentMdlObj.index(unit)]
-                                for footnoteLink in footnoteLinksToDrop:
-                                    dropFootnoteLink(modelXbrl, footnoteLink)
-                                    del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                                fact = cntx = unit = footnoteLink = None
-                                del contextsToDrop[:]
-                                del unitsToDrop[:]
-                                del footnoteLinksToDrop[:]
-                            del factsToCheck # dereference fact or batch of facts
-                    else:
-                        dropFact(modelXbrl, mdlObj, modelXbrl.facts) # single fact has been processed
-                        del parentMdlObj[parentMdlObj.index(mdlObj)]
-                if self.numRootFacts % 1000 == 0:
-                    pass
-                    #modelXbrl.profileActivity("... streaming fact {0} of {1} {2:.2f}%".format(self.numRootFacts, instInfoNumRootFacts,
-                    #                                                                          100.0 * self.numRootFacts / instInfoNumRootFacts),
-                    #                          minTimeToShow=20.0)
-                    gc.collect()
-                    sys.stdout.write ("\rAt fact {} of {} mem {}".format(self.numRootFacts, instInfoNumRootFacts, modelXbrl.modelManager.cntlr.memoryUsed))
-            return mdlObj
-        def data(self, data):
-            self.currentMdlObj.text = data
-        def comment(self, text):
-            pass
-        def pi(self, target, data):
-            if target == "xbrl-facts-check":
-                _match = re.search("([\\w-]+)=[\"']([^\"']+)[\"']", data)
-                if _match:
-                    _matchGroups = _match.groups()
-                    if len(_matchGroups) == 2:
-                        if _matchGroups[0] == "version":
-                            self.factsCheckVersion = _matchGroups[1]
-                        elif _matchGroups[0] == "sum-of-fact-md5s":
-                            try:
-                                expectedMd5 = Md5Sum(_matchGroups[1])
-                                if self.factsCheckMd5s != expectedMd5:
-                                    modelXbrl.warning("streamingExtensions:xbrlFactsCheckWarning",
-                                            _("XBRL facts sum of md5s expected %(expectedMd5)s not matched to actual sum %(actualMd5Sum)s"),
-                                            modelObject=modelXbrl, expectedMd5=expectedMd5, actualMd5Sum=self.factsCheckMd5s)
-                                else:
-                                    modelXbrl.info("info",
-                                            _("Successful XBRL facts sum of md5s."),
-                                            modelObject=modelXbrl)
-                            except ValueError:
-                                modelXbrl.error("streamingExtensions:xbrlFactsCheckError",
-                                        _("Invalid sum-of-md5s %(sumOfMd5)s"),
-                                        modelObject=modelXbrl, sumOfMd5=_matchGroups[1])
-        def close(self):
-            del modelXbrl.makeelementParentModelObject
-            return None
-
-        def factCheckFact(self, fact):
-            self.factsCheckMd5s += fact.md5sum
-            for _tupleFact in fact.modelTupleFacts:
-                self.factCheckFact(_tupleFact)
-
-    _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl, filepath, target=modelLoaderTarget())
-    etree.parse(_file, parser=_parser, base_url=filepath)
-    logSyntaxErrors(_parser)
-    '''
-    # replace modelLoaderTarget with iterparse (as it now supports CustomElementClassLookup)
-    streamingParserContext = etree.iterparse(_file, events=("start","end"), huge_tree=True)
-    from arelle.ModelObjectFactory import setParserElementClassLookup
-    modelXbrl.isStreamingMode = True # must be set before setting element class lookup
-    (_parser, _parserLookupName, _parserLookupClass) = setParserElementClassLookup(streamingParserContext, modelXbrl)
-    foundInstance = False
-    beforeInstanceStream = beforeStartStreamingPlugin = True
-    numRootFacts = 0
-    factsCheckVersion = None
-    def factCheckFact(fact):
-        modelDocument._factsCheckMd5s += fact.md5sum
-        for _tupleFact in fact.modelTupleFacts:
-            factCheckFact(_tupleFact)
-    for event, mdlObj in streamingParserContext:
-        if event == "start":
-            if mdlObj.tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                modelDocument = ModelDocument(modelXbrl, Type.INSTANCE, mappedUri, filepath, mdlObj.getroottree())
-                modelXbrl.modelDocument = modelDocument # needed for incremental validation
-                mdlObj.init(modelDocument)
-                modelDocument.parser = _parser # needed for XmlUtil addChild's makeelement
-                modelDocument.parserLookupName = _parserLookupName
-                modelDocument.parserLookupClass = _parserLookupClass
-                modelDocument.xmlRootElement = mdlObj
-                modelDocument.schemaLocationElements.add(mdlObj)
-                modelDocument.documentEncoding = _encoding
-                modelDocument._creationSoftwareComment = precedingComment(mdlObj)
-                modelDocument._factsCheckMd5s = Md5Sum()
-                modelXbrl.info("streamingExtensions:streaming",
-                               _("Stream processing this instance."),
-                               modelObject = modelDocument)
-            elif mdlObj.getparent() is not None:
-                mdlObj._init() # requires discovery as part of start elements
-                if mdlObj.getparent().tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    if not foundInstance:
-                        foundInstance = True
-                        pi = precedingProcessingInstruction(mdlObj, "xbrl-facts-check")
-                        if pi is not None:
-                            factsCheckVersion = pi.attrib.get("version", None)
-                elif not foundInstance:
-                    break
+                        validator = Validate(modelXbrl)
+                        instValidator = validator.instValidator
+                    _streamingFactsPlugin = any(True for pluginMethod in pluginClassMethods("Streaming.Facts"))
+                    _streamingValidateFactsPlugin = (_streamingExtensionsValidate and
+                                                     any(True for pluginMethod in pluginClassMethods("Streaming.ValidateFacts")))
+                    modelXbrl.profileStat(_("streaming header check"), time.time() - startedAt)
+                    startedAt = time.time()
+                    modelDocument = ModelDocument(modelXbrl, Type.INSTANCE, mappedUri, filepath, rootElt.getroottree())
+                    modelXbrl.modelDocument = modelDocument # needed for incremental validation
+                    rootElt.init(modelDocument)
+                    modelDocument.parser = _parser # needed for XmlUtil addChild's makeelement
+                    modelDocument.parserLookupName = _parserLookupName
+                    modelDocument.parserLookupClass = _parserLookupClass
+                    modelDocument.xmlRootElement = rootElt
+                    modelDocument.schemaLocationElements.add(rootElt)
+                    modelDocument.documentEncoding = _encoding
+                    modelDocument._creationSoftwareComment = precedingComment(rootElt)
+                    modelDocument._factsCheckMd5s = Md5Sum()
+                    modelXbrl.info("streamingExtensions:streaming",
+                                   _("Stream processing this instance."),
+                                   modelObject = modelDocument)
+                if parentMdlObj is rootElt:
+                    factsCheckSum = None # only a sum following the last root child applies
+                    for elt in droppedElts:
+                        rootElt.remove(elt)
+                    del droppedElts[:]
+                if not hasattr(mdlObj, "modelDocument"): # proxy was made (and _init'ed) before modelDocument was established
+                    mdlObj._init()
                 ns = mdlObj.qname.namespaceURI
                 ln = mdlObj.qname.localName
                 if beforeInstanceStream:
@@ -569,199 +262,147 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                             instValidator.validate(modelXbrl, modelXbrl.modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces))
                         else: # need default dimensions
                             ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
-                elif not beforeInstanceStream and beforeStartStreamingPlugin:
+                elif beforeStartStreamingPlugin:
                     for pluginMethod in pluginClassMethods("Streaming.Start"):
                         pluginMethod(modelXbrl)
                     beforeStartStreamingPlugin = False
-        elif event == "end":
-            parentMdlObj = mdlObj.getparent()
-            ns = mdlObj.namespaceURI
-            ln = mdlObj.localName
-            if ns == XbrlConst.xbrli:
-                if ln == "context":
-                    if mdlObj.get("sticky"):
-                        del mdlObj.attrib["sticky"]
-                        XmlValidate.validate(modelXbrl, mdlObj)
-                        modelDocument.contextDiscover(mdlObj)
-                    else:
-                        if len(contextBuffer) >= contextBufferLimit:
+            elif event == "end" and modelDocument is not None:
+                parentMdlObj = mdlObj.getparent()
+                ns = mdlObj.namespaceURI
+                ln = mdlObj.localName
+                if ns == XbrlConst.xbrli:
+                    if ln == "context":
+                        if mdlObj.get("sticky"):
+                            del mdlObj.attrib["sticky"]
+                            XmlValidate.validate(modelXbrl, mdlObj)
+                            modelDocument.contextDiscover(mdlObj)
+                        else:
+                            if len(contextBuffer) >= contextBufferLimit:
+                                # drop before adding as dropped may have same id as added
+                                cntx = contextBuffer.pop(0)
+                                if _streamingFactsPlugin or _streamingValidateFactsPlugin:
+                                    contextsToDrop.append(cntx)
+                                else:
+                                    dropContext(modelXbrl, cntx)
+                                    droppedElts.append(cntx)
+                                cntx = None
+                            XmlValidate.validate(modelXbrl, mdlObj)
+                            modelDocument.contextDiscover(mdlObj)
+                            if contextBufferLimit.is_finite():
+                                contextBuffer.append(mdlObj)
+                        if _streamingExtensionsValidate:
+                            contextsToCheck = (mdlObj,)
+                            instValidator.checkContexts(contextsToCheck)
+                            if modelXbrl.hasXDT:
+                                instValidator.checkContextsDimensions(contextsToCheck)
+                            del contextsToCheck # dereference
+                    elif ln == "unit":
+                        if len(unitBuffer) >= unitBufferLimit:
                             # drop before adding as dropped may have same id as added
-                            cntx = contextBuffer.pop(0)
+                            unit = unitBuffer.pop(0)
                             if _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                                contextsToDrop.append(cntx)
+                                unitsToDrop.append(unit)
                             else:
-                                dropContext(modelXbrl, cntx)
-                                #>>del parentMdlObj[parentMdlObj.index(cntx)]
-                            cntx = None
+                                dropUnit(modelXbrl, unit)
+                                droppedElts.append(unit)
+                            unit = None
                         XmlValidate.validate(modelXbrl, mdlObj)
-                        modelDocument.contextDiscover(mdlObj)
-                        if contextBufferLimit.is_finite():
-                            contextBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        contextsToCheck = (mdlObj,)
-                        instValidator.checkContexts(contextsToCheck)
-                        if modelXbrl.hasXDT:
-                            instValidator.checkContextsDimensions(contextsToCheck)
-                        del contextsToCheck # dereference
-                elif ln == "unit":
-                    if len(unitBuffer) >= unitBufferLimit:
-                        # drop before additing as dropped may have same id as added
-                        unit = unitBuffer.pop(0)
+                        modelDocument.unitDiscover(mdlObj)
+                        if unitBufferLimit.is_finite():
+                            unitBuffer.append(mdlObj)
+                        if _streamingExtensionsValidate:
+                            instValidator.checkUnits( (mdlObj,) )
+                    elif ln == "xbrl": # end of document
+                        # process any final batch of facts
+                        if (_streamingFactsPlugin or _streamingValidateFactsPlugin) and len(modelXbrl.facts) > 0:
+                            processFactsBatch()
+                        # check remaining footnote refs
+                        for footnoteLink in footnoteBuffer:
+                            checkFootnoteHrefs(modelXbrl, footnoteLink)
+                        if factsCheckSum is not None: # pseudo-attribute of PI is in its text
+                            _match = re.search("([\\w-]+)=[\"']([^\"']+)[\"']", factsCheckSum)
+                            if _match:
+                                _matchGroups = _match.groups()
+                                if len(_matchGroups) == 2:
+                                    if _matchGroups[0] == "sum-of-fact-md5s":
+                                        try:
+                                            expectedMd5 = Md5Sum(_matchGroups[1])
+                                            if modelDocument._factsCheckMd5s != expectedMd5:
+                                                modelXbrl.warning("streamingExtensions:xbrlFactsCheckWarning",
+                                                        _("XBRL facts sum of md5s expected %(expectedMd5)s not matched to actual sum %(actualMd5Sum)s"),
+                                                        modelObject=modelXbrl, expectedMd5=expectedMd5, actualMd5Sum=modelDocument._factsCheckMd5s)
+                                            else:
+                                                modelXbrl.info("info",
+                                                        _("Successful XBRL facts sum of md5s."),
+                                                        modelObject=modelXbrl)
+                                        except ValueError:
+                                            modelXbrl.error("streamingExtensions:xbrlFactsCheckError",
+                                                    _("Invalid sum-of-md5s %(sumOfMd5)s"),
+                                                    modelObject=modelXbrl, sumOfMd5=_matchGroups[1])
+                        if _streamingValidateFactsPlugin:
+                            for pluginMethod in pluginClassMethods("Streaming.ValidateFinish"):
+                                pluginMethod(instValidator)
+                        if _streamingFactsPlugin:
+                            for pluginMethod in pluginClassMethods("Streaming.Finish"):
+                                pluginMethod(modelXbrl)
+                elif ns == XbrlConst.link:
+                    if ln in ("schemaRef", "linkbaseRef"):
+                        modelDocument.discoverHref(mdlObj, urlRewritePluginClass="ModelDocument.InstanceSchemaRefRewriter")
+                    elif ln in ("roleRef", "arcroleRef"):
+                        modelDocument.linkbaseDiscover((mdlObj,), inInstance=True)
+                    elif ln == "footnoteLink":
+                        XmlValidate.validate(modelXbrl, mdlObj)
+                        footnoteLinks = (mdlObj,)
+                        modelDocument.linkbaseDiscover(footnoteLinks, inInstance=True)
+                        if footnoteBufferLimit.is_finite():
+                            footnoteBuffer.append(mdlObj)
+                        if _streamingExtensionsValidate:
+                            instValidator.checkLinks(footnoteLinks)
+                            if len(footnoteBuffer) > footnoteBufferLimit:
+                                # check that hrefObjects for locators were all satisfied
+                                    # drop before addition as dropped may have same id as added
+                                footnoteLink = footnoteBuffer.pop(0)
+                                checkFootnoteHrefs(modelXbrl, footnoteLink)
+                                if _streamingValidateFactsPlugin:
+                                    footnoteLinksToDrop.append(footnoteLink)
+                                else:
+                                    dropFootnoteLink(modelXbrl, footnoteLink)
+                                    droppedElts.append(footnoteLink)
+                                footnoteLink = None
+                        footnoteLinks = None
+                elif parentMdlObj is rootElt and isinstance(mdlObj, ModelFact):
+                    XmlValidate.validate(modelXbrl, mdlObj)
+                    modelDocument.factDiscover(mdlObj, modelXbrl.facts)
+                    if factsCheckVersion:
+                        factCheckFact(mdlObj)
+                    if _streamingExtensionsValidate or _streamingFactsPlugin or _streamingValidateFactsPlugin:
+                        factsToCheck = (mdlObj,)  # validate current fact by itself
+                        if _streamingExtensionsValidate:
+                            instValidator.checkFacts(factsToCheck)
+                            if modelXbrl.hasXDT:
+                                instValidator.checkFactsDimensions(factsToCheck)
+                        del factsToCheck # dereference
                         if _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                            unitsToDrop.append(unit)
+                            if len(modelXbrl.facts) >= _streamingFactsBatchSize:
+                                processFactsBatch()
                         else:
-                            dropUnit(modelXbrl, unit)
-                            #>>del parentMdlObj[parentMdlObj.index(unit)]
-                        unit = None
-                    XmlValidate.validate(modelXbrl, mdlObj)
-                    modelDocument.unitDiscover(mdlObj)
-                    if unitBufferLimit.is_finite():
-                        unitBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        instValidator.checkUnits( (mdlObj,) )
-                elif ln == "xbrl": # end of document
-                    # check remaining batched facts if any
-                    if _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                        # plugin attempts to process batch of all root facts not yet processed (not just current one)
-                        # finish any final batch of facts
-                        if len(modelXbrl.facts) > 0:
-                            factsToCheck = modelXbrl.facts.copy()
-                            # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
-                            if _streamingValidateFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
-                                    pluginMethod(instValidator, factsToCheck)
-                            if _streamingFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.Facts"):
-                                    pluginMethod(modelXbrl, factsToCheck)
-                            for fact in factsToCheck:
-                                dropFact(modelXbrl, fact, modelXbrl.facts)
-                                #>>del parentMdlObj[parentMdlObj.index(fact)]
-                            for cntx in contextsToDrop:
-                                dropContext(modelXbrl, cntx)
-                                #>>del parentMdlObj[parentMdlObj.index(cntx)]
-                            for unit in unitsToDrop:
-                                dropUnit(modelXbrl, unit)
-                                #>>del parentMdlObj[parentMdlObj.index(unit)]
-                            for footnoteLink in footnoteLinksToDrop:
-                                dropFootnoteLink(modelXbrl, footnoteLink)
-                                #>>del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                            fact = cntx = unit = footnoteLink = None
-                            del contextsToDrop[:]
-                            del unitsToDrop[:]
-                            del footnoteLinksToDrop[:]
-                            del factsToCheck
-                    # check remaining footnote refs
-                    for footnoteLink in footnoteBuffer:
-                        checkFootnoteHrefs(modelXbrl, footnoteLink)
-                    pi = childProcessingInstruction(mdlObj, "xbrl-facts-check", reversed=True)
-                    if pi is not None: # attrib is in .text, not attrib, no idea why!!!
-                        _match = re.search("([\\w-]+)=[\"']([^\"']+)[\"']", pi.text)
-                        if _match:
-                            _matchGroups = _match.groups()
-                            if len(_matchGroups) == 2:
-                                if _matchGroups[0] == "sum-of-fact-md5s":
-                                    try:
-                                        expectedMd5 = Md5Sum(_matchGroups[1])
-                                        if modelDocument._factsCheckMd5s != expectedMd5:
-                                            modelXbrl.warning("streamingExtensions:xbrlFactsCheckWarning",
-                                                    _("XBRL facts sum of md5s expected %(expectedMd5)s not matched to actual sum %(actualMd5Sum)s"),
-                                                    modelObject=modelXbrl, expectedMd5=expectedMd5, actualMd5Sum=modelDocument._factsCheckMd5s)
-                                        else:
-                                            modelXbrl.info("info",
-                                                    _("Successful XBRL facts sum of md5s."),
-                                                    modelObject=modelXbrl)
-                                    except ValueError:
-                                        modelXbrl.error("streamingExtensions:xbrlFactsCheckError",
-                                                _("Invalid sum-of-md5s %(sumOfMd5)s"),
-                                                modelObject=modelXbrl, sumOfMd5=_matchGroups[1])
-                    if _streamingValidateFactsPlugin:
-                        for pluginMethod in pluginClassMethods("Streaming.ValidateFinish"):
-                            pluginMethod(instValidator)
-                    if _streamingFactsPlugin:
-                        for pluginMethod in pluginClassMethods("Streaming.Finish"):
-                            pluginMethod(modelXbrl)
-            elif ns == XbrlConst.link:
-                if ln in ("schemaRef", "linkbaseRef"):
-                    modelDocument.discoverHref(mdlObj, urlRewritePluginClass="ModelDocument.InstanceSchemaRefRewriter")
-                elif ln in ("roleRef", "arcroleRef"):
-                    modelDocument.linkbaseDiscover((mdlObj,), inInstance=True)
-                elif ln == "footnoteLink":
-                    XmlValidate.validate(modelXbrl, mdlObj)
-                    footnoteLinks = (mdlObj,)
-                    modelDocument.linkbaseDiscover(footnoteLinks, inInstance=True)
-                    if footnoteBufferLimit.is_finite():
-                        footnoteBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        instValidator.checkLinks(footnoteLinks)
-                        if len(footnoteBuffer) > footnoteBufferLimit:
-                            # check that hrefObjects for locators were all satisfied
-                                # drop before addition as dropped may have same id as added
-                            footnoteLink = footnoteBuffer.pop(0)
-                            checkFootnoteHrefs(modelXbrl, footnoteLink)
-                            if _streamingValidateFactsPlugin:
-                                footnoteLinksToDrop.append(footnoteLink)
-                            else:
-                                dropFootnoteLink(modelXbrl, footnoteLink)
-                                #>>del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                            footnoteLink = None
-                    footnoteLinks = None
-            elif parentMdlObj.qname == XbrlConst.qnXbrliXbrl and isinstance(mdlObj, ModelFact):
-                numRootFacts += 1
-                XmlValidate.validate(modelXbrl, mdlObj)
-                modelDocument.factDiscover(mdlObj, modelXbrl.facts)
-                if factsCheckVersion:
-                    factCheckFact(mdlObj)
-                if _streamingExtensionsValidate or _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                    factsToCheck = (mdlObj,)  # validate current fact by itself
-                    if _streamingExtensionsValidate:
-                        instValidator.checkFacts(factsToCheck)
-                        if modelXbrl.hasXDT:
-                            instValidator.checkFactsDimensions(factsToCheck)
-                    if _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                        # plugin attempts to process batch of all root facts not yet processed (not just current one)
-                        # use batches of 1000 facts
-                        if len(modelXbrl.facts) > 1000:
-                            factsToCheck = modelXbrl.facts.copy()
-                            # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
-                            if _streamingValidateFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
-                                    pluginMethod(instValidator, factsToCheck)
-                            if _streamingFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.Facts"):
-                                    pluginMethod(modelXbrl, factsToCheck)
-                            for fact in factsToCheck:
-                                dropFact(modelXbrl, fact, modelXbrl.facts)
-                                #>>del parentMdlObj[parentMdlObj.index(fact)]
-                            for cntx in contextsToDrop:
-                                dropContext(modelXbrl, cntx)
-                                #>>del parentMdlObj[parentMdlObj.index(cntx)]
-                            for unit in unitsToDrop:
-                                dropUnit(modelXbrl, unit)
-                                #>>del parentMdlObj[parentMdlObj.index(unit)]
-                            for footnoteLink in footnoteLinksToDrop:
-                                dropFootnoteLink(modelXbrl, footnoteLink)
-                                #>>del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                            fact = cntx = unit = footnoteLink = None
-                            del contextsToDrop[:]
-                            del unitsToDrop[:]
-                            del footnoteLinksToDrop[:]
-                            del factsToCheck # dereference fact or batch of facts
-                    else:
-                        dropFact(modelXbrl, mdlObj, modelXbrl.facts) # single fact has been processed
-                        #>>del parentMdlObj[parentMdlObj.index(mdlObj)]
-                if numRootFacts % 1000 == 0:
-                    pass
-                    #modelXbrl.profileActivity("... streaming fact {0} of {1} {2:.2f}%".format(self.numRootFacts, instInfoNumRootFacts,
-                    #                                                                          100.0 * self.numRootFacts / instInfoNumRootFacts),
-                    #                          minTimeToShow=20.0)
-                    #gc.collect()
-                    #sys.stdout.write ("\rAt fact {} of {} mem {}".format(numRootFacts, instInfoNumRootFacts, modelXbrl.modelManager.cntlr.memoryUsed))
+                            dropFact(modelXbrl, mdlObj, modelXbrl.facts) # single fact has been processed
+                            droppedElts.append(mdlObj)
+    except etree.XMLSyntaxError as err:
+        modelXbrl.error("xmlSchema:syntax",
+                _("Unrecoverable error: %(error)s"),
+                error=err)
+        _file.close()
+        return err
+    if modelDocument is None: # no root child, nothing to stream
+        return notStreamed()
     if mdlObj is not None:
+        resolveLogRecords(modelXbrl)
         mdlObj.clear()
-    del _parser, _parserLookupName, _parserLookupClass
+    del _parser, _parserLookupName, _parserLookupClass, streamingParser
+    _file.close()
 
     if _streamingExtensionsValidate and validator is not None:
-        _file.close()
         del instValidator
         validator.close()
         # track that modelXbrl has been validated by this streaming extension
@@ -770,6 +411,81 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
     modelXbrl.profileStat(_("streaming complete"), time.time() - startedAt)
     return modelXbrl.modelDocument
 
+def streamingInlineParser(modelXbrl, normalizedUri, filepath, *args, **kwargs):
+    # an inline XBRL document is parsed in a single pass retaining only its inline XBRL elements, with their content,
+    # their ancestors and the xhtml head, other xhtml elements (such as embedded images) being pruned as they're parsed
+    if not _streamingInline or not filepath.lower().endswith((".htm", ".html", ".xhtml")):
+        return None
+    startedAt = time.time()
+    _file, = modelXbrl.fileSource.file(filepath, binary=True)
+    try:
+        _encoding = XmlUtil.encoding(_file.read(512))
+        _file.seek(0,io.SEEK_SET)
+        streamingParser = etree.XMLPullParser(events=("start","end"), huge_tree=True, base_url=filepath)
+        from arelle.ModelObjectFactory import setParserElementClassLookup
+        setParserElementClassLookup(streamingParser, modelXbrl, normalizedUri)
+        retainedStack = [] # for each open element, whether it is retained
+        ixDepth = headDepth = 0
+        prunedElts = [] # removed when the parser has moved past them (with their tails)
+        numPrunedElts = numPrunedImages = prunedImagesSize = 0
+        rootElt = None
+        while True:
+            data = _file.read(_streamingReadSize)
+            if data:
+                streamingParser.feed(data)
+            else:
+                rootElt = streamingParser.close()
+            for event, elt in streamingParser.read_events():
+                for prunedElt in prunedElts:
+                    prunedElt.getparent().remove(prunedElt)
+                del prunedElts[:]
+                tag = elt.tag
+                if not isinstance(tag, str): # comment or processing instruction
+                    continue
+                if event == "start":
+                    if not retainedStack and tag not in xhtmlRootTags:
+                        return None # not an html document, leave to be parsed as loaded
+                    if tag.startswith(ixNStags):
+                        ixDepth += 1
+                    elif tag == xhtmlHeadTag:
+                        headDepth += 1
+                    retainedStack.append(ixDepth > 0 or headDepth > 0 or tag == xhtmlBaseTag or
+                                         "-ix-hidden" in (elt.get("style") or ""))
+                else:
+                    isRetained = retainedStack.pop()
+                    if tag.startswith(ixNStags):
+                        ixDepth -= 1
+                    elif tag == xhtmlHeadTag:
+                        headDepth -= 1
+                    if isRetained or not retainedStack: # html element is retained
+                        if retainedStack:
+                            retainedStack[-1] = True # ancestors of retained elements are retained
+                    else:
+                        prunedElts.append(elt)
+                        numPrunedElts += 1
+                        if tag == xhtmlImgTag:
+                            src = elt.get("src") or ""
+                            if src.startswith("data:"):
+                                numPrunedImages += 1
+                                prunedImagesSize += len(src)
+            if not data:
+                break
+    except etree.XMLSyntaxError:
+        # the pull parser doesn't recover from malformed xhtml, leave it to be parsed as loaded,
+        # which reports its syntax errors
+        return None
+    finally:
+        _file.close()
+    if rootElt is None:
+        return None
+    modelXbrl.info("streamingExtensions:streamingInline",
+                   _("Stream processed inline document %(fileName)s, pruned %(prunedElements)s xhtml elements outside of inline XBRL elements, "
+                     "including %(prunedImages)s embedded images of %(prunedImagesSize)s characters"),
+                   modelObject=modelXbrl, fileName=os.path.basename(filepath), prunedElements=numPrunedElts,
+                   prunedImages=numPrunedImages, prunedImagesSize=prunedImagesSize)
+    modelXbrl.profileStat(_("streaming inline parse"), time.time() - startedAt)
+    return (rootElt.getroottree(), _encoding)
+
 def checkFootnoteHrefs(modelXbrl, footnoteLink):
     for locElt in footnoteLink.iterchildren(tag="{http://www.xbrl.org/2003/linkbase}loc"):
         for hrefElt, _doc, _id in footnoteLink.modelDocument.hrefObjects:
@@ -780,10 +496,12 @@ def checkFootnoteHrefs(modelXbrl, footnoteLink):
 
 def dropContext(modelXbrl, cntx):
     del modelXbrl.contexts[cntx.id]
+    modelXbrl.clearIndexes(CONTEXT_UNIT_INDEXES) # stale, rebuilt from remaining contexts if used again
     dropObject(modelXbrl, cntx)
 
 def dropUnit(modelXbrl, unit):
     del modelXbrl.units[unit.id]
+    modelXbrl.clearIndexes(CONTEXT_UNIT_INDEXES)
     dropObject(modelXbrl, unit)
 
 def dropFootnoteLink(modelXbrl, footnoteLink):
@@ -792,17 +510,27 @@ def dropFootnoteLink(modelXbrl, footnoteLink):
             baseSet.remove(footnoteLink)
     dropObject(modelXbrl, footnoteLink)
 
-def dropFact(modelXbrl, fact, facts):
+def resolveLogRecords(modelXbrl):
+    # messages not yet serialized by a log handler (such as buffered json or xml logs) prepare their
+    # arguments and refs while the model objects they refer to are still intact
+    if modelXbrl.deferredLogRecords:
+        modelXbrl.resolveDeferredLogRecords()
+
+def dropFact(modelXbrl, fact, facts=None): # facts, if any, to remove fact from
+    resolveLogRecords(modelXbrl)
     while fact.modelTupleFacts:
         dropFact(modelXbrl, fact.modelTupleFacts[0], fact.modelTupleFacts)
     modelXbrl.factsInInstance.discard(fact)
-    facts.remove(fact)
+    if facts is not None:
+        facts.remove(fact)
+    modelXbrl.clearIndexes(FACT_INDEXES) # stale, rebuilt from remaining facts if used again
     modelXbrl.modelObjects[fact.objectIndex] = None # objects found by index, can't remove position from list
     if fact.id:
         fact.modelDocument.idObjects.pop(fact.id, None)
     fact.clear()
 
 def dropObject(modelXbrl, mdlObj):
+    resolveLogRecords(modelXbrl)
     for childObj in mdlObj.iterchildren():
         dropObject(modelXbrl, childObj)
     if mdlObj.qname == XbrlConst.qnLinkLoc:
@@ -815,19 +543,28 @@ def dropObject(modelXbrl, mdlObj):
         mdlObj.modelDocument.idObjects.pop(mdlObj.id, None)
     mdlObj.clear()
 
-'''
-def streamingOptionsExtender(parser):
-    parser.add_option("--check-streaming",
+def streamingOptionsExtender(parser, *args, **kwargs):
+    parser.add_option("--streamingFactsBatchSize",
+                      action="store",
+                      type="int",
+                      dest="streamingFactsBatchSize",
+                      help=_("Number of facts given at a time to streaming validation and processing plug-ins, "
+                             "after which they are freed (default 1000)."))
+    parser.add_option("--streamingInline",
                       action="store_true",
-                      dest="check_streaming",
-                      help=_('Check streamability of instance document."'))
-'''
+                      dest="streamingInline",
+                      help=_("Parse inline XBRL documents retaining only inline XBRL elements, their content and ancestors, "
+                             "and the xhtml head, so that xhtml content such as embedded images is not kept in memory "
+                             "(xhtml checks of pruned content are not performed)."))
 
 def streamingExtensionsSetup(cntlr, options, *args, **kwargs):
-    global _streamingExtensionsCheck, _streamingExtensionsValidate
+    global _streamingExtensionsCheck, _streamingExtensionsValidate, _streamingFactsBatchSize, _streamingInline
     # streaming only checked in CmdLine/web server mode if requested
     # _streamingExtensionsCheck = getattr(options, 'check_streaming', False)
     _streamingExtensionsValidate = options.validate
+    _streamingInline = getattr(options, "streamingInline", False)
+    if getattr(options, "streamingFactsBatchSize", None):
+        _streamingFactsBatchSize = max(options.streamingFactsBatchSize, 1)
 
 def streamingExtensionsIsValidated(modelXbrl, *args, **kwargs):
     return getattr(modelXbrl, "_streamingExtensionValidated", False)
@@ -840,13 +577,14 @@ __pluginInfo__ = {
     'name': 'Streaming Extensions Loader',
     'version': '0.9',
     'description': "This plug-in loads big XBRL instances without building a DOM in memory.  "
-                    "lxml iterparse parses XBRL directly into an object model without a DOM.  ",
+                    "lxml XMLPullParser parses XBRL directly into an object model without a DOM.  ",
     'license': 'Apache-2',
     'author': authorLabel,
     'copyright': copyrightLabel,
     # classes of mount points (required)
-    # take out for now: 'CntlrCmdLine.Options': streamingOptionsExtender,
+    'CntlrCmdLine.Options': streamingOptionsExtender,
     'CntlrCmdLine.Utility.Run': streamingExtensionsSetup,
     'ModelDocument.PullLoader': streamingExtensionsLoader,
+    'ModelDocument.CustomParser': streamingInlineParser,
     'ModelDocument.IsValidated': streamingExtensionsIsValidated,
 }
@@ -145,6 +145,17 @@ def validateSetup(val, parameters=None, *args, **kwargs):
         val.namespacePrefixesUsed[ns].add(prefix)
     val.firstFactObjectIndex = sys.maxsize
     val.firstFact = None
+    # accumulated across streaming batches: contexts and units by hash, id of the first of equivalent ones,
+    # fact keys (parent, qname, context hash, unit hash, xml:lang): entry, or list of entries, of the unequal facts of
+    # the key, each the fact's objectIndex, or (objectIndex, contextID) if its context isn't the first of its hash, and
+    # facts (qnames when streaming) reported in final.  The fact keys hold every fact of the instance, about 200 bytes
+    # a fact (a single entry keyed by interned values), so about 200MB for a million facts streamed
+    val.cntxHashes = {}
+    val.unitHashes = {}
+    val.factKeys = {}
+    val.nilFacts = []
+    val.stringFactsWithXmlLang = []
+    val.nonMonetaryNonPureFacts = []
     val.footnotesRelationshipSet = ModelRelationshipSet(val.modelXbrl, "XBRL-footnotes")
     # re-init batch flag to enable more than one context/unit validation sessions for the same instance.
     # (note that this monkey-patching would give trouble on two concurrent validation sessions of the same instance)
@@ -160,6 +171,48 @@ def prefixUsed(val, ns, prefix):
     for _prefix in val.namespacePrefixesUsed[ns]:
         val.prefixesUnused.discard(_prefix)
 
+def recordPrefixesUsed(val, elt, isRootOnly=False):
+    # note prefixes used by elt and its descendants (or just elt if isRootOnly), checking for EIOPA 2.5 business data
+    modelXbrl = val.modelXbrl
+    for elt in ((elt,) if isRootOnly else elt.iter()):
+        if isinstance(elt, ModelObject): # skip comments and processing instructions
+            prefixUsed(val, elt.qname.namespaceURI, elt.qname.prefix)
+            for attrTag in elt.keys():
+                if attrTag.startswith("{"):
+                    _prefix, _NS, _localName = XmlUtil.clarkNotationToPrefixNsLocalname(elt, attrTag, isAttribute=True)
+                    if _prefix:
+                        prefixUsed(val, _NS, _prefix)
+        elif val.isEIOPA_2_0_1:
+            if elt.tag in ("{http://www.w3.org/2001/XMLSchema}documentation", "{http://www.w3.org/2001/XMLSchema}annotation"):
+                modelXbrl.error("EIOPA.2.5",
+                    _("xs:documentation element found, all relevant business data MUST only be contained in contexts, units, schemaRef and facts."),
+                    modelObject=modelXbrl.modelDocument)
+            elif isinstance(elt, etree._Comment):
+                modelXbrl.error("EIOPA.2.5",
+                    _("XML comment found, all relevant business data MUST only be contained in contexts, units, schemaRef and facts: %(comment)s"),
+                    modelObject=modelXbrl.modelDocument, comment=elt.text)
+
+def factsOrModelXbrl(val, factsOrQnames):
+    # facts noted for a message, or modelXbrl if they are qnames (noted when streaming)
+    return [f for f in factsOrQnames if isinstance(f, ModelFact)] or val.modelXbrl
+
+def priorEquivalent(obj, objects, priorId, hashAttr):
+    # prior context or unit, by id, of the same hash as obj: the prior object if equal to obj, else None,
+    # or modelXbrl if streaming dropped it (its id may have been reused) and only the equal hash is known
+    prior = objects.get(priorId)
+    if prior is None or getattr(prior, hashAttr) != getattr(obj, hashAttr):
+        return obj.modelXbrl
+    return prior if obj.isEqualTo(prior) else None
+
+def factKeyEntries(val, priorFacts, cntxHash):
+    # (objectIndex, contextID) of the fact key entry or entries of unequal prior facts of a key
+    if priorFacts is None:
+        return ()
+    if not isinstance(priorFacts, list):
+        priorFacts = (priorFacts,)
+    return [entry if isinstance(entry, tuple) else (entry, val.cntxHashes[cntxHash])
+            for entry in priorFacts]
+
 def validateStreamingFacts(val, factsToCheck, *args, **kwargs):
     if not (val.validateEBA or val.validateEIOPA):
         return True
@@ -167,9 +220,11 @@ def validateStreamingFacts(val, factsToCheck, *args, **kwargs):
 
 def validateFacts(val, factsToCheck):
     # may be called in streaming batches or all at end (final) if not streaming
+    # contexts and units are checked in the first batch they are present in, facts of the batch in one pass,
+    # and findings across batches are accumulated in val for final, so messages are the same when streaming
 
     modelXbrl = val.modelXbrl
-    modelDocument = modelXbrl.modelDocument
+    isStreamingMode = getattr(modelXbrl, "isStreamingMode", False)
 
     # note EBA 2.1 is in ModelDocument.py
 
@@ -194,8 +249,7 @@ def validateFacts(val, factsToCheck):
                     modelObject=cntx)
         elif cntx.isInstantPeriod:
             # cannot pass context object to final() below, for error logging, if streaming mode
-            val.cntxDates[cntx.instantDatetime].add(modelXbrl if getattr(val.modelXbrl, "isStreamingMode", False)
-                                                    else cntx)
+            val.cntxDates[cntx.instantDatetime].add(modelXbrl if isStreamingMode else cntx)
         if cntx.hasSegment:
             modelXbrl.error(("EBA.2.14","EIOPA.N.2.14"),
                 _("Contexts MUST NOT contain xbrli:segment values: %(cntx)s.'"),
@@ -210,24 +264,245 @@ def validateFacts(val, factsToCheck):
             modelXbrl.warning("EIOPA.S.2.6",
                 _("Contexts IDs SHOULD be short: %(cntx)s.'"),
                 modelObject=cntx, cntx=cntx.id)
+        h = cntx.contextDimAwareHash
+        prior = (priorEquivalent(cntx, modelXbrl.contexts, val.cntxHashes[h], "contextDimAwareHash")
+                 if h in val.cntxHashes else None)
+        if prior is not None:
+            modelXbrl.log("WARNING" if val.isEIOPAfullVersion else "ERROR",
+                "EIOPA.S.2.7.b",
+                _("Duplicate contexts MUST NOT be reported, contexts %(cntx1)s and %(cntx2)s are equivalent.'"),
+                modelObject=(cntx, prior), cntx1=cntx.id, cntx2=val.cntxHashes[h])
+        else:
+            val.cntxHashes[h] = cntx.id
+        for _dim in cntx.qnameDims.values():
+            _dimQn = _dim.dimensionQname
+            prefixUsed(val, _dimQn.namespaceURI, _dimQn.prefix)
+            if _dim.isExplicit:
+                _memQn = _dim.memberQname
+            else:
+                _memQn = _dim.typedMember.qname
+            if _memQn:
+                prefixUsed(val, _memQn.namespaceURI, _memQn.prefix)
+        recordPrefixesUsed(val, cntx)
 
     for unit in modelXbrl.units.values():
         if getattr(unit, "_batchChecked", False):
             continue # prior streaming batch already checked
         unit._batchChecked = True
         val.unusedUnitIDs.add(unit.id)
+        h = unit.hash
+        prior = priorEquivalent(unit, modelXbrl.units, val.unitHashes[h], "hash") if h in val.unitHashes else None
+        if prior is not None:
+            modelXbrl.warning("EBA.2.21",
+                _("Duplicate units SHOULD NOT be reported, units %(unit1)s and %(unit2)s have same measures.'"),
+                modelObject=(unit, prior), unit1=unit.id, unit2=val.unitHashes[h])
+            modelXbrl.error("EIOPA.2.21",
+                _("Duplicate units MUST NOT be reported, units %(unit1)s and %(unit2)s have same measures.'"),
+                modelObject=(unit, prior), unit1=unit.id, unit2=val.unitHashes[h])
+        else:
+            val.unitHashes[h] = unit.id
+        for _measures in unit.measures:
+            for _measure in _measures:
+                prefixUsed(val, _measure.namespaceURI, _measure.prefix)
+        recordPrefixesUsed(val, unit)
 
-    factsByQname = defaultdict(set) # top level for this
+    fIndicatorsTuples = []
+    rootFilingIndicators = []
     for f in factsToCheck:
-        factsByQname[f.qname].add(f)
         val.unusedCntxIDs.discard(f.contextID)
         val.unusedUnitIDs.discard(f.unitID)
         if f.objectIndex < val.firstFactObjectIndex:
             val.firstFactObjectIndex = f.objectIndex
             val.firstFact = f
-
-
-    for fIndicators in factsByQname[qnFIndicators]:
+        recordPrefixesUsed(val, f)
+        if f.qname == qnFIndicators:
+            fIndicatorsTuples.append(f)
+            continue # skip root-level and non-root-level filing indicators
+        if f.qname == qnFilingIndicator:
+            rootFilingIndicators.append(f)
+        if modelXbrl.skipDTS:
+            c = f.qname.localName[0]
+            isNumeric = c in ('m', 'p', 'r', 'i')
+            isMonetary = c == 'm'
+            isInteger = c == 'i'
+            isPercent = c == 'p'
+            isString = c == 's'
+            isEnum = c == 'e'
+        else:
+            concept = f.concept
+            if concept is not None:
+                isNumeric = concept.isNumeric
+                isMonetary = concept.isMonetary
+                isInteger = concept.baseXbrliType in integerItemTypes
+                isPercent = concept.typeQname in (qnPercentItemType, qnPureItemType)
+                isString = concept.baseXbrliType in ("stringItemType", "normalizedStringItemType")
+                isEnum = concept.typeQname in qnEnumerationItemTypes
+            else:
+                isNumeric = isString = isEnum = False # error situation
+        # facts of prior streaming batches are noted by compact key, the first of equal facts by a compact entry
+        cntxHash = f.context.contextDimAwareHash if f.context is not None else None
+        k = (f.getparent().objectIndex,
+             f.qname,
+             cntxHash,
+             f.unit.hash if f.unit is not None else None,
+             f.xmlLang and sys.intern(f.xmlLang))
+        priorFacts = val.factKeys.get(k)
+        matches = [(objectIndex, contextID)
+                   for objectIndex, contextID in factKeyEntries(val, priorFacts, cntxHash)
+                   if f.context is None or
+                      priorEquivalent(f.context, modelXbrl.contexts, contextID, "contextDimAwareHash") is not None]
+        if matches:
+            contexts = [f.contextID] + [contextID for _objectIndex, contextID in matches]
+            modelXbrl.error(("EBA.2.16", "EIOPA.S.2.16" if val.isEIOPAfullVersion else "EIOPA.S.2.16.a"),
+                            _('Facts are duplicates %(fact)s contexts %(contexts)s.'),
+                            modelObject=[f] + [o for o in (modelXbrl.modelObject(objectIndex) for objectIndex, _contextID in matches)
+                                               if o is not None],
+                            fact=f.qname, contexts=', '.join(contexts),
+                            messageCodes=("EBA.2.16", "EIOPA.S.2.16", "EIOPA.S.2.16.a"))
+        else:
+            if f.contextID == val.cntxHashes.get(cntxHash):
+                entry = f.objectIndex # context is the first of its hash, noted in cntxHashes
+            else:
+                entry = (f.objectIndex, sys.intern(f.contextID or ""))
+            if priorFacts is None:
+                val.factKeys[k] = entry
+            elif isinstance(priorFacts, list):
+                priorFacts.append(entry)
+            else:
+                val.factKeys[k] = [priorFacts, entry]
+        if isNumeric:
+            if f.precision:
+                modelXbrl.error(("EBA.2.17", "EIOPA.2.18.a"),
+                    _("Numeric fact %(fact)s of context %(contextID)s has a precision attribute '%(precision)s'"),
+                    modelObject=f, fact=f.qname, contextID=f.contextID, precision=f.precision)
+            if f.decimals and not f.isNil: # in XbrlDpmSqlDB for 2_0_1
+                if f.decimals == "INF":
+                    if not val.isEIOPAfullVersion:
+                        modelXbrl.error("EIOPA.S.2.18.f",
+                            _("Monetary fact %(fact)s of context %(contextID)s has a decimal attribute INF: '%(decimals)s'"),
+                            modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
+                else:
+                    try:
+                        xValue = f.xValue
+                        dec = int(f.decimals)
+                        if isMonetary:
+                            if val.isEIOPA_2_0_1:
+                                _absXvalue = abs(xValue)
+                                if str(f.qname) in s_2_18_c_a_met:
+                                    dMin = 2
+                                elif _absXvalue >= 100000000:
+                                    dMin = -4
+                                elif 100000000 > _absXvalue >= 1000000:
+                                    dMin = -3
+                                elif 1000000 > _absXvalue >= 1000:
+                                    dMin = -2
+                                else:
+                                    dMin = -1
+                                if dMin > dec:
+                                    modelXbrl.error("EIOPA.S.2.18.c",
+                                        _("Monetary fact %(fact)s of context %(contextID)s has a decimals attribute less than minimum %(minimumDecimals)s: '%(decimals)s'"),
+                                        modelObject=f, fact=f.qname, contextID=f.contextID, minimumDecimals=dMin, decimals=f.decimals)
+                            elif dec < -3:
+                                modelXbrl.error(("EBA.2.18","EIOPA.S.2.18.c"),
+                                    _("Monetary fact %(fact)s of context %(contextID)s has a decimals attribute < -3: '%(decimals)s'"),
+                                    modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
+                            else: # apply dynamic decimals check
+                                if  -.1 < xValue < .1: dMin = 2
+                                elif -1 < xValue < 1: dMin = 1
+                                elif -10 < xValue < 10: dMin = 0
+                                elif -100 < xValue < 100: dMin = -1
+                                elif -1000 < xValue < 1000: dMin = -2
+                                else: dMin = -3
+                                if dMin > dec:
+                                    modelXbrl.warning("EIOPA:factDecimalsWarning",
+                                        _("Monetary fact %(fact)s of context %(contextID)s value %(value)s has an imprecise decimals attribute: %(decimals)s, minimum is %(mindec)s"),
+                                        modelObject=f, fact=f.qname, contextID=f.contextID, value=xValue, decimals=f.decimals, mindec=dMin)
+                        elif isInteger:
+                            if dec != 0:
+                                modelXbrl.error(("EBA.2.18","EIOPA.S.2.18.d"),
+                                    _("Integer fact %(fact)s of context %(contextID)s has a decimals attribute \u2260 0: '%(decimals)s'"),
+                                    modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
+                        elif isPercent:
+                            if dec < 4:
+                                modelXbrl.error(("EBA.2.18","EIOPA.S.2.18.e"),
+                                    _("Percent fact %(fact)s of context %(contextID)s has a decimals attribute < 4: '%(decimals)s'"),
+                                    modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
+                            if val.isEIOPA_2_0_1 and xValue > 1:
+                                modelXbrl.warning(("EIOPA.3.2.b"),
+                                    _("Percent fact %(fact)s of context %(contextID)s appears to be over 100% = 1.0: '%(value)s'"),
+                                    modelObject=f, fact=f.qname, contextID=f.contextID, value=xValue)
+                        else:
+                            if -.001 < xValue < .001: dMin = 4
+                            elif -.01 < xValue < .01: dMin = 3
+                            elif -.1 < xValue < .1: dMin = 2
+                            elif  -1 < xValue < 1: dMin = 1
+                            else: dMin = 0
+                            if dMin > dec:
+                                modelXbrl.warning("EIOPA:factDecimalsWarning",
+                                    _("Numeric fact %(fact)s of context %(contextID)s value %(value)s has an imprecise decimals attribute: %(decimals)s, minimum is %(mindec)s"),
+                                    modelObject=f, fact=f.qname, contextID=f.contextID, value=xValue, decimals=f.decimals, mindec=dMin)
+                    except (AttributeError, ValueError, TypeError):
+                        pass # should have been reported as a schema error by loader (or no xValue when skipDTS)
+                    '''' (not intended by EBA 2.18, paste here is from EFM)
+                    if not f.isNil and getattr(f,"xValid", 0) == 4:
+                        try:
+                            insignificance = insignificantDigits(f.xValue, decimals=f.decimals)
+                            if insignificance: # if not None, returns (truncatedDigits, insiginficantDigits)
+                                modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
+                                    _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s has nonzero digits in insignificant portion %(insignificantDigits)s."),
+                                    modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals,
+                                    value=f1.xValue, truncatedDigits=insignificance[0], insignificantDigits=insignificance[1])
+                        except (ValueError,TypeError):
+                            modelXbrl.error(("EBA.2.18"),
+                                _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s causes Value Error exception."),
+                                modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals, value=f1.value)
+                    '''
+            unit = f.unit
+            if unit is not None:
+                if isMonetary:
+                    if unit.measures[0]:
+                        _currencyMeasure = unit.measures[0][0]
+                        if val.isEIOPA_2_0_1 and f.context is not None:
+                            if f.context.dimMemberQname(val.qnDimAF) == val.qnCAx1 and val.qnDimOC in f.context.qnameDims:
+                                _ocCurrency = f.context.dimMemberQname(val.qnDimOC).localName
+                                if _currencyMeasure.localName != _ocCurrency:
+                                    modelXbrl.error("EIOPA.3.1",
+                                        _("There MUST be only one currency but metric %(metric)s reported OC dimension currency %(ocCurrency)s differs from unit currency: %(unitCurrency)s."),
+                                        modelObject=f, metric=f.qname, ocCurrency=_ocCurrency, unitCurrency=_currencyMeasure.localName)
+                            else:
+                                val.currenciesUsed[_currencyMeasure] = unit
+                        elif val.validateEBA and f.context is not None:
+                            if f.context.dimMemberQname(val.eba_qnDimCCA) == val.eba_qnCAx1 and val.eba_qnDimCUS in f.context.qnameDims:
+                                currency = f.context.dimMemberQname(val.eba_qnDimCUS).localName
+                                if _currencyMeasure.localName != currency:
+                                    modelXbrl.error("EBA.3.1",
+                                        _("There MUST be only one currency but metric %(metric)s reported CCA dimension currency %(currency)s differs from unit currency: %(unitCurrency)s."),
+                                        modelObject=f, metric=f.qname, currency=currency, unitCurrency=_currencyMeasure.localName)
+                            else:
+                                val.currenciesUsed[_currencyMeasure] = unit
+                        else:
+                            val.currenciesUsed[_currencyMeasure] = unit
+                elif not unit.isSingleMeasure or unit.measures[0][0] != XbrlConst.qnXbrliPure:
+                    val.nonMonetaryNonPureFacts.append(f.qname if isStreamingMode else f)
+        if isEnum:
+            _eQn = getattr(f,"xValue", None) or qnameEltPfxName(f, f.value)
+            if _eQn:
+                prefixUsed(val, _eQn.namespaceURI, _eQn.prefix)
+                if val.isEIOPA_2_0_1 and f.qname.localName == "ei1930":
+                    val.reportingCurrency = _eQn.localName
+        elif isString:
+            if f.xmlLang: # requires disclosureSystem to NOT specify default language
+                val.stringFactsWithXmlLang.append(f.qname if isStreamingMode else f)
+
+        if f.isNil:
+            val.nilFacts.append(f.qname if isStreamingMode else f)
+
+        if val.footnotesRelationshipSet.fromModelObject(f):
+            modelXbrl.warning("EIOPA.S.19",
+                _("Fact %(fact)s of context %(contextID)s has footnotes.'"),
+                modelObject=f, fact=f.qname, contextID=f.contextID)
+
+    for fIndicators in fIndicatorsTuples:
         val.numFilingIndicatorTuples += 1
         for fIndicator in fIndicators.modelTupleFacts:
             _value = (getattr(fIndicator, "xValue", None) or fIndicator.value) # use validated xValue if DTS else value for skipDTS
@@ -257,7 +532,7 @@ def validateFacts(val, factsToCheck):
             prevObj = prevObj.getprevious()
 
     if val.isEIOPAfullVersion:
-        for fIndicator in factsByQname[qnFilingIndicator]:
+        for fIndicator in rootFilingIndicators:
             if fIndicator.getparent().qname == XbrlConst.qnXbrliXbrl:
                 _isPos = fIndicator.get("{http://www.eurofiling.info/xbrl/ext/filing-indicators}filed", "true") in ("true", "1")
                 _value = (getattr(fIndicator, "xValue", None) or fIndicator.value) # use validated xValue if DTS else value for skipDTS
@@ -266,261 +541,8 @@ def validateFacts(val, factsToCheck):
                         modelObject=fIndicator, filingIndicator=_value,
                         messageCodes=("EIOPA.1.6.a", "EIOPA.1.6.b"))
 
-    otherFacts = {} # (contextHash, unitHash, xmlLangHash) : fact
-    nilFacts = []
-    stringFactsWithXmlLang = []
-    nonMonetaryNonPureFacts = []
-    for qname, facts in factsByQname.items():
-        for f in facts:
-            if f.qname == qnFIndicators or f.qname == qnFIndicators:
-                continue # skip root-level and non-root-level filing indicators
-            if modelXbrl.skipDTS:
-                c = f.qname.localName[0]
-                isNumeric = c in ('m', 'p', 'r', 'i')
-                isMonetary = c == 'm'
-                isInteger = c == 'i'
-                isPercent = c == 'p'
-                isString = c == 's'
-                isEnum = c == 'e'
-            else:
-                concept = f.concept
-                if concept is not None:
-                    isNumeric = concept.isNumeric
-                    isMonetary = concept.isMonetary
-                    isInteger = concept.baseXbrliType in integerItemTypes
-                    isPercent = concept.typeQname in (qnPercentItemType, qnPureItemType)
-                    isString = concept.baseXbrliType in ("stringItemType", "normalizedStringItemType")
-                    isEnum = concept.typeQname in qnEnumerationItemTypes
-                else:
-                    isNumeric = isString = isEnum = False # error situation
-            k = (f.getparent().objectIndex,
-                 f.qname,
-                 f.context.contextDimAwareHash if f.context is not None else None,
-                 f.unit.hash if f.unit is not None else None,
-                 hash(f.xmlLang))
-            if k not in otherFacts:
-                otherFacts[k] = {f}
-            else:
-                matches = [o
-                           for o in otherFacts[k]
-                           if (f.getparent().objectIndex == o.getparent().objectIndex and
-                               f.qname == o.qname and
-                               f.context.isEqualTo(o.context) if f.context is not None and o.context is not None else True) and
-                               # (f.unit.isEqualTo(o.unit) if f.unit is not None and o.unit is not None else True) and
-                              (f.xmlLang == o.xmlLang)]
-                if matches:
-                    contexts = [f.contextID] + [o.contextID for o in matches]
-                    modelXbrl.error(("EBA.2.16", "EIOPA.S.2.16" if val.isEIOPAfullVersion else "EIOPA.S.2.16.a"),
-                                    _('Facts are duplicates %(fact)s contexts %(contexts)s.'),
-                                    modelObject=[f] + matches, fact=f.qname, contexts=', '.join(contexts),
-                                    messageCodes=("EBA.2.16", "EIOPA.S.2.16", "EIOPA.S.2.16.a"))
-                else:
-                    otherFacts[k].add(f)
-            if isNumeric:
-                if f.precision:
-                    modelXbrl.error(("EBA.2.17", "EIOPA.2.18.a"),
-                        _("Numeric fact %(fact)s of context %(contextID)s has a precision attribute '%(precision)s'"),
-                        modelObject=f, fact=f.qname, contextID=f.contextID, precision=f.precision)
-                if f.decimals and not f.isNil: # in XbrlDpmSqlDB for 2_0_1
-                    if f.decimals == "INF":
-                        if not val.isEIOPAfullVersion:
-                            modelXbrl.error("EIOPA.S.2.18.f",
-                                _("Monetary fact %(fact)s of context %(contextID)s has a decimal attribute INF: '%(decimals)s'"),
-                                modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
-                    else:
-                        try:
-                            xValue = f.xValue
-                            dec = int(f.decimals)
-                            if isMonetary:
-                                if val.isEIOPA_2_0_1:
-                                    _absXvalue = abs(xValue)
-                                    if str(f.qname) in s_2_18_c_a_met:
-                                        dMin = 2
-                                    elif _absXvalue >= 100000000:
-                                        dMin = -4
-                                    elif 100000000 > _absXvalue >= 1000000:
-                                        dMin = -3
-                                    elif 1000000 > _absXvalue >= 1000:
-                                        dMin = -2
-                                    else:
-                                        dMin = -1
-                                    if dMin > dec:
-                                        modelXbrl.error("EIOPA.S.2.18.c",
-                                            _("Monetary fact %(fact)s of context %(contextID)s has a decimals attribute less than minimum %(minimumDecimals)s: '%(decimals)s'"),
-                                            modelObject=f, fact=f.qname, contextID=f.contextID, minimumDecimals=dMin, decimals=f.decimals)
-                                elif dec < -3:
-                                    modelXbrl.error(("EBA.2.18","EIOPA.S.2.18.c"),
-                                        _("Monetary fact %(fact)s of context %(contextID)s has a decimals attribute < -3: '%(decimals)s'"),
-                                        modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
-                                else: # apply dynamic decimals check
-                                    if  -.1 < xValue < .1: dMin = 2
-                                    elif -1 < xValue < 1: dMin = 1
-                                    elif -10 < xValue < 10: dMin = 0
-                                    elif -100 < xValue < 100: dMin = -1
-                                    elif -1000 < xValue < 1000: dMin = -2
-                                    else: dMin = -3
-                                    if dMin > dec:
-                                        modelXbrl.warning("EIOPA:factDecimalsWarning",
-                                            _("Monetary fact %(fact)s of context %(contextID)s value %(value)s has an imprecise decimals attribute: %(decimals)s, minimum is %(mindec)s"),
-                                            modelObject=f, fact=f.qname, contextID=f.contextID, value=xValue, decimals=f.decimals, mindec=dMin)
-                            elif isInteger:
-                                if dec != 0:
-                                    modelXbrl.error(("EBA.2.18","EIOPA.S.2.18.d"),
-                                        _("Integer fact %(fact)s of context %(contextID)s has a decimals attribute \u2260 0: '%(decimals)s'"),
-                                        modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
-                            elif isPercent:
-                                if dec < 4:
-                                    modelXbrl.error(("EBA.2.18","EIOPA.S.2.18.e"),
-                                        _("Percent fact %(fact)s of context %(contextID)s has a decimals attribute < 4: '%(decimals)s'"),
-                                        modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals)
-                                if val.isEIOPA_2_0_1 and xValue > 1:
-                                    modelXbrl.warning(("EIOPA.3.2.b"),
-                                        _("Percent fact %(fact)s of context %(contextID)s appears to be over 100% = 1.0: '%(value)s'"),
-                                        modelObject=f, fact=f.qname, contextID=f.contextID, value=xValue)
-                            else:
-                                if -.001 < xValue < .001: dMin = 4
-                                elif -.01 < xValue < .01: dMin = 3
-                                elif -.1 < xValue < .1: dMin = 2
-                                elif  -1 < xValue < 1: dMin = 1
-                                else: dMin = 0
-                                if dMin > dec:
-                                    modelXbrl.warning("EIOPA:factDecimalsWarning",
-                                        _("Numeric fact %(fact)s of context %(contextID)s value %(value)s has an imprecise decimals attribute: %(decimals)s, minimum is %(mindec)s"),
-                                        modelObject=f, fact=f.qname, contextID=f.contextID, value=xValue, decimals=f.decimals, mindec=dMin)
-                        except (AttributeError, ValueError):
-                            pass # should have been reported as a schema error by loader
-                        '''' (not intended by EBA 2.18, paste here is from EFM)
-                        if not f.isNil and getattr(f,"xValid", 0) == 4:
-                            try:
-                                insignificance = insignificantDigits(f.xValue, decimals=f.decimals)
-                                if insignificance: # if not None, returns (truncatedDigits, insiginficantDigits)
-                                    modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
-                                        _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s has nonzero digits in insignificant portion %(insignificantDigits)s."),
-                                        modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals,
-                                        value=f1.xValue, truncatedDigits=insignificance[0], insignificantDigits=insignificance[1])
-                            except (ValueError,TypeError):
-                                modelXbrl.error(("EBA.2.18"),
-                                    _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s causes Value Error exception."),
-                                    modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals, value=f1.value)
-                        '''
-                unit = f.unit
-                if unit is not None:
-                    if isMonetary:
-                        if unit.measures[0]:
-                            _currencyMeasure = unit.measures[0][0]
-                            if val.isEIOPA_2_0_1 and f.context is not None:
-                                if f.context.dimMemberQname(val.qnDimAF) == val.qnCAx1 and val.qnDimOC in f.context.qnameDims:
-                                    _ocCurrency = f.context.dimMemberQname(val.qnDimOC).localName
-                                    if _currencyMeasure.localName != _ocCurrency:
-                                        modelXbrl.error("EIOPA.3.1",
-                                            _("There MUST be only one currency but metric %(metric)s reported OC dimension currency %(ocCurrency)s differs from unit currency: %(unitCurrency)s."),
-                                            modelObject=f, metric=f.qname, ocCurrency=_ocCurrency, unitCurrency=_currencyMeasure.localName)
-                                else:
-                                    val.currenciesUsed[_currencyMeasure] = unit
-                            elif val.validateEBA and f.context is not None:
-                                if f.context.dimMemberQname(val.eba_qnDimCCA) == val.eba_qnCAx1 and val.eba_qnDimCUS in f.context.qnameDims:
-                                    currency = f.context.dimMemberQname(val.eba_qnDimCUS).localName
-                                    if _currencyMeasure.localName != currency:
-                                        modelXbrl.error("EBA.3.1",
-                                            _("There MUST be only one currency but metric %(metric)s reported CCA dimension currency %(currency)s differs from unit currency: %(unitCurrency)s."),
-                                            modelObject=f, metric=f.qname, currency=currency, unitCurrency=_currencyMeasure.localName)
-                                else:
-                                    val.currenciesUsed[_currencyMeasure] = unit
-                            else:
-                                val.currenciesUsed[_currencyMeasure] = unit
-                    elif not unit.isSingleMeasure or unit.measures[0][0] != XbrlConst.qnXbrliPure:
-                        nonMonetaryNonPureFacts.append(f)
-            if isEnum:
-                _eQn = getattr(f,"xValue", None) or qnameEltPfxName(f, f.value)
-                if _eQn:
-                    prefixUsed(val, _eQn.namespaceURI, _eQn.prefix)
-                    if val.isEIOPA_2_0_1 and f.qname.localName == "ei1930":
-                        val.reportingCurrency = _eQn.localName
-            elif isString:
-                if f.xmlLang: # requires disclosureSystem to NOT specify default language
-                    stringFactsWithXmlLang.append(f)
-
-            if f.isNil:
-                nilFacts.append(f)
-
-            if val.footnotesRelationshipSet.fromModelObject(f):
-                modelXbrl.warning("EIOPA.S.19",
-                    _("Fact %(fact)s of context %(contextID)s has footnotes.'"),
-                    modelObject=f, fact=f.qname, contextID=f.contextID)
-
-    if nilFacts:
-        modelXbrl.error(("EBA.2.19", "EIOPA.S.2.19"),
-                _('Nil facts MUST NOT be present in the instance: %(nilFacts)s.'),
-                modelObject=nilFacts, nilFacts=", ".join(str(f.qname) for f in nilFacts))
-    if stringFactsWithXmlLang:
-        modelXbrl.warning("EIOPA.2.20", # not reported for EBA
-                          _("String facts reporting xml:lang (not saved by T4U, not round-tripped): '%(factsWithLang)s'"),
-                          modelObject=stringFactsWithXmlLang, factsWithLang=", ".join(set(str(f.qname) for f in stringFactsWithXmlLang)))
-    if nonMonetaryNonPureFacts:
-        modelXbrl.error(("EBA.3.2","EIOPA.3.2.a"),
-                        _("Non monetary (numeric) facts MUST use the pure unit: '%(langLessFacts)s'"),
-                        modelObject=nonMonetaryNonPureFacts, langLessFacts=", ".join(set(str(f.qname) for f in nonMonetaryNonPureFacts)))
-
     val.utrValidator.validateFacts() # validate facts for UTR at logLevel WARNING
 
-    unitHashes = {}
-    for unit in modelXbrl.units.values():
-        h = unit.hash
-        if h in unitHashes and unit.isEqualTo(unitHashes[h]):
-            modelXbrl.warning("EBA.2.21",
-                _("Duplicate units SHOULD NOT be reported, units %(unit1)s and %(unit2)s have same measures.'"),
-                modelObject=(unit, unitHashes[h]), unit1=unit.id, unit2=unitHashes[h].id)
-            if not getattr(modelXbrl, "isStreamingMode", False):
-                modelXbrl.error("EIOPA.2.21",
-                    _("Duplicate units MUST NOT be reported, units %(unit1)s and %(unit2)s have same measures.'"),
-                    modelObject=(unit, unitHashes[h]), unit1=unit.id, unit2=unitHashes[h].id)
-        else:
-            unitHashes[h] = unit
-        for _measures in unit.measures:
-            for _measure in _measures:
-                prefixUsed(val, _measure.namespaceURI, _measure.prefix)
-
-    del unitHashes
-
-    cntxHashes = {}
-    for cntx in modelXbrl.contexts.values():
-        h = cntx.contextDimAwareHash
-        if h in cntxHashes and cntx.isEqualTo(cntxHashes[h]):
-            if not getattr(modelXbrl, "isStreamingMode", False):
-                modelXbrl.log("WARNING" if val.isEIOPAfullVersion else "ERROR",
-                    "EIOPA.S.2.7.b",
-                    _("Duplicate contexts MUST NOT be reported, contexts %(cntx1)s and %(cntx2)s are equivalent.'"),
-                    modelObject=(cntx, cntxHashes[h]), cntx1=cntx.id, cntx2=cntxHashes[h].id)
-        else:
-            cntxHashes[h] = cntx
-        for _dim in cntx.qnameDims.values():
-            _dimQn = _dim.dimensionQname
-            prefixUsed(val, _dimQn.namespaceURI, _dimQn.prefix)
-            if _dim.isExplicit:
-                _memQn = _dim.memberQname
-            else:
-                _memQn = _dim.typedMember.qname
-            if _memQn:
-                prefixUsed(val, _memQn.namespaceURI, _memQn.prefix)
-
-    for elt in modelDocument.xmlRootElement.iter():
-        if isinstance(elt, ModelObject): # skip comments and processing instructions
-            prefixUsed(val, elt.qname.namespaceURI, elt.qname.prefix)
-            for attrTag in elt.keys():
-                if attrTag.startswith("{"):
-                    _prefix, _NS, _localName = XmlUtil.clarkNotationToPrefixNsLocalname(elt, attrTag, isAttribute=True)
-                    if _prefix:
-                        prefixUsed(val, _NS, _prefix)
-        elif val.isEIOPA_2_0_1:
-            if elt.tag in ("{http://www.w3.org/2001/XMLSchema}documentation", "{http://www.w3.org/2001/XMLSchema}annotation"):
-                modelXbrl.error("EIOPA.2.5",
-                    _("xs:documentation element found, all relevant business data MUST only be contained in contexts, units, schemaRef and facts."),
-                    modelObject=modelDocument)
-            elif isinstance(elt, etree._Comment):
-                modelXbrl.error("EIOPA.2.5",
-                    _("XML comment found, all relevant business data MUST only be contained in contexts, units, schemaRef and facts: %(comment)s"),
-                    modelObject=modelDocument, comment=elt.text)
-
 def validateNonStreamingFinish(val, *args, **kwargs):
     # non-streaming EBA checks, ignore when streaming (first all from ValidateXbrl.py)
     if not getattr(val.modelXbrl, "isStreamingMode", False):
@@ -625,6 +647,26 @@ def final(val):
                             _("Successful XBRL facts sum of md5s."),
                             modelObject=modelXbrl)
 
+        recordPrefixesUsed(val, modelDocument.xmlRootElement, isRootOnly=True)
+        for elt in modelDocument.xmlRootElement.iterchildren():
+            if not (isinstance(elt, ModelFact) or getattr(elt, "_batchChecked", False)): # not checked in batches
+                recordPrefixesUsed(val, elt)
+
+        if val.nilFacts:
+            modelXbrl.error(("EBA.2.19", "EIOPA.S.2.19"),
+                    _('Nil facts MUST NOT be present in the instance: %(nilFacts)s.'),
+                    modelObject=factsOrModelXbrl(val, val.nilFacts), nilFacts=", ".join(str(getattr(f, "qname", f)) for f in val.nilFacts))
+        if val.stringFactsWithXmlLang:
+            modelXbrl.warning("EIOPA.2.20", # not reported for EBA
+                              _("String facts reporting xml:lang (not saved by T4U, not round-tripped): '%(factsWithLang)s'"),
+                              modelObject=factsOrModelXbrl(val, val.stringFactsWithXmlLang),
+                              factsWithLang=", ".join(set(str(getattr(f, "qname", f)) for f in val.stringFactsWithXmlLang)))
+        if val.nonMonetaryNonPureFacts:
+            modelXbrl.error(("EBA.3.2","EIOPA.3.2.a"),
+                            _("Non monetary (numeric) facts MUST use the pure unit: '%(langLessFacts)s'"),
+                            modelObject=factsOrModelXbrl(val, val.nonMonetaryNonPureFacts),
+                            langLessFacts=", ".join(set(str(getattr(f, "qname", f)) for f in val.nonMonetaryNonPureFacts)))
+
         if any(badError in modelXbrl.errors
                for badError in ("EBA.2.1", "EIOPA.2.1", "EIOPA.S.1.5.a/EIOPA.S.1.5.b")):
             pass # skip checking filingIndicators if bad errors
@@ -736,6 +778,7 @@ def final(val):
 
     del val.prefixNamespace, val.namespacePrefix, val.idObjects, val.typedDomainElements
     del val.utrValidator, val.firstFact, val.footnotesRelationshipSet
+    del val.cntxHashes, val.unitHashes, val.factKeys, val.nilFacts, val.stringFactsWithXmlLang, val.nonMonetaryNonPureFacts
 
 __pluginInfo__ = {
     # Do not use _( ) in pluginInfo itself (it is applied later, after loading
@@ -10,13 +10,12 @@ Implementation of DQC rules invokes https://xbrl.us/dqc-license and https://xbrl
 '''
 import datetime, decimal, json, unicodedata, holidays, fnmatch
 import regex as re
-from math import isnan, pow
+from math import pow
 from collections import defaultdict, OrderedDict
 from pytz import timezone
-from arelle import (ModelDocument, ModelValue, ModelRelationshipSet,
+from arelle import (ModelDocument, ModelValue,
                     XmlUtil, XbrlConst, ValidateFilingText)
 from arelle.ModelValue import qname, QName, dateUnionEqual
-from arelle.ValidateXbrlCalcs import insignificantDigits
 from arelle.ModelObject import ModelObject
 from arelle.ModelInstanceObject import ModelFact, ModelInlineFact, ModelInlineFootnote
 from arelle.ModelDtsObject import ModelConcept, ModelResource
@@ -24,8 +23,7 @@ from arelle.ModelXbrl import NONDEFAULT
 from arelle.PluginManager import pluginClassMethods
 from arelle.PrototypeDtsObject import LinkPrototype, LocPrototype, ArcPrototype
 from arelle.PythonUtil import pyNamedObject, strTruncate, flattenSequence, flattenToSet, OrderedSet
-from arelle.UrlUtil import isHttpUrl
-from arelle.ValidateXbrlCalcs import inferredDecimals, rangeValue, roundValue, ONE
+from arelle.ValidateXbrlCalcs import roundValue, ONE
 from arelle.XmlValidate import VALID
 from .DTS import checkFilingDTS
 from .Consts import submissionTypesAllowingWellKnownSeasonedIssuer, \
@@ -44,10 +42,11 @@ from .Consts import submissionTypesAllowingWellKnownSeasonedIssuer, \
 
 from .Dimensions import checkFilingDimensions
 from .PreCalAlignment import checkCalcsTreeWalk
+from .Rules import RulesPass, FACTS, CONTEXTS, LABELS, REFERENCES, LINKBASES, ROLE_TYPES, ARCROLE_TYPES
 from .Util import conflictClassFromNamespace, abbreviatedNamespace, NOYEAR, WITHYEARandWILD, loadDeprecatedConceptDates, \
                     loadCustomAxesReplacements, loadNonNegativeFacts, loadDeiValidations, loadOtherStandardTaxonomies, \
                     loadUgtRelQnames, loadDqcRules, factBindings, leastDecimals, axisMemQnames, memChildQnames, \
-                    loadTaxonomyCompatibility, loadIxTransformRegistries
+                    loadTaxonomyCompatibility, loadIxTransformRegistries, isStandardUri
 
 MIN_DOC_PER_END_DATE = ModelValue.dateTime("1980-01-01", type=ModelValue.DATE)
 MAX_DOC_PER_END_DATE = ModelValue.dateTime("2050-12-31", type=ModelValue.DATE)
@@ -69,7 +68,6 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
         return
 
     datePattern = re.compile(r"([12][0-9]{3})-([01][0-9])-([0-3][0-9])")
-    GFMcontextDatePattern = re.compile(r"^[12][0-9]{3}-[01][0-9]-[0-3][0-9]$")
     # note \u20zc = euro, \u00a3 = pound, \u00a5 = yen
     signOrCurrencyPattern = re.compile("^(-)[0-9]+|[^eE](-)[0-9]+|(\\()[0-9].*(\\))|([$\u20ac\u00a3\00a5])")
     instanceFileNamePattern = re.compile(r"^(\w+)-([12][0-9]{3}[01][0-9][0-3][0-9]).xml$")
@@ -244,131 +242,22 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                                 filerIdentifier=",".join(sorted(val.params["cikNameList"].keys()) if "cikNameList" in val.params else []))
             val.modelXbrl.profileActivity("... filer identifier checks", minTimeToShow=1.0)
 
-        #6.5.7 duplicated contexts
+        #6.5 context checks
         contexts = modelXbrl.contexts.values()
         contextIDs = set()
         contextsWithNonNilFacts = set()
-        uniqueContextHashes = {}
-        contextsWithDisallowedOCEs = []
-        contextsWithDisallowedOCEcontent = []
-        nonStandardTypedDimensions = defaultdict(set)
-        nonStandardReplacableDimensions = defaultdict(set)
+        contextRules = RulesPass(val, CONTEXTS, isEFM=isEFM, isGFM=isGFM, validateEFMpragmatic=validateEFMpragmatic,
+                                 customAxesReplacements=customAxesReplacements if isEFM else None)
         for context in contexts:
             contextID = context.id
             contextIDs.add(contextID)
-            h = context.contextDimAwareHash
-            if h in uniqueContextHashes:
-                if context.isEqualTo(uniqueContextHashes[h]):
-                    modelXbrl.error(("EFM.6.05.07", "GFM.1.02.07"),
-                        _("The instance document contained more than one context equivalent to %(context)s (%(context2)s).  "
-                          "Please remove duplicate contexts from the instance."),
-                        edgarCode="du-0507-Duplicate-Contexts",
-                        modelObject=(context, uniqueContextHashes[h]), context=contextID, context2=uniqueContextHashes[h].id)
-            else:
-                uniqueContextHashes[h] = context
-
-            #GFM no time in contexts
-            if isGFM:
-                for dateElt in XmlUtil.children(context, XbrlConst.xbrli, ("startDate", "endDate", "instant")):
-                    dateText = XmlUtil.text(dateElt)
-                    if not GFMcontextDatePattern.match(dateText):
-                        modelXbrl.error("GFM.1.02.25",
-                            _("Context id %(context)s %(elementName)s invalid content %(value)s"),
-                            modelObject=dateElt, context=contextID,
-                            elementName=dateElt.prefixedName, value=dateText)
-            #6.5.4 scenario
-            hasSegment = XmlUtil.hasChild(context, XbrlConst.xbrli, "segment")
-            hasScenario = XmlUtil.hasChild(context, XbrlConst.xbrli, "scenario")
-            notAllowed = None
-            if disclosureSystem.contextElement == "segment" and hasScenario:
-                notAllowed = _("Scenario")
-            elif disclosureSystem.contextElement == "scenario" and hasSegment:
-                notAllowed = _("Segment")
-            elif disclosureSystem.contextElement == "either" and hasSegment and hasScenario:
-                notAllowed = _("Both segment and scenario")
-            elif disclosureSystem.contextElement == "none" and (hasSegment or hasScenario):
-                notAllowed = _("Neither segment nor scenario")
-            if notAllowed:
-                if validateEFMpragmatic:
-                    contextsWithDisallowedOCEs.append(context)
-                else:
-                    modelXbrl.error(("EFM.6.05.04", "GFM.1.02.04"),
-                        _("There must be no contexts with %(elementName)s, but %(count)s was(were) found: %(context)s."),
-                        edgarCode="cp-0504-No-Scenario",
-                        modelObject=context, elementName=notAllowed, context=contextID, count=1)
-
-            #6.5.5 segment only explicit dimensions
-            for contextName in {"segment": ("{http://www.xbrl.org/2003/instance}segment",),
-                                "scenario": ("{http://www.xbrl.org/2003/instance}scenario",),
-                                "either": ("{http://www.xbrl.org/2003/instance}segment","{http://www.xbrl.org/2003/instance}scenario"),
-                                "both": ("{http://www.xbrl.org/2003/instance}segment","{http://www.xbrl.org/2003/instance}scenario"),
-                                "none": [], None:[]
-                                }[disclosureSystem.contextElement]:
-                for segScenElt in context.iterdescendants(contextName):
-                    if isinstance(segScenElt,ModelObject):
-                        _childTagNames = [child.prefixedName for child in segScenElt.iterchildren()
-                                          if isinstance(child,ModelObject) and
-                                             child.tag not in ("{http://xbrl.org/2006/xbrldi}explicitMember",
-                                                               "{http://xbrl.org/2006/xbrldi}typedMember")]
-                        childTags = ", ".join(_childTagNames)
-                        if len(childTags) > 0:
-                            if validateEFMpragmatic:
-                                contextsWithDisallowedOCEcontent.append(context)
-                            else:
-                                modelXbrl.error(("EFM.6.05.05", "GFM.1.02.05"),
-                                                _("There must be no %(elementName)s with non-explicitDimension content, but %(count)s was(were) found: %(content)s."),
-                                                edgarCode="cp-0505-Segment-Child-Not-Explicit-Member",
-                                                modelObject=context, context=contextID, content=childTags, count=len(_childTagNames),
-                                                elementName=contextName.partition("}")[2].title())
+            contextRules.check(context)
             for dim in context.qnameDims.values():
-                if isEFM and dim.dimension is not None and dim.dimensionQname.namespaceURI not in disclosureSystem.standardTaxonomiesDict:
-                    if dim.isTyped:
-                        nonStandardTypedDimensions[dim.dimensionQname].add(context)
-                    if customAxesReplacements.customNamePatterns.match(dim.dimensionQname.localName):
-                        nonStandardReplacableDimensions[dim.dimensionQname].add(context)
                 for _qname in (dim.dimensionQname, dim.memberQname):
                     if _qname in deprecatedConceptDates: # none if typed and then won't be in deprecatedConceptDates
                         deprecatedConceptContexts[contextID].append(_qname)
-            #6.5.38 period forever
-            if context.isForeverPeriod:
-                val.modelXbrl.error("EFM.6.05.38",
-                    _("Context %(contextID)s uses period <xbrli:forever>. Please remove it and resubmit."),
-                    edgarCode="du-0538-Context-Has-Period-Forever",
-                    modelObject=context, contextID=contextID)
-        if validateEFMpragmatic: # output combined count message
-            if contextsWithDisallowedOCEs:
-                modelXbrl.error(("EFM.6.05.04", "GFM.1.02.04"),
-                    _("There must be no contexts with %(elementName)s, but %(count)s was(were) found: %(context)s."),
-                    edgarCode="cp-0504-No-Scenario",
-                    modelObject=contextsWithDisallowedOCEs, elementName=notAllowed,
-                    count=len(contextsWithDisallowedOCEs), context=', '.join(c.id for c in contextsWithDisallowedOCEs))
-            if contextsWithDisallowedOCEcontent:
-                modelXbrl.error(("EFM.6.05.05", "GFM.1.02.05"),
-                    _("There must be no %(elementName)s with non-explicitDimension content, but %(count)s was(were) found: %(context)s."),
-                    edgarCode="cp-0505-Segment-Child-Not-Explicit-Member",
-                    modelObject=contextsWithDisallowedOCEcontent, elementName=disclosureSystem.contextElement,
-                    count=len(contextsWithDisallowedOCEcontent), context=', '.join(c.id for c in contextsWithDisallowedOCEcontent))
-        if nonStandardTypedDimensions:
-            val.modelXbrl.error("EFM.6.05.39",
-                _("Typed dimensions must be defined in standard taxonomy schemas, contexts: %(contextIDs)s dimensions: %(dimensions)s."),
-                modelObject=set.union(*nonStandardTypedDimensions.values()),
-                edgarCode="cp-0539-Typed-Dimension-Not-Standard",
-                contextIDs=", ".join(sorted(cntx.id for cntx in set.union(*nonStandardTypedDimensions.values()))),
-                dimensions=", ".join(sorted(str(qn) for qn in nonStandardTypedDimensions.keys())))
-        for qn, contexts in sorted(nonStandardReplacableDimensions.items(), key=lambda i:str(i[0])):
-            try:
-                replacableAxisMatch = customAxesReplacements.customNamePatterns.match(qn.localName)
-                axis = [customAxesReplacements.standardAxes[k] for k,v in replacableAxisMatch.groupdict().items() if v is not None][0]
-                if replacableAxisMatch and any(v is not None for v in replacableAxisMatch.groupdict().values()):
-                    val.modelXbrl.warning("EFM.6.05.44.customAxis",
-                        _("Contexts %(contextIDs)s use dimension %(dimension)s in namespace %(namespace)s but %(axis)s in %(taxonomy)s is preferred."),
-                        edgarCode="dq-0544-Custom-Axis",
-                        modelObject=contexts, dimension=qn.localName, namespace=qn.namespaceURI,
-                        axis=axis.partition(":")[2], taxonomy=axis.partition(":")[0],
-                        contextIDs=", ".join(sorted(c.id for c in contexts)))
-            except (AttributeError, IndexError):
-                pass # something wrong with match table
-        del uniqueContextHashes, contextsWithDisallowedOCEs, contextsWithDisallowedOCEcontent, nonStandardTypedDimensions, nonStandardReplacableDimensions
+        contextRules.finish()
+        del contextRules
         val.modelXbrl.profileActivity("... filer context checks", minTimeToShow=1.0)
 
 
@@ -418,6 +307,8 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
              }
         #6.5.8 unused contexts
         #candidateRequiredContexts = set()
+        # rules checking each fact (6.5.12, 6.5.14, 6.5.37) are run by this pass of the facts, reported after unit checks
+        factRules = RulesPass(val, FACTS)
         for f in modelXbrl.facts:
             factContextID = f.contextID
             contextIDs.discard(factContextID)
@@ -573,6 +464,8 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                             modelObject=f, fact=f.qname, contextID=factContextID,
                             value="".join(s for t in syms for s in t), text=f.text)
 
+            factRules.check(f)
+
         val.entityRegistrantName = deiItems.get("EntityRegistrantName") # used for name check in 6.8.6
 
         # 6.05..23,24 check (after dei facts read)
@@ -773,107 +666,10 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
         val.modelXbrl.profileActivity("... filer unit checks", minTimeToShow=1.0)
 
 
-        # EFM.6.05.14, GFM.1.02.13 xml:lang tests, as of v-17, full default lang is compared
-        #if val.validateEFM:
-        #    factLangStartsWith = disclosureSystem.defaultXmlLang[:2]
-        #else:
-        #    factLangStartsWith = disclosureSystem.defaultXmlLang
-
-        #6.5.12 equivalent facts
-        factsForLang = {}
-        factForConceptContextUnitHash = defaultdict(list)
-        keysNotDefaultLang = {}
-        for f1 in modelXbrl.facts:
-            if f1.context is not None and f1.concept is not None and f1.concept.type is not None and getattr(f1,"xValid", 0) >= VALID:
-                # build keys table for 6.5.14
-                if not f1.isNil:
-                    langTestKey = "{0},{1},{2}".format(f1.qname, f1.contextID, f1.unitID)
-                    factsForLang.setdefault(langTestKey, []).append(f1)
-                    lang = f1.xmlLang
-                    if lang and lang.lower() != requiredFactLang: # not lang.startswith(factLangStartsWith):
-                        keysNotDefaultLang[langTestKey] = f1
-
-                    # 6.5.37 test (insignificant digits due to rounding)
-                    if f1.isNumeric and f1.decimals and f1.decimals != "INF":
-                        try:
-                            insignificance = insignificantDigits(f1.xValue, decimals=f1.decimals)
-                            if insignificance: # if not None, returns (truncatedDigits, insiginficantDigits)
-                                modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
-                                    _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s has insignificant digits %(insignificantDigits)s.  "
-                                      "Please correct the fact value and resubmit."),
-                                    edgarCode="du-0537-Nonzero-Digits-Truncated",
-                                    modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals,
-                                    value=f1.xValue, truncatedDigits=insignificance[0], insignificantDigits=insignificance[1])
-                        except (ValueError,TypeError):
-                            modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
-                                _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s causes a Value Error exception.  "
-                                  "Please correct the fact value and resubmit."),
-                                edgarCode="du-0537-Nonzero-Digits-Truncated",
-                                modelObject=f1, fact=f1.qname, contextID=f1.contextID, decimals=f1.decimals, value=f1.value)
-                # 6.5.12 test
-                factForConceptContextUnitHash[f1.conceptContextUnitHash].append(f1)
-        # 6.5.12 test
-        aspectEqualFacts = defaultdict(list)
-        decVals = {}
-        for hashEquivalentFacts in factForConceptContextUnitHash.values():
-            if len(hashEquivalentFacts) > 1:
-                for f in hashEquivalentFacts:
-                    aspectEqualFacts[(f.qname,f.contextID,f.unitID,
-                                      f.xmlLang.lower() if f.concept.type.isWgnStringFactType else None)].append(f)
-                for fList in aspectEqualFacts.values():
-                    f0 = fList[0]
-                    if f0.concept.isNumeric:
-                        if any(f.isNil for f in fList):
-                            _inConsistent = not all(f.isNil for f in fList)
-                        else: # not all have same decimals
-                            _d = inferredDecimals(f0)
-                            _v = f0.xValue
-                            _inConsistent = isnan(_v) # NaN is incomparable, always makes dups inconsistent
-                            decVals[_d] = _v
-                            aMax, bMin = rangeValue(_v, _d)
-                            for f in fList[1:]:
-                                _d = inferredDecimals(f)
-                                _v = f.xValue
-                                if isnan(_v):
-                                    _inConsistent = True
-                                    break
-                                if _d in decVals:
-                                    _inConsistent |= _v != decVals[_d]
-                                else:
-                                    decVals[_d] = _v
-                                a, b = rangeValue(_v, _d)
-                                if a > aMax: aMax = a
-                                if b < bMin: bMin = b
-                            if not _inConsistent:
-                                _inConsistent = (bMin < aMax)
-                            decVals.clear()
-                    else:
-                        _inConsistent = any(not f.isVEqualTo(f0) for f in fList[1:])
-                    if _inConsistent:
-                        modelXbrl.error(("EFM.6.05.12", "GFM.1.02.11"),
-                            "The instance document contained an element, %(fact)s that was used more than once in contexts equivalent to %(contextID)s: values %(values)s.  "
-                            "Please ensure there are no duplicate combinations of concept and context in the instance.",
-                            edgarCode="du-0512-Duplicate-Facts",
-                            modelObject=fList, fact=f0.qname, contextID=f0.contextID, values=", ".join(strTruncate(f.value, 128) for f in fList))
-                aspectEqualFacts.clear()
-        del factForConceptContextUnitHash, aspectEqualFacts
+        factRules.finish() # 6.5.37 insignificant digits, 6.5.12 duplicate facts, 6.5.14 facts without english text
+        del factRules
         val.modelXbrl.profileActivity("... filer fact checks", minTimeToShow=1.0)
 
-        #6.5.14 facts without english text
-        for keyNotDefaultLang, factNotDefaultLang in keysNotDefaultLang.items():
-            anyDefaultLangFact = False
-            for fact in factsForLang[keyNotDefaultLang]:
-                if fact.xmlLang.lower() == requiredFactLang: #.startswith(factLangStartsWith):
-                    anyDefaultLangFact = True
-                    break
-            if not anyDefaultLangFact:
-                val.modelXbrl.error(("EFM.6.05.14", "GFM.1.02.13"),
-                    _("Element %(fact)s in context %(contextID)s has text with xml:lang other than '%(lang2)s' (%(lang)s) without matching English text.  "
-                      "Please provide a fact with xml:lang equal to '%(lang2)s'."),
-                    edgarCode="du-0514-English-Text-Missing",
-                    modelObject=factNotDefaultLang, fact=factNotDefaultLang.qname, contextID=factNotDefaultLang.contextID,
-                    lang=factNotDefaultLang.xmlLang, lang2=disclosureSystem.defaultXmlLang) # report lexical format default lang
-
         #label validations
         if not labelsRelationshipSet:
             val.modelXbrl.error(("EFM.6.10.01.missingLabelLinkbase", "GFM.1.05.01"),
@@ -2016,7 +1812,7 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
             unsupportedTrNamespaces = set()
             unsupportedNamespacePrefixes = defaultdict(set)
             for tag in ixTags:
-                for ixElt in ixdsHtmlRootElt.iterdescendants(tag=tag):
+                for ixElt in ixdsHtmlRootElt.modelDocument.inlineIndex.ixElements(tag):
                     if isinstance(ixElt,ModelObject):
                         if ixElt.get("target"):
                             modelXbrl.error("EFM.5.02.05.targetDisallowed",
@@ -2042,12 +1838,12 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                     modelObject=facts, submittedPrefix=pfx, recommendedPrefix=ixTrRegistries[ns], namespace=ns)
 
             del unsupportedTrFacts, unsupportedTrNamespaces, unsupportedNamespacePrefixes
-            for ixElt in ixdsHtmlRootElt.iterdescendants(tag=ixNStag+"tuple"):
+            for ixElt in ixdsHtmlRootElt.modelDocument.inlineIndex.ixElements(ixNStag+"tuple"):
                 if isinstance(ixElt,ModelObject):
                     modelXbrl.error("EFM.5.02.05.tupleDisallowed",
                         _("Inline tuple %(qname)s is disallowed."),
                         modelObject=ixElt, qname=ixElt.qname)
-            for ixElt in ixdsHtmlRootElt.iterdescendants(tag=ixNStag+"fraction"):
+            for ixElt in ixdsHtmlRootElt.modelDocument.inlineIndex.ixElements(ixNStag+"fraction"):
                 if isinstance(ixElt,ModelObject):
                     modelXbrl.error("EFM.5.02.05.fractionDisallowed",
                         _("Inline fraction %(qname)s is disallowed."),
@@ -2057,7 +1853,7 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                     _("Inline HTML %(doctype)s is disallowed."),
                     modelObject=ixdsHtmlRootElt, doctype=modelXbrl.modelDocument.xmlDocument.docinfo.doctype)
 
-            for ixHiddenElt in ixdsHtmlRootElt.iterdescendants(tag=ixNStag + "hidden"):
+            for ixHiddenElt in ixdsHtmlRootElt.modelDocument.inlineIndex.ixElements(ixNStag + "hidden"):
                 for tag in (ixNStag + "nonNumeric", ixNStag+"nonFraction"):
                     for ixElt in ixHiddenElt.iterdescendants(tag=tag):
                         if (getattr(ixElt, "xValid", 0) >= VALID and # may not be validated
@@ -2080,7 +1876,7 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                 countEligible=len(eligibleForTransformHiddenFacts),
                 elements=", ".join(sorted(set(str(f.qname) for f in eligibleForTransformHiddenFacts))))
         for ixdsHtmlRootElt in modelXbrl.ixdsHtmlElements:
-            for ixElt in ixdsHtmlRootElt.getroottree().iterfind("//{http://www.w3.org/1999/xhtml}*[@style]"):
+            for ixElt in ixdsHtmlRootElt.modelDocument.inlineIndex.styledElts:
                 hiddenFactRefMatch = styleIxHiddenPattern.match(ixElt.get("style",""))
                 if hiddenFactRefMatch:
                     hiddenFactRef = hiddenFactRefMatch.group(2)
@@ -2129,99 +1925,33 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                 del facts
         del eligibleForTransformHiddenFacts, hiddenEltIds, presentedHiddenEltIds, requiredToDisplayFacts, undisplayedCoverFacts
     # all-labels and references checks
-    defaultLangStandardLabels = {}
+    labelRules = RulesPass(val, LABELS, isEFM=isEFM, isGFM=isGFM)
+    referenceRules = RulesPass(val, REFERENCES, isEFM=isEFM, isGFM=isGFM)
     for concept in modelXbrl.qnameConcepts.values():
-        # conceptHasDefaultLangStandardLabel = False
         for modelLabelRel in labelsRelationshipSet.fromModelObject(concept):
             if modelLabelRel.modelDocument.inDTS: # ignore documentation labels added by EdgarRenderer not in DTS
-                modelLabel = modelLabelRel.toModelObject
-                role = modelLabel.role
-                text = modelLabel.text
-                lang = modelLabel.xmlLang
-                if role == XbrlConst.documentationLabel:
-                    if concept.modelDocument.targetNamespace in disclosureSystem.standardTaxonomiesDict:
-                        modelXbrl.error(("EFM.6.10.05", "GFM.1.05.05"),
-                            _("Your filing attempted to add a new definition, '%(text)s', to an existing concept in the standard taxonomy, %(concept)s.  Please remove this definition."),
-                            edgarCode="cp-1005-Custom-Documentation-Standard-Element",
-                            modelObject=modelLabel, concept=concept.qname, text=text)
-                elif text and lang and disclosureSystem.defaultXmlLang and lang.startswith(disclosureSystem.defaultXmlLang):
-                    if role == XbrlConst.standardLabel:
-                        if text in defaultLangStandardLabels:
-                            concept2, modelLabel2 = defaultLangStandardLabels[text]
-                            modelXbrl.error(("EFM.6.10.04", "GFM.1.05.04"),
-                                _("More than one element has %(text)s as its English standard label (%(concept)s and %(concept2)s).  "
-                                  "Please change or remove all but one label."),
-                                edgarCode="du-1004-English-Standard-Labels-Duplicated",
-                                modelObject=(concept, modelLabel, concept2, modelLabel2),
-                                concept=concept.qname,
-                                concept2=concept2.qname,
-                                lang=disclosureSystem.defaultLanguage, text=text[:80])
-                        else:
-                            defaultLangStandardLabels[text] = (concept, modelLabel)
-                        # conceptHasDefaultLangStandardLabel = True
-                    if len(text) > 511:
-                        modelXbrl.error(("EFM.6.10.06", "GFM.1.05.06"),
-                            _("Element %(concept)s, label length %(length)s, has more than 511 characters or contains a left-angle-bracket character in the label for role %(role)s. "
-                              "Please correct the label."),
-                            edgarCode="rq-1006-Label-Disallowed",
-                            modelObject=modelLabel, concept=concept.qname, role=role, length=len(text), text=text[:80])
-                    match = modelXbrl.modelManager.disclosureSystem.labelCheckPattern.search(text)
-                    if match:
-                        modelXbrl.error(("EFM.6.10.06", "GFM.1.05.07"),
-                            'Label for concept %(concept)s role %(role)s has disallowed characters: "%(text)s"',
-                            modelObject=modelLabel, concept=concept.qname, role=role, text=match.group())
-                if (text is not None and len(text) > 0 and
-                    modelXbrl.modelManager.disclosureSystem.labelTrimPattern and
-                   (modelXbrl.modelManager.disclosureSystem.labelTrimPattern.match(text[0]) or \
-                    modelXbrl.modelManager.disclosureSystem.labelTrimPattern.match(text[-1]))):
-                    modelXbrl.error(("EFM.6.10.08", "GFM.1.05.08"),
-                        _("The label %(text)s of element %(concept)s has leading or trailing white space in role %(role)s for lang %(lang)s.  Please remove it."),
-                        edgarCode="du-1008-Label-Not-Trimmed",
-                        modelObject=modelLabel, concept=concept.qname, role=role, lang=lang, text=text)
+                labelRules.check(modelLabelRel)
         for modelRefRel in referencesRelationshipSetWithProhibits.fromModelObject(concept):
             if modelRefRel.modelDocument.inDTS: # ignore references added by EdgarRenderer that are not in DTS
-                modelReference = modelRefRel.toModelObject
-                text = XmlUtil.innerText(modelReference)
-                #6.18.1 no reference to company extension concepts
-                if (concept.modelDocument.targetNamespace not in disclosureSystem.standardTaxonomiesDict and
-                    concept.modelDocument.targetNamespace not in val.otherStandardTaxonomies):
-                    modelXbrl.error(("EFM.6.18.01", "GFM.1.9.1"),
-                        _("Your filing provides a reference, '%(xml)s', for an custom concept in extension taxonomy, %(concept)s.  "
-                          "Please remove this reference."),
-                        edgarCode="cp-1801-Custom-Element-Has-Reference",
-                        modelObject=modelReference, concept=concept.qname, text=text, xml=XmlUtil.xmlstring(modelReference, stripXmlns=True, contentsOnly=True))
-                elif isEFM and not isStandardUri(val, modelRefRel.modelDocument.uri) and concept.modelDocument.targetNamespace not in val.otherStandardTaxonomies:
-                    #6.18.2 no extension to add or remove references to standard concepts
-                    modelXbrl.error(("EFM.6.18.02"),
-                        _("Your filing attempted to add a new reference, '%(xml)s', to an existing concept in the standard taxonomy, %(concept)s.  "
-                          "Please remove this reference."),
-                        edgarCode="cp-1802-Standard-Element-Has-Reference",
-                        modelObject=modelReference, concept=concept.qname, text=text, xml=XmlUtil.xmlstring(modelReference, stripXmlns=True, contentsOnly=True))
+                referenceRules.check(modelRefRel)
+    labelRules.finish()
+    referenceRules.finish()
+    del labelRules, referenceRules
 
     # role types checks
-    # 6.7.10 only one role type declaration in DTS
-    for roleURI, modelRoleTypes in modelXbrl.roleTypes.items():
-        countInDTS = sum(1 for m in modelRoleTypes if m.modelDocument.inDTS)
-        if countInDTS > 1:
-            modelXbrl.error(("EFM.6.07.10", "GFM.1.03.10"),
-                _("Role %(roleType)s was declared more than once (%(numberOfDeclarations)s times.).  "
-                  "Please remove all but one declaration."),
-                edgarCode="du-0710-Role-Type-Duplicates",
-                modelObject=modelRoleTypes, roleType=roleURI, numberOfDeclarations=countInDTS)
-    # 6.7.14 only one arcrole type declaration in DTS
-    for arcroleURI, modelRoleTypes in modelXbrl.arcroleTypes.items():
-        countInDTS = sum(1 for m in modelRoleTypes if m.modelDocument.inDTS)
-        if countInDTS > 1:
-            modelXbrl.error(("EFM.6.07.14", "GFM.1.03.16"),
-                _("Relationship arc role %(arcroleType)s is declared more than once (%(numberOfDeclarations)s duplicates).  "
-                  "Please remove all but one of them."),
-                edgarCode="du-0714-Arcrole-Type-Duplicates",
-                modelObject=modelRoleTypes, arcroleType=arcroleURI, numberOfDeclarations=countInDTS )
+    roleTypeRules = RulesPass(val, ROLE_TYPES, isEFM=isEFM, isGFM=isGFM)
+    for roleTypesItem in modelXbrl.roleTypes.items():
+        roleTypeRules.check(roleTypesItem)
+    roleTypeRules.finish()
+    arcroleTypeRules = RulesPass(val, ARCROLE_TYPES, isEFM=isEFM, isGFM=isGFM)
+    for arcroleTypesItem in modelXbrl.arcroleTypes.items():
+        arcroleTypeRules.check(arcroleTypesItem)
+    arcroleTypeRules.finish()
+    del roleTypeRules, arcroleTypeRules
 
 
     val.modelXbrl.profileActivity("... filer concepts checks", minTimeToShow=1.0)
 
-    del defaultLangStandardLabels #dereference
 
     # checks on all documents: instance, schema, instance
     val.hasExtensionSchema = False
@@ -2308,6 +2038,7 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
 
     # do calculation, then presentation, then other arcroles
     val.summationItemRelsSetAllELRs = modelXbrl.relationshipSet(XbrlConst.summationItem)
+    linkbaseRules = RulesPass(val, LINKBASES, isEFM=isEFM, isGFM=isGFM)
     for arcroleFilter in (XbrlConst.summationItem, XbrlConst.parentChild, "*"):
         for baseSetKey, baseSetModelLinks  in modelXbrl.baseSets.items():
             arcrole, ELR, linkqname, arcqname = baseSetKey
@@ -2316,17 +2047,7 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                 if not (arcroleFilter == arcrole or
                         arcroleFilter == "*" and arcrole not in (XbrlConst.summationItem, XbrlConst.parentChild)):
                     continue
-                ineffectiveArcs = ModelRelationshipSet.ineffectiveArcs(baseSetModelLinks, arcrole)
-                #validate ineffective arcs
-                for modelRel in ineffectiveArcs:
-                    if isinstance(modelRel.fromModelObject, ModelObject) and isinstance(modelRel.toModelObject, ModelObject):
-                        modelXbrl.error(("EFM.6.09.03", "GFM.1.04.03"),
-                            _("The %(arcrole)s relationship from %(conceptFrom)s to %(conceptTo)s, link role %(linkroleDefinition)s, in the submission is ineffectual.  Please remove or correct the relationship."),
-                            edgarCode="du-0903-Relationship-Ineffectual",
-                            modelObject=modelRel, arc=modelRel.qname, arcrole=modelRel.arcrole,
-                            linkrole=modelRel.linkrole, linkroleDefinition=modelXbrl.roleTypeDefinition(modelRel.linkrole),
-                            conceptFrom=modelRel.fromModelObject.qname, conceptTo=modelRel.toModelObject.qname,
-                            ineffectivity=modelRel.ineffectivity)
+                linkbaseRules.check((baseSetKey, baseSetModelLinks))
                 if arcrole == XbrlConst.parentChild:
                     isStatementSheet = any(linkroleDefinitionStatementSheet.match(roleType.definition or '')
                                            for roleType in val.modelXbrl.roleTypes.get(ELR,()))
@@ -2480,43 +2201,8 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
                 elif arcrole == XbrlConst.all or arcrole == XbrlConst.notAll:
                     drsELRs.add(ELR)
 
-                elif arcrole == XbrlConst.dimensionDomain or arcrole == XbrlConst.dimensionDefault:
-                    # 6.16.3 check domain targets in extension linkbases are domain items
-                    fromRelationships = modelXbrl.relationshipSet(arcrole,ELR).fromModelObjects()
-                    for relFrom, rels in fromRelationships.items():
-                        for rel in rels:
-                            relTo = rel.toModelObject
-
-                            if not (isinstance(relTo, ModelConcept) and relTo.type is not None and relTo.type.isDomainItemType) and not isStandardUri(val, rel.modelDocument.uri):
-                                val.modelXbrl.error(("EFM.6.16.03", "GFM.1.08.03"),
-                                    _("There is a dimension-domain relationship from %(conceptFrom)s but its target element %(conceptTo)s is not a domain.  "
-                                      "Please change the relationship or change the type of the target element."),
-                                    edgarCode="du-1603-Dimension-Domain-Target-Mismatch",
-                                    modelObject=(rel, relFrom, relTo), conceptFrom=relFrom.qname, conceptTo=(relTo.qname if relTo is not None else None), linkrole=rel.linkrole)
-
-
-                # definition tests (GFM only, for now)
-                if XbrlConst.isDefinitionOrXdtArcrole(arcrole) and disclosureSystem.GFM:
-                    fromRelationships = modelXbrl.relationshipSet(arcrole,ELR).fromModelObjects()
-                    for relFrom, rels in fromRelationships.items():
-                        orderRels = {}
-                        for rel in rels:
-                            relTo = rel.toModelObject
-                            order = rel.order
-                            if order in orderRels and disclosureSystem.GFM:
-                                val.modelXbrl.error("GFM.1.08.10",
-                                    _("Duplicate definitions relations from concept %(conceptFrom)s for order %(order)s in base set role %(linkrole)s "
-                                      "to concept %(conceptTo)s and to concept %(conceptTo2)s"),
-                                    modelObject=(rel, relFrom, relTo), conceptFrom=relFrom.qname, order=order, linkrole=rel.linkrole,
-                                    conceptTo=rel.toModelObject.qname, conceptTo2=orderRels[order].toModelObject.qname)
-                            else:
-                                orderRels[order] = rel
-                            if (arcrole not in (XbrlConst.dimensionDomain, XbrlConst.domainMember) and
-                                rel.get("{http://xbrl.org/2005/xbrldt}usable") == "false"):
-                                val.modelXrl.error("GFM.1.08.11",
-                                    _("Disallowed xbrldt:usable='false' attribute on %(arc)s relationship from concept %(conceptFrom)s in "
-                                      "base set role %(linkrole)s to concept %(conceptTo)s"),
-                                    modelObject=(rel, relFrom, relTo), arc=rel.qname, conceptFrom=relFrom.qname, linkrole=rel.linkrole, conceptTo=rel.toModelObject.qname)
+    linkbaseRules.finish()
+    del linkbaseRules
 
     # 6.9.10 checks on custom arcs
     if isEFM:
@@ -3051,19 +2737,6 @@ def validateFiling(val, modelXbrl, isEFM=False, isGFM=False):
 
     modelXbrl.modelManager.showStatus(_("ready"), 2000)
 
-def isStandardUri(val, uri):
-    try:
-        return val._isStandardUri[uri]
-    except KeyError:
-        isStd = (uri in val.disclosureSystem.standardTaxonomiesDict or
-                 (not isHttpUrl(uri) and
-                  # try 2011-12-23 RH: if works, remove the localHrefs
-                  # any(u.endswith(e) for u in (uri.replace("\\","/"),) for e in disclosureSystem.standardLocalHrefs)
-                  "/basis/sbr/" in uri.replace("\\","/")
-                  ))
-        val._isStandardUri[uri] = isStd
-        return isStd
-
 def directedCycle(val, relFrom, origin, fromRelationships, path):
     if relFrom in fromRelationships:
         for rel in fromRelationships[relFrom]:
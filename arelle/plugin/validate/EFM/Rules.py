@@ -0,0 +1,655 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+EFM checks organized as rules, each declaring the items it iterates, so that the rules iterating the same
+items are run in a single pass of those items (RulesPass), with the time taken by each rule reported as
+a profile stat when profile stats are collected.
+
+Checks depending on dei facts or the document type, or on the concepts used by facts, remain in
+validateFiling, which passes the items of each pass to its rules while walking them for those checks.
+'''
+import time
+from collections import defaultdict
+from math import isnan
+import regex as re
+from arelle import ModelRelationshipSet, XbrlConst, XmlUtil
+from arelle.ModelDtsObject import ModelConcept
+from arelle.ModelObject import ModelObject
+from arelle.PythonUtil import strTruncate
+from arelle.ValidateXbrlCalcs import insignificantDigits, inferredDecimals, rangeValue
+from arelle.XmlValidate import VALID
+from .Util import isStandardUri
+
+FACTS = "facts" # rule iterates modelXbrl.facts
+CONTEXTS = "contexts" # rule iterates modelXbrl.contexts
+LABELS = "labels" # rule iterates concept label relationships of DTS linkbases, by concept
+REFERENCES = "references" # rule iterates concept reference relationships (with prohibits) of DTS linkbases, by concept
+LINKBASES = "linkbases" # rule iterates base sets (baseSetKey, modelLinks) of extended links, calculation first
+ROLE_TYPES = "role types" # rule iterates modelXbrl.roleTypes items
+ARCROLE_TYPES = "arcrole types" # rule iterates modelXbrl.arcroleTypes items
+
+GFMcontextDatePattern = re.compile(r"^[12][0-9]{3}-[01][0-9]-[0-3][0-9]$")
+
+RULES = [] # rule classes, in order of running within their pass
+
+def rule(ruleClass):
+    """Decorator registering a Rule class"""
+    RULES.append(ruleClass)
+    return ruleClass
+
+class Rule:
+    """A check which is given each item of the items it iterates (check), reporting what it finds as it is
+    found, or after the pass of the items (finish), keeping the order of messages of validateFiling.
+
+    options are those of the filing validation (such as isEFM, isGFM), given to the rules of each pass.
+    """
+    iterates = FACTS
+    name = None
+
+    def __init__(self, val, **options):
+        self.val = val
+        self.modelXbrl = val.modelXbrl
+        self.options = options
+
+    @classmethod
+    def appliesTo(cls, val, options):
+        """False if the rule is not run for the disclosure system or options"""
+        return True
+
+    def check(self, item):
+        pass
+
+    def finish(self):
+        pass
+
+class RulesPass:
+    """The registered rules iterating the same items, checking each item with every rule in one pass"""
+
+    def __init__(self, val, iterates, **options):
+        self.modelXbrl = val.modelXbrl
+        self.rules = [ruleClass(val, **options) for ruleClass in RULES
+                      if ruleClass.iterates == iterates and ruleClass.appliesTo(val, options)]
+        modelManager = self.modelXbrl.modelManager
+        self.isTimed = modelManager.collectProfileStats or modelManager.spanTracer is not None
+        self.ruleTimes = defaultdict(float) # by rule name, seconds
+
+    def check(self, item):
+        if self.isTimed:
+            for _rule in self.rules:
+                startedAt = time.perf_counter()
+                _rule.check(item)
+                self.ruleTimes[_rule.name] += time.perf_counter() - startedAt
+        else:
+            for _rule in self.rules:
+                _rule.check(item)
+
+    def finish(self):
+        for _rule in self.rules:
+            startedAt = time.perf_counter()
+            _rule.finish()
+            self.ruleTimes[_rule.name] += time.perf_counter() - startedAt
+        if self.isTimed:
+            for name, secs in self.ruleTimes.items():
+                self.modelXbrl.profileStat(_("EFM rule {0}").format(name), secs)
+
+def isCheckedFact(f):
+    return (f.context is not None and f.concept is not None and f.concept.type is not None and
+            getattr(f, "xValid", 0) >= VALID)
+
+@rule
+class InsignificantDigitsRule(Rule):
+    """6.5.37 numeric facts with nonzero digits beyond their decimals"""
+    name = "6.5.37 insignificant digits"
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.insignificantFacts = [] # (fact, (truncatedDigits, insignificantDigits) or None if value error)
+
+    def check(self, f):
+        if isCheckedFact(f) and not f.isNil and f.isNumeric and f.decimals and f.decimals != "INF":
+            try:
+                insignificance = insignificantDigits(f.xValue, decimals=f.decimals)
+                if insignificance: # if not None, returns (truncatedDigits, insiginficantDigits)
+                    self.insignificantFacts.append((f, insignificance))
+            except (ValueError,TypeError):
+                self.insignificantFacts.append((f, None))
+
+    def finish(self):
+        for f, insignificance in self.insignificantFacts:
+            if insignificance is not None:
+                self.modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
+                    _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s has insignificant digits %(insignificantDigits)s.  "
+                      "Please correct the fact value and resubmit."),
+                    edgarCode="du-0537-Nonzero-Digits-Truncated",
+                    modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals,
+                    value=f.xValue, truncatedDigits=insignificance[0], insignificantDigits=insignificance[1])
+            else:
+                self.modelXbrl.error(("EFM.6.05.37", "GFM.1.02.26"),
+                    _("Fact %(fact)s of context %(contextID)s decimals %(decimals)s value %(value)s causes a Value Error exception.  "
+                      "Please correct the fact value and resubmit."),
+                    edgarCode="du-0537-Nonzero-Digits-Truncated",
+                    modelObject=f, fact=f.qname, contextID=f.contextID, decimals=f.decimals, value=f.value)
+        self.insignificantFacts = None # dereference
+
+@rule
+class DuplicateFactsRule(Rule):
+    """6.5.12 inconsistent facts of equivalent concept, context, unit (and language)"""
+    name = "6.5.12 duplicate facts"
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.factForConceptContextUnitHash = defaultdict(list)
+
+    def check(self, f):
+        if isCheckedFact(f):
+            self.factForConceptContextUnitHash[f.conceptContextUnitHash].append(f)
+
+    def finish(self):
+        aspectEqualFacts = defaultdict(list)
+        decVals = {}
+        for hashEquivalentFacts in self.factForConceptContextUnitHash.values():
+            if len(hashEquivalentFacts) > 1:
+                for f in hashEquivalentFacts:
+                    aspectEqualFacts[(f.qname,f.contextID,f.unitID,
+                                      f.xmlLang.lower() if f.concept.type.isWgnStringFactType else None)].append(f)
+                for fList in aspectEqualFacts.values():
+                    f0 = fList[0]
+                    if f0.concept.isNumeric:
+                        if any(f.isNil for f in fList):
+                            _inConsistent = not all(f.isNil for f in fList)
+                        else: # not all have same decimals
+                            _d = inferredDecimals(f0)
+                            _v = f0.xValue
+                            _inConsistent = isnan(_v) # NaN is incomparable, always makes dups inconsistent
+                            decVals[_d] = _v
+                            aMax, bMin = rangeValue(_v, _d)
+                            for f in fList[1:]:
+                                _d = inferredDecimals(f)
+                                _v = f.xValue
+                                if isnan(_v):
+                                    _inConsistent = True
+                                    break
+                                if _d in decVals:
+                                    _inConsistent |= _v != decVals[_d]
+                                else:
+                                    decVals[_d] = _v
+                                a, b = rangeValue(_v, _d)
+                                if a > aMax: aMax = a
+                                if b < bMin: bMin = b
+                            if not _inConsistent:
+                                _inConsistent = (bMin < aMax)
+                            decVals.clear()
+                    else:
+                        _inConsistent = any(not f.isVEqualTo(f0) for f in fList[1:])
+                    if _inConsistent:
+                        self.modelXbrl.error(("EFM.6.05.12", "GFM.1.02.11"),
+                            "The instance document contained an element, %(fact)s that was used more than once in contexts equivalent to %(contextID)s: values %(values)s.  "
+                            "Please ensure there are no duplicate combinations of concept and context in the instance.",
+                            edgarCode="du-0512-Duplicate-Facts",
+                            modelObject=fList, fact=f0.qname, contextID=f0.contextID, values=", ".join(strTruncate(f.value, 128) for f in fList))
+                aspectEqualFacts.clear()
+        self.factForConceptContextUnitHash = None # dereference
+
+@rule
+class FactLangRule(Rule):
+    """6.5.14 facts with text in a language other than the default language, without a default language fact"""
+    name = "6.5.14 facts without default language"
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        defaultXmlLang = val.disclosureSystem.defaultXmlLang
+        self.requiredFactLang = defaultXmlLang.lower() if defaultXmlLang else defaultXmlLang
+        self.factsForLang = {}
+        self.keysNotDefaultLang = {}
+
+    def check(self, f):
+        if isCheckedFact(f) and not f.isNil:
+            langTestKey = "{0},{1},{2}".format(f.qname, f.contextID, f.unitID)
+            self.factsForLang.setdefault(langTestKey, []).append(f)
+            lang = f.xmlLang
+            if lang and lang.lower() != self.requiredFactLang:
+                self.keysNotDefaultLang[langTestKey] = f
+
+    def finish(self):
+        for keyNotDefaultLang, factNotDefaultLang in self.keysNotDefaultLang.items():
+            if not any(fact.xmlLang.lower() == self.requiredFactLang
+                       for fact in self.factsForLang[keyNotDefaultLang]):
+                self.modelXbrl.error(("EFM.6.05.14", "GFM.1.02.13"),
+                    _("Element %(fact)s in context %(contextID)s has text with xml:lang other than '%(lang2)s' (%(lang)s) without matching English text.  "
+                      "Please provide a fact with xml:lang equal to '%(lang2)s'."),
+                    edgarCode="du-0514-English-Text-Missing",
+                    modelObject=factNotDefaultLang, fact=factNotDefaultLang.qname, contextID=factNotDefaultLang.contextID,
+                    lang=factNotDefaultLang.xmlLang, lang2=self.val.disclosureSystem.defaultXmlLang) # report lexical format default lang
+        self.factsForLang = self.keysNotDefaultLang = None # dereference
+
+@rule
+class DuplicateContextsRule(Rule):
+    """6.5.7 contexts equivalent to a prior context"""
+    iterates = CONTEXTS
+    name = "6.5.7 duplicate contexts"
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.uniqueContextHashes = {}
+
+    def check(self, context):
+        h = context.contextDimAwareHash
+        if h in self.uniqueContextHashes:
+            if context.isEqualTo(self.uniqueContextHashes[h]):
+                self.modelXbrl.error(("EFM.6.05.07", "GFM.1.02.07"),
+                    _("The instance document contained more than one context equivalent to %(context)s (%(context2)s).  "
+                      "Please remove duplicate contexts from the instance."),
+                    edgarCode="du-0507-Duplicate-Contexts",
+                    modelObject=(context, self.uniqueContextHashes[h]), context=context.id, context2=self.uniqueContextHashes[h].id)
+        else:
+            self.uniqueContextHashes[h] = context
+
+    def finish(self):
+        self.uniqueContextHashes = None # dereference
+
+@rule
+class ContextDatesRule(Rule):
+    """GFM 1.2.25 context dates without time"""
+    iterates = CONTEXTS
+    name = "GFM 1.2.25 context dates"
+
+    @classmethod
+    def appliesTo(cls, val, options):
+        return options.get("isGFM", False)
+
+    def check(self, context):
+        for dateElt in XmlUtil.children(context, XbrlConst.xbrli, ("startDate", "endDate", "instant")):
+            dateText = XmlUtil.text(dateElt)
+            if not GFMcontextDatePattern.match(dateText):
+                self.modelXbrl.error("GFM.1.02.25",
+                    _("Context id %(context)s %(elementName)s invalid content %(value)s"),
+                    modelObject=dateElt, context=context.id,
+                    elementName=dateElt.prefixedName, value=dateText)
+
+@rule
+class ContextElementRule(Rule):
+    """6.5.4 segment or scenario of contexts allowed by the disclosure system, 6.5.5 with only dimension content,
+    for efm-pragmatic reported as one message of the contexts of each"""
+    iterates = CONTEXTS
+    name = "6.5.4, 6.5.5 context segment and scenario"
+    contextElementNames = {"segment": ("{http://www.xbrl.org/2003/instance}segment",),
+                           "scenario": ("{http://www.xbrl.org/2003/instance}scenario",),
+                           "either": ("{http://www.xbrl.org/2003/instance}segment","{http://www.xbrl.org/2003/instance}scenario"),
+                           "both": ("{http://www.xbrl.org/2003/instance}segment","{http://www.xbrl.org/2003/instance}scenario"),
+                           "none": (), None: ()}
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.contextElement = val.disclosureSystem.contextElement
+        self.isPragmatic = options.get("validateEFMpragmatic", False)
+        self.notAllowed = None
+        self.contextsWithDisallowedOCEs = []
+        self.contextsWithDisallowedOCEcontent = []
+
+    def check(self, context):
+        hasSegment = XmlUtil.hasChild(context, XbrlConst.xbrli, "segment")
+        hasScenario = XmlUtil.hasChild(context, XbrlConst.xbrli, "scenario")
+        notAllowed = None
+        if self.contextElement == "segment" and hasScenario:
+            notAllowed = _("Scenario")
+        elif self.contextElement == "scenario" and hasSegment:
+            notAllowed = _("Segment")
+        elif self.contextElement == "either" and hasSegment and hasScenario:
+            notAllowed = _("Both segment and scenario")
+        elif self.contextElement == "none" and (hasSegment or hasScenario):
+            notAllowed = _("Neither segment nor scenario")
+        self.notAllowed = notAllowed
+        if notAllowed:
+            if self.isPragmatic:
+                self.contextsWithDisallowedOCEs.append(context)
+            else:
+                self.modelXbrl.error(("EFM.6.05.04", "GFM.1.02.04"),
+                    _("There must be no contexts with %(elementName)s, but %(count)s was(were) found: %(context)s."),
+                    edgarCode="cp-0504-No-Scenario",
+                    modelObject=context, elementName=notAllowed, context=context.id, count=1)
+        for contextName in self.contextElementNames[self.contextElement]:
+            for segScenElt in context.iterdescendants(contextName):
+                if isinstance(segScenElt,ModelObject):
+                    _childTagNames = [child.prefixedName for child in segScenElt.iterchildren()
+                                      if isinstance(child,ModelObject) and
+                                         child.tag not in ("{http://xbrl.org/2006/xbrldi}explicitMember",
+                                                           "{http://xbrl.org/2006/xbrldi}typedMember")]
+                    childTags = ", ".join(_childTagNames)
+                    if len(childTags) > 0:
+                        if self.isPragmatic:
+                            self.contextsWithDisallowedOCEcontent.append(context)
+                        else:
+                            self.modelXbrl.error(("EFM.6.05.05", "GFM.1.02.05"),
+                                            _("There must be no %(elementName)s with non-explicitDimension content, but %(count)s was(were) found: %(content)s."),
+                                            edgarCode="cp-0505-Segment-Child-Not-Explicit-Member",
+                                            modelObject=context, context=context.id, content=childTags, count=len(_childTagNames),
+                                            elementName=contextName.partition("}")[2].title())
+
+    def finish(self):
+        if self.contextsWithDisallowedOCEs: # output combined count message
+            self.modelXbrl.error(("EFM.6.05.04", "GFM.1.02.04"),
+                _("There must be no contexts with %(elementName)s, but %(count)s was(were) found: %(context)s."),
+                edgarCode="cp-0504-No-Scenario",
+                modelObject=self.contextsWithDisallowedOCEs, elementName=self.notAllowed,
+                count=len(self.contextsWithDisallowedOCEs), context=', '.join(c.id for c in self.contextsWithDisallowedOCEs))
+        if self.contextsWithDisallowedOCEcontent:
+            self.modelXbrl.error(("EFM.6.05.05", "GFM.1.02.05"),
+                _("There must be no %(elementName)s with non-explicitDimension content, but %(count)s was(were) found: %(context)s."),
+                edgarCode="cp-0505-Segment-Child-Not-Explicit-Member",
+                modelObject=self.contextsWithDisallowedOCEcontent, elementName=self.contextElement,
+                count=len(self.contextsWithDisallowedOCEcontent), context=', '.join(c.id for c in self.contextsWithDisallowedOCEcontent))
+        self.contextsWithDisallowedOCEs = self.contextsWithDisallowedOCEcontent = None # dereference
+
+def extensionDimensions(val, context):
+    # dimensions of context not defined in standard taxonomies
+    standardTaxonomiesDict = val.disclosureSystem.standardTaxonomiesDict
+    return [dim for dim in context.qnameDims.values()
+            if dim.dimension is not None and dim.dimensionQname.namespaceURI not in standardTaxonomiesDict]
+
+@rule
+class TypedDimensionsRule(Rule):
+    """6.5.39 typed dimensions of contexts defined in extension schemas"""
+    iterates = CONTEXTS
+    name = "6.5.39 extension typed dimensions"
+
+    @classmethod
+    def appliesTo(cls, val, options):
+        return options.get("isEFM", False)
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.nonStandardTypedDimensions = defaultdict(set)
+
+    def check(self, context):
+        for dim in extensionDimensions(self.val, context):
+            if dim.isTyped:
+                self.nonStandardTypedDimensions[dim.dimensionQname].add(context)
+
+    def finish(self):
+        if self.nonStandardTypedDimensions:
+            contexts = set.union(*self.nonStandardTypedDimensions.values())
+            self.modelXbrl.error("EFM.6.05.39",
+                _("Typed dimensions must be defined in standard taxonomy schemas, contexts: %(contextIDs)s dimensions: %(dimensions)s."),
+                modelObject=contexts,
+                edgarCode="cp-0539-Typed-Dimension-Not-Standard",
+                contextIDs=", ".join(sorted(cntx.id for cntx in contexts)),
+                dimensions=", ".join(sorted(str(qn) for qn in self.nonStandardTypedDimensions.keys())))
+        self.nonStandardTypedDimensions = None # dereference
+
+@rule
+class CustomAxisRule(Rule):
+    """6.5.44 extension dimensions of contexts replacable by a standard axis"""
+    iterates = CONTEXTS
+    name = "6.5.44 custom axes"
+
+    @classmethod
+    def appliesTo(cls, val, options):
+        return options.get("isEFM", False)
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.customAxesReplacements = options["customAxesReplacements"]
+        self.nonStandardReplacableDimensions = defaultdict(set)
+
+    def check(self, context):
+        for dim in extensionDimensions(self.val, context):
+            if self.customAxesReplacements.customNamePatterns.match(dim.dimensionQname.localName):
+                self.nonStandardReplacableDimensions[dim.dimensionQname].add(context)
+
+    def finish(self):
+        for qn, contexts in sorted(self.nonStandardReplacableDimensions.items(), key=lambda i:str(i[0])):
+            try:
+                replacableAxisMatch = self.customAxesReplacements.customNamePatterns.match(qn.localName)
+                axis = [self.customAxesReplacements.standardAxes[k] for k,v in replacableAxisMatch.groupdict().items() if v is not None][0]
+                if replacableAxisMatch and any(v is not None for v in replacableAxisMatch.groupdict().values()):
+                    self.modelXbrl.warning("EFM.6.05.44.customAxis",
+                        _("Contexts %(contextIDs)s use dimension %(dimension)s in namespace %(namespace)s but %(axis)s in %(taxonomy)s is preferred."),
+                        edgarCode="dq-0544-Custom-Axis",
+                        modelObject=contexts, dimension=qn.localName, namespace=qn.namespaceURI,
+                        axis=axis.partition(":")[2], taxonomy=axis.partition(":")[0],
+                        contextIDs=", ".join(sorted(c.id for c in contexts)))
+            except (AttributeError, IndexError):
+                pass # something wrong with match table
+        self.nonStandardReplacableDimensions = None # dereference
+
+@rule
+class ForeverPeriodRule(Rule):
+    """6.5.38 contexts of period forever"""
+    iterates = CONTEXTS
+    name = "6.5.38 period forever"
+
+    def check(self, context):
+        if context.isForeverPeriod:
+            self.modelXbrl.error("EFM.6.05.38",
+                _("Context %(contextID)s uses period <xbrli:forever>. Please remove it and resubmit."),
+                edgarCode="du-0538-Context-Has-Period-Forever",
+                modelObject=context, contextID=context.id)
+
+def isDefaultLangLabel(disclosureSystem, modelLabel):
+    # label checked for the default language (other than documentation labels)
+    text = modelLabel.text
+    lang = modelLabel.xmlLang
+    return (modelLabel.role != XbrlConst.documentationLabel and bool(text) and bool(lang) and
+            bool(disclosureSystem.defaultXmlLang) and lang.startswith(disclosureSystem.defaultXmlLang))
+
+@rule
+class StandardConceptDocumentationRule(Rule):
+    """6.10.5 documentation labels of standard taxonomy concepts"""
+    iterates = LABELS
+    name = "6.10.5 standard concept documentation"
+
+    def check(self, modelLabelRel):
+        concept = modelLabelRel.fromModelObject
+        modelLabel = modelLabelRel.toModelObject
+        if (modelLabel.role == XbrlConst.documentationLabel and
+                concept.modelDocument.targetNamespace in self.val.disclosureSystem.standardTaxonomiesDict):
+            self.modelXbrl.error(("EFM.6.10.05", "GFM.1.05.05"),
+                _("Your filing attempted to add a new definition, '%(text)s', to an existing concept in the standard taxonomy, %(concept)s.  Please remove this definition."),
+                edgarCode="cp-1005-Custom-Documentation-Standard-Element",
+                modelObject=modelLabel, concept=concept.qname, text=modelLabel.text)
+
+@rule
+class DuplicateStandardLabelsRule(Rule):
+    """6.10.4 concepts with the same default language standard label"""
+    iterates = LABELS
+    name = "6.10.4 duplicate standard labels"
+
+    def __init__(self, val, **options):
+        super().__init__(val, **options)
+        self.defaultLangStandardLabels = {}
+
+    def check(self, modelLabelRel):
+        modelLabel = modelLabelRel.toModelObject
+        disclosureSystem = self.val.disclosureSystem
+        if modelLabel.role == XbrlConst.standardLabel and isDefaultLangLabel(disclosureSystem, modelLabel):
+            concept = modelLabelRel.fromModelObject
+            text = modelLabel.text
+            if text in self.defaultLangStandardLabels:
+                concept2, modelLabel2 = self.defaultLangStandardLabels[text]
+                self.modelXbrl.error(("EFM.6.10.04", "GFM.1.05.04"),
+                    _("More than one element has %(text)s as its English standard label (%(concept)s and %(concept2)s).  "
+                      "Please change or remove all but one label."),
+                    edgarCode="du-1004-English-Standard-Labels-Duplicated",
+                    modelObject=(concept, modelLabel, concept2, modelLabel2),
+                    concept=concept.qname,
+                    concept2=concept2.qname,
+                    lang=disclosureSystem.defaultLanguage, text=text[:80])
+            else:
+                self.defaultLangStandardLabels[text] = (concept, modelLabel)
+
+    def finish(self):
+        self.defaultLangStandardLabels = None # dereference
+
+@rule
+class LabelTextRule(Rule):
+    """6.10.6 default language labels of more than 511 characters, or with disallowed characters"""
+    iterates = LABELS
+    name = "6.10.6 label text"
+
+    def check(self, modelLabelRel):
+        modelLabel = modelLabelRel.toModelObject
+        disclosureSystem = self.val.disclosureSystem
+        if isDefaultLangLabel(disclosureSystem, modelLabel):
+            concept = modelLabelRel.fromModelObject
+            text = modelLabel.text
+            if len(text) > 511:
+                self.modelXbrl.error(("EFM.6.10.06", "GFM.1.05.06"),
+                    _("Element %(concept)s, label length %(length)s, has more than 511 characters or contains a left-angle-bracket character in the label for role %(role)s. "
+                      "Please correct the label."),
+                    edgarCode="rq-1006-Label-Disallowed",
+                    modelObject=modelLabel, concept=concept.qname, role=modelLabel.role, length=len(text), text=text[:80])
+            match = self.modelXbrl.modelManager.disclosureSystem.labelCheckPattern.search(text)
+            if match:
+                self.modelXbrl.error(("EFM.6.10.06", "GFM.1.05.07"),
+                    'Label for concept %(concept)s role %(role)s has disallowed characters: "%(text)s"',
+                    modelObject=modelLabel, concept=concept.qname, role=modelLabel.role, text=match.group())
+
+@rule
+class LabelTrimRule(Rule):
+    """6.10.8 labels with leading or trailing white space"""
+    iterates = LABELS
+    name = "6.10.8 label white space"
+
+    def check(self, modelLabelRel):
+        modelLabel = modelLabelRel.toModelObject
+        text = modelLabel.text
+        labelTrimPattern = self.modelXbrl.modelManager.disclosureSystem.labelTrimPattern
+        if (text is not None and len(text) > 0 and labelTrimPattern and
+                (labelTrimPattern.match(text[0]) or labelTrimPattern.match(text[-1]))):
+            self.modelXbrl.error(("EFM.6.10.08", "GFM.1.05.08"),
+                _("The label %(text)s of element %(concept)s has leading or trailing white space in role %(role)s for lang %(lang)s.  Please remove it."),
+                edgarCode="du-1008-Label-Not-Trimmed",
+                modelObject=modelLabel, concept=modelLabelRel.fromModelObject.qname, role=modelLabel.role,
+                lang=modelLabel.xmlLang, text=text)
+
+@rule
+class ConceptReferencesRule(Rule):
+    """6.18.1 references of extension concepts, 6.18.2 references added by extensions to standard concepts"""
+    iterates = REFERENCES
+    name = "6.18.1, 6.18.2 concept references"
+
+    def check(self, modelRefRel):
+        val = self.val
+        concept = modelRefRel.fromModelObject
+        modelReference = modelRefRel.toModelObject
+        conceptNamespace = concept.modelDocument.targetNamespace
+        if (conceptNamespace not in val.disclosureSystem.standardTaxonomiesDict and
+            conceptNamespace not in val.otherStandardTaxonomies):
+            self.modelXbrl.error(("EFM.6.18.01", "GFM.1.9.1"),
+                _("Your filing provides a reference, '%(xml)s', for an custom concept in extension taxonomy, %(concept)s.  "
+                  "Please remove this reference."),
+                edgarCode="cp-1801-Custom-Element-Has-Reference",
+                modelObject=modelReference, concept=concept.qname, text=XmlUtil.innerText(modelReference),
+                xml=XmlUtil.xmlstring(modelReference, stripXmlns=True, contentsOnly=True))
+        elif (self.options.get("isEFM", False) and not isStandardUri(val, modelRefRel.modelDocument.uri) and
+              conceptNamespace not in val.otherStandardTaxonomies):
+            self.modelXbrl.error(("EFM.6.18.02"),
+                _("Your filing attempted to add a new reference, '%(xml)s', to an existing concept in the standard taxonomy, %(concept)s.  "
+                  "Please remove this reference."),
+                edgarCode="cp-1802-Standard-Element-Has-Reference",
+                modelObject=modelReference, concept=concept.qname, text=XmlUtil.innerText(modelReference),
+                xml=XmlUtil.xmlstring(modelReference, stripXmlns=True, contentsOnly=True))
+
+@rule
+class RoleTypeDuplicatesRule(Rule):
+    """6.7.10 roles declared more than once in the DTS"""
+    iterates = ROLE_TYPES
+    name = "6.7.10 duplicate role types"
+
+    def check(self, roleTypesItem):
+        roleURI, modelRoleTypes = roleTypesItem
+        countInDTS = sum(1 for m in modelRoleTypes if m.modelDocument.inDTS)
+        if countInDTS > 1:
+            self.modelXbrl.error(("EFM.6.07.10", "GFM.1.03.10"),
+                _("Role %(roleType)s was declared more than once (%(numberOfDeclarations)s times.).  "
+                  "Please remove all but one declaration."),
+                edgarCode="du-0710-Role-Type-Duplicates",
+                modelObject=modelRoleTypes, roleType=roleURI, numberOfDeclarations=countInDTS)
+
+@rule
+class ArcroleTypeDuplicatesRule(Rule):
+    """6.7.14 arcroles declared more than once in the DTS"""
+    iterates = ARCROLE_TYPES
+    name = "6.7.14 duplicate arcrole types"
+
+    def check(self, arcroleTypesItem):
+        arcroleURI, modelRoleTypes = arcroleTypesItem
+        countInDTS = sum(1 for m in modelRoleTypes if m.modelDocument.inDTS)
+        if countInDTS > 1:
+            self.modelXbrl.error(("EFM.6.07.14", "GFM.1.03.16"),
+                _("Relationship arc role %(arcroleType)s is declared more than once (%(numberOfDeclarations)s duplicates).  "
+                  "Please remove all but one of them."),
+                edgarCode="du-0714-Arcrole-Type-Duplicates",
+                modelObject=modelRoleTypes, arcroleType=arcroleURI, numberOfDeclarations=countInDTS )
+
+@rule
+class IneffectiveArcsRule(Rule):
+    """6.9.3 ineffective relationships of base sets"""
+    iterates = LINKBASES
+    name = "6.9.3 ineffective relationships"
+
+    def check(self, baseSet):
+        (arcrole, ELR, linkqname, arcqname), baseSetModelLinks = baseSet
+        for modelRel in ModelRelationshipSet.ineffectiveArcs(baseSetModelLinks, arcrole):
+            if isinstance(modelRel.fromModelObject, ModelObject) and isinstance(modelRel.toModelObject, ModelObject):
+                self.modelXbrl.error(("EFM.6.09.03", "GFM.1.04.03"),
+                    _("The %(arcrole)s relationship from %(conceptFrom)s to %(conceptTo)s, link role %(linkroleDefinition)s, in the submission is ineffectual.  Please remove or correct the relationship."),
+                    edgarCode="du-0903-Relationship-Ineffectual",
+                    modelObject=modelRel, arc=modelRel.qname, arcrole=modelRel.arcrole,
+                    linkrole=modelRel.linkrole, linkroleDefinition=self.modelXbrl.roleTypeDefinition(modelRel.linkrole),
+                    conceptFrom=modelRel.fromModelObject.qname, conceptTo=modelRel.toModelObject.qname,
+                    ineffectivity=modelRel.ineffectivity)
+
+@rule
+class DimensionDomainTargetsRule(Rule):
+    """6.16.3 targets of extension dimension-domain and dimension-default relationships which are not domains"""
+    iterates = LINKBASES
+    name = "6.16.3 dimension domain targets"
+
+    def check(self, baseSet):
+        (arcrole, ELR, linkqname, arcqname), baseSetModelLinks = baseSet
+        if arcrole == XbrlConst.dimensionDomain or arcrole == XbrlConst.dimensionDefault:
+            fromRelationships = self.modelXbrl.relationshipSet(arcrole,ELR).fromModelObjects()
+            for relFrom, rels in fromRelationships.items():
+                for rel in rels:
+                    relTo = rel.toModelObject
+                    if not (isinstance(relTo, ModelConcept) and relTo.type is not None and relTo.type.isDomainItemType) and not isStandardUri(self.val, rel.modelDocument.uri):
+                        self.modelXbrl.error(("EFM.6.16.03", "GFM.1.08.03"),
+                            _("There is a dimension-domain relationship from %(conceptFrom)s but its target element %(conceptTo)s is not a domain.  "
+                              "Please change the relationship or change the type of the target element."),
+                            edgarCode="du-1603-Dimension-Domain-Target-Mismatch",
+                            modelObject=(rel, relFrom, relTo), conceptFrom=relFrom.qname, conceptTo=(relTo.qname if relTo is not None else None), linkrole=rel.linkrole)
+
+@rule
+class DefinitionArcsRule(Rule):
+    """GFM 1.8.10 distinct orders of definition relationships, 1.8.11 no xbrldt:usable false, but of domains"""
+    iterates = LINKBASES
+    name = "GFM 1.8.10, 1.8.11 definition relationships"
+
+    @classmethod
+    def appliesTo(cls, val, options):
+        return bool(val.disclosureSystem.GFM)
+
+    def check(self, baseSet):
+        (arcrole, ELR, linkqname, arcqname), baseSetModelLinks = baseSet
+        if XbrlConst.isDefinitionOrXdtArcrole(arcrole):
+            fromRelationships = self.modelXbrl.relationshipSet(arcrole,ELR).fromModelObjects()
+            for relFrom, rels in fromRelationships.items():
+                orderRels = {}
+                for rel in rels:
+                    relTo = rel.toModelObject
+                    order = rel.order
+                    if order in orderRels:
+                        self.modelXbrl.error("GFM.1.08.10",
+                            _("Duplicate definitions relations from concept %(conceptFrom)s for order %(order)s in base set role %(linkrole)s "
+                              "to concept %(conceptTo)s and to concept %(conceptTo2)s"),
+                            modelObject=(rel, relFrom, relTo), conceptFrom=relFrom.qname, order=order, linkrole=rel.linkrole,
+                            conceptTo=rel.toModelObject.qname, conceptTo2=orderRels[order].toModelObject.qname)
+                    else:
+                        orderRels[order] = rel
+                    if (arcrole not in (XbrlConst.dimensionDomain, XbrlConst.domainMember) and
+                        rel.get("{http://xbrl.org/2005/xbrldt}usable") == "false"):
+                        self.modelXbrl.error("GFM.1.08.11",
+                            _("Disallowed xbrldt:usable='false' attribute on %(arc)s relationship from concept %(conceptFrom)s in "
+                              "base set role %(linkrole)s to concept %(conceptTo)s"),
+                            modelObject=(rel, relFrom, relTo), arc=rel.qname, conceptFrom=relFrom.qname, linkrole=rel.linkrole, conceptTo=rel.toModelObject.qname)
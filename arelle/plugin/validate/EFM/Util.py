@@ -8,6 +8,7 @@ from arelle.FileSource import openFileStream, openFileSource, saveFile # only ne
 from arelle.ModelValue import qname
 from arelle import XbrlConst
 from arelle.PythonUtil import attrdict, flattenSequence, pyObjectSize
+from arelle.UrlUtil import isHttpUrl
 from arelle.ValidateXbrlCalcs import inferredDecimals, floatINF
 from arelle.XmlValidate import VALID
 from .Consts import standardNamespacesPattern, latestTaxonomyDocs, latestEntireUgt
@@ -35,6 +36,19 @@ def abbreviatedNamespace(namespaceURI, pattern=WITHYEAR):
                 }[pattern].format(match.group(2) or match.group(6), match.group(3) or match.group(5))
     return None
 
+def isStandardUri(val, uri):
+    try:
+        return val._isStandardUri[uri]
+    except KeyError:
+        isStd = (uri in val.disclosureSystem.standardTaxonomiesDict or
+                 (not isHttpUrl(uri) and
+                  # try 2011-12-23 RH: if works, remove the localHrefs
+                  # any(u.endswith(e) for u in (uri.replace("\\","/"),) for e in disclosureSystem.standardLocalHrefs)
+                  "/basis/sbr/" in uri.replace("\\","/")
+                  ))
+        val._isStandardUri[uri] = isStd
+        return isStd
+
 def usgaapYear(modelXbrl):
     for d in modelXbrl.urlDocs.values():
         abbrNs = abbreviatedNamespace(d.targetNamespace)
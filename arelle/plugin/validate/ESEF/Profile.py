@@ -0,0 +1,159 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+ESEF filing profile, the features of a filing which the ESEF filing rules check (namespaces, report language,
+CSS usage, image references, inline elements and anchoring relationships), collected by a single pass of
+its html documents, so that the rules (Rules.py) are queries of the profile instead of each walking the
+documents.  Shared by the ESEF and ESEF_2022 plugins.
+'''
+from __future__ import annotations
+import time
+import regex as re
+from typing import Any, NamedTuple
+from lxml.etree import _ElementTree, _Comment, _ProcessingInstruction, EntityBase
+from arelle import XbrlConst
+from arelle.ModelDtsObject import ModelResource
+from arelle.ModelInstanceObject import ModelInlineFact, ModelInlineFootnote
+from arelle.ModelXbrl import ModelXbrl
+from arelle.typing import TypeGetText
+
+_: TypeGetText  # Handle gettext
+
+styleIxHiddenPattern = re.compile(r"(.*[^\w]|^)-esef-ix-hidden\s*:\s*([\w.-]+).*")
+styleCssHiddenPattern = re.compile(r"(.*[^\w]|^)display\s*:\s*none([^\w].*|$)")
+
+xhtmlNs = "{{{}}}".format(XbrlConst.xhtml)
+xhtmlNsLen = len(xhtmlNs)
+xmlLangAttr = "{http://www.w3.org/XML/1998/namespace}lang"
+xmlBaseAttr = "{http://www.w3.org/XML/1998/namespace}base"
+
+class ImageReference(NamedTuple):
+    elt: Any
+    src: str # stripped src attribute
+    inIxTextElt: bool # image is in the text of an ix text-bearing element (not excluded)
+
+class FilingProfile:
+    """Features of a filing, collected from its html documents (ixdsHtmlElements of an inline XBRL document
+    set, or the html element of a stand-alone xhtml document), each list in document order:
+
+    - namespaces: target namespaces of the DTS
+    - reportXmlLang: xml:lang of the rootmost xhtml element having one in the first html document
+    - executableCodeElts: (element, local name) of object and script elements and of a and img elements with javascript
+    - mailtoElts: a elements with mailto hrefs (and no javascript)
+    - imageRefs: ImageReference of each other img element
+    - htmlBaseElts, cssLinkElts (link elements of text/css), cssStyleElts (style elements of text/css)
+    - absolutePositioningDocs: documents whose css style elements position absolutely
+    - ixHiddenStyleRefs: (element, fact id) of elements with -esef-ix-hidden style
+    - cssHiddenElts: elements with display:none style
+    - ixTargetElts, ixTupleElts, ixFractionElts: ix elements with target attributes, ix:tuple and ix:fraction elements
+    - xmlBaseElts: elements with xml:base attributes
+    - footnoteElts: ix:footnote and link:footnote elements
+    - inlineFacts: inline facts
+    - anchoringRelationships: wider-narrower relationships between concepts (collected when first used)
+    """
+
+    def __init__(self, modelXbrl: ModelXbrl, htmlRootElts: Any) -> None:
+        startedAt = time.time()
+        self.modelXbrl = modelXbrl
+        self.htmlRootElts = list(htmlRootElts)
+        self.namespaces = list(modelXbrl.namespaceDocs.keys())
+        self.reportXmlLang: str | None = None
+        self.executableCodeElts: list[tuple[Any, str]] = []
+        self.mailtoElts: list[Any] = []
+        self.imageRefs: list[ImageReference] = []
+        self.htmlBaseElts: list[Any] = []
+        self.cssLinkElts: list[Any] = []
+        self.cssStyleElts: list[Any] = []
+        self.absolutePositioningDocs: set[Any] = set()
+        self.ixHiddenStyleRefs: list[tuple[Any, str]] = []
+        self.cssHiddenElts: list[Any] = []
+        self.ixTargetElts: list[Any] = []
+        self.ixTupleElts: list[Any] = []
+        self.ixFractionElts: list[Any] = []
+        self.xmlBaseElts: list[Any] = []
+        self.footnoteElts: list[Any] = []
+        self.inlineFacts: list[Any] = []
+        self._anchoringRelationships: list[Any] | None = None
+        for i, htmlRootElt in enumerate(self.htmlRootElts):
+            self.profileDocument(htmlRootElt, isFirstDocument=(i == 0))
+        modelXbrl.profileStat(_("ESEF filing profile"), time.time() - startedAt)
+
+    def profileDocument(self, htmlRootElt: Any, isFirstDocument: bool) -> None:
+        ixNStag = getattr(htmlRootElt.modelDocument, "ixNStag", "{" + XbrlConst.ixbrl11 + "}")
+        ixTargetTags = set(ixNStag + ln for ln in ("nonNumeric", "nonFraction", "references", "relationship"))
+        ixTextTags = set(ixNStag + ln for ln in ("nonFraction", "continuation", "footnote"))
+        ixExcludeTag = ixNStag + "exclude"
+        ixTupleTag = ixNStag + "tuple"
+        ixFractionTag = ixNStag + "fraction"
+        rootmostXmlLangDepth = None
+        for elt in htmlRootElt.iter():
+            if isinstance(elt, (_ElementTree, _Comment, _ProcessingInstruction, EntityBase)):
+                continue # comment or other non-parsed element
+            eltTag = elt.tag
+            if eltTag.startswith(xhtmlNs):
+                eltTag = eltTag[xhtmlNsLen:]
+                if isFirstDocument:
+                    xmlLang = elt.get(xmlLangAttr)
+                    if xmlLang:
+                        depth = sum(1 for _ancestor in elt.iterancestors())
+                        if rootmostXmlLangDepth is None or depth < rootmostXmlLangDepth:
+                            self.reportXmlLang = xmlLang
+                            rootmostXmlLangDepth = depth
+                if ((eltTag in ("object", "script")) or
+                    (eltTag == "a" and "javascript:" in elt.get("href","")) or
+                    (eltTag == "img" and "javascript:" in elt.get("src",""))):
+                    self.executableCodeElts.append((elt, eltTag))
+                elif eltTag == "a" and "mailto" in elt.get("href",""):
+                    self.mailtoElts.append(elt)
+                elif eltTag == "img":
+                    inIxTextElt = False # check if image is in an ix text-bearing element
+                    _ancestorElt = elt
+                    while (_ancestorElt is not None):
+                        if _ancestorElt.tag == ixExcludeTag: # excluded from any parent text-bearing ix element
+                            break
+                        if _ancestorElt.tag in ixTextTags:
+                            inIxTextElt = True
+                            break
+                        _ancestorElt = _ancestorElt.getparent()
+                    self.imageRefs.append(ImageReference(elt, elt.get("src","").strip(), inIxTextElt))
+                elif eltTag == "base":
+                    self.htmlBaseElts.append(elt)
+                elif eltTag == "link" and elt.get("type") == "text/css":
+                    self.cssLinkElts.append(elt)
+                elif eltTag == "style" and elt.get("type") == "text/css":
+                    self.cssStyleElts.append(elt)
+                    if "position:absolute" in elt.stringValue:
+                        # absolute positioning such as from Adobe Indesign producing pdf from which html is extracted
+                        self.absolutePositioningDocs.add(elt.modelDocument)
+                style = elt.get("style")
+                if style is not None:
+                    hiddenFactRefMatch = styleIxHiddenPattern.match(style)
+                    if hiddenFactRefMatch:
+                        self.ixHiddenStyleRefs.append((elt, hiddenFactRefMatch.group(2)))
+                    if styleCssHiddenPattern.match(style):
+                        self.cssHiddenElts.append(elt)
+            elif eltTag.startswith(ixNStag):
+                if eltTag in ixTargetTags and elt.get("target"):
+                    self.ixTargetElts.append(elt)
+                elif eltTag == ixTupleTag:
+                    self.ixTupleElts.append(elt)
+                elif eltTag == ixFractionTag:
+                    self.ixFractionElts.append(elt)
+            if elt.get(xmlBaseAttr) is not None:
+                self.xmlBaseElts.append(elt)
+            if isinstance(elt, ModelInlineFootnote):
+                self.footnoteElts.append(elt)
+            elif isinstance(elt, ModelResource) and elt.qname == XbrlConst.qnLinkFootnote:
+                self.footnoteElts.append(elt)
+            elif isinstance(elt, ModelInlineFact):
+                self.inlineFacts.append(elt)
+
+    def namespacesMatching(self, pattern: Any) -> list[str]:
+        return [ns for ns in self.namespaces if pattern.match(ns)]
+
+    @property
+    def anchoringRelationships(self) -> list[Any]:
+        if self._anchoringRelationships is None:
+            self._anchoringRelationships = [rel for rel in self.modelXbrl.relationshipSet(XbrlConst.widerNarrower).modelRelationships
+                                            if rel.fromModelObject is not None and rel.toModelObject is not None]
+        return self._anchoringRelationships
@@ -0,0 +1,173 @@
+'''
+See COPYRIGHT.md for copyright information.
+
+ESEF filing rules which are queries of a filing's profile (Profile.py), registered in a plugin's Rules by
+the section of the validation in which they run, with the time taken by each rule reported as a profile
+stat when profile stats are collected.  The sharedRules are those of both the ESEF and ESEF_2022 plugins.
+'''
+from __future__ import annotations
+import base64, binascii, os, time
+from typing import Any, Callable
+from urllib.parse import unquote
+import regex as re
+from arelle.UrlUtil import isHttpUrl, scheme
+from arelle.ValidateXbrl import ValidateXbrl
+from arelle.typing import TypeGetText
+from .Profile import FilingProfile
+from .Util import checkImageContents
+
+_: TypeGetText  # Handle gettext
+
+DOCUMENTS = "documents" # rule runs with the checks of the html documents
+TAXONOMY = "taxonomy" # rule runs with the checks of the extension taxonomy
+
+imgDataMediaBase64Pattern = re.compile(r"data:image([^,;]*)(;base64)?,(.*)$", re.S)
+
+RuleFunction = Callable[[ValidateXbrl, FilingProfile], None]
+
+class Rules:
+    """Rules of a plugin, by section, each a function of (val, profile), in order of running within its section"""
+
+    def __init__(self, name: str, baseRules: Rules | None = None) -> None:
+        self.name = name
+        self.rules: list[tuple[str, str, RuleFunction]] = list(baseRules.rules) if baseRules is not None else []
+
+    def rule(self, name: str, section: str = DOCUMENTS) -> Callable[[RuleFunction], RuleFunction]:
+        """Decorator registering a rule function"""
+        def register(ruleFunction: RuleFunction) -> RuleFunction:
+            self.rules.append((name, section, ruleFunction))
+            return ruleFunction
+        return register
+
+    def run(self, val: ValidateXbrl, profile: FilingProfile, section: str) -> None:
+        modelXbrl = val.modelXbrl
+        for name, ruleSection, ruleFunction in self.rules:
+            if ruleSection == section:
+                startedAt = time.perf_counter()
+                ruleFunction(val, profile)
+                modelXbrl.profileStat(_("{0} rule {1}").format(self.name, name), time.perf_counter() - startedAt)
+
+sharedRules = Rules("ESEF")
+
+@sharedRules.rule("2.5.1 executable code")
+def executableCodeRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    for elt, eltTag in profile.executableCodeElts:
+        val.modelXbrl.error("ESEF.2.5.1.executableCodePresent",
+            _("Inline XBRL documents MUST NOT contain executable code: %(element)s"),
+            modelObject=elt, element=eltTag)
+
+def checkImageReferences(val: ValidateXbrl, profile: FilingProfile, unquoteData: bool = False) -> None:
+    # unquoteData: data of embedded images which are not base64 encoded is url-decoded to check its contents
+    modelXbrl = val.modelXbrl
+    for elt, src, inIxTextElt in profile.imageRefs:
+        if scheme(src) in ("http", "https", "ftp"):
+            modelXbrl.error("ESEF.4.1.6.xHTMLDocumentContainsExternalReferences" if val.unconsolidated
+                            else "ESEF.3.5.1.inlineXbrlDocumentContainsExternalReferences",
+                _("Inline XBRL instance documents MUST NOT contain any reference pointing to resources outside the reporting package: %(element)s"),
+                modelObject=elt, element="img",
+                messageCodes=("ESEF.3.5.1.inlineXbrlDocumentContainsExternalReferences", "ESEF.4.1.6.xHTMLDocumentContainsExternalReferences"))
+        elif not src.startswith("data:image"):
+            if inIxTextElt:
+                modelXbrl.error("ESEF.2.5.1.imageInIXbrlElementNotEmbedded",
+                    _("Images appearing within an inline XBRL element MUST be embedded regardless of their size."),
+                    modelObject=elt)
+            else:
+                # presume it to be an image file, check image contents
+                try:
+                    base = elt.modelDocument.baseForElement(elt)
+                    normalizedUri = elt.modelXbrl.modelManager.cntlr.webCache.normalizeUrl(src, base)
+                    if not elt.modelXbrl.fileSource.isInArchive(normalizedUri):
+                        normalizedUri = elt.modelXbrl.modelManager.cntlr.webCache.getfilename(normalizedUri)
+                    with elt.modelXbrl.fileSource.file(normalizedUri,binary=True)[0] as fh:
+                        imgContents = fh.read()
+                        checkImageContents(modelXbrl, elt, os.path.splitext(src)[1], True, imgContents)
+                        imgContents = None # deref, may be very large
+                except IOError as err:
+                    modelXbrl.error("ESEF.2.5.1.imageFileCannotBeLoaded",
+                        _("Image file which isn't openable '%(src)s', error: %(error)s"),
+                        modelObject=elt, src=src, error=err)
+        else:
+            m = imgDataMediaBase64Pattern.match(src)
+            if not m or not m.group(2):
+                modelXbrl.warning("ESEF.2.5.1.embeddedImageNotUsingBase64Encoding",
+                    _("Images included in the XHTML document SHOULD be base64 encoded: %(src)s."),
+                    modelObject=elt, src=src[:128])
+                if m and m.group(1) and m.group(3):
+                    checkImageContents(modelXbrl, elt, m.group(1), False, unquote(m.group(3)) if unquoteData else m.group(3))
+            else:
+                if not m.group(1):
+                    modelXbrl.error("ESEF.2.5.1.MIMETypeNotSpecified",
+                        _("Images included in the XHTML document MUST be saved with MIME type specifying PNG, GIF, SVG or JPG/JPEG formats: %(src)s."),
+                        modelObject=elt, src=src[:128])
+                elif m.group(1) not in ("/gif", "/jpeg", "/jpg", "/png", "/svg+xml"):
+                    modelXbrl.error("ESEF.2.5.1.imageFormatNotSupported",
+                        _("Images included in the XHTML document MUST be saved in PNG, GIF, SVG or JPG/JPEG formats: %(src)s."),
+                        modelObject=elt, src=src[:128])
+                # check for malicious image contents
+                try: # allow embedded newlines
+                    checkImageContents(modelXbrl, elt, m.group(1), False, base64.b64decode(m.group(3)))
+                except binascii.Error as err:
+                    modelXbrl.error("ESEF.2.5.1.embeddedImageNotUsingBase64Encoding",
+                        _("Base64 encoding error %(err)s in image source: %(src)s."),
+                        modelObject=elt, err=str(err), src=src[:128])
+
+@sharedRules.rule("2.4.2 html base")
+def htmlBaseRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    for elt in profile.htmlBaseElts:
+        val.modelXbrl.error("ESEF.2.4.2.htmlOrXmlBaseUsed",
+            _("The HTML <base> elements MUST NOT be used in the Inline XBRL document."),
+            modelObject=elt, element="base")
+
+@sharedRules.rule("2.5.4 css")
+def cssRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    modelXbrl = val.modelXbrl
+    isMultiDocument = not val.unconsolidated and len(modelXbrl.ixdsHtmlElements) > 1 # stand-alone xhtml has no ixds
+    for elt in profile.cssLinkElts:
+        if val.unconsolidated:
+            modelXbrl.warning("ESEF.4.1.4.externalCssFileForXhtmlDocument",
+                _("For XHTML stand-alone documents, the CSS SHOULD be embedded within the document."),
+                modelObject=elt, element="link")
+        elif isMultiDocument:
+            _file = elt.get("href")
+            if not _file or isHttpUrl(_file) or os.path.isabs(_file):
+                modelXbrl.warning("ESEF.2.5.4.externalCssReportPackage",
+                    _("The CSS file should be physically stored within the report package: %{file}s."),
+                    modelObject=elt, file=_file)
+        else:
+            modelXbrl.warning("ESEF.2.5.4.externalCssFileForSingleIXbrlDocument",
+                _("Where an Inline XBRL document set contains a single document, the CSS SHOULD be embedded within the document."),
+                modelObject=elt, element="link")
+    if isMultiDocument: # embedded css isn't checked for stand-alone documents
+        for elt in profile.cssStyleElts:
+            modelXbrl.warning("ESEF.2.5.4.embeddedCssForMultiHtmlIXbrlDocumentSets",
+                _("Where an Inline XBRL document set contains multiple documents, the CSS SHOULD be defined in a separate file."),
+                modelObject=elt, element="style")
+
+@sharedRules.rule("2.5.3 target attribute")
+def ixTargetRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    ixTargetUsage = val.authParam["ixTargetUsage"]
+    if ixTargetUsage != "allowed":
+        for elt in profile.ixTargetElts:
+            val.modelXbrl.log(ixTargetUsage.upper(),
+                "ESEF.2.5.3.targetAttributeUsedForESEFContents",
+                _("Target attribute %(severityVerb)s not be used unless explicitly required by local jurisdictions: element %(localName)s, target attribute %(target)s."),
+                modelObject=elt, localName=elt.elementQname, target=elt.get("target"),
+                severityVerb={"warning":"SHOULD","error":"MUST"}[ixTargetUsage])
+
+@sharedRules.rule("2.4.1 tuples and fractions")
+def ixTupleFractionRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    for elt in profile.ixTupleElts:
+        val.modelXbrl.error("ESEF.2.4.1.tupleElementUsed",
+            _("The ix:tuple element MUST not be used in the Inline XBRL document: %(qname)s."),
+            modelObject=elt, qname=elt.qname)
+    for elt in profile.ixFractionElts:
+        val.modelXbrl.error("ESEF.2.4.1.fractionElementUsed",
+            _("The ix:fraction element MUST not be used in the Inline XBRL document."),
+            modelObject=elt)
+
+@sharedRules.rule("2.4.2 xml base")
+def xmlBaseRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    for elt in profile.xmlBaseElts:
+        val.modelXbrl.error("ESEF.2.4.2.htmlOrXmlBaseUsed",
+            _("xml:base attributes MUST NOT be used in the Inline XBRL document: element %(localName)s, base attribute %(base)s."),
+            modelObject=elt, localName=elt.elementQname, base=elt.get("{http://www.w3.org/XML/1998/namespace}base"))
@@ -47,7 +47,7 @@ supportedImgTypes: dict[bool, tuple[str, ...]] = {
     False: ("gif", "jpeg", "png") # mime types: jpg is not a valid mime type
     }
 # check image contents against mime/file ext and for Steganography
-def checkImageContents(modelXbrl: ModelXbrl, imgElt: ModelObject, imgType: str, isFile: bool, data: bytes) -> None:
+def checkImageContents(modelXbrl: ModelXbrl, imgElt: ModelObject, imgType: str, isFile: bool, data: bytes | str) -> None:
     if "svg" in imgType:
         try:
             rootElement = True
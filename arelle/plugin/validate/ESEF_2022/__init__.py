@@ -42,13 +42,12 @@ Client with curl:
 
 '''
 from __future__ import annotations
-import os, base64
+import os
 import zipfile
 import regex as re
 from collections import defaultdict
 from math import isnan
-from lxml.etree import _ElementTree, _Comment, _ProcessingInstruction, EntityBase, _Element
-from urllib.parse import unquote
+from lxml.etree import _ElementTree, _Comment, _ProcessingInstruction
 from arelle import LeiUtil, ModelDocument, XbrlConst, XhtmlValidate
 from arelle.FunctionIxt import ixtNamespaces
 from arelle.ModelDtsObject import ModelResource
@@ -57,20 +56,21 @@ from arelle.ModelValue import qname
 from arelle.PackageManager import validateTaxonomyPackage
 from arelle.PythonUtil import strTruncate, normalizeSpace
 from arelle.Version import authorLabel, copyrightLabel
-from arelle.UrlUtil import isHttpUrl, scheme
 from arelle.XmlValidate import lexicalPatterns
 
 from arelle.ValidateXbrlCalcs import inferredDecimals, rangeValue
 from arelle.XbrlConst import (ixbrl11, xhtml, parentChild, summationItem, standardLabel,
                               all as hc_all, notAll as hc_notAll, dimensionDomain, domainMember,
-                              qnLinkLoc, qnLinkFootnoteArc, qnLinkFootnote, qnIXbrl11Footnote, iso17442, widerNarrower)
+                              qnLinkLoc, qnLinkFootnoteArc, qnLinkFootnote, qnIXbrl11Footnote, iso17442)
 from arelle.XmlValidate import VALID
 from arelle.ValidateUtr import ValidateUtr
 from .Const import (mandatory, untransformableTypes,
                     esefPrimaryStatementPlaceholderNames, esefStatementsOfMonetaryDeclarationNames, esefMandatoryElementNames2020)
 from .Dimensions import checkFilingDimensions
 from .DTS import checkFilingDTS
-from .Util import isExtension, checkImageContents, loadAuthorityValidations, checkForMultiLangDuplicates
+from .Util import isExtension, loadAuthorityValidations, checkForMultiLangDuplicates
+from arelle.plugin.validate.ESEF.Profile import FilingProfile
+from arelle.plugin.validate.ESEF.Rules import Rules, sharedRules, checkImageReferences, DOCUMENTS, TAXONOMY
 from arelle.typing import TypeGetText
 from arelle.ModelObject import ModelObject
 from arelle.DisclosureSystem import DisclosureSystem
@@ -82,16 +82,12 @@ from arelle.ModelRelationshipSet import ModelRelationshipSet
 from arelle.ModelInstanceObject import ModelInlineFootnote
 from arelle.ModelInstanceObject import ModelContext
 from typing import Any, cast
-from collections.abc import Generator
 from arelle.ModelValue import QName
 
 _: TypeGetText  # Handle gettext
 
-styleIxHiddenPattern = re.compile(r"(.*[^\w]|^)-esef-ix-hidden\s*:\s*([\w.-]+).*")
-styleCssHiddenPattern = re.compile(r"(.*[^\w]|^)display\s*:\s*none([^\w].*|$)")
 ifrsNsPattern = re.compile(r"https?://xbrl.ifrs.org/taxonomy/[0-9-]{10}/ifrs-full")
 datetimePattern = lexicalPatterns["XBRLI_DATEUNION"]
-imgDataMediaBase64Pattern = re.compile(r"data:image([^,;]*)(;base64)?,(.*)$", re.S)
 ixErrorPattern = re.compile(r"ix11[.]|xmlSchema[:]|(?!xbrl.5.2.5.2|xbrl.5.2.6.2)xbrl[.]|xbrld[ti]e[:]|utre[:]")
 docTypeXhtmlPattern = re.compile(r"^<!(?:DOCTYPE\s+)\s*html(?:PUBLIC\s+)?(?:.*-//W3C//DTD\s+(X?HTML)\s)?.*>$", re.IGNORECASE)
 
@@ -100,11 +96,62 @@ PERCENT_TYPE = qname("{http://www.xbrl.org/dtr/type/numeric}num:percentItemType"
 IXT_NAMESPACES = {ixtNamespaces["ixt v4"], # only tr4 or newer REC is currently recommended
                   ixtNamespaces["ixt v5"]}
 
-def etreeIterWithDepth(node: ModelObject | _Element, depth: int=0) -> Generator[tuple[ModelObject | _Element, int], None, None]:
-    yield (node, depth)
-    for child in node.iterchildren():
-        for n_d in etreeIterWithDepth(child, depth+1):
-            yield n_d
+esefRules = Rules("ESEF 2022", sharedRules)
+
+@esefRules.rule("2.5.1 mailto links")
+def mailtoRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    for elt in profile.mailtoElts:
+        val.modelXbrl.error("ESEF.2.5.1.executableCodePresent",
+            _("Inline XBRL documents MUST NOT contain executable code: %(element)s"),
+            modelObject=elt, element="a")
+
+@esefRules.rule("2.5.1 images")
+def imagesRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    checkImageReferences(val, profile, unquoteData=True)
+
+@esefRules.rule("2.2.6 text blocks")
+def textBlocksRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    modelXbrl = val.modelXbrl
+    for elt in profile.inlineFacts:
+        if elt.concept is not None and elt.concept.isTextBlock:
+            normalized_str = normalizeSpace(elt.value)
+            if not normalized_str or normalized_str.isspace():
+                modelXbrl.warning("ESEF.1.3.3.emptyTextBlock",
+                        _("The text block element SHOULD not be empty: %(qname)s."),
+                        modelObject=elt, qname=elt.qname)
+            elif any(character in elt.stringValue for character in ['&lt;', '&amp;', '&', '<']):
+                if not (hasattr(elt, 'attrib')) or ('escape' not in elt.attrib or elt.attrib.get('escape').lower() != 'true'):
+                    modelXbrl.error("ESEF.2.2.6.escapedHTMLUsedInBlockTagWithSpecialCharacters",
+                            _("A text block containing '&' or '<' character MUST have an 'escape' attribute: %(qname)s."),
+                            modelObject=elt, qname=elt.qname)
+            # Check that continuation elements are in the order of html text as rendered to user
+            if elt.modelDocument not in profile.absolutePositioningDocs:
+                continuationChain = []
+                e = elt # continuation chain
+                while e is not None:
+                    continuationChain.append(e)
+                    e = getattr(e, "_continuationElement", None)
+                if continuationChain != sorted(continuationChain, key=lambda e: cast(int, e.objectIndex)):
+                    modelXbrl.warning("ESEF.2.2.6.textContentOrdering",
+                            _("The text content of tagged fact should have same order as human-readable report, ix:continuation elements out of order:  %(qname)s"),
+                            modelObject=continuationChain, qname=elt.qname)
+                del continuationChain[:] # dereference elements
+
+@esefRules.rule("3.3.1 anchoring to abstract concepts", TAXONOMY)
+def anchoringRule(val: ValidateXbrl, profile: FilingProfile) -> None:
+    anchoringToAbstractConcept = set()
+    for rel in profile.anchoringRelationships:
+        fr = rel.fromModelObject
+        to = rel.toModelObject
+        if to.isAbstract and isExtension(val, fr):
+            anchoringToAbstractConcept.add(fr)
+        if fr.isAbstract and isExtension(val, to):
+            anchoringToAbstractConcept.add(to)
+
+    for _elem in anchoringToAbstractConcept:
+        val.modelXbrl.warning("ESEF.3.3.1.ExtensionConceptAnchoredToAbstractConcept",
+            _("A concept from extension SHOULD NOT be anchored to an abstract concept: %(qname)s."),
+            modelObject=_elem, qname=_elem.qname)
 
 def dislosureSystemTypes(disclosureSystem: DisclosureSystem, *args: Any, **kwargs: Any) -> tuple[tuple[str, str]]:
     # return ((disclosure system name, variable name), ...)
@@ -220,8 +267,6 @@ def validateXbrlFinally(val: ValidateXbrl, *args: Any, **kwargs: Any) -> None:
     if not (val.validateESEFplugin):
         return
 
-    _xhtmlNs = "{{{}}}".format(xhtml)
-    _xhtmlNsLen = len(_xhtmlNs)
     modelXbrl = val.modelXbrl
     modelDocument = modelXbrl.modelDocument
     if not modelDocument:
@@ -254,14 +299,15 @@ def validateXbrlFinally(val: ValidateXbrl, *args: Any, **kwargs: Any) -> None:
                         _("The \"Publisher Country\" element of the report package metadata for a UKSEF report MUST be set to \"GB\" but was \"%(publisherCountry)s\"."),
                         modelObject=modelXbrl, publisherCountry=modelXbrl.fileSource.taxonomyPackage["publisherCountry"] )
 
-    reportXmlLang = None
-    firstRootmostXmlLangDepth = 9999999
+    if modelDocument.type in (ModelDocument.Type.INLINEXBRL, ModelDocument.Type.INLINEXBRLDOCUMENTSET, ModelDocument.Type.UnknownXML):
+        profile = FilingProfile(modelXbrl, modelXbrl.ixdsHtmlElements if val.consolidated else # ix root elements for all ix docs in IXDS
+                                           (modelDocument.xmlRootElement,)) # plain xhtml filing
+    else:
+        profile = FilingProfile(modelXbrl, ())
+    reportXmlLang = profile.reportXmlLang
 
-    _ifrsNses = []
+    _ifrsNses = profile.namespacesMatching(ifrsNsPattern)
     _ifrsNs = None
-    for targetNs in modelXbrl.namespaceDocs.keys():
-        if ifrsNsPattern.match(targetNs):
-            _ifrsNses.append(targetNs)
     if val.consolidated:
         if not _ifrsNses:
             modelXbrl.warning("ESEF.RTS.ifrsRequired",
@@ -403,212 +449,23 @@ def validateXbrlFinally(val: ValidateXbrl, *args: Any, **kwargs: Any) -> None:
                        "http://www.xbrl.org/WGN/report-packages/WGN-2018-08-14/report-packages-WGN-2018-08-14.html: "
                        "%(documentSets)s (Document files appear to be in multiple document sets)"),
                 modelObject=doc, documentSets=", ".join(sorted(ixdsDocDirs)))
-        ixTargetUsage = val.authParam["ixTargetUsage"]
         if modelDocument.type in (ModelDocument.Type.INLINEXBRL, ModelDocument.Type.INLINEXBRLDOCUMENTSET, ModelDocument.Type.UnknownXML):
             hiddenEltIds = {}
             presentedHiddenEltIds = defaultdict(list)
             eligibleForTransformHiddenFacts = []
             requiredToDisplayFacts = []
             requiredToDisplayFactIds: dict[Any, Any] = {}
-            firstIxdsDoc = True
 
-            # ModelDocument.load has None as a return type. For typing reasons, we need to guard against that here.
-            assert modelXbrl.modelDocument is not None
-            for ixdsHtmlRootElt in (modelXbrl.ixdsHtmlElements if val.consolidated else # ix root elements for all ix docs in IXDS
-                                    (modelXbrl.modelDocument.xmlRootElement,)): # plain xhtml filing
+            esefRules.run(val, profile, DOCUMENTS)
+            for elt in profile.footnoteElts:
+                checkFootnote(elt, elt.value)
+            for elt in profile.inlineFacts:
+                if elt.format is not None and elt.format.namespaceURI not in IXT_NAMESPACES:
+                    transformRegistryErrors.add(elt)
+            ixHiddenFacts = set()
+            for ixdsHtmlRootElt in profile.htmlRootElts:
                 ixNStag = getattr(ixdsHtmlRootElt.modelDocument, "ixNStag", ixbrl11)
-                ixTags = set(ixNStag + ln for ln in ("nonNumeric", "nonFraction", "references", "relationship"))
-                ixTextTags = set(ixNStag + ln for ln in ("nonFraction", "continuation", "footnote"))
-                ixExcludeTag = ixNStag + "exclude"
-                ixTupleTag = ixNStag + "tuple"
-                ixFractionTag = ixNStag + "fraction"
-                hasAbsolutePositioning = False
-
-                for uncast_elt, depth in etreeIterWithDepth(ixdsHtmlRootElt):
-                    elt = cast(Any, uncast_elt)
-
-                    eltTag = elt.tag
-                    if isinstance(elt, (_ElementTree, _Comment, _ProcessingInstruction, EntityBase)):
-                        continue # comment or other non-parsed element
-                    else:
-                        eltTag = elt.tag
-                        if eltTag.startswith(_xhtmlNs):
-                            eltTag = eltTag[_xhtmlNsLen:]
-                            if firstIxdsDoc and (not reportXmlLang or depth < firstRootmostXmlLangDepth):
-                                xmlLang = elt.get("{http://www.w3.org/XML/1998/namespace}lang")
-                                if xmlLang:
-                                    reportXmlLang = xmlLang
-                                    firstRootmostXmlLangDepth = depth
-                        if ((eltTag in ("object", "script")) or
-                            (eltTag == "a" and "javascript:" in elt.get("href", "")) or
-                            (eltTag == "img" and "javascript:" in elt.get("src", "")) or
-                            (eltTag == "a" and "mailto" in elt.get("href", ""))):
-                            modelXbrl.error("ESEF.2.5.1.executableCodePresent",
-                                _("Inline XBRL documents MUST NOT contain executable code: %(element)s"),
-                                modelObject=elt, element=eltTag)
-                        elif eltTag == "img":
-                            src = elt.get("src","").strip()
-                            hasParentIxTextTag = False # check if image is in an ix text-bearing element
-                            _ancestorElt = elt
-                            while (_ancestorElt is not None):
-                                if _ancestorElt.tag == ixExcludeTag: # excluded from any parent text-bearing ix element
-                                    break
-                                if _ancestorElt.tag in ixTextTags:
-                                    hasParentIxTextTag = True
-                                    break
-                                _ancestorElt = _ancestorElt.getparent()
-                            if scheme(src) in ("http", "https", "ftp"):
-                                modelXbrl.error("ESEF.4.1.6.xHTMLDocumentContainsExternalReferences" if val.unconsolidated
-                                                else "ESEF.3.5.1.inlineXbrlDocumentContainsExternalReferences",
-                                    _("Inline XBRL instance documents MUST NOT contain any reference pointing to resources outside the reporting package: %(element)s"),
-                                    modelObject=elt, element=eltTag,
-                                    messageCodes=("ESEF.3.5.1.inlineXbrlDocumentContainsExternalReferences", "ESEF.4.1.6.xHTMLDocumentContainsExternalReferences"))
-                            elif not src.startswith("data:image"):
-                                if hasParentIxTextTag:
-                                    modelXbrl.error("ESEF.2.5.1.imageInIXbrlElementNotEmbedded",
-                                        _("Images appearing within an inline XBRL element MUST be embedded regardless of their size."),
-                                        modelObject=elt)
-                                else:
-                                    # presume it to be an image file, check image contents
-                                    try:
-                                        base = elt.modelDocument.baseForElement(elt)
-                                        normalizedUri = elt.modelXbrl.modelManager.cntlr.webCache.normalizeUrl(src, base)
-                                        if not elt.modelXbrl.fileSource.isInArchive(normalizedUri):
-                                            normalizedUri = elt.modelXbrl.modelManager.cntlr.webCache.getfilename(normalizedUri)
-                                        imglen = 0
-                                        with elt.modelXbrl.fileSource.file(normalizedUri,binary=True)[0] as fh:
-                                            imgContents = fh.read()
-                                            imglen += len(imgContents)
-                                            checkImageContents(modelXbrl, elt, os.path.splitext(src)[1], True, imgContents)
-                                            imgContents = None # deref, may be very large
-                                        #if imglen < browserMaxBase64ImageLength:
-                                        #    modelXbrl.error("ESEF.2.5.1.imageIncludedAndNotEmbeddedAsBase64EncodedString",
-                                        #        _("Images MUST be included in the XHTML document as a base64 encoded string unless their size exceeds support of browsers (%(maxImageSize)s): %(file)s."),
-                                        #        modelObject=elt, maxImageSize=browserMaxBase64ImageLength, file=os.path.basename(normalizedUri))
-                                    except IOError as err:
-                                        modelXbrl.error("ESEF.2.5.1.imageFileCannotBeLoaded",
-                                            _("Image file which isn't openable '%(src)s', error: %(error)s"),
-                                            modelObject=elt, src=src, error=err)
-                            else:
-                                m = imgDataMediaBase64Pattern.match(src)
-                                if not m or not m.group(2):
-                                    modelXbrl.warning("ESEF.2.5.1.embeddedImageNotUsingBase64Encoding",
-                                        _("Images included in the XHTML document SHOULD be base64 encoded: %(src)s."),
-                                        modelObject=elt, src=src[:128])
-                                    if m and m.group(1) and m.group(3):
-                                        checkImageContents(modelXbrl, elt, m.group(1), False, unquote(m.group(3)))
-                                else:
-                                    if not m.group(1):
-                                        modelXbrl.error("ESEF.2.5.1.MIMETypeNotSpecified",
-                                            _("Images included in the XHTML document MUST be saved with MIME type specifying PNG, GIF, SVG or JPG/JPEG formats: %(src)s."),
-                                            modelObject=elt, src=src[:128])
-                                    elif m.group(1) not in ("/gif", "/jpeg", "/jpg", "/png", "/svg+xml"):
-                                        modelXbrl.error("ESEF.2.5.1.imageFormatNotSupported",
-                                            _("Images included in the XHTML document MUST be saved in PNG, GIF, SVG or JPG/JPEG formats: %(src)s."),
-                                            modelObject=elt, src=src[:128])
-                                    # check for malicious image contents
-                                    try: # allow embedded newlines
-                                        checkImageContents(modelXbrl, elt, m.group(1), False, base64.b64decode(m.group(3)))
-                                        imgContents = None # deref, may be very large
-                                    except base64.binascii.Error as err:
-                                        modelXbrl.error("ESEF.2.5.1.embeddedImageNotUsingBase64Encoding",
-                                            _("Base64 encoding error %(err)s in image source: %(src)s."),
-                                            modelObject=elt, err=str(err), src=src[:128])
-                        # links to external documents are allowed as of 2021 per G.2.5.1
-                        #    Since ESEF is a format requirement and is not expected to impact the 'human readable layer' of a report,
-                        #    this guidance should not be seen as limiting the inclusion of links to external websites, to other documents
-                        #    or to other sections of the annual financial report.'''
-                        #elif eltTag == "a":
-                        #    href = elt.get("href","").strip()
-                        #    if scheme(href) in ("http", "https", "ftp"):
-                        #        modelXbrl.error("ESEF.4.1.6.xHTMLDocumentContainsExternalReferences" if val.unconsolidated
-                        #                        else "ESEF.3.5.1.inlineXbrlDocumentContainsExternalReferences",
-                        #            _("Inline XBRL instance documents MUST NOT contain any reference pointing to resources outside the reporting package: %(element)s"),
-                        #            modelObject=elt, element=eltTag,
-                        #            messageCodes=("ESEF.3.5.1.inlineXbrlDocumentContainsExternalReferences", "ESEF.4.1.6.xHTMLDocumentContainsExternalReferences"))
-                        elif eltTag == "base":
-                            modelXbrl.error("ESEF.2.4.2.htmlOrXmlBaseUsed",
-                                _("The HTML <base> elements MUST NOT be used in the Inline XBRL document."),
-                                modelObject=elt, element=eltTag)
-                        elif eltTag == "link" and elt.get("type") == "text/css":
-                            if val.unconsolidated:
-                                modelXbrl.warning("ESEF.4.1.4.externalCssFileForXhtmlDocument",
-                                    _("For XHTML stand-alone documents, the CSS SHOULD be embedded within the document."),
-                                    modelObject=elt, element=eltTag)
-                            elif len(modelXbrl.ixdsHtmlElements) > 1:
-                                _file = elt.get("href")
-                                if not _file or isHttpUrl(_file) or os.path.isabs(_file):
-                                    modelXbrl.warning("ESEF.2.5.4.externalCssReportPackage",
-                                        _("The CSS file should be physically stored within the report package: %{file}s."),
-                                        modelObject=elt, file=_file)
-                            else:
-                                modelXbrl.warning("ESEF.2.5.4.externalCssFileForSingleIXbrlDocument",
-                                    _("Where an Inline XBRL document set contains a single document, the CSS SHOULD be embedded within the document."),
-                                    modelObject=elt, element=eltTag)
-                        elif val.unconsolidated:
-                            pass # rest of following tests don't apply to unconsolidated
-                        elif eltTag == "style" and elt.get("type") == "text/css":
-                            if len(modelXbrl.ixdsHtmlElements) > 1:
-                                modelXbrl.warning("ESEF.2.5.4.embeddedCssForMultiHtmlIXbrlDocumentSets",
-                                    _("Where an Inline XBRL document set contains multiple documents, the CSS SHOULD be defined in a separate file."),
-                                    modelObject=elt, element=eltTag)
-                            if "position:absolute" in elt.stringValue:
-                                # detect absolute positioning such as from Adobe Indesign producing pdf from whic html is extracted
-                                hasAbsolutePositioning = True
-
-                    if eltTag in ixTags and elt.get("target") and ixTargetUsage != "allowed":
-                        modelXbrl.log(ixTargetUsage.upper(),
-                            "ESEF.2.5.3.targetAttributeUsedForESEFContents",
-                            _("Target attribute %(severityVerb)s not be used unless explicitly required by local jurisdictions: element %(localName)s, target attribute %(target)s."),
-                            modelObject=elt, localName=elt.elementQname, target=elt.get("target"),
-                            severityVerb={"warning":"SHOULD","error":"MUST"}[ixTargetUsage])
-
-                    if hasattr(elt, "concept") and elt.concept is not None and elt.concept.isTextBlock:
-                        normalized_str = normalizeSpace(elt.value)
-                        if not normalized_str or normalized_str.isspace():
-                            modelXbrl.warning("ESEF.1.3.3.emptyTextBlock",
-                                    _("The text block element SHOULD not be empty: %(qname)s."),
-                                    modelObject=elt, qname=elt.qname)
-                        elif any(character in elt.stringValue for character in ['&lt;', '&amp;', '&', '<']):
-                            if not (hasattr(elt, 'attrib')) or ('escape' not in elt.attrib or elt.attrib.get('escape').lower() != 'true'):
-                                modelXbrl.error("ESEF.2.2.6.escapedHTMLUsedInBlockTagWithSpecialCharacters",
-                                        _("A text block containing '&' or '<' character MUST have an 'escape' attribute: %(qname)s."),
-                                        modelObject=elt, qname=elt.qname)
-                        # Check that continuation elements are in the order of html text as rendered to user
-                        if not hasAbsolutePositioning:
-                            continuationChain = []
-                            e = elt # continuation chain
-                            while e is not None:
-                                continuationChain.append(e)
-                                e = getattr(e, "_continuationElement", None)
-                            if continuationChain != sorted(continuationChain, key=lambda e:e.objectIndex):
-                                modelXbrl.warning("ESEF.2.2.6.textContentOrdering",
-                                        _("The text content of tagged fact should have same order as human-readable report, ix:continuation elements out of order:  %(qname)s"),
-                                        modelObject=continuationChain, qname=elt.qname)
-                            del continuationChain[:] # dereference elements
-
-
-                    if eltTag == ixTupleTag:
-                        modelXbrl.error("ESEF.2.4.1.tupleElementUsed",
-                            _("The ix:tuple element MUST not be used in the Inline XBRL document: %(qname)s."),
-                            modelObject=elt, qname=elt.qname)
-                    if eltTag == ixFractionTag:
-                        modelXbrl.error("ESEF.2.4.1.fractionElementUsed",
-                            _("The ix:fraction element MUST not be used in the Inline XBRL document."),
-                            modelObject=elt)
-                    if elt.get("{http://www.w3.org/XML/1998/namespace}base") is not None:
-                        modelXbrl.error("ESEF.2.4.2.htmlOrXmlBaseUsed",
-                            _("xml:base attributes MUST NOT be used in the Inline XBRL document: element %(localName)s, base attribute %(base)s."),
-                            modelObject=elt, localName=elt.elementQname, base=elt.get("{http://www.w3.org/XML/1998/namespace}base"))
-                    if isinstance(elt, ModelInlineFootnote):
-                        checkFootnote(elt, elt.value)
-                    elif isinstance(elt, ModelResource) and elt.qname == XbrlConst.qnLinkFootnote:
-                        checkFootnote(elt, elt.value)
-                    elif isinstance(elt, ModelInlineFact):
-                        if elt.format is not None and elt.format.namespaceURI not in IXT_NAMESPACES:
-                            transformRegistryErrors.add(elt)
-                ixHiddenFacts = set()
-                for ixHiddenElt in ixdsHtmlRootElt.iterdescendants(tag=ixNStag + "hidden"):
+                for ixHiddenElt in ixdsHtmlRootElt.modelDocument.inlineIndex.ixElements(ixNStag + "hidden"):
                     for tag in (ixNStag + "nonNumeric", ixNStag+"nonFraction"):
                         for ixElt in ixHiddenElt.iterdescendants(tag=tag):
                             if (getattr(ixElt, "xValid", 0) >= VALID  # may not be validated
@@ -621,18 +478,16 @@ def validateXbrlFinally(val: ValidateXbrl, *args: Any, **kwargs: Any) -> None:
                             if ixElt.id:
                                 hiddenEltIds[ixElt.id] = ixElt
                             ixHiddenFacts.add(ixElt)
-                # maliciously hidden facts
-                for cssHiddenElt in ixdsHtmlRootElt.getroottree().iterfind("//{http://www.w3.org/1999/xhtml}*[@style]"):
-                    if styleCssHiddenPattern.match(cssHiddenElt.get("style","")):
-                        for tag in (ixNStag + "nonNumeric", ixNStag+"nonFraction"):
-                            for ixElt in cssHiddenElt.iterdescendants(tag=tag):
-                                if ixElt not in ixHiddenFacts:
-                                    modelXbrl.error("ESEF.2.5.4.displayNoneUsedToHideTaggedFacts",
-                                        _("\"display:none\" style applies to a fact that is not in an ix:hidden section."),
-                                        modelObject=ixElt)
-                del ixHiddenFacts
-
-                firstIxdsDoc = False
+            # maliciously hidden facts
+            for cssHiddenElt in profile.cssHiddenElts:
+                ixNStag = getattr(cssHiddenElt.modelDocument, "ixNStag", ixbrl11)
+                for tag in (ixNStag + "nonNumeric", ixNStag+"nonFraction"):
+                    for ixElt in cssHiddenElt.iterdescendants(tag=tag):
+                        if ixElt not in ixHiddenFacts:
+                            modelXbrl.error("ESEF.2.5.4.displayNoneUsedToHideTaggedFacts",
+                                _("\"display:none\" style applies to a fact that is not in an ix:hidden section."),
+                                modelObject=ixElt)
+            del ixHiddenFacts
 
             if val.unconsolidated:
                 modelXbrl.modelManager.showStatus(None)
@@ -644,17 +499,13 @@ def validateXbrlFinally(val: ValidateXbrl, *args: Any, **kwargs: Any) -> None:
                     modelObject=eligibleForTransformHiddenFacts,
                     countEligible=len(eligibleForTransformHiddenFacts),
                     elements=", ".join(sorted(set(str(f.qname) for f in eligibleForTransformHiddenFacts))))
-            for ixdsHtmlRootElt in modelXbrl.ixdsHtmlElements:
-                for ixElt in ixdsHtmlRootElt.getroottree().iterfind("//{http://www.w3.org/1999/xhtml}*[@style]"):
-                    hiddenFactRefMatch = styleIxHiddenPattern.match(ixElt.get("style",""))
-                    if hiddenFactRefMatch:
-                        hiddenFactRef = hiddenFactRefMatch.group(2)
-                        if hiddenFactRef not in hiddenEltIds:
-                            modelXbrl.error("ESEF.2.4.1.esefIxHiddenStyleNotLinkingFactInHiddenSection",
-                                _("\"-esef-ix-hidden\" style identifies @id, %(id)s of a fact that is not in ix:hidden section."),
-                                modelObject=ixElt, id=hiddenFactRef)
-                        else:
-                            presentedHiddenEltIds[hiddenFactRef].append(ixElt)
+            for ixElt, hiddenFactRef in profile.ixHiddenStyleRefs:
+                if hiddenFactRef not in hiddenEltIds:
+                    modelXbrl.error("ESEF.2.4.1.esefIxHiddenStyleNotLinkingFactInHiddenSection",
+                        _("\"-esef-ix-hidden\" style identifies @id, %(id)s of a fact that is not in ix:hidden section."),
+                        modelObject=ixElt, id=hiddenFactRef)
+                else:
+                    presentedHiddenEltIds[hiddenFactRef].append(ixElt)
             for hiddenEltId, ixElt in hiddenEltIds.items():
                 if (hiddenEltId not in presentedHiddenEltIds and
                     getattr(ixElt, "xValid", 0) >= VALID and # may not be validated
@@ -1011,21 +862,7 @@ def validateXbrlFinally(val: ValidateXbrl, *args: Any, **kwargs: Any) -> None:
                 _("All usable concepts in extension taxonomy relationships SHOULD be applied by tagged facts: %(elements)s."),
                 modelObject=unreportedLbElts, elements=", ".join(sorted((str(c.qname) for c in unreportedLbElts))))
 
-        anchoringToAbstractConcept = set()
-        for rel in modelXbrl.relationshipSet(widerNarrower).modelRelationships:
-            fr = rel.fromModelObject
-            to = rel.toModelObject
-
-            if fr is not None and to is not None:
-                if to.isAbstract and isExtension(val, fr):
-                    anchoringToAbstractConcept.add(fr)
-                if fr.isAbstract and isExtension(val, to):
-                    anchoringToAbstractConcept.add(to)
-
-        for _elem in anchoringToAbstractConcept:
-            modelXbrl.warning("ESEF.3.3.1.ExtensionConceptAnchoredToAbstractConcept",
-                _("A concept from extension SHOULD NOT be anchored to an abstract concept: %(qname)s."),
-                modelObject=_elem, qname=_elem.qname)
+        esefRules.run(val, profile, TAXONOMY)
 
         # 3.4.4 check for presentation preferred labels
         missingConceptLabels = defaultdict(set) # by role
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+#
+# this script generates a large EBA (COREP-like) instance and benchmarks EBA filing rules validation of it,
+# loaded as a DOM and streamed (streamingExtensions), reporting time and peak memory of each mode and
+# checking that both modes log the same messages
+#
+# the instance is validated without its DTS (--skipDTS), EBA rules then typing facts by the first letter of
+# their metric names (m monetary, i integer, p percent, s string, ...)
+#
+#   python scripts/benchmarkEbaValidation.py --facts 1000000 --dir /tmp/ebaBenchmark
+#
+
+import argparse, os, re, resource, subprocess, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NAMESPACES = (
+    ('xbrli', 'http://www.xbrl.org/2003/instance'),
+    ('link', 'http://www.xbrl.org/2003/linkbase'),
+    ('xlink', 'http://www.w3.org/1999/xlink'),
+    ('iso4217', 'http://www.xbrl.org/2003/iso4217'),
+    ('xbrldi', 'http://xbrl.org/2006/xbrldi'),
+    ('find', 'http://www.eurofiling.info/xbrl/ext/filing-indicators'),
+    ('eba_met', 'http://www.eba.europa.eu/xbrl/crr/dict/met'),
+    ('eba_dim', 'http://www.eba.europa.eu/xbrl/crr/dict/dim'),
+    ('eba_BA', 'http://www.eba.europa.eu/xbrl/crr/dict/dom/BA'),
+    )
+MESSAGE_CODE_PATTERN = re.compile(r"^\[([^\]]+)\]")
+FILING_RULES_CODES_PATTERN = re.compile(r"^(EBA|EIOPA)") # loading messages differ between modes
+
+def generateInstance(path, numFacts, numContexts, duplicateEvery):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        fh.write('<xbrli:xbrl {}>\n'.format(" ".join('xmlns:{}="{}"'.format(prefix, ns) for prefix, ns in NAMESPACES)))
+        fh.write('<?xbrl-streamable-instance version="1.0" contextBuffer="INF" unitBuffer="INF"?>\n')
+        fh.write('<link:schemaRef xlink:type="simple" '
+                 'xlink:href="http://www.eba.europa.eu/eu/fr/xbrl/crr/fws/corep/its-2013-02/2014-03-31/mod/corep_ind.xsd"/>\n')
+        fh.write('<find:fIndicators><find:filingIndicator contextRef="c0">C_00.01</find:filingIndicator></find:fIndicators>\n')
+        for i in range(numContexts):
+            scenario = ('<xbrli:scenario><xbrldi:explicitMember dimension="eba_dim:BAS">eba_BA:x{}</xbrldi:explicitMember>'
+                        '</xbrli:scenario>'.format(i) if i else '')
+            fh.write('<xbrli:context id="c{}"><xbrli:entity><xbrli:identifier scheme="http://standards.iso.org/iso/17442">'
+                     '529900T8BM49AURSDO55</xbrli:identifier></xbrli:entity><xbrli:period><xbrli:instant>2014-03-31'
+                     '</xbrli:instant></xbrli:period>{}</xbrli:context>\n'.format(i, scenario))
+        fh.write('<xbrli:unit id="uEUR"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>\n')
+        fh.write('<xbrli:unit id="uPure"><xbrli:measure>xbrli:pure</xbrli:measure></xbrli:unit>\n')
+        for i in range(numFacts):
+            cntx = i % numContexts
+            metric = i // numContexts
+            if duplicateEvery and i % duplicateEvery == duplicateEvery - 1:
+                metric, cntx = 0, 0 # duplicates the first fact
+            if metric % 3 == 2:
+                fh.write('<eba_met:pi{} contextRef="c{}" unitRef="uPure" decimals="4">0.{:04d}</eba_met:pi{}>\n'.format(
+                         metric, cntx, i % 10000, metric))
+            else:
+                fh.write('<eba_met:mi{} contextRef="c{}" unitRef="uEUR" decimals="-3">{}000</eba_met:mi{}>\n'.format(
+                         metric, cntx, i, metric))
+        fh.write('</xbrli:xbrl>\n')
+
+def runValidation(instancePath, logPath, plugins, furtherArgs=(), skipDTS=True):
+    # validates in a child process, returning its time and peak memory
+    args = ["--file", instancePath, "--validate", "--plugins", plugins,
+            "--logFile", logPath, "--logFormat", "[%(messageCode)s] %(message)s"] + list(furtherArgs)
+    if skipDTS:
+        args.append("--skipDTS")
+    startedAt = time.time()
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--run"] + args,
+                            capture_output=True, text=True, check=True).stdout
+    return time.time() - startedAt, int(output.split()[-1])
+
+def loggedMessages(logPath):
+    messages = []
+    with open(logPath, encoding="utf-8") as fh:
+        for line in fh:
+            match = MESSAGE_CODE_PATTERN.match(line)
+            if match and FILING_RULES_CODES_PATTERN.match(match.group(1)):
+                messages.append(line.rstrip())
+    return sorted(messages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EBA filing rules validation, DOM and streaming")
+    parser.add_argument("--facts", type=int, default=100000, help="number of facts to generate")
+    parser.add_argument("--contexts", type=int, default=1000, help="number of contexts to generate")
+    parser.add_argument("--duplicateEvery", type=int, default=10000, help="every nth fact duplicates the first fact (0 for none)")
+    parser.add_argument("--dir", default=".", help="directory for the generated instance and logs")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    instancePath = os.path.join(args.dir, "eba-benchmark-{}.xbrl".format(args.facts))
+    if not os.path.exists(instancePath):
+        generateInstance(instancePath, args.facts, args.contexts, args.duplicateEvery)
+    print("instance {} ({:.1f} MB, {} facts)".format(instancePath, os.path.getsize(instancePath) / 1e6, args.facts))
+    messages = {}
+    for isStreaming in (False, True):
+        mode = "streaming" if isStreaming else "DOM"
+        logPath = os.path.join(args.dir, "eba-benchmark-{}-{}.log".format(args.facts, mode))
+        plugins = "validate/EBA|streamingExtensions" if isStreaming else "validate/EBA"
+        secs, maxRssKb = runValidation(instancePath, logPath, plugins, ["--disclosureSystem", "eba"])
+        messages[mode] = loggedMessages(logPath)
+        print("{:9} {:8.2f} secs {:8.1f} MB peak, {} messages".format(mode, secs, maxRssKb / 1024, len(messages[mode])))
+    if messages["DOM"] != messages["streaming"]:
+        print("messages differ between DOM and streaming modes:")
+        for message in sorted(set(messages["DOM"]) ^ set(messages["streaming"])):
+            print("  " + message)
+        sys.exit(1)
+    print("messages are the same in both modes")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]: # validation in this (child) process, reporting its peak memory
+        from arelle import CntlrCmdLine
+        CntlrCmdLine.parseAndRun(sys.argv[2:])
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    else:
+        main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+#
+# this script generates a large inline XBRL document, with embedded base64 images between its facts, and loads
+# it as a DOM and with --streamingInline (streamingExtensions), reporting time and peak memory of each mode and
+# checking that both modes have the same facts (and continuation and footnote resolved values)
+#
+# the document's DTS is a generated schema importing the xbrl instance schema (from the web cache)
+#
+#   python scripts/benchmarkStreamingInline.py --facts 200000 --imageKb 200 --dir /tmp/inlineBenchmark
+#
+
+import argparse, base64, os, sys
+from benchmarkEbaValidation import runValidation
+
+NUM_ITEMS = 100 # item concepts, facts being in a context for each NUM_ITEMS facts
+
+def generateSchema(path):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<schema xmlns="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+                 'targetNamespace="http://example.com/benchmark" elementFormDefault="qualified">\n'
+                 '<import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>\n')
+        for name, itemType in [("hiddenText", "stringItemType"), ("note", "stringItemType")] + [
+                               ("item{}".format(i), "monetaryItemType") for i in range(NUM_ITEMS)]:
+            fh.write('<element name="{}" id="e_{}" type="xbrli:{}" substitutionGroup="xbrli:item" '
+                     'xbrli:periodType="instant" nillable="true"/>\n'.format(name, name, itemType))
+        fh.write('</schema>\n')
+
+def generateInlineDocument(path, numFacts, numImages, imageKb):
+    generateSchema(os.path.join(os.path.dirname(path), "benchmark.xsd"))
+    image = "data:image/png;base64," + base64.b64encode(os.urandom(imageKb * 768)).decode("ascii")
+    imageEvery = max(numFacts // max(numImages, 1), 1)
+    numContexts = (numFacts + NUM_ITEMS - 1) // NUM_ITEMS
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL" '
+                 'xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase" '
+                 'xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+                 'xmlns:ixt="http://www.xbrl.org/inlineXBRL/transformation/2020-02-12" '
+                 'xmlns:e="http://example.com/benchmark" xml:lang="en">\n'
+                 '<head><title>Benchmark report</title><style type="text/css">.h{font-weight:bold}</style></head>\n<body>\n'
+                 '<div style="display:none"><ix:header><ix:hidden>'
+                 '<ix:nonNumeric name="e:hiddenText" contextRef="c0" id="hidden1">hidden</ix:nonNumeric></ix:hidden>'
+                 '<ix:references><link:schemaRef xlink:type="simple" xlink:href="benchmark.xsd"/></ix:references>'
+                 '<ix:resources>\n')
+        for c in range(numContexts):
+            fh.write('<xbrli:context id="c{}"><xbrli:entity><xbrli:identifier scheme="http://standards.iso.org/iso/17442">'
+                     '529900T8BM49AURSDO55</xbrli:identifier></xbrli:entity><xbrli:period><xbrli:instant>{}-12-31</xbrli:instant>'
+                     '</xbrli:period></xbrli:context>\n'.format(c, 1000 + c))
+        for c in range(numContexts):
+            fh.write('<ix:relationship fromRefs="n{0}" toRefs="f{0}"/>\n'.format(c))
+        fh.write('<xbrli:unit id="u"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>'
+                 '</ix:resources></ix:header></div>\n'
+                 '<p style="-ix-hidden:hidden1">shown hidden</p>\n')
+        for i in range(numFacts):
+            c, item = divmod(i, NUM_ITEMS)
+            if i % imageEvery == 0 and i // imageEvery < numImages:
+                fh.write('<div class="h"><img alt="chart {0}" src="{1}"/></div>\n'.format(i, image))
+            if item == 0: # text block continued later in the document, with a footnote
+                fh.write('<div><p>Note {0} <ix:nonNumeric name="e:note" contextRef="c{0}" id="n{0}" continuedAt="k{0}" '
+                         'escape="true"><b>Text</b> of note {0}</ix:nonNumeric></p><span>page text</span></div>\n'
+                         '<ix:footnote id="f{0}" footnoteRole="http://www.xbrl.org/2003/role/footnote">Footnote {0}</ix:footnote>\n'
+                         .format(c))
+            fh.write('<table><tr><td>Item {0}</td><td><ix:nonFraction name="e:item{1}" contextRef="c{2}" unitRef="u" decimals="0" '
+                     'format="ixt:num-dot-decimal" scale="3">{3:,}</ix:nonFraction></td></tr></table>\n'.format(i, item, c, i * 7))
+            if item == NUM_ITEMS - 1 or i == numFacts - 1:
+                fh.write('<p><ix:continuation id="k{0}">continued note {0}</ix:continuation></p>\n'.format(c))
+        fh.write('</body>\n</html>\n')
+
+def factsOf(factsPath):
+    with open(factsPath, encoding="utf-8-sig") as fh:
+        return sorted(fh)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inline XBRL loading, DOM and --streamingInline")
+    parser.add_argument("--facts", type=int, default=20000, help="number of facts to generate")
+    parser.add_argument("--images", type=int, default=50, help="number of embedded images to generate")
+    parser.add_argument("--imageKb", type=int, default=200, help="size of each embedded image, KB of base64")
+    parser.add_argument("--dir", default=".", help="directory for the generated document and logs")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    documentPath = os.path.join(args.dir, "inline-benchmark-{}.xhtml".format(args.facts))
+    if not os.path.exists(documentPath):
+        generateInlineDocument(documentPath, args.facts, args.images, args.imageKb)
+    print("document {} ({:.1f} MB, {} facts)".format(documentPath, os.path.getsize(documentPath) / 1e6, args.facts))
+    facts = {}
+    for mode, furtherArgs in (("DOM", []), ("streaming", ["--streamingInline"])):
+        logPath = os.path.join(args.dir, "inline-benchmark-{}-{}.log".format(args.facts, mode))
+        factsPath = os.path.join(args.dir, "inline-benchmark-{}-{}.csv".format(args.facts, mode))
+        secs, maxRssKb = runValidation(documentPath, logPath, "streamingExtensions",
+                                       furtherArgs + ["--facts", factsPath, "--factListCols", "Name,contextRef,unitRef,Dec,Value"],
+                                       skipDTS=False)
+        facts[mode] = factsOf(factsPath)
+        print("{:9} {:8.2f} secs {:8.1f} MB peak, {} facts".format(mode, secs, maxRssKb / 1024, len(facts[mode]) - 1))
+    if facts["DOM"] != facts["streaming"]:
+        print("facts differ between DOM and streaming modes:")
+        for fact in sorted(set(facts["DOM"]) ^ set(facts["streaming"]))[:20]:
+            print("  " + fact.rstrip())
+        sys.exit(1)
+    print("facts are the same in both modes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+#
+# this script generates instances of increasing numbers of facts and streams each of them (streamingExtensions),
+# validated, reporting the time and peak memory of each, so that peak memory may be seen to be bounded
+# (not growing with the instance size), such as for a 5 GB instance (about 60 million facts)
+#
+#   python scripts/benchmarkStreamingMemory.py --facts 1000000,10000000,60000000 --dir /tmp/streamingBenchmark
+#
+# instances are generated as EBA-like instances by benchmarkEbaValidation.py, and validated without their DTS
+# (--skipDTS), optionally with further plugins (such as validate/EBA, whose duplicate facts check does grow
+# with the number of distinct facts)
+#
+
+import argparse, os, sys
+from benchmarkEbaValidation import generateInstance, runValidation
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of streamed instances of increasing size")
+    parser.add_argument("--facts", default="100000,400000,1600000", help="comma separated numbers of facts of the instances")
+    parser.add_argument("--contexts", type=int, default=1000, help="number of contexts of each instance")
+    parser.add_argument("--streamingFactsBatchSize", type=int, default=1000, help="facts per streaming batch")
+    parser.add_argument("--plugins", default="", help="further plugins, '|' separated, such as validate/EBA")
+    parser.add_argument("--dir", default=".", help="directory for the generated instances and logs")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    plugins = "|".join(p for p in (args.plugins, "streamingExtensions") if p)
+    disclosureSystemArgs = ["--disclosureSystem", "eba"] if "validate/EBA" in args.plugins else []
+    for numFacts in (int(n) for n in args.facts.split(",")):
+        instancePath = os.path.join(args.dir, "streaming-benchmark-{}.xbrl".format(numFacts))
+        if not os.path.exists(instancePath):
+            generateInstance(instancePath, numFacts, args.contexts, 0)
+        logPath = os.path.join(args.dir, "streaming-benchmark-{}.log".format(numFacts))
+        secs, maxRssKb = runValidation(instancePath, logPath, plugins,
+                                       ["--streamingFactsBatchSize", str(args.streamingFactsBatchSize)] + disclosureSystemArgs)
+        print("{:10} facts {:9.1f} MB instance {:9.2f} secs {:8.1f} MB peak".format(
+              numFacts, os.path.getsize(instancePath) / 1e6, secs, maxRssKb / 1024))
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
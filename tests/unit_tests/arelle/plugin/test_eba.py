@@ -0,0 +1,82 @@
+import re
+
+import pytest
+
+from arelle import PluginManager
+from arelle.CntlrCmdLine import parseAndRun
+
+# facts are streamed in batches of 2: the duplicate of mi0 of c1 is in the third batch, the duplicate of mi1 of c1
+# is reported in equivalent context c3, and the nil, xml:lang and non-pure facts are reported in final
+INSTANCE = '''<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+    xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:find="http://www.eurofiling.info/xbrl/ext/filing-indicators"
+    xmlns:eba_met="http://www.eba.europa.eu/xbrl/crr/dict/met">
+<?xbrl-streamable-instance version="1.0" contextBuffer="INF" unitBuffer="INF"?>
+<link:schemaRef xlink:type="simple" xlink:href="http://www.eba.europa.eu/eu/fr/xbrl/crr/fws/corep/its-2013-02/2014-03-31/mod/corep_ind.xsd"/>
+<find:fIndicators><find:filingIndicator contextRef="c1">C_00.01</find:filingIndicator></find:fIndicators>
+<xbrli:context id="c1"><xbrli:entity><xbrli:identifier scheme="http://standards.iso.org/iso/17442">529900T8BM49AURSDO55</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2014-03-31</xbrli:instant></xbrli:period></xbrli:context>
+<xbrli:context id="c2"><xbrli:entity><xbrli:identifier scheme="http://standards.iso.org/iso/17442">529900T8BM49AURSDO55</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2014-12-31</xbrli:instant></xbrli:period></xbrli:context>
+<xbrli:context id="c3"><xbrli:entity><xbrli:identifier scheme="http://standards.iso.org/iso/17442">529900T8BM49AURSDO55</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2014-03-31</xbrli:instant></xbrli:period></xbrli:context>
+<xbrli:unit id="uEUR"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>
+<xbrli:unit id="uPure"><xbrli:measure>xbrli:pure</xbrli:measure></xbrli:unit>
+<eba_met:mi0 contextRef="c1" unitRef="uEUR" decimals="-3">1000</eba_met:mi0>
+<eba_met:mi1 contextRef="c1" unitRef="uEUR" decimals="-3">2000</eba_met:mi1>
+<eba_met:mi0 contextRef="c2" unitRef="uEUR" decimals="-3">3000</eba_met:mi0>
+<eba_met:mi2 contextRef="c1" unitRef="uEUR" xsi:nil="true"/>
+<eba_met:mi0 contextRef="c1" unitRef="uEUR" decimals="-3">4000</eba_met:mi0>
+<eba_met:mi1 contextRef="c3" unitRef="uEUR" decimals="-3">5000</eba_met:mi1>
+<eba_met:si3 contextRef="c1" xml:lang="en">text</eba_met:si3>
+<eba_met:si3 contextRef="c1" xml:lang="fr">texte</eba_met:si3>
+<eba_met:pi4 contextRef="c1" unitRef="uEUR" decimals="4">0.5</eba_met:pi4>
+<eba_met:pi5 contextRef="c2" unitRef="uPure" decimals="4">0.5</eba_met:pi5>
+</xbrli:xbrl>
+'''
+FILING_RULES_CODES_PATTERN = re.compile(r"^\[((EBA|EIOPA)[^\]]*)\]") # loading messages differ between modes
+
+
+@pytest.fixture
+def instancePath(tmp_path):
+    path = tmp_path / "instance.xbrl"
+    path.write_text(INSTANCE, encoding="utf-8")
+    yield path
+    PluginManager.close()
+
+
+def _validate(instancePath, disclosureSystem, isStreaming):
+    logPath = instancePath.with_name("{}-{}.log".format(disclosureSystem, "streaming" if isStreaming else "DOM"))
+    args = ["--file", str(instancePath), "--validate", "--skipDTS", "--disclosureSystem", disclosureSystem,
+            "--logFile", str(logPath), "--logFormat", "[%(messageCode)s] %(message)s"]
+    if isStreaming:
+        args += ["--plugins", "validate/EBA|streamingExtensions", "--streamingFactsBatchSize", "2"]
+    else:
+        args += ["--plugins", "validate/EBA"]
+    cntlr = parseAndRun(args)
+    cntlr.logger.removeHandler(cntlr.logHandler)
+    cntlr.logHandler.close()
+    with open(logPath, encoding="utf-8") as fh:
+        return sorted(line.rstrip() for line in fh if FILING_RULES_CODES_PATTERN.match(line))
+
+
+def _codes(messages):
+    return {FILING_RULES_CODES_PATTERN.match(message).group(1) for message in messages}
+
+
+class TestStreamingMessages:
+
+    @pytest.mark.parametrize("disclosureSystem, expectedCodes", [
+        ("eba", {"EBA.2.16", "EBA.2.19", "EBA.3.2"}),
+        ("eiopa", {"EIOPA.S.2.16.a", "EIOPA.S.2.19", "EIOPA.2.20", "EIOPA.3.2.a"}),
+    ])
+    def test_dom_and_streaming_messages(self, instancePath, disclosureSystem, expectedCodes):
+        domMessages = _validate(instancePath, disclosureSystem, isStreaming=False)
+        streamingMessages = _validate(instancePath, disclosureSystem, isStreaming=True)
+        assert streamingMessages == domMessages
+        assert expectedCodes <= _codes(domMessages)
+        duplicates = [message for message in domMessages if "Facts are duplicates" in message]
+        assert [message.split("] ")[1] for message in duplicates] == [
+            "Facts are duplicates eba_met:mi0 contexts c1, c1.",
+            "Facts are duplicates eba_met:mi1 contexts c3, c1."]
@@ -0,0 +1,318 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+import regex as re
+
+pytest.importorskip("holidays") # EFM plugin dependencies
+pytest.importorskip("pytz")
+
+from arelle import XbrlConst
+from arelle.ModelValue import qname
+from arelle.XmlValidate import VALID
+from arelle.plugin.validate.EFM import Rules
+from arelle.plugin.validate.EFM.Rules import (ARCROLE_TYPES, CONTEXTS, FACTS, LABELS, LINKBASES, ROLE_TYPES,
+                                              ArcroleTypeDuplicatesRule, ContextDatesRule, ContextElementRule,
+                                              CustomAxisRule, DefinitionArcsRule, DimensionDomainTargetsRule,
+                                              DuplicateContextsRule, DuplicateFactsRule, DuplicateStandardLabelsRule,
+                                              FactLangRule, ForeverPeriodRule, IneffectiveArcsRule,
+                                              InsignificantDigitsRule, LabelTextRule, LabelTrimRule,
+                                              RoleTypeDuplicatesRule, Rule, RulesPass,
+                                              StandardConceptDocumentationRule, TypedDimensionsRule)
+
+
+def _val(collectProfileStats=False, spanTracer=None):
+    val = Mock()
+    val.modelXbrl.modelManager.collectProfileStats = collectProfileStats
+    val.modelXbrl.modelManager.spanTracer = spanTracer
+    val.disclosureSystem.defaultXmlLang = "en-US"
+    val.disclosureSystem.standardTaxonomiesDict = {"http://fasb.org/us-gaap/2023": None}
+    val.disclosureSystem.GFM = False
+    val.modelXbrl.modelManager.disclosureSystem.labelCheckPattern = re.compile(r"[<]|&lt;")
+    val.modelXbrl.modelManager.disclosureSystem.labelTrimPattern = re.compile(r"\s")
+    return val
+
+
+def _fact(value="1000", decimals="-3", qname="us-gaap:Revenues", contextID="c1", unitID="u1", isNumeric=True,
+          isNil=False, xmlLang=None):
+    if xmlLang is None and not isNumeric:
+        xmlLang = "en-US" # non-numeric facts default to the disclosure system language
+    concept = Mock(isNumeric=isNumeric)
+    concept.type.isWgnStringFactType = not isNumeric
+    f = Mock(context=Mock(), concept=concept, xValid=VALID, isNil=isNil, isNumeric=isNumeric,
+             decimals=decimals if isNumeric else None, precision=None, value=value,
+             xValue=Decimal(value) if isNumeric and not isNil else value,
+             qname=qname, contextID=contextID, unitID=unitID, xmlLang=xmlLang,
+             conceptContextUnitHash=hash((qname, contextID, unitID)))
+    f.isVEqualTo.side_effect = lambda other: other.value == f.value
+    return f
+
+
+def _context(contextID="c1", hash=1, isForeverPeriod=False, dims=()):
+    context = Mock(id=contextID, contextDimAwareHash=hash, isForeverPeriod=isForeverPeriod)
+    context.isEqualTo.side_effect = lambda other: other.contextDimAwareHash == context.contextDimAwareHash
+    context.qnameDims = {dim.dimensionQname: dim for dim in dims}
+    return context
+
+
+def _dim(namespaceURI="http://example.com/ext", localName="ExtAxis", isTyped=False):
+    return Mock(dimension=Mock(), dimensionQname=qname(namespaceURI, localName), isTyped=isTyped)
+
+
+def _labelRel(text, role=XbrlConst.standardLabel, xmlLang="en-US", qname="ext:Concept",
+              namespaceURI="http://example.com/ext"):
+    concept = Mock(qname=qname)
+    concept.modelDocument.targetNamespace = namespaceURI
+    return Mock(fromModelObject=concept, toModelObject=Mock(text=text, role=role, xmlLang=xmlLang))
+
+
+def _run(ruleClass, items, val=None, **options):
+    val = val or _val()
+    _rule = ruleClass(val, **options)
+    for item in items:
+        _rule.check(item)
+    _rule.finish()
+    return val.modelXbrl.error.call_args_list
+
+
+class TestRulesPass:
+
+    @pytest.fixture
+    def rules(self, monkeypatch):
+        calls = []
+
+        class FirstRule(Rule):
+            name = "first"
+
+            def check(self, item):
+                calls.append(("first", item))
+
+            def finish(self):
+                calls.append(("first", "finish"))
+
+        class SecondRule(Rule):
+            name = "second"
+
+            def check(self, item):
+                calls.append(("second", item))
+
+            def finish(self):
+                calls.append(("second", "finish"))
+
+        class OtherItemsRule(Rule):
+            iterates = "other"
+            name = "other"
+
+            def check(self, item):
+                calls.append(("other", item))
+
+        monkeypatch.setattr(Rules, "RULES", [FirstRule, OtherItemsRule, SecondRule])
+        return calls
+
+    def test_rules_of_items_checked_in_one_pass(self, rules):
+        rulesPass = RulesPass(_val(), FACTS)
+        assert [_rule.name for _rule in rulesPass.rules] == ["first", "second"]
+        rulesPass.check("f1")
+        rulesPass.check("f2")
+        rulesPass.finish()
+        assert rules == [("first", "f1"), ("second", "f1"), ("first", "f2"), ("second", "f2"),
+                         ("first", "finish"), ("second", "finish")]
+
+    @pytest.mark.parametrize("collectProfileStats, spanTracer, isTimed", [
+        (False, None, False),
+        (True, None, True),
+        (False, Mock(), True),
+    ])
+    def test_rule_times(self, rules, collectProfileStats, spanTracer, isTimed):
+        val = _val(collectProfileStats, spanTracer)
+        rulesPass = RulesPass(val, FACTS)
+        assert rulesPass.isTimed == isTimed
+        rulesPass.check("f1")
+        rulesPass.finish()
+        profileStats = [call.args[0] for call in val.modelXbrl.profileStat.call_args_list]
+        assert profileStats == (["EFM rule first", "EFM rule second"] if isTimed else [])
+        assert all(secs >= 0 for secs in rulesPass.ruleTimes.values())
+
+    def test_registered_fact_rules(self):
+        assert [type(_rule) for _rule in RulesPass(_val(), FACTS).rules] == [
+            InsignificantDigitsRule, DuplicateFactsRule, FactLangRule]
+
+    @pytest.mark.parametrize("iterates, options, GFM, ruleClasses", [
+        (CONTEXTS, {}, False, [DuplicateContextsRule, ContextElementRule, ForeverPeriodRule]),
+        (CONTEXTS, {"isGFM": True}, False, [DuplicateContextsRule, ContextDatesRule, ContextElementRule, ForeverPeriodRule]),
+        (CONTEXTS, {"isEFM": True, "customAxesReplacements": Mock()}, False,
+         [DuplicateContextsRule, ContextElementRule, TypedDimensionsRule, CustomAxisRule, ForeverPeriodRule]),
+        (LABELS, {}, False, [StandardConceptDocumentationRule, DuplicateStandardLabelsRule, LabelTextRule, LabelTrimRule]),
+        (ROLE_TYPES, {}, False, [RoleTypeDuplicatesRule]),
+        (ARCROLE_TYPES, {}, False, [ArcroleTypeDuplicatesRule]),
+        (LINKBASES, {}, False, [IneffectiveArcsRule, DimensionDomainTargetsRule]),
+        (LINKBASES, {}, True, [IneffectiveArcsRule, DimensionDomainTargetsRule, DefinitionArcsRule]),
+    ])
+    def test_registered_rules_applying_to_options(self, iterates, options, GFM, ruleClasses):
+        val = _val()
+        val.disclosureSystem.GFM = GFM
+        rulesPass = RulesPass(val, iterates, **options)
+        assert [type(_rule) for _rule in rulesPass.rules] == ruleClasses
+        assert all(_rule.options == options for _rule in rulesPass.rules)
+
+
+class TestInsignificantDigitsRule:
+
+    def test_insignificant_digits(self):
+        calls = _run(InsignificantDigitsRule, [_fact("1234", "-2"), _fact("1200", "-2", contextID="c2")])
+        assert len(calls) == 1
+        assert calls[0].args[0] == ("EFM.6.05.37", "GFM.1.02.26")
+        assert "has insignificant digits" in calls[0].args[1]
+        assert calls[0].kwargs["contextID"] == "c1"
+        assert calls[0].kwargs["insignificantDigits"] == Decimal("34")
+
+    @pytest.mark.parametrize("f", [
+        _fact("1200", "-2"),
+        _fact("1234", "INF"),
+        _fact("1234", "-2", isNil=True),
+        _fact("text", isNumeric=False),
+    ])
+    def test_significant_digits(self, f):
+        assert _run(InsignificantDigitsRule, [f]) == []
+
+    def test_value_error(self):
+        f = _fact("1234", "-2")
+        f.xValue = None
+        calls = _run(InsignificantDigitsRule, [f])
+        assert len(calls) == 1
+        assert "causes a Value Error exception" in calls[0].args[1]
+
+
+class TestDuplicateFactsRule:
+
+    @pytest.mark.parametrize("facts", [
+        [_fact("1000"), _fact("2000")],
+        [_fact("1000"), _fact("1000", isNil=True)],
+        [_fact("text", isNumeric=False), _fact("other text", isNumeric=False)],
+    ])
+    def test_inconsistent_duplicates(self, facts):
+        calls = _run(DuplicateFactsRule, facts)
+        assert len(calls) == 1
+        assert calls[0].args[0] == ("EFM.6.05.12", "GFM.1.02.11")
+        assert calls[0].kwargs["modelObject"] == facts
+        assert calls[0].kwargs["values"] == ", ".join(f.value for f in facts)
+
+    @pytest.mark.parametrize("facts", [
+        [_fact("1000"), _fact("1000")],
+        [_fact("1000"), _fact("1040", "0")], # consistent within the decimals of each
+        [_fact("1000"), _fact("2000", contextID="c2")],
+        [_fact("text", isNumeric=False), _fact("text", isNumeric=False)],
+        [_fact("text", isNumeric=False, xmlLang="en"), _fact("texte", isNumeric=False, xmlLang="fr")],
+    ])
+    def test_consistent_or_not_duplicates(self, facts):
+        assert _run(DuplicateFactsRule, facts) == []
+
+
+class TestFactLangRule:
+
+    def test_fact_without_default_language(self):
+        f = _fact("texte", isNumeric=False, xmlLang="fr")
+        calls = _run(FactLangRule, [f, _fact("text", isNumeric=False, xmlLang="en-US", contextID="c2")])
+        assert len(calls) == 1
+        assert calls[0].args[0] == ("EFM.6.05.14", "GFM.1.02.13")
+        assert calls[0].kwargs["modelObject"] is f
+        assert (calls[0].kwargs["lang"], calls[0].kwargs["lang2"]) == ("fr", "en-US")
+
+    @pytest.mark.parametrize("facts", [
+        [_fact("texte", isNumeric=False, xmlLang="fr"), _fact("text", isNumeric=False, xmlLang="EN-us")],
+        [_fact("text", isNumeric=False, xmlLang="en-US")],
+        [_fact("texte", isNumeric=False, xmlLang="fr", isNil=True)],
+    ])
+    def test_fact_with_default_language(self, facts):
+        assert _run(FactLangRule, facts) == []
+
+
+class TestContextRules:
+
+    def test_duplicate_contexts(self):
+        c1, c2, c3 = _context("c1", 1), _context("c2", 2), _context("c3", 1)
+        calls = _run(DuplicateContextsRule, [c1, c2, c3])
+        assert len(calls) == 1
+        assert calls[0].args[0] == ("EFM.6.05.07", "GFM.1.02.07")
+        assert (calls[0].kwargs["context"], calls[0].kwargs["context2"]) == ("c3", "c1")
+
+    def test_forever_period(self):
+        calls = _run(ForeverPeriodRule, [_context("c1"), _context("c2", isForeverPeriod=True)])
+        assert [(call.args[0], call.kwargs["contextID"]) for call in calls] == [("EFM.6.05.38", "c2")]
+
+    def test_extension_typed_dimensions(self):
+        contexts = [_context("c2", dims=[_dim(localName="TypedAxis", isTyped=True)]),
+                    _context("c1", dims=[_dim(localName="TypedAxis", isTyped=True)]),
+                    _context("c3", dims=[_dim(), _dim("http://fasb.org/us-gaap/2023", "StdAxis", isTyped=True)])]
+        calls = _run(TypedDimensionsRule, contexts, isEFM=True)
+        assert len(calls) == 1
+        assert calls[0].args[0] == "EFM.6.05.39"
+        assert (calls[0].kwargs["contextIDs"], calls[0].kwargs["dimensions"]) == ("c1, c2", "TypedAxis")
+
+    def test_no_extension_typed_dimensions(self):
+        assert _run(TypedDimensionsRule, [_context(dims=[_dim()])], isEFM=True) == []
+
+    def test_pragmatic_disallowed_contexts_combined(self, monkeypatch):
+        monkeypatch.setattr(Rules.XmlUtil, "hasChild", lambda context, ns, localName: localName == "scenario")
+        val = _val()
+        val.disclosureSystem.contextElement = "segment"
+        contexts = [_context("c1"), _context("c2")]
+        for context in contexts:
+            context.iterdescendants.return_value = []
+        calls = _run(ContextElementRule, contexts, val, validateEFMpragmatic=True)
+        assert len(calls) == 1
+        assert calls[0].args[0] == ("EFM.6.05.04", "GFM.1.02.04")
+        assert (calls[0].kwargs["count"], calls[0].kwargs["context"]) == (2, "c1, c2")
+        val.modelXbrl.error.reset_mock()
+        calls = _run(ContextElementRule, contexts, val)
+        assert [call.kwargs["context"] for call in calls] == ["c1", "c2"]
+
+
+class TestLabelRules:
+
+    def test_duplicate_standard_labels(self):
+        labelRels = [_labelRel("Revenues", qname="ext:A"), _labelRel("Revenues", qname="ext:B"),
+                     _labelRel("Revenues", qname="ext:C", xmlLang="fr"),
+                     _labelRel("Revenues", qname="ext:D", role=XbrlConst.terseLabel)]
+        calls = _run(DuplicateStandardLabelsRule, labelRels)
+        assert len(calls) == 1
+        assert calls[0].args[0] == ("EFM.6.10.04", "GFM.1.05.04")
+        assert (calls[0].kwargs["concept"], calls[0].kwargs["concept2"]) == ("ext:B", "ext:A")
+
+    def test_standard_concept_documentation(self):
+        labelRels = [_labelRel("Definition", role=XbrlConst.documentationLabel),
+                     _labelRel("Definition", role=XbrlConst.documentationLabel,
+                               namespaceURI="http://fasb.org/us-gaap/2023", qname="us-gaap:Revenues")]
+        calls = _run(StandardConceptDocumentationRule, labelRels)
+        assert [(call.args[0], call.kwargs["concept"]) for call in calls] == [
+            (("EFM.6.10.05", "GFM.1.05.05"), "us-gaap:Revenues")]
+
+    def test_label_text(self):
+        calls = _run(LabelTextRule, [_labelRel("x" * 512), _labelRel("a < b"), _labelRel("Revenues"),
+                                     _labelRel("a < b", role=XbrlConst.documentationLabel)])
+        assert [call.args[0] for call in calls] == [("EFM.6.10.06", "GFM.1.05.06"), ("EFM.6.10.06", "GFM.1.05.07")]
+
+    @pytest.mark.parametrize("text, isTrimmed", [
+        ("Revenues", True),
+        (" Revenues", False),
+        ("Revenues ", False),
+        ("", True),
+    ])
+    def test_label_trim(self, text, isTrimmed):
+        calls = _run(LabelTrimRule, [_labelRel(text, xmlLang="fr")])
+        assert [call.args[0] for call in calls] == ([] if isTrimmed else [("EFM.6.10.08", "GFM.1.05.08")])
+
+
+class TestRoleTypeRules:
+
+    @pytest.mark.parametrize("ruleClass, code", [
+        (RoleTypeDuplicatesRule, ("EFM.6.07.10", "GFM.1.03.10")),
+        (ArcroleTypeDuplicatesRule, ("EFM.6.07.14", "GFM.1.03.16")),
+    ])
+    def test_declared_more_than_once_in_dts(self, ruleClass, code):
+        inDTS, notInDTS = Mock(), Mock()
+        inDTS.modelDocument.inDTS = True
+        notInDTS.modelDocument.inDTS = False
+        calls = _run(ruleClass, [("http://example.com/role/A", [inDTS, inDTS]),
+                                 ("http://example.com/role/B", [inDTS, notInDTS])])
+        assert [(call.args[0], call.kwargs["numberOfDeclarations"]) for call in calls] == [(code, 2)]
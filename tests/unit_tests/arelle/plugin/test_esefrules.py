@@ -0,0 +1,132 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+from lxml import etree
+
+from arelle.plugin.validate.ESEF.Profile import FilingProfile
+from arelle.plugin.validate.ESEF.Rules import DOCUMENTS, TAXONOMY, Rules
+
+HTML = '''<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">{}</html>'''
+
+
+class _HtmlElement(etree.ElementBase):
+    # stands in for the ModelObject of a loaded html element
+    modelDocument = Mock(ixNStag="{http://www.xbrl.org/2013/inlineXBRL}")
+
+    @property
+    def stringValue(self):
+        return "".join(self.itertext())
+
+
+def _html(body):
+    parser = etree.XMLParser()
+    parser.set_element_class_lookup(etree.ElementDefaultClassLookup(element=_HtmlElement))
+    return etree.fromstring(HTML.format(body), parser)
+
+
+def _profile(*bodies):
+    return FilingProfile(Mock(namespaceDocs={}), [_html(body) for body in bodies])
+
+
+def _ids(elts):
+    return [elt.get("id") for elt in elts]
+
+
+def _rules_calls():
+    calls = []
+    baseRules = Rules("base")
+
+    @baseRules.rule("documents rule")
+    def documentsRule(val, profile):
+        calls.append(("documents rule", profile))
+
+    pluginRules = Rules("plugin", baseRules)
+
+    @pluginRules.rule("taxonomy rule", TAXONOMY)
+    def taxonomyRule(val, profile):
+        calls.append(("taxonomy rule", profile))
+
+    @pluginRules.rule("second documents rule")
+    def secondDocumentsRule(val, profile):
+        calls.append(("second documents rule", profile))
+
+    return baseRules, pluginRules, calls
+
+
+class TestRules:
+
+    def test_run_section(self):
+        baseRules, pluginRules, calls = _rules_calls()
+        val = Mock()
+        profile = Mock()
+        pluginRules.run(val, profile, DOCUMENTS)
+        assert calls == [("documents rule", profile), ("second documents rule", profile)]
+        del calls[:]
+        pluginRules.run(val, profile, TAXONOMY)
+        assert calls == [("taxonomy rule", profile)]
+
+    def test_base_rules_unchanged(self):
+        baseRules, pluginRules, calls = _rules_calls()
+        baseRules.run(Mock(), Mock(), DOCUMENTS)
+        baseRules.run(Mock(), Mock(), TAXONOMY)
+        assert [name for name, profile in calls] == ["documents rule"]
+
+    def test_rule_profile_stats(self):
+        baseRules, pluginRules, calls = _rules_calls()
+        val = Mock()
+        pluginRules.run(val, Mock(), DOCUMENTS)
+        assert [call.args[0] for call in val.modelXbrl.profileStat.call_args_list] == [
+            "plugin rule documents rule", "plugin rule second documents rule"]
+
+
+class TestFilingProfile:
+
+    def test_report_xml_lang_is_rootmost(self):
+        profile = _profile(
+            '<body><div><p xml:lang="de">deeper, first in document order</p></div><div xml:lang="en"/></body>',
+            '<body xml:lang="fr"/>')
+        assert profile.reportXmlLang == "en"
+
+    def test_report_xml_lang_of_first_document(self):
+        assert _profile('<body/>', '<body xml:lang="fr"/>').reportXmlLang is None
+
+    def test_image_references(self):
+        profile = _profile(
+            '<body><img id="outside" src=" pic.png "/>'
+            '<p><ix:continuation><img id="inText" src="data:image/png;base64,AAAA"/>'
+            '<ix:exclude><img id="excluded" src="excluded.png"/></ix:exclude></ix:continuation></p>'
+            '<ix:nonNumeric><img id="inNonNumeric" src="nn.png"/></ix:nonNumeric></body>')
+        assert [(ref.elt.get("id"), ref.src, ref.inIxTextElt) for ref in profile.imageRefs] == [
+            ("outside", "pic.png", False),
+            ("inText", "data:image/png;base64,AAAA", True),
+            ("excluded", "excluded.png", False),
+            ("inNonNumeric", "nn.png", False)]
+
+    def test_executable_code_and_mailto(self):
+        profile = _profile(
+            '<body><script id="s"/><object id="o"/>'
+            '<a id="js" href="javascript:mailto()"/><img id="jsImg" src="javascript:x()"/>'
+            '<a id="mail" href="mailto:someone@example.com"/><a id="link" href="other.html"/></body>')
+        assert [(elt.get("id"), tag) for elt, tag in profile.executableCodeElts] == [
+            ("s", "script"), ("o", "object"), ("js", "a"), ("jsImg", "img")]
+        assert _ids(profile.mailtoElts) == ["mail"]
+        assert profile.imageRefs == []
+
+    def test_hidden_styles(self):
+        profile = _profile(
+            '<body><span id="ixHidden" style="color:red; -esef-ix-hidden:fact-1"/>'
+            '<span id="cssHidden" style="display: none; color:red"/>'
+            '<span id="bothHidden" style="display:none;-esef-ix-hidden:fact-2"/>'
+            '<span id="notHidden" style="display:nonesuch"/><span id="notHiddenEither" style="x-esef-ix-hidden:f"/></body>')
+        assert [(elt.get("id"), factId) for elt, factId in profile.ixHiddenStyleRefs] == [
+            ("ixHidden", "fact-1"), ("bothHidden", "fact-2")]
+        assert _ids(profile.cssHiddenElts) == ["cssHidden", "bothHidden"]
+
+    def test_anchoring_relationships_collected_once(self):
+        rels = [Mock(), Mock(fromModelObject=None), Mock()]
+        modelXbrl = Mock(namespaceDocs={})
+        modelXbrl.relationshipSet.return_value.modelRelationships = rels
+        profile = FilingProfile(modelXbrl, [])
+        assert profile.anchoringRelationships == [rels[0], rels[2]]
+        assert profile.anchoringRelationships is profile.anchoringRelationships
+        modelXbrl.relationshipSet.assert_called_once()
@@ -0,0 +1,314 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import ModelDocument, ModelManager, ModelXbrl, XbrlConst
+from arelle.Cntlr import LogToBufferHandler
+from arelle.CntlrCmdLine import CntlrCmdLine
+from arelle.FileSource import openFileSource
+from arelle.ModelXbrl import FACT_INDEXES
+from arelle.plugin import streamingExtensions
+
+STREAMING_HEADER = '<?xbrl-streamable-instance version="1.0" contextBuffer="1" unitBuffer="1"?>'
+
+INSTANCE = '''<?xml version="1.0" encoding="utf-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+    xmlns:t="http://example.com/t">
+{header}
+<xbrli:context id="c1"><xbrli:entity><xbrli:identifier scheme="http://example.com">1</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2020-12-31</xbrli:instant></xbrli:period></xbrli:context>
+<xbrli:unit id="u1"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>
+<t:a contextRef="c1" unitRef="u1" decimals="0">1</t:a>
+<t:b contextRef="c1" unitRef="u1" decimals="0">2</t:b>
+<xbrli:context id="c2"><xbrli:entity><xbrli:identifier scheme="http://example.com">1</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:instant>2021-12-31</xbrli:instant></xbrli:period></xbrli:context>
+<xbrli:unit id="u2"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>
+<t:c contextRef="c2" unitRef="u2" decimals="0">3</t:c>
+{trailer}
+</xbrli:xbrl>
+'''
+
+
+@pytest.fixture
+def cntlr():
+    cntlr = CntlrCmdLine(uiLang='en')
+    cntlr.startLogging(logHandler=LogToBufferHandler())
+    yield cntlr
+    cntlr.logger.removeHandler(cntlr.logHandler)
+
+
+@pytest.fixture
+def streamingPlugins(monkeypatch):
+    # plugin methods by plugin class, called by the streaming loader
+    plugins = {}
+    monkeypatch.setattr(streamingExtensions, "pluginClassMethods", lambda className: iter(plugins.get(className, ())))
+    monkeypatch.setattr(streamingExtensions, "_streamingFactsBatchSize", 2)
+    return plugins
+
+
+def _stream(cntlr, tmp_path, header=STREAMING_HEADER, trailer=""):
+    filepath = str(tmp_path / "instance.xbrl")
+    with open(filepath, "w") as fh:
+        fh.write(INSTANCE.format(header=header, trailer=trailer))
+    modelXbrl = ModelXbrl.create(ModelManager.initialize(cntlr))
+    modelXbrl.modelManager.formulaOptions = Mock()
+    modelXbrl.fileSource = openFileSource(filepath, cntlr)
+    modelXbrl.closeFileSource = True
+    modelDocument = streamingExtensions.streamingExtensionsLoader(modelXbrl, filepath, filepath)
+    return modelXbrl, modelDocument
+
+
+def _messages(cntlr):
+    return [(record.messageCode, record.getMessage()) for record in cntlr.logHandler.logRecordBuffer]
+
+
+def _localNames(facts):
+    return [fact.qname.localName for fact in facts]
+
+
+class TestStreamingHeader:
+
+    def test_streamed(self, cntlr, tmp_path, streamingPlugins):
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path)
+        assert modelDocument is modelXbrl.modelDocument
+        assert modelXbrl.isStreamingMode
+        assert _messages(cntlr) == [("streamingExtensions:streaming", "Stream processing this instance.")]
+        modelXbrl.close()
+
+    @pytest.mark.parametrize("header, messageCode", [
+        ("", None),
+        ('<?xbrl-streamable-instance version="2.0"?>', "streamingExtensions:unsupportedVersion"),
+        ('<?xbrl-streamable-instance version="x"?>', "streamingExtensions:versionError"),
+        ('<?xbrl-streamable-instance version="1.0" contextBuffer="0"?>', "streamingExtensions:valueError"),
+        ('<?xbrl-streamable-instance version="1.0" unitBuffer="1.5"?>', "streamingExtensions:valueError"),
+    ])
+    def test_not_streamed(self, cntlr, tmp_path, streamingPlugins, header, messageCode):
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path, header=header)
+        assert modelDocument is None
+        assert not hasattr(modelXbrl, "isStreamingMode") # left to be loaded as a DOM
+        assert [code for code, message in _messages(cntlr)] == ([messageCode] if messageCode else [])
+        modelXbrl.close()
+
+    def test_not_instance(self, cntlr, tmp_path, streamingPlugins):
+        filepath = str(tmp_path / "schema.xsd")
+        with open(filepath, "w") as fh:
+            fh.write('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"/>')
+        modelXbrl = ModelXbrl.create(ModelManager.initialize(cntlr))
+        modelXbrl.fileSource = openFileSource(filepath, cntlr)
+        modelXbrl.closeFileSource = True
+        assert streamingExtensions.streamingExtensionsLoader(modelXbrl, filepath, filepath) is None
+        assert not hasattr(modelXbrl, "isStreamingMode")
+        modelXbrl.close()
+
+
+class TestStreamingBatches:
+
+    def test_plugin_call_order(self, cntlr, tmp_path, streamingPlugins, monkeypatch):
+        validate = Mock()
+        monkeypatch.setattr(streamingExtensions, "Validate", validate)
+        monkeypatch.setattr(streamingExtensions, "_streamingExtensionsValidate", True)
+        calls = []
+        streamingPlugins.update({
+            "Streaming.Start": [lambda modelXbrl: calls.append("Start")],
+            "Streaming.ValidateFacts": [lambda instValidator, facts: calls.append(("ValidateFacts", _localNames(facts)))],
+            "Streaming.Facts": [lambda modelXbrl, facts: calls.append(("Facts", _localNames(facts)))],
+            "Streaming.ValidateFinish": [lambda instValidator: calls.append("ValidateFinish")],
+            "Streaming.Finish": [lambda modelXbrl: calls.append("Finish")],
+        })
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path)
+        assert calls == ["Start",
+                         ("ValidateFacts", ["a", "b"]), ("Facts", ["a", "b"]),
+                         ("ValidateFacts", ["c"]), ("Facts", ["c"]),
+                         "ValidateFinish", "Finish"]
+        instValidator = validate.return_value.instValidator
+        assert [_localNames(call.args[0]) for call in instValidator.checkFacts.call_args_list] == [["a"], ["b"], ["c"]]
+        validate.return_value.close.assert_called_once_with()
+        assert modelXbrl._streamingExtensionValidated
+        modelXbrl.close()
+
+    @pytest.mark.parametrize("batchSize, batches", [
+        (1, [["a"], ["b"], ["c"]]),
+        (2, [["a", "b"], ["c"]]),
+        (1000, [["a", "b", "c"]]),
+    ])
+    def test_batch_size(self, cntlr, tmp_path, streamingPlugins, monkeypatch, batchSize, batches):
+        monkeypatch.setattr(streamingExtensions, "_streamingFactsBatchSize", batchSize)
+        factBatches = []
+        streamingPlugins["Streaming.Facts"] = [lambda modelXbrl, facts: factBatches.append(_localNames(facts))]
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path)
+        assert factBatches == batches
+        assert modelXbrl.facts == []
+        modelXbrl.close()
+
+
+class TestStreamingBuffers:
+
+    def test_dropped_without_plugins(self, cntlr, tmp_path, streamingPlugins):
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path)
+        assert list(modelXbrl.contexts) == ["c2"]
+        assert list(modelXbrl.units) == ["u2"]
+        modelXbrl.close()
+
+    def test_dropped_after_batch(self, cntlr, tmp_path, streamingPlugins):
+        # contexts and units beyond the buffer remain until the batch of facts which may refer to them is processed
+        batchContextsUnits = []
+        streamingPlugins["Streaming.Facts"] = [
+            lambda modelXbrl, facts: batchContextsUnits.append((sorted(modelXbrl.contexts), sorted(modelXbrl.units)))]
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path)
+        assert batchContextsUnits == [(["c1"], ["u1"]), (["c1", "c2"], ["u1", "u2"])]
+        assert list(modelXbrl.contexts) == ["c2"]
+        assert list(modelXbrl.units) == ["u2"]
+        modelXbrl.close()
+
+    def test_unbounded_buffers(self, cntlr, tmp_path, streamingPlugins):
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path, header='<?xbrl-streamable-instance version="1.0"?>')
+        assert sorted(modelXbrl.contexts) == ["c1", "c2"]
+        assert sorted(modelXbrl.units) == ["u1", "u2"]
+        modelXbrl.close()
+
+
+class TestDropFact:
+
+    def test_fact_indexes_invalidated(self):
+        item = Mock(modelTupleFacts=[], objectIndex=1, id=None)
+        fact = Mock(modelTupleFacts=[item], objectIndex=0, id="f1")
+        modelXbrl = Mock(deferredLogRecords=[], factsInInstance={fact, item}, modelObjects=[fact, item])
+        facts = [fact]
+        streamingExtensions.dropFact(modelXbrl, fact, facts)
+        assert facts == [] and modelXbrl.factsInInstance == set() and modelXbrl.modelObjects == [None, None]
+        modelXbrl.clearIndexes.assert_called_with(FACT_INDEXES)
+        fact.modelDocument.idObjects.pop.assert_called_once_with("f1", None)
+
+
+class TestFactsCheck:
+
+    def _streamFactsCheck(self, cntlr, tmp_path, md5Sum):
+        return _stream(cntlr, tmp_path,
+                       header=STREAMING_HEADER + '\n<?xbrl-facts-check version="1.0"?>',
+                       trailer='<?xbrl-facts-check sum-of-fact-md5s="{}"?>'.format(md5Sum))
+
+    def test_sum_of_fact_md5s(self, cntlr, tmp_path, streamingPlugins):
+        modelXbrl, modelDocument = self._streamFactsCheck(cntlr, tmp_path, "0" * 32)
+        actualMd5Sum = str(modelDocument._factsCheckMd5s)
+        assert _messages(cntlr)[-1] == ("streamingExtensions:xbrlFactsCheckWarning",
+                                        "XBRL facts sum of md5s expected 0 not matched to actual sum " + actualMd5Sum)
+        modelXbrl.close()
+        cntlr.logHandler.clearLogBuffer()
+        modelXbrl, modelDocument = self._streamFactsCheck(cntlr, tmp_path, actualMd5Sum)
+        assert _messages(cntlr)[-1] == ("info", "Successful XBRL facts sum of md5s.")
+        modelXbrl.close()
+
+    def test_invalid_sum_of_fact_md5s(self, cntlr, tmp_path, streamingPlugins):
+        modelXbrl, modelDocument = self._streamFactsCheck(cntlr, tmp_path, "xyz")
+        assert _messages(cntlr)[-1] == ("streamingExtensions:xbrlFactsCheckError", "Invalid sum-of-md5s xyz")
+        modelXbrl.close()
+
+
+class TestDeferredLogRecords:
+
+    def test_refs_of_dropped_facts(self, cntlr, tmp_path, streamingPlugins):
+        def streamingFacts(modelXbrl, modelFacts):
+            for fact in modelFacts:
+                modelXbrl.error("test:fact", "fact %(name)s", modelObject=fact, name=fact.qname.localName)
+        streamingPlugins["Streaming.Facts"] = [streamingFacts]
+        modelXbrl, modelDocument = _stream(cntlr, tmp_path)
+        assert modelDocument is not None
+        modelXbrl.close()
+        records = json.loads(cntlr.logHandler.getJson())["log"]
+        factRecords = [record for record in records if record["code"] == "test:fact"]
+        assert [record["message"]["text"] for record in factRecords] == ["fact a", "fact b", "fact c"]
+        assert [[ref["sourceLine"] for ref in record["refs"]] for record in factRecords] == [[8], [9], [13]]
+
+
+INLINE_SCHEMA = '''<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+    targetNamespace="http://example.com/t" elementFormDefault="qualified">
+<xs:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+<xs:element name="a" id="a" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+<xs:element name="t" id="t" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+</xs:schema>
+'''
+
+INLINE_DOCUMENT = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"
+    xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+    xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+    xmlns:ixt="http://www.xbrl.org/inlineXBRL/transformation/2020-02-12" xmlns:t="http://example.com/t">
+<head><title>report</title></head>
+<body>
+<div style="display:none"><ix:header>
+    <ix:references><link:schemaRef xlink:type="simple" xlink:href="t.xsd"/></ix:references>
+    <ix:resources>
+        <xbrli:context id="c1"><xbrli:entity><xbrli:identifier scheme="http://example.com">1</xbrli:identifier></xbrli:entity>
+            <xbrli:period><xbrli:instant>2020-12-31</xbrli:instant></xbrli:period></xbrli:context>
+        <xbrli:unit id="u1"><xbrli:measure>iso4217:EUR</xbrli:measure></xbrli:unit>
+        <ix:relationship fromRefs="f1" toRefs="fn1"/>
+    </ix:resources>
+</ix:header></div>
+<p>Introduction <img src="data:image/png;base64,iVBORw0KGgo=" alt="logo"/></p>
+<table><tr><td>Amount</td><td><ix:nonFraction name="t:a" contextRef="c1" unitRef="u1" decimals="0" id="f1"
+    format="ixt:num-dot-decimal">1,000</ix:nonFraction></td></tr></table>
+<p><ix:nonNumeric name="t:t" contextRef="c1" id="f2" continuedAt="k1">Start <b>bold</b> </ix:nonNumeric></p>
+<div><p>between</p><img src="data:image/png;base64,AAAA" alt="chart"/></div>
+<p><ix:continuation id="k1">continued <i>text</i></ix:continuation></p>
+<p><ix:footnote id="fn1" footnoteRole="http://www.xbrl.org/2003/role/footnote">A <span>footnote</span></ix:footnote></p>
+{malformed}
+</body>
+</html>
+'''
+
+
+def _loadInline(tmp_path, monkeypatch, streamingInline, malformed=""):
+    with open(tmp_path / "t.xsd", "w") as fh:
+        fh.write(INLINE_SCHEMA)
+    filepath = str(tmp_path / "report.xhtml")
+    with open(filepath, "w") as fh:
+        fh.write(INLINE_DOCUMENT.format(malformed=malformed))
+    cntlr = CntlrCmdLine(uiLang='en')
+    cntlr.startLogging(logHandler=LogToBufferHandler())
+    monkeypatch.setattr(streamingExtensions, "_streamingInline", streamingInline)
+    monkeypatch.setattr(ModelDocument, "pluginClassMethods", lambda className:
+                        iter([streamingExtensions.streamingInlineParser] if className == "ModelDocument.CustomParser" else []))
+    modelXbrl = ModelManager.initialize(cntlr).load(openFileSource(filepath, cntlr))
+    loaded = {
+        "facts": [(str(fact.qname), fact.contextID, fact.value) for fact in modelXbrl.facts],
+        "footnotes": [(rel.fromModelObject.id, rel.toModelObject.viewText())
+                      for rel in modelXbrl.relationshipSet(XbrlConst.factFootnote).modelRelationships],
+        "images": [img.get("alt") for img in modelXbrl.modelDocument.xmlRootElement.iter("{http://www.w3.org/1999/xhtml}img")],
+        "messages": _messages(cntlr),
+    }
+    modelXbrl.close()
+    cntlr.logger.removeHandler(cntlr.logHandler)
+    return loaded
+
+
+class TestStreamingInline:
+
+    def test_pruned_document(self, tmp_path, monkeypatch):
+        loaded = _loadInline(tmp_path, monkeypatch, streamingInline=False)
+        pruned = _loadInline(tmp_path, monkeypatch, streamingInline=True)
+        assert pruned["facts"] == loaded["facts"] == [
+            ("t:a", "c1", "1000"), ("t:t", "c1", "Start bold continued text")]
+        assert pruned["footnotes"] == loaded["footnotes"] == [("f1", "A <span>footnote</span>")]
+        assert loaded["images"] == ["logo", "chart"]
+        assert pruned["images"] == []
+        assert pruned["messages"] == [
+            ("streamingExtensions:streamingInline",
+             "Stream processed inline document report.xhtml, pruned 6 xhtml elements outside of inline XBRL elements, "
+             "including 2 embedded images of 60 characters")] + loaded["messages"]
+
+    def test_malformed_document_parsed_as_loaded(self, tmp_path, monkeypatch):
+        loaded = _loadInline(tmp_path, monkeypatch, streamingInline=False, malformed="<p>unclosed <b>bold</p>")
+        streamed = _loadInline(tmp_path, monkeypatch, streamingInline=True, malformed="<p>unclosed <b>bold</p>")
+        assert "xmlSchema:syntax" in [code for code, message in loaded["messages"]]
+        assert streamed == loaded
+
+    def test_file_closed_on_error(self, monkeypatch):
+        monkeypatch.setattr(streamingExtensions, "_streamingInline", True)
+        _file = Mock()
+        _file.read.side_effect = [b'<?xml version="1.0" encoding="utf-8"?>', OSError("read error")]
+        modelXbrl = Mock()
+        modelXbrl.fileSource.file.return_value = (_file,)
+        with pytest.raises(OSError):
+            streamingExtensions.streamingInlineParser(modelXbrl, "report.xhtml", "report.xhtml")
+        _file.close.assert_called_once_with()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+from decimal import Decimal
+from math import isinf, isnan
+from unittest.mock import Mock
+
+from arelle.ColumnarFactStore import NO_ROW, ColumnarFactStore
+
+
+def _fact(concept, context, unit=None, value=None, decimals=None, isNil=False, isItem=True):
+    return Mock(concept=concept, context=context, unit=unit, xValue=value, value=str(value),
+                decimals=decimals, precision=None, isNil=isNil, isItem=isItem, isTuple=False,
+                isNumeric=unit is not None)
+
+
+def _tuple(*modelTupleFacts):
+    return Mock(isItem=False, isTuple=True, modelTupleFacts=list(modelTupleFacts))
+
+
+class TestColumnarFactStore:
+
+    def test_columns(self):
+        concept, context, unit = Mock(), Mock(), Mock()
+        numeric = _fact(concept, context, unit, Decimal("1234.5"), "1")
+        infinite = _fact(concept, context, unit, Decimal("7"), "INF")
+        nil = _fact(concept, context, unit, None, None, isNil=True)
+        text = _fact(Mock(), Mock(), value="text")
+        store = ColumnarFactStore([numeric, infinite, nil, text, _fact(Mock(), None, isItem=False)]) # not an item nor tuple
+
+        assert len(store) == 4 and store.facts == [numeric, infinite, nil, text]
+        assert list(store.conceptIds) == [0, 0, 0, 1]
+        assert list(store.contextIds) == [0, 0, 0, 1]
+        assert list(store.unitIds) == [0, 0, 0, NO_ROW]
+        assert store.units == [unit]
+        assert store.decimals[0] == 1 and isinf(store.decimals[1]) and isnan(store.decimals[3])
+        assert store.numericValues[0] == 1234.5 and isnan(store.numericValues[2])
+        assert list(store.isNil) == [0, 0, 1, 0]
+        assert list(store.numericRows()) == [0, 1]
+        assert store.rowsByContext() == {0: [0, 1, 2], 1: [3]}
+        assert store.factRows[text] == 3
+
+    def test_append(self):
+        store = ColumnarFactStore([])
+        context = Mock()
+        store.append(_fact(Mock(), context, Mock(), Decimal("2"), "0"))
+        assert list(store.numericRows()) == [0]
+        assert store.contexts == [context]
+
+    def test_tuple_items_in_document_order(self):
+        facts = [_fact(Mock(), Mock()) for i in range(5)]
+        store = ColumnarFactStore([facts[0], _tuple(facts[1], _tuple(facts[2]), facts[3]), facts[4]])
+        assert store.facts == facts
+        assert [store.factRows[fact] for fact in facts] == [0, 1, 2, 3, 4]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from arelle.ContextPeriodTable import ContextPeriodTable, epochMicroseconds
+from arelle.ModelValue import DateTime
+
+
+def _context(start=None, end=None, instant=None, forever=False):
+    return Mock(
+        isStartEndPeriod=start is not None,
+        isInstantPeriod=instant is not None,
+        isForeverPeriod=forever,
+        startDatetime=start,
+        endDatetime=end if end is not None else instant,
+        instantDatetime=instant,
+    )
+
+
+class TestContextPeriodTable:
+
+    def test_datetime_columns(self):
+        duration = _context(start=datetime(2021, 1, 1), end=datetime(2022, 1, 1))
+        instant = _context(instant=datetime(2022, 1, 1))
+        forever = _context(forever=True)
+        table = ContextPeriodTable([duration, instant, forever])
+
+        assert table.contextsWithDatetime("start", datetime(2021, 1, 1)) == {duration}
+        assert table.contextsWithDatetime("end", datetime(2022, 1, 1)) == {duration}
+        assert table.contextsWithDatetime("instant", datetime(2022, 1, 1)) == {instant}
+        assert table.contextsWithDatetime("instant", datetime(2021, 1, 1)) == set()
+        assert table.foreverContexts == {forever}
+
+    def test_timezone_awareness(self):
+        naive = _context(instant=datetime(2022, 1, 1, 12))
+        utc = _context(instant=datetime(2022, 1, 1, 12, tzinfo=timezone.utc))
+        table = ContextPeriodTable([naive, utc])
+
+        assert table.contextsWithDatetime("instant", datetime(2022, 1, 1, 12)) == {naive}
+        assert table.contextsWithDatetime(
+            "instant", datetime(2022, 1, 1, 14, tzinfo=timezone(timedelta(hours=2)))) == {utc}
+
+    def test_append(self):
+        table = ContextPeriodTable([])
+        instant = _context(instant=datetime(2022, 1, 1))
+        table.append(instant)
+
+        assert table.contextsWithDatetime("instant", datetime(2022, 1, 1)) == {instant}
+
+    def test_model_value_datetimes(self):
+        assert epochMicroseconds(DateTime(2022, 1, 1, 12)) == (1641038400000000, False)
+        assert epochMicroseconds(DateTime(2022, 1, 1, 0, 0, 1)) == (1640995201000000, False)
+        assert epochMicroseconds(DateTime(2022, 1, 1, 0, 0, 2, 5)) == (1640995202000005, False)
+        assert epochMicroseconds(DateTime(2022, 1, 1, 12, tzinfo=timezone.utc)) == (1641038400000000, True)
+        noon = _context(instant=DateTime(2022, 1, 1, 12))
+        second = _context(instant=DateTime(2022, 1, 1, 0, 0, 1))
+        table = ContextPeriodTable([noon, second])
+
+        assert table.contextsWithDatetime("instant", DateTime(2022, 1, 1, 12)) == {noon}
+        assert table.contextsWithDatetime("instant", datetime(2022, 1, 1, 0, 0, 1)) == {second}
+        assert table.contextsWithDatetime("instant", DateTime(2022, 1, 1, 0, 0, 2)) == set()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+from arelle.ContextUnitCanonicalTable import ContextUnitCanonicalTable
+from arelle.ModelValue import qname
+
+qnUSD = qname("{http://www.xbrl.org/2003/iso4217}USD")
+qnShares = qname("{http://www.xbrl.org/2003/instance}shares")
+
+
+def _context(key, nonDimKey=None, entity=("http://example.com", "ABC")):
+    # contexts are equal by key when dimension aware, by nonDimKey (s-equal segment) when not
+    nonDimKey = key if nonDimKey is None else nonDimKey
+    cntx = Mock(contextDimAwareHash=hash(key), contextNonDimAwareHash=hash(nonDimKey), entityIdentifier=entity)
+    cntx.isEqualTo.side_effect = lambda other, dimensionalAspectModel: (
+        (key, nonDimKey)[not dimensionalAspectModel] == other.key[not dimensionalAspectModel])
+    cntx.key = (key, nonDimKey)
+    return cntx
+
+
+def _unit(measures):
+    unit = Mock(measures=measures, hash=hash(measures))
+    unit.isEqualTo.side_effect = lambda other: other.measures == measures
+    return unit
+
+
+class TestContextUnitCanonicalTable:
+
+    def test_contexts(self):
+        c1, c2, c3 = _context("a", "s"), _context("a", "s"), _context("b", "s")
+        table = ContextUnitCanonicalTable([c1, c2, c3])
+        assert [table.contextId(c) for c in (c1, c2, c3)] == [0, 0, 1]
+        assert [table.contextId(c, dimensionAware=False) for c in (c1, c2, c3)] == [0, 0, 0]
+        assert table.canonicalContext(c2) is c1 and table.canonicalContext(c3) is c3
+        assert table.canonicalContext(c3, dimensionAware=False) is c1
+        assert table.canonicalContextsOfEntity(("http://example.com", "ABC")) == [c1, c3]
+        assert table.canonicalContextsOfEntity(("http://example.com", "XYZ")) == []
+
+    def test_hash_collision(self):
+        c1, c2 = _context("a"), _context("b")
+        c2.contextDimAwareHash = c1.contextDimAwareHash
+        table = ContextUnitCanonicalTable([c1, c2])
+        assert table.canonicalContext(c2) is c2
+
+    def test_units(self):
+        usd = ((qnUSD,), ())
+        u1, u2, u3 = _unit(usd), _unit(((qnShares,), ())), _unit(usd)
+        table = ContextUnitCanonicalTable(units=[u1, u2])
+        table.appendUnit(u3)  # as by createUnit
+        assert [table.unitId(u) for u in (u1, u2, u3)] == [0, 1, 0]
+        assert table.canonicalUnit(u3) is u1
+        assert table.unitWithMeasures(usd) is u1
+        assert table.unitWithMeasures(((qnUSD,), (qnShares,))) is None
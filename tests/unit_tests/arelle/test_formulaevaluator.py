@@ -0,0 +1,126 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import pytest
+
+from arelle.ModelFormulaObject import (  # imports FormulaEvaluator, which can't be imported first
+    Aspect, ModelConceptName, ModelFilter, ModelRelativeFilter, ModelTestFilter, filterIndexedFacts)
+from arelle.FormulaEvaluator import aspectsMatchKey, factsPartitions, filterPlan, trialFilterFacts
+from arelle.ModelValue import qname
+
+qnA = qname("{http://example.com}a")
+qnB = qname("{http://example.com}b")
+modelXbrl = Mock()
+
+
+def _context(period):
+    cntx = Mock(isForeverPeriod=False, isStartEndPeriod=False, isInstantPeriod=True, instantDatetime=period)
+    cntx.isPeriodEqualTo.side_effect = lambda other: other.instantDatetime == period
+    return cntx
+
+
+def _fact(concept, cntx):
+    return Mock(qname=concept, isTuple=False, unit=None, context=cntx, modelXbrl=modelXbrl)
+
+
+class TestFactsPartitions:
+
+    def test_partitions_in_facts_order(self):
+        c2020, c2021 = _context("2020"), _context("2021")
+        facts = [_fact(qnA, c2020), _fact(qnB, c2020), _fact(qnA, c2021), _fact(qnA, _context("2020")),
+                 _fact(qnB, c2020)]
+        assert aspectsMatchKey(None, facts[0], (Aspect.CONCEPT, Aspect.PERIOD)) == (qnA, ("instant", "2020"))
+        partitions = factsPartitions(None, facts, {Aspect.CONCEPT, Aspect.PERIOD})
+        assert partitions == [[facts[0], facts[3]], [facts[1], facts[4]], [facts[2]]]
+        assert factsPartitions(None, facts, {Aspect.CONCEPT}) == [[facts[0], facts[2], facts[3]], [facts[1], facts[4]]]
+
+    def test_fact_without_context_is_not_keyed(self):
+        c2020 = _context("2020")
+        facts = [_fact(qnA, c2020), _fact(qnA, None), _fact(qnA, c2020)]
+        assert aspectsMatchKey(None, facts[1], (Aspect.CONCEPT, Aspect.PERIOD)) is None
+        assert aspectsMatchKey(None, facts[1], (Aspect.CONCEPT,)) == (qnA,)
+        partitions = factsPartitions(None, facts, {Aspect.CONCEPT, Aspect.PERIOD})
+        assert partitions == [[facts[0], facts[2]], [facts[1]]]
+
+
+def _filterRel(name, indexedFactSets=None, passingFacts=None, filterClass=ModelFilter, isComplemented=False):
+    # relationship to a filter answered by instance fact index sets, or passing passingFacts when evaluated per fact
+    _filter = Mock(spec=filterClass, localName=name, xlinkLabel=name)
+    _filter.indexedFactSets.return_value = indexedFactSets
+    if indexedFactSets is not None:
+        passingFacts = set().union(*indexedFactSets)
+    _filter.filter.side_effect = lambda xpCtx, vb, facts, cmplmt: {f for f in facts if cmplmt ^ (f in passingFacts)}
+    _filter.aspectsCovered.return_value = set()
+    return Mock(toModelObject=_filter, isComplemented=isComplemented, isCovered=False)
+
+
+def _xpCtx():
+    xpCtx = Mock(formulaProfiler=None)
+    xpCtx.formulaOptions.traceVariableFilterPlan = False
+    xpCtx.formulaOptions.traceVariableFilterWinnowing = False
+    return xpCtx
+
+
+class TestFilterPlan:
+
+    def test_plan_order(self):
+        facts = set(range(10))
+        test = _filterRel("test", passingFacts=facts, filterClass=ModelTestFilter)
+        scan = _filterRel("scan", passingFacts=facts)
+        large = _filterRel("large", [{1, 2}, {3, 4}])
+        small = _filterRel("small", [{1}])
+        complemented = _filterRel("complemented", [set(range(9))], isComplemented=True)
+        relative = _filterRel("relative", passingFacts=facts, filterClass=ModelRelativeFilter)
+        afterRelative = _filterRel("afterRelative", [{1}])
+        scanAfterRelative = _filterRel("scanAfterRelative", passingFacts=facts)
+        plan = filterPlan(_xpCtx(), Mock(), facts,
+                          [test, scan, large, small, complemented, relative, scanAfterRelative, afterRelative])
+        assert [(rel.toModelObject.localName, step) for rel, indexedFactSets, step in plan] == [
+            ("small", "index, 1 facts estimated"),
+            ("complemented", "index, 1 facts estimated"),
+            ("large", "index, 4 facts estimated"),
+            ("scan", "scan"),
+            ("test", "test"),
+            ("relative", "ordered"),
+            ("afterRelative", "index, 1 facts estimated"),
+            ("scanAfterRelative", "scan")]
+        assert plan[0][1] == [{1}]
+
+    def test_indexed_filters_pushed_down(self):
+        facts = set(range(10))
+        conceptFilter = _filterRel("concept", [{1, 2, 3}, {8, 11}])
+        unitFilter = _filterRel("unit", [{2, 3, 4}], isComplemented=True)
+        result = trialFilterFacts(_xpCtx(), Mock(), facts, [conceptFilter, unitFilter], "and")
+        assert result == {1, 8}
+        conceptFilter.toModelObject.filter.assert_not_called()
+        unitFilter.toModelObject.filter.assert_not_called()
+
+    @pytest.mark.parametrize("complemented", [(False, False, False), (True, False, False), (False, True, True), (True, True, True)])
+    def test_planned_same_as_unplanned(self, complemented):
+        facts = set(range(20))
+        filterRels = [
+            _filterRel("scan", passingFacts=set(range(0, 20, 2)), isComplemented=complemented[0]),
+            _filterRel("index", [set(range(5)), set(range(15, 25))], isComplemented=complemented[1]),
+            _filterRel("test", passingFacts=set(range(0, 20, 3)), filterClass=ModelTestFilter, isComplemented=complemented[2]),
+        ]
+        unplanned = facts
+        for rel in filterRels:
+            unplanned = rel.toModelObject.filter(None, None, unplanned, rel.isComplemented)
+        assert trialFilterFacts(_xpCtx(), Mock(), facts, filterRels, "and") == unplanned
+
+    def test_filter_indexed_facts(self):
+        facts = {1, 2, 3, 4}
+        assert filterIndexedFacts(facts, [{1, 5}, {2}], False) == {1, 2}
+        assert filterIndexedFacts(facts, [{1, 5}, {2}], True) == {3, 4}
+        assert filterIndexedFacts(facts, [], False) == set()
+        assert filterIndexedFacts(facts, [], True) == facts
+
+    def test_concept_name_index_sets(self):
+        # index sets are those of the instance, their union isn't built
+        qnA_facts, qnB_facts = {1, 2}, {3}
+        inst = Mock(factsByQname={qnA: qnA_facts, qnB: qnB_facts})
+        conceptName = Mock(qnameExpressionProgs=[], conceptQnames=[qnA, qnB])
+        factSets = ModelConceptName.indexedFactSets(conceptName, None, Mock(instances=[inst]))
+        assert len(factSets) == 2 and factSets[0] is qnA_facts and factSets[1] is qnB_facts
+        conceptName.qnameExpressionProgs = [Mock()]
+        assert ModelConceptName.indexedFactSets(conceptName, None, Mock(instances=[inst])) is None
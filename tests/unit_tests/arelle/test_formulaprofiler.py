@@ -0,0 +1,57 @@
+from __future__ import annotations
+import csv
+import json
+from unittest.mock import Mock
+
+from arelle.FormulaProfiler import FormulaProfiler
+
+
+def _variableSet(id, objectIndex):
+    return Mock(id=id, xlinkLabel=id, localName="valueAssertion", objectIndex=objectIndex)
+
+
+def _filter(localName, xlinkLabel):
+    return Mock(localName=localName, xlinkLabel=xlinkLabel)
+
+
+class TestFormulaProfiler:
+
+    def _profiler(self):
+        profiler = FormulaProfiler()
+        cheap, costly = _variableSet("cheap", 1), _variableSet("costly", 2)
+        profiler.variableSetProfile(cheap).evaluationTime = 0.5
+        profiler.variableSetProfile(cheap).evaluations = 2
+        costlyProfile = profiler.variableSetProfile(costly)
+        costlyProfile.compileTime = 0.25
+        costlyProfile.evaluationTime = 3.0
+        costlyProfile.evaluations = 10
+        costlyProfile.skippedEvaluations = 4
+        conceptName = _filter("conceptName", "f1")
+        costlyProfile.filterApplied("v", conceptName, 100, 10, 0.5)
+        costlyProfile.filterApplied("v", conceptName, 100, 20, 0.25)
+        costlyProfile.filterApplied("w", _filter("period", "f2"), 30, 3, 1.0)
+        return profiler
+
+    def test_report_most_costly_first(self):
+        report = self._profiler().report()
+        assert [row["variableSet"] for row in report] == ["costly", "cheap"]
+        costly = report[0]
+        assert (costly["evaluations"], costly["skippedEvaluations"], costly["filterCalls"]) == (10, 4, 3)
+        assert (costly["factsIn"], costly["factsOut"], costly["filterTime"]) == (230, 33, 1.75)
+        assert [(f["variable"], f["filter"], f["calls"]) for f in costly["filters"]] == [
+            ("w", "period f2", 1), ("v", "conceptName f1", 2)]
+
+    def test_sort_by_compile_time(self):
+        report = self._profiler().report(sortBy="compileTime")
+        assert [row["variableSet"] for row in report] == ["costly", "cheap"]
+
+    def test_save(self, tmp_path):
+        profiler = self._profiler()
+        profiler.save(str(tmp_path / "profile.csv"))
+        profiler.save(str(tmp_path / "profile.json"))
+        with open(tmp_path / "profile.csv", newline="") as fh:
+            rows = list(csv.DictReader(fh))
+        assert [row["variableSet"] for row in rows] == ["costly", "cheap"]
+        assert "filters" not in rows[0]
+        with open(tmp_path / "profile.json") as fh:
+            assert json.load(fh)["variableSets"][0]["filters"][0]["filter"] == "period f2"
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from lxml import etree
+
+from arelle.InlineDocumentIndex import InlineDocumentIndex
+from arelle.ModelObject import ModelObject
+
+XHTML = "{http://www.w3.org/1999/xhtml}"
+IX = "{http://www.xbrl.org/2013/inlineXBRL}"
+IX10 = "{http://www.xbrl.org/2008/inlineXBRL}"
+
+DOCUMENT = b"""<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"
+      xmlns:ix10="http://www.xbrl.org/2008/inlineXBRL" id="root" style="color:black">
+<head><base href="http://example.com/a/"/><base href="http://example.com/b/"/></head>
+<body>
+<!-- comment -->
+<div style="display:none"><ix:header><ix:hidden><ix:nonFraction id="f1" name="a:b">1</ix:nonFraction></ix:hidden></ix:header></div>
+<p id="p1"><ix:nonNumeric id="f2" name="a:c" continuedAt="k1">a</ix:nonNumeric><a href="x.htm">x</a></p>
+<ix:continuation id="k1">b</ix:continuation>
+<p id="p1"><img src="y.png"/><ix:nonFraction name="a:d">2</ix:nonFraction><ix10:exclude>c</ix10:exclude></p>
+</body></html>"""
+
+
+def _parse():
+    lookup = etree.ElementNamespaceClassLookup()
+    for ns in ("http://www.xbrl.org/2013/inlineXBRL", "http://www.xbrl.org/2008/inlineXBRL"):
+        lookup.get_namespace(ns)[None] = ModelObject
+    parser = etree.XMLParser()
+    parser.set_element_class_lookup(lookup)
+    return etree.fromstring(DOCUMENT, parser)
+
+
+class TestInlineDocumentIndex:
+
+    def test_index_matches_document_walks(self):
+        htmlElement = _parse()
+        index = InlineDocumentIndex(htmlElement)
+        assert index.eltsById == {  # not the root element, as iterfind(".//*[@id]")
+            id: [e for e in htmlElement.iterfind(".//*[@id]") if e.get("id") == id]
+            for id in ("f1", "p1", "f2", "k1")}
+        for tag in ("hidden", "nonFraction", "continuation"):
+            assert index.ixElements(IX + tag) == list(htmlElement.iterdescendants(IX + tag))
+        facts = (IX + "nonNumeric", IX + "nonFraction")
+        assert index.ixElements(*facts) == list(htmlElement.iterdescendants(*facts))
+        assert index.ixElements(IX + "footnote") == []
+        # descendants only, not the styled root element
+        assert index.styledElts == list(htmlElement.iterfind(".//" + XHTML + "*[@style]"))
+        assert [e.tag for e in index.referencingElts] == [XHTML + "a", XHTML + "img"]
+        assert index.htmlBase == "http://example.com/b/"
+
+    def test_xhtml_elements_indexed_on_first_use(self):
+        index = InlineDocumentIndex(_parse())
+        assert index._styledElts is None and index._referencingElts is None
+        styledElts = index.styledElts
+        assert index.styledElts is styledElts
+        assert [e.get("style") for e in styledElts] == ["display:none"]
+        assert index._referencingElts is not None
+
+    def test_ix_namespace(self):
+        index = InlineDocumentIndex(_parse())
+        assert index.ixNS == "http://www.xbrl.org/2013/inlineXBRL"
+        assert [e.tag for e in index.conflictingIxNSElts] == [IX10 + "exclude"]
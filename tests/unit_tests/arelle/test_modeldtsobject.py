@@ -0,0 +1,206 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import XbrlConst
+from arelle.ModelDtsObject import ModelConcept, ModelRelationship, ModelType
+from arelle.ModelValue import qname
+
+XLINK = "{http://www.w3.org/1999/xlink}"
+
+
+def _arc(**attributes):
+    arcElement = Mock()
+    arcElement.get.side_effect = attributes.get
+    # role strings from distinct arcs are equal but not identical objects
+    linkrole = "".join(["http://example.com/role/", "link"])
+    arcElement.getparent.return_value.get.side_effect = {XLINK + "role": linkrole}.get
+    return arcElement
+
+
+def _relationship(arcElement):
+    modelDocument = Mock(idObjects={})
+    modelDocument.modelXbrl.modelObjects = []
+    return ModelRelationship(modelDocument, arcElement, Mock(), Mock())
+
+
+class TestModelRelationship:
+
+    def test_attributes_from_arc(self):
+        rel = _relationship(_arc(**{XLINK + "arcrole": XbrlConst.summationItem,
+                                    "order": "2", "priority": "1", "weight": "-1.0", "use": "prohibited"}))
+        assert (rel.arcrole, rel.linkrole) == (XbrlConst.summationItem, "http://example.com/role/link")
+        assert (rel.order, rel.priority, rel.weight, rel.preferredLabel) == (2.0, 1, -1.0, None)
+        assert rel.isProhibited and rel.prohibitedUseSortKey == 2
+        assert rel.objectIndex == 0
+        assert not rel.__dict__  # all assigned attributes are slots
+
+    def test_defaults_and_invalid_values(self):
+        rel = _relationship(_arc(**{XLINK + "arcrole": XbrlConst.parentChild, "priority": "x", "weight": "y"}))
+        assert (rel.order, rel.priority, rel.isProhibited) == (1.0, 0, False)
+        assert rel.weight != rel.weight  # nan
+
+    def test_roles_are_interned(self):
+        preferredLabels = ["".join(["http://www.xbrl.org/2003/role/", "terseLabel"]) for _i in range(2)]
+        rel1, rel2 = (_relationship(_arc(**{XLINK + "arcrole": XbrlConst.parentChild, "preferredLabel": preferredLabel}))
+                      for preferredLabel in preferredLabels)
+        assert rel1.linkrole is rel2.linkrole
+        assert rel1.preferredLabel is rel2.preferredLabel
+
+    def test_clear(self):
+        rel = _relationship(_arc(**{XLINK + "arcrole": XbrlConst.parentChild}))
+        rel.ineffectivity = "not a slot"
+        rel.clear()
+        assert rel.arcElement is None and rel.toModelObject is None
+        assert not rel.__dict__
+
+
+EX = "http://example.com/ns"
+XSD_DECIMAL = qname(XbrlConst.xsd, "decimal")
+XSD_STRING = qname(XbrlConst.xsd, "string")
+
+
+class _ModelXbrl:
+    def __init__(self):
+        self.qnameTypes = {}
+        self.qnameConcepts = {}
+
+
+class _Type:
+    # type derivation of ModelType with derivation given rather than from its schema element
+    isDerivedFrom = ModelType.isDerivedFrom
+    qnamesDerivedFromClosure = ModelType.qnamesDerivedFromClosure
+    _derivedFromClosure = ModelType._derivedFromClosure
+
+    def __init__(self, modelXbrl, localName, qnameDerivedFrom):
+        self.modelXbrl = modelXbrl
+        self.qname = qname(EX, localName)
+        self.qnameDerivedFrom = qnameDerivedFrom
+        modelXbrl.qnameTypes[self.qname] = self
+
+
+class _Concept:
+    # type and substitution group closures of ModelConcept with type and substitution group given
+    instanceOfType = ModelConcept.instanceOfType
+    instanceOfTypeQnames = ModelConcept.instanceOfTypeQnames
+    _instanceOfTypeClosure = ModelConcept._instanceOfTypeClosure
+    substitutionGroup = ModelConcept.substitutionGroup
+    substitutionGroupQnameChain = ModelConcept.substitutionGroupQnameChain
+    substitutionGroupQnameSet = ModelConcept.substitutionGroupQnameSet
+    substitutionGroupQnames = ModelConcept.substitutionGroupQnames
+
+    def __init__(self, modelXbrl, localName, typeQname=None, substitutionGroupQname=None):
+        self.modelXbrl = modelXbrl
+        self.qname = qname(EX, localName)
+        self.typeQname = typeQname
+        self.substitutionGroupQname = substitutionGroupQname
+        modelXbrl.qnameConcepts[self.qname] = self
+
+    @property
+    def type(self):
+        return self.modelXbrl.qnameTypes.get(self.typeQname)
+
+
+class TestModelTypeDerivation:
+
+    def test_derivation_chain(self):
+        modelXbrl = _ModelXbrl()
+        baseType = _Type(modelXbrl, "baseType", XSD_DECIMAL)
+        derivedType = _Type(modelXbrl, "derivedType", baseType.qname)
+        assert derivedType.qnamesDerivedFromClosure == {baseType.qname, XSD_DECIMAL}
+        assert derivedType.isDerivedFrom(XSD_DECIMAL)
+        assert derivedType.isDerivedFrom([XSD_STRING, baseType.qname])
+        assert not derivedType.isDerivedFrom(XSD_STRING)
+        assert not derivedType.isDerivedFrom(derivedType.qname)
+
+    def test_union_type(self):
+        modelXbrl = _ModelXbrl()
+        memberType = _Type(modelXbrl, "memberType", XSD_DECIMAL)
+        unionType = _Type(modelXbrl, "unionType", [memberType.qname, XSD_STRING])
+        derivedType = _Type(modelXbrl, "derivedType", unionType.qname)
+        assert derivedType.qnamesDerivedFromClosure == {unionType.qname, memberType.qname, XSD_DECIMAL, XSD_STRING}
+        assert unionType.isDerivedFrom(XSD_STRING) and unionType.isDerivedFrom(XSD_DECIMAL)
+        assert derivedType.isDerivedFrom((qname(EX, "otherType"), memberType.qname))
+        assert not derivedType.isDerivedFrom([qname(EX, "otherType")])
+
+    def test_derived_from_nothing(self):
+        modelXbrl = _ModelXbrl()
+        nothingType = _Type(modelXbrl, "nothingType", None)
+        derivedType = _Type(modelXbrl, "derivedType", nothingType.qname)
+        decimalType = _Type(modelXbrl, "decimalType", XSD_DECIMAL)
+        for _type in (nothingType, derivedType):
+            assert _type.isDerivedFrom(None)
+            assert _type.isDerivedFrom([])
+            assert not _type.isDerivedFrom([None, XSD_DECIMAL])
+        assert not decimalType.isDerivedFrom(None)
+        assert not decimalType.isDerivedFrom([])
+
+    def test_closure_not_cached_until_resolved(self):
+        modelXbrl = _ModelXbrl()
+        derivedType = _Type(modelXbrl, "derivedType", qname(EX, "baseType"))
+        assert not derivedType.isDerivedFrom(XSD_DECIMAL) # base type not yet discovered
+        assert "_qnamesDerivedFromClosure" not in derivedType.__dict__
+        _Type(modelXbrl, "baseType", XSD_DECIMAL)
+        assert derivedType.isDerivedFrom(XSD_DECIMAL)
+        assert derivedType.__dict__["_qnamesDerivedFromClosure"] == {qname(EX, "baseType"), XSD_DECIMAL}
+
+
+class TestModelConceptInstanceOfType:
+
+    def test_type_and_substitution_group_chain(self):
+        modelXbrl = _ModelXbrl()
+        headType = _Type(modelXbrl, "headType", XSD_STRING)
+        conceptType = _Type(modelXbrl, "conceptType", XSD_DECIMAL)
+        head = _Concept(modelXbrl, "head", headType.qname)
+        middle = _Concept(modelXbrl, "middle", conceptType.qname, head.qname)
+        concept = _Concept(modelXbrl, "concept", conceptType.qname, middle.qname)
+        assert concept.substitutionGroupQnames == [middle.qname, head.qname]
+        assert concept.substitutionGroupQnameSet == {middle.qname, head.qname}
+        assert concept.instanceOfTypeQnames == {conceptType.qname, XSD_DECIMAL, headType.qname, XSD_STRING}
+        assert concept.instanceOfType(XSD_STRING) # type of substitution group head
+        assert concept.instanceOfType([qname(EX, "otherType"), conceptType.qname])
+        assert not head.instanceOfType(XSD_DECIMAL)
+
+    def test_substitution_group_loop(self):
+        modelXbrl = _ModelXbrl()
+        concept1 = _Concept(modelXbrl, "concept1", XSD_DECIMAL, qname(EX, "concept2"))
+        concept2 = _Concept(modelXbrl, "concept2", XSD_STRING, concept1.qname)
+        assert concept1.substitutionGroupQnames == [concept2.qname]
+        assert concept1.instanceOfTypeQnames == {XSD_DECIMAL, XSD_STRING}
+
+    @pytest.mark.parametrize("typeqname, expected", [
+        ([], False),
+        (None, True),
+        ([None], True),
+        (XSD_DECIMAL, False),
+    ])
+    def test_without_type(self, typeqname, expected):
+        concept = _Concept(_ModelXbrl(), "concept")
+        assert concept.instanceOfType(typeqname) == expected
+
+    @pytest.mark.parametrize("typeqname, expected", [
+        ([], True),
+        (None, True),
+        ([None], False),
+        ([qname(EX, "nothingType")], True),
+    ])
+    def test_type_derived_from_nothing(self, typeqname, expected):
+        modelXbrl = _ModelXbrl()
+        nothingType = _Type(modelXbrl, "nothingType", None)
+        concept = _Concept(modelXbrl, "concept", nothingType.qname)
+        assert concept.instanceOfType(typeqname) == expected
+
+    def test_closures_not_cached_until_chain_resolved(self):
+        modelXbrl = _ModelXbrl()
+        concept = _Concept(modelXbrl, "concept", XSD_DECIMAL, qname(EX, "middle"))
+        middle = _Concept(modelXbrl, "middle", XSD_DECIMAL, qname(EX, "head"))
+        assert concept.substitutionGroupQnames == [middle.qname] # head not yet discovered
+        assert not concept.instanceOfType(XSD_STRING)
+        assert not {"_substitutionGroupQnameChain", "_substitutionGroupQnameSet",
+                    "_instanceOfTypeQnames"} & concept.__dict__.keys()
+        head = _Concept(modelXbrl, "head", XSD_STRING)
+        assert concept.substitutionGroupQnameSet == {middle.qname, head.qname}
+        assert concept.instanceOfType(XSD_STRING)
+        assert concept.__dict__["_substitutionGroupQnameChain"] == (middle.qname, head.qname)
+        assert concept.__dict__["_instanceOfTypeQnames"] == {XSD_DECIMAL, XSD_STRING}
@@ -0,0 +1,68 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import XbrlConst
+from arelle.ModelRelationshipSet import ModelRelationshipSet
+
+
+def _label_rel(text: str, lang: str | None, role: str = XbrlConst.standardLabel, priority: int = 0):
+    return Mock(
+        priority=priority,
+        linkrole=XbrlConst.defaultLinkRole,
+        toModelObject=Mock(role=role, xmlLang=lang, textValue=text),
+    )
+
+
+def _label_relationship_set(concept, rels) -> ModelRelationshipSet:
+    modelXbrl = Mock(baseSets={}, relationshipSets={})
+    relSet = ModelRelationshipSet(modelXbrl, XbrlConst.conceptLabel)
+    relSet.modelRelationships = rels
+    relSet.modelRelationshipsFrom = {concept: rels}
+    return relSet
+
+
+class TestLabelIndex:
+
+    @pytest.mark.parametrize(
+        "lang, expected",
+        [
+            ("en-US", "US label"),
+            ("EN-us", "US label"),
+            ("en", "US label"),
+            ("de-DE", "German label"),
+            ("en-US-x-custom", "US label"),
+            ("fr", None),
+        ]
+    )
+    def test_lang_fallback(self, lang: str, expected: str | None):
+        concept = object()
+        relSet = _label_relationship_set(concept, [
+            _label_rel("US label", "en-US"),
+            _label_rel("German label", "de"),
+        ])
+
+        assert relSet.label(concept, XbrlConst.standardLabel, lang) == expected
+
+    def test_repeated_lookup_uses_index(self):
+        concept = object()
+        rel = _label_rel("label", "en")
+        relSet = _label_relationship_set(concept, [rel])
+
+        assert relSet.label(concept, XbrlConst.standardLabel, "en") == "label"
+        rel.toModelObject.textValue = "changed"
+        assert relSet.label(concept, XbrlConst.standardLabel, "EN") == "label"
+        assert len(relSet.modelLabelIndex) == 1
+
+    def test_return_multiple_is_copied(self):
+        concept = object()
+        relSet = _label_relationship_set(concept, [
+            _label_rel("low", "en", priority=0),
+            _label_rel("high", "en", priority=1),
+        ])
+
+        labels = relSet.label(concept, XbrlConst.standardLabel, "en", returnMultiple=True)
+        assert labels == ["high", "low"]
+        labels.clear()
+        assert relSet.label(concept, XbrlConst.standardLabel, "en", returnMultiple=True) == ["high", "low"]
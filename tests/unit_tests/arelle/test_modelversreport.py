@@ -0,0 +1,188 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import pytest
+from lxml import etree
+
+from arelle import XbrlConst, XbrlUtil
+from arelle.ModelDtsObject import ModelConcept
+from arelle.ModelValue import qname
+from arelle.ModelVersReport import ModelVersReport
+
+FROM_NS = "http://example.com/2020"
+TO_NS = "http://example.com/2021"
+XBRLI = XbrlConst.xbrli
+
+
+class _Label(etree.ElementBase):
+    # stands in for the ModelResource of a label
+    @property
+    def role(self):
+        return self.get("role")
+
+    @property
+    def xmlLang(self):
+        return self.get("lang")
+
+    @property
+    def qname(self):
+        return qname(XbrlConst.link, "label")
+
+
+def _label(text, id="label"):
+    parser = etree.XMLParser()
+    parser.set_element_class_lookup(etree.ElementDefaultClassLookup(element=_Label))
+    return etree.fromstring('<label id="{}" role="{}" lang="en">{}</label>'.format(
+        id, XbrlConst.standardLabel, text), parser)
+
+
+def _concept(ns, localName, labels=(), **attributes):
+    details = dict(id=localName, substitutionGroupQname=qname(XBRLI, "item"), isItem=True, isTuple=False,
+                   typeQname=qname(ns, "customItemType"), nillable="true", abstract="false", block=None,
+                   default=None, fixed=None, final=None, periodType="instant", balance="debit")
+    details.update(attributes)
+    concept = Mock(spec=ModelConcept, qname=qname(ns, localName), **details)
+    concept.items.return_value = []
+    concept.labels = list(labels)
+    return concept
+
+
+def _rel(fromConcept, toConcept, **arcAttributes):
+    arcElement = etree.Element("arc", {k: str(v) for k, v in arcAttributes.items()})
+    return Mock(fromModelObject=fromConcept, toModelObject=toConcept, arcElement=arcElement,
+                linkrole=XbrlConst.defaultLinkRole, linkQname=qname(XbrlConst.link, "labelLink"),
+                qname=qname(XbrlConst.link, "labelArc"))
+
+
+def _dts(*concepts):
+    dts = Mock()
+    dts.qnameConcepts = {concept.qname: concept for concept in concepts}
+    labelRelationshipSet = Mock()
+    labelRelationshipSet.fromModelObject.side_effect = lambda concept: [
+        _rel(concept, label) for label in concept.labels]
+
+    def relationshipSet(arcrole, linkrole=None):
+        return labelRelationshipSet if arcrole == XbrlConst.conceptLabel else None
+    dts.relationshipSet.side_effect = relationshipSet
+    return dts
+
+
+@pytest.fixture
+def report(monkeypatch):
+    # arc and resource attributes, by name, for elements which are not model objects
+    monkeypatch.setattr(XbrlUtil, "attributes", lambda modelXbrl, elt, exclusions=(), ns2ns1Tbl=None:
+                        tuple(sorted((name, value) for name, value in elt.items() if name not in exclusions)))
+    report = ModelVersReport(Mock(urlDocs={}, modelObjects=[]), uri="report.xml", filepath="report.xml")
+    report.namespaceRenameFromURI = {FROM_NS: TO_NS}
+    report.namespaceRenameToURI = {TO_NS: FROM_NS}
+    report.roleChangeFromURI = report.roleChangeToURI = {}
+    return report
+
+
+class TestConceptSignature:
+
+    def test_equal_concepts_of_renamed_namespace(self, report):
+        fromDTS = _dts(_concept(FROM_NS, "a", labels=[_label("A")]))
+        toDTS = _dts(_concept(TO_NS, "a", labels=[_label("A")]))
+        fromConcept, = fromDTS.qnameConcepts.values()
+        toConcept, = toDTS.qnameConcepts.values()
+        assert report.conceptSignature(fromDTS, fromConcept) == report.conceptSignature(toDTS, toConcept, report.fromDTSqname)
+
+    @pytest.mark.parametrize("attributes, labels", [
+        ({"balance": "credit"}, ["A"]),
+        ({"periodType": "duration"}, ["A"]),
+        ({"nillable": "false"}, ["A"]),
+        ({"typeQname": qname(XBRLI, "monetaryItemType")}, ["A"]),
+        ({}, ["changed A"]),
+        ({}, ["A", "another A"]),
+        ({}, []),
+    ])
+    def test_changed_concepts(self, report, attributes, labels):
+        fromConcept = _concept(FROM_NS, "a", labels=[_label("A")])
+        toConcept = _concept(TO_NS, "a", labels=[_label(text, id="label{}".format(i or "")) for i, text in enumerate(labels)],
+                             **attributes)
+        fromDTS, toDTS = _dts(fromConcept), _dts(toConcept)
+        assert report.conceptSignature(fromDTS, fromConcept) != report.conceptSignature(toDTS, toConcept, report.fromDTSqname)
+
+    def test_resource_signature_excludes_ids(self, report):
+        assert report.resourceSignature(_label("A", id="l1")) == report.resourceSignature(_label("A", id="l2"))
+        assert report.resourceSignature(_label("A")) != report.resourceSignature(_label("<b>A</b>"))
+
+
+class TestDiffConcepts:
+
+    def test_only_changed_concepts_compared_in_detail(self, report):
+        fromConcepts = [_concept(FROM_NS, "unchanged"), _concept(FROM_NS, "changed"), _concept(FROM_NS, "deleted")]
+        toConcepts = [_concept(TO_NS, "unchanged"), _concept(TO_NS, "changed", balance="credit"), _concept(TO_NS, "added")]
+        report.fromDTS, report.toDTS = _dts(*fromConcepts), _dts(*toConcepts)
+        report.diffConcept = Mock()
+        report.createConceptEvent = Mock()
+        report.diffConcepts()
+        report.diffConcept.assert_called_once_with(fromConcepts[1], toConcepts[1])
+        assert [(call.args[1], call.kwargs) for call in report.createConceptEvent.call_args_list] == [
+            ("vercu:conceptDelete", {"fromConcept": fromConcepts[2]}),
+            ("vercu:conceptAdd", {"toConcept": toConcepts[2]})]
+
+    def test_tuples_compared_in_detail(self, report):
+        fromConcept = _concept(FROM_NS, "tuple", isItem=False, isTuple=True)
+        toConcept = _concept(TO_NS, "tuple", isItem=False, isTuple=True)
+        report.fromDTS, report.toDTS = _dts(fromConcept), _dts(toConcept)
+        report.diffConcept = Mock()
+        report.createConceptEvent = Mock()
+        report.diffConcepts()
+        report.diffConcept.assert_called_once_with(fromConcept, toConcept)
+        report.createConceptEvent.assert_not_called()
+
+
+def _relationshipSet(rels):
+    relationshipSet = Mock(modelRelationships=rels, linkRoleUris={XbrlConst.defaultLinkRole},
+                           linkrole=XbrlConst.defaultLinkRole, arcrole=XbrlConst.parentChild)
+    relationshipSet.rootConcepts = [rel.fromModelObject for rel in rels[:1]]
+    return relationshipSet
+
+
+def _presentation(ns, targets=("b", "c"), **arcAttributes):
+    root = _concept(ns, "a")
+    return _relationshipSet([_rel(root, _concept(ns, target), order=i, **arcAttributes)
+                             for i, target in enumerate(targets)])
+
+
+class TestRelationshipSetSignature:
+
+    def test_equal_relationship_sets_of_renamed_namespace(self, report):
+        assert (report.relationshipSetSignature(_presentation(FROM_NS), report.toDTSqname) ==
+                report.relationshipSetSignature(_presentation(TO_NS), ns2ns1Tbl=report.namespaceRenameToURI))
+
+    @pytest.mark.parametrize("toRelationshipSet", [
+        _presentation(TO_NS, targets=("c", "b")), # order attributes of targets differ
+        _presentation(TO_NS, targets=("b", "d")),
+        _presentation(TO_NS, targets=("b",)),
+        _presentation(TO_NS, preferredLabel=XbrlConst.terseLabel),
+    ])
+    def test_changed_relationship_sets(self, report, toRelationshipSet):
+        assert (report.relationshipSetSignature(_presentation(FROM_NS), report.toDTSqname) !=
+                report.relationshipSetSignature(toRelationshipSet, ns2ns1Tbl=report.namespaceRenameToURI))
+
+    def test_non_concept_targets_never_equal(self, report):
+        relationshipSet = _relationshipSet([_rel(_concept(FROM_NS, "a"), Mock())])
+        assert report.relationshipSetSignature(relationshipSet) != report.relationshipSetSignature(relationshipSet)
+
+
+class TestDiffRelationshipSet:
+
+    @pytest.mark.parametrize("toRelationshipSet, isChanged", [
+        (_presentation(TO_NS), False),
+        (_presentation(TO_NS, targets=("b", "d")), True),
+    ])
+    def test_only_changed_relationship_sets_compared(self, report, toRelationshipSet, isChanged):
+        fromRelationshipSet = _presentation(FROM_NS)
+        report.fromDTS, report.toDTS = Mock(), Mock()
+        report.fromDTS.relationshipSet.return_value = fromRelationshipSet
+        report.toDTS.relationshipSet.return_value = toRelationshipSet
+        report.toDTS.qnameConcepts = {concept.qname: concept for concept in toRelationshipSet.rootConcepts}
+        report.fromDTS.qnameConcepts = {concept.qname: concept for concept in fromRelationshipSet.rootConcepts}
+        report.diffRelationships = Mock()
+        report.createRelationshipSetEvent = Mock()
+        report.diffRelationshipSet(XbrlConst.parentChild)
+        assert report.diffRelationships.called == isChanged
+        report.createRelationshipSetEvent.assert_not_called()
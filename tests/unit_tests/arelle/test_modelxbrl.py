@@ -0,0 +1,70 @@
+import pytest
+
+from arelle import ModelManager, XbrlConst
+from arelle.Cntlr import LogToBufferHandler
+from arelle.CntlrCmdLine import CntlrCmdLine
+from arelle.FileSource import openFileSource
+from arelle.ModelValue import DATE, dateTime, qname
+
+
+@pytest.fixture
+def cntlr():
+    cntlr = CntlrCmdLine(uiLang='en')
+    cntlr.startLogging(logHandler=LogToBufferHandler())
+    yield cntlr
+    cntlr.logger.removeHandler(cntlr.logHandler)
+
+
+def _load(cntlr):
+    modelManager = ModelManager.initialize(cntlr)
+    modelXbrl = modelManager.load(openFileSource('arelle/config/empty-instance.xml', cntlr))
+    cntlr.logHandler.clearLogBuffer()
+    return modelXbrl
+
+
+class TestMessageCodeLimit:
+
+    def test_messages_beyond_limit_are_summarized(self, cntlr):
+        modelXbrl = _load(cntlr)
+        cntlr.setLogMessageCodeLimit(2, 3)
+        for i in range(10):
+            modelXbrl.error("test:repeated", "message %(i)s", modelObject=modelXbrl.modelDocument.xmlRootElement, i=i)
+        modelXbrl.info("test:info", "info messages are not limited")
+        modelXbrl.logMessageCodeLimitSummaries()
+        records = cntlr.logHandler.logRecordBuffer
+        assert [(r.messageCode, r.getMessage()) for r in records] == [
+            ("test:repeated", "message 0"),
+            ("test:repeated", "message 1"),
+            ("test:info", "info messages are not limited"),
+            ("test:repeated", "8 further test:repeated messages not logged individually, "
+                              "exceeding the limit of 2 messages per message code"),
+        ]
+        assert len(records[3].refs) == 3  # sampled at 1st, 2nd and 4th further message
+        assert modelXbrl.errors == ["test:repeated"] * 10
+        modelXbrl.close()
+
+    def test_no_limit(self, cntlr):
+        modelXbrl = _load(cntlr)
+        cntlr.setLogMessageCodeLimit(None)
+        for i in range(5):
+            modelXbrl.warning("test:repeated", "message %(i)s", i=i)
+        modelXbrl.logMessageCodeLimitSummaries()
+        assert len(cntlr.logHandler.logRecordBuffer) == 5
+        modelXbrl.close()
+
+
+class TestCreateInstance:
+
+    def test_removed_contexts_and_units_not_matched(self, cntlr, tmp_path):
+        modelXbrl = _load(cntlr)
+        period = ("instant", None, dateTime("2022-12-31", addOneDay=True, type=DATE))
+        usd = [qname(XbrlConst.iso4217, "USD")]
+        cntx = modelXbrl.createContext("http://example.com", "ABC", *period, None, {}, [], [])
+        unit = modelXbrl.createUnit(usd, [])
+        assert modelXbrl.matchContext("http://example.com", "ABC", *period, {}, [], []) is cntx
+        assert modelXbrl.matchUnit(usd, []) is unit
+        modelXbrl.createInstance(str(tmp_path / "instance.xml"))
+        assert modelXbrl.contexts == {} and modelXbrl.units == {}
+        assert modelXbrl.matchContext("http://example.com", "ABC", *period, {}, [], []) is None
+        assert modelXbrl.matchUnit(usd, []) is None
+        modelXbrl.close()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+import logging
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import RssFeedPipeline
+from arelle.Validate import Validate
+from arelle.RssFeedPipeline import PROCESSED, TIMEOUT, WORKER_FAILED, picklableLogRecord
+
+pytestmark = pytest.mark.skipif(not RssFeedPipeline.isSupported(), reason="worker processes are forked")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def feedModelXbrl():
+    logger = logging.getLogger("test_rssfeedpipeline")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    modelXbrl = Mock(logger=logger, errors=[], logCount={})
+    yield modelXbrl
+    logger.removeHandler(handler)
+
+
+def _items(*names, skip=()):
+    return [Mock(zippedUrl="/feed/{}.zip/{}.xml".format(name, name), itemName=name, skipRssItem=name in skip)
+            for name in names]
+
+
+def _run(modelXbrl, items, processItem, **kwargs):
+    collected = []
+
+    def collectItem(rssItem, result):
+        if result is not None:
+            result.emitLogRecords(modelXbrl)
+        collected.append((rssItem.itemName, result))
+    RssFeedPipeline.RssFeedPipeline(modelXbrl, processItem, collectItem, **kwargs).run(items)
+    return collected
+
+
+def _recordDownloads(modelXbrl, path, slowUrl=None):
+    # downloads are by the prefetch process, recorded in a file for the controller to read
+    def download(url, reload=False):
+        if url == slowUrl:
+            time.sleep(3)
+        with open(path, "a") as fh:
+            fh.write(url + "\n")
+    modelXbrl.modelManager.cntlr.webCache.getfilename.side_effect = download
+
+
+class TestRssFeedPipeline:
+
+    def test_results_collected_in_feed_order(self, feedModelXbrl, tmp_path):
+        def processItem(rssItem):
+            time.sleep({"a": 0.3, "b": 0.1}.get(rssItem.itemName, 0)) # first items finish last
+            feedModelXbrl.logger.info("validated %(item)s", {"item": rssItem.itemName})
+            return None if rssItem.itemName == "d" else ["code:" + rssItem.itemName]
+        items = _items("a", "b", "c", "d", "e", skip=("c",))
+        _recordDownloads(feedModelXbrl, tmp_path / "downloads")
+        collected = _run(feedModelXbrl, items, processItem, workers=3, prefetch=1)
+        assert [name for name, _result in collected] == ["a", "b", "c", "d", "e"]
+        results = dict(collected)
+        assert results["a"].status == PROCESSED and results["a"].errors == ["code:a"]
+        assert results["c"] is None
+        assert results["d"].errors is None
+        handler = feedModelXbrl.logger.handlers[0]
+        assert [record.getMessage() for record in handler.records] == [
+            "validated a", "validated b", "validated d", "validated e"]
+        # archives of items not skipped are prefetched
+        assert sorted((tmp_path / "downloads").read_text().split()) == [
+            "/feed/a.zip/a.xml", "/feed/b.zip/b.xml", "/feed/d.zip/d.xml", "/feed/e.zip/e.xml"]
+
+    def test_timeout_and_failed_worker(self, feedModelXbrl):
+        def processItem(rssItem):
+            if rssItem.itemName == "slow":
+                time.sleep(30)
+            elif rssItem.itemName == "exits":
+                sys.exit(1)
+            return []
+        startedAt = time.monotonic()
+        results = dict(_run(feedModelXbrl, _items("slow", "exits", "ok"), processItem,
+                            workers=2, prefetch=0, timeout=0.5))
+        assert time.monotonic() - startedAt < 10
+        assert results["slow"].status == TIMEOUT
+        assert results["exits"].status == WORKER_FAILED
+        assert results["ok"].status == PROCESSED and results["ok"].errors == []
+
+    def test_download_wait_bounded_by_worker_timeout(self, feedModelXbrl, tmp_path):
+        # slow download of the item after the item to time out
+        _recordDownloads(feedModelXbrl, tmp_path / "downloads", slowUrl="/feed/ok.zip/ok.xml")
+        timedOutAt = {}
+
+        def collectItem(rssItem, result):
+            timedOutAt.setdefault(rssItem.itemName, time.monotonic())
+        startedAt = time.monotonic()
+        RssFeedPipeline.RssFeedPipeline(feedModelXbrl, lambda rssItem: time.sleep(30) or [], collectItem,
+                                        workers=2, prefetch=1, timeout=0.5).run(_items("slow", "ok"))
+        assert timedOutAt["slow"] - startedAt < 2.5 # not held by the download of the next item
+
+    def test_workers_forked_without_controller_threads(self, feedModelXbrl, tmp_path):
+        _recordDownloads(feedModelXbrl, tmp_path / "downloads")
+        threadCounts = []
+        threadCount = threading.active_count()
+
+        def processItem(rssItem):
+            return []
+        RssFeedPipeline.RssFeedPipeline(feedModelXbrl, processItem,
+                                        lambda rssItem, result: threadCounts.append(threading.active_count()),
+                                        workers=2, prefetch=2).run(_items("a", "b", "c", "d"))
+        assert threadCounts == [threadCount] * 4
+
+    def test_feed_errors_and_log_counts_merged(self, feedModelXbrl):
+        def processItem(rssItem):
+            # as by feed modelXbrl.error in the worker
+            feedModelXbrl.errors.append("feed:" + rssItem.itemName)
+            feedModelXbrl.logCount[logging.ERROR] = feedModelXbrl.logCount.get(logging.ERROR, 0) + 1
+            return ["code:" + rssItem.itemName]
+        feedModelXbrl.errors.append("feed:prior")
+        feedModelXbrl.logCount[logging.ERROR] = 1
+        results = dict(_run(feedModelXbrl, _items("a", "b"), processItem, workers=2, prefetch=0))
+        assert results["a"].feedErrors == [] # merged into the feed's model
+        assert feedModelXbrl.errors == ["feed:prior", "feed:a", "feed:b"]
+        assert feedModelXbrl.logCount == {logging.ERROR: 3}
+
+
+class TestValidateRssFeed:
+
+    def test_serial_fallback_logged(self, monkeypatch):
+        monkeypatch.setattr(RssFeedPipeline, "isSupported", lambda: False)
+        validate = Validate.__new__(Validate)
+        validate.modelXbrl = Mock(reloadCache=False)
+        validate.modelXbrl.modelManager.rssWorkers = 4
+        validate.modelXbrl.modelDocument.rssItems = _items("a", "b")
+        validate.validateRssItem = Mock()
+        validate.logRssItem = Mock(return_value=True)
+        validate.validateRssFeed()
+        assert validate.validateRssItem.call_count == 2
+        validate.modelXbrl.warning.assert_called_once()
+        assert validate.modelXbrl.warning.call_args.args[0] == "arelle:rssWorkersNotSupported"
+
+
+class TestPicklableLogRecord:
+
+    def test_record_without_model_objects(self):
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            record = logging.LogRecord("arelle", logging.ERROR, __file__, 1, "%(value)s is %(obj)s",
+                                       None, sys.exc_info())
+        record.args = {"value": 1, "obj": object()}
+        record.messageCode = "test:code"
+        record.refs = [{"href": "a.xml#element(/1)", "modelObject": lambda: None}]
+        recordDict = picklableLogRecord(record)
+        assert recordDict["args"]["value"] == 1 and recordDict["args"]["obj"].startswith("<object")
+        assert recordDict["messageCode"] == "test:code"
+        assert recordDict["refs"] == []  # not picklable
+        assert "ValueError: bad value" in recordDict["exc_text"]
+        assert logging.makeLogRecord(recordDict).getMessage().startswith("1 is <object")
+
+    def test_numeric_args_preserved(self):
+        record = logging.LogRecord("arelle", logging.INFO, __file__, 1, "%d items, %.2f%%, %s", (3, 12.345, object()), None)
+        recordDict = picklableLogRecord(record)
+        assert recordDict["args"][:2] == (3, 12.345)
+        assert logging.makeLogRecord(recordDict).getMessage().startswith("3 items, 12.35%, <object")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import json
+from unittest.mock import Mock
+
+from arelle.SpanTracer import NULL_SPAN, SpanTracer, traceSpan
+
+
+class Traced:
+    def __init__(self, tracer):
+        self.modelXbrl = Mock()
+        self.modelXbrl.modelManager.spanTracer = tracer
+
+    @traceSpan("outer")
+    def outer(self):
+        with self.modelXbrl.modelManager.spanTracer.span("inner", count=2):
+            pass
+        return "result"
+
+    @traceSpan("plain")
+    def plain(self):
+        return "result"
+
+
+class TestSpanTracer:
+
+    def test_nested_spans(self):
+        tracer = SpanTracer(memoryUsed=lambda: 100)
+        assert Traced(tracer).outer() == "result"
+
+        events = tracer.chromeTrace()["traceEvents"]
+        assert [e["name"] for e in events] == ["inner", "outer"]
+        inner, outer = events
+        assert inner["args"] == {"count": 2, "memoryDeltaKB": 0}
+        assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1
+        assert [line.rpartition(" ")[0] for line in tracer.foldedStacks()] == ["outer", "outer;inner"]
+        json.dumps(tracer.chromeTrace())
+
+    def test_completed_spans_do_not_double_count_siblings(self):
+        tracer = SpanTracer()
+        with tracer.span("parent"):
+            with tracer.span("child"):
+                pass
+            tracer.completed("mark", 10.0) # starts no earlier than parent, overlaps child
+        child, mark, parent = tracer.events
+        assert mark["ts"] >= parent["ts"]
+        assert abs(sum(tracer.stackSelfTimes.values()) * 1e6 - parent["dur"]) < 1
+
+    def test_disabled(self):
+        assert Traced(None).plain() == "result"
+        with NULL_SPAN as span:
+            assert span is NULL_SPAN
@@ -0,0 +1,42 @@
+from __future__ import annotations
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from arelle.ModelFormulaObject import Aspect
+from arelle.ModelValue import qname
+from arelle.TableFactIndex import TableFactIndex
+
+qnA = qname("{http://example.com}a")
+qnB = qname("{http://example.com}b")
+
+
+def _context(instant=None, **period):
+    # as context (or context prototype) period: instant, or start/end datetimes of a duration
+    return SimpleNamespace(isForeverPeriod=False, isStartEndPeriod=instant is None, isInstantPeriod=instant is not None,
+                           instantDatetime=instant, **period)
+
+
+def _fact(concept, cntx):
+    return Mock(qname=concept, isTuple=False, unit=None, context=cntx)
+
+
+class TestTableFactIndex:
+
+    def test_cell_facts(self):
+        facts = [_fact(qnA, _context("2020")), _fact(qnA, _context("2021")), _fact(qnB, _context("2020")),
+                 _fact(qnA, None), _fact(qnA, _context("2020"))]
+        index = TableFactIndex(Mock(), facts)
+        aspects = {Aspect.CONCEPT, Aspect.PERIOD, Aspect.LOCATION}
+        assert index.cellFacts(_fact(qnA, _context("2020")), aspects) == [facts[0], facts[4]]
+        assert index.cellFacts(_fact(qnB, _context("2021")), aspects) == []
+        # duration prototype without start datetime: period not keyed, facts without context are candidates
+        assert index.cellFacts(_fact(qnA, _context(endDatetime="2021")), aspects) == [facts[0], facts[1], facts[3], facts[4]]
+        assert index.cellFacts(_fact(qnA, _context("2020")), {Aspect.CONCEPT}) == [facts[0], facts[1], facts[3], facts[4]]
+
+    def test_coverage(self):
+        facts = [_fact(qnA, _context("2020")), _fact(qnB, _context("2020"))]
+        index = TableFactIndex(Mock(), facts)
+        assert index.coverage == (2, 0)
+        index.factMatched(facts[1])
+        assert index.coverage == (2, 1)
+        assert index.unmatchedFacts == [facts[0]]
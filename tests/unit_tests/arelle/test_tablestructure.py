@@ -0,0 +1,101 @@
+from __future__ import annotations
+import gc
+import weakref
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import TableStructure, XbrlConst
+from arelle.ModelDocument import Type
+from arelle.ModelDtsObject import ModelConcept
+from arelle.ModelValue import qname
+from arelle.TableStructure import EFMtableCodes, definitionTableCodes, linkRoleStructures
+
+ROLE = "http://example.com/role/BalanceSheet"
+BASE_NS = "http://example.com/taxonomy/2023"
+BASE_SCHEMA_URI = "http://example.com/taxonomy/2023/base.xsd"
+BASE_LINKBASE_URI = "http://example.com/taxonomy/2023/stm-pre.xml"
+
+
+@pytest.fixture(autouse=True)
+def baseRoleStructures(monkeypatch):
+    # each test starts with no base role structures shared by prior DTSes
+    monkeypatch.setattr(TableStructure, "BASE_ROLE_STRUCTURES", weakref.WeakValueDictionary())
+
+
+def _concept(name, isAbstract=False):
+    concept = Mock(spec=ModelConcept, qname=qname("{http://example.com}" + name), isDimensionItem=False,
+                   isAbstract=isAbstract)
+    concept.name = name  # name keyword of Mock names the mock
+    return concept
+
+
+def _doc(uri, type, targetNamespace=None, referencesDocument=()):
+    return Mock(uri=uri, type=type, targetNamespace=targetNamespace,
+                referencesDocument={doc: Mock() for doc in referencesDocument})
+
+
+def _modelXbrl(linkbaseUri, standardTaxonomiesDict=None):
+    root, item = _concept("StatementOfFinancialPositionAbstract", True), _concept("Assets")
+    rel = Mock(fromModelObject=root, toModelObject=item)
+    relSet = Mock(rootConcepts=[root], modelRelationships=[rel])
+    relSet.fromModelObject.side_effect = lambda concept: [rel] if concept is root else []
+    baseLinkbase = _doc(BASE_LINKBASE_URI, Type.LINKBASE)
+    docs = [_doc(BASE_SCHEMA_URI, Type.SCHEMA, BASE_NS, [baseLinkbase]), baseLinkbase,
+            _doc("http://example.com/filings/pre.xml", Type.LINKBASE)]
+    modelXbrl = Mock(spec=["modelManager", "urlDocs", "baseSets", "relationshipSet"],
+                     urlDocs={doc.uri: doc for doc in docs},
+                     baseSets={(XbrlConst.parentChild, ROLE, None, None): [Mock(modelDocument=Mock(uri=linkbaseUri))]})
+    modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict = (
+        {BASE_NS: {BASE_SCHEMA_URI}} if standardTaxonomiesDict is None else standardTaxonomiesDict)
+    modelXbrl.relationshipSet.return_value = relSet
+    return modelXbrl
+
+
+class TestDefinitionTableCodes:
+
+    def test_matches(self):
+        matches = definitionTableCodes(EFMtableCodes, "2001 - Statement - Consolidated Balance Sheets")
+        assert [EFMtableCodes[i][0] for i in matches][:2] == ["BS", "IS"]
+        assert definitionTableCodes(EFMtableCodes, "1001 - Document - Cover") == ()
+
+
+class TestLinkRoleStructures:
+
+    def test_held_by_dts(self):
+        modelXbrl = _modelXbrl(BASE_LINKBASE_URI)
+        roleStructures = linkRoleStructures(modelXbrl)
+        assert linkRoleStructures(modelXbrl) is roleStructures
+        assert roleStructures.baseTaxonomyUris == {BASE_SCHEMA_URI, BASE_LINKBASE_URI}
+        roleStructure = roleStructures[ROLE]
+        assert roleStructure.rootConceptNames == {"StatementOfFinancialPositionAbstract"}
+        assert roleStructure.priItems == {qname("{http://example.com}Assets")}
+        assert roleStructure.conceptNames == {"StatementOfFinancialPositionAbstract", "Assets"}
+
+    def test_base_taxonomy_role_structure_shared_by_open_dtses(self):
+        roleStructure = linkRoleStructures(_modelXbrl(BASE_LINKBASE_URI))[ROLE]
+        otherModelXbrl = _modelXbrl(BASE_LINKBASE_URI)
+        assert linkRoleStructures(otherModelXbrl)[ROLE] is roleStructure
+        otherModelXbrl.relationshipSet.assert_not_called()
+
+    def test_base_taxonomy_role_structure_released_with_dtses(self):
+        modelXbrl = _modelXbrl(BASE_LINKBASE_URI)
+        linkRoleStructures(modelXbrl)[ROLE]
+        assert len(TableStructure.BASE_ROLE_STRUCTURES) == 1
+        del modelXbrl._linkRoleStructures # as by closing modelXbrl
+        gc.collect()
+        assert len(TableStructure.BASE_ROLE_STRUCTURES) == 0
+
+    @pytest.mark.parametrize("linkbaseUri, standardTaxonomiesDict", [
+        ("http://example.com/filings/pre.xml", None), # extension linkbase
+        (BASE_LINKBASE_URI, {}), # no standard taxonomies
+    ])
+    def test_extension_role_structure_per_dts(self, linkbaseUri, standardTaxonomiesDict):
+        roleStructure = linkRoleStructures(_modelXbrl(linkbaseUri, standardTaxonomiesDict))[ROLE]
+        assert linkRoleStructures(_modelXbrl(linkbaseUri, standardTaxonomiesDict))[ROLE] is not roleStructure
+        assert len(TableStructure.BASE_ROLE_STRUCTURES) == 0
+
+    def test_standard_linkbase_by_href(self):
+        modelXbrl = _modelXbrl("http://example.com/filings/pre.xml",
+                               {"http://example.com/filings/pre.xml": "AllowedLIN"})
+        assert linkRoleStructures(modelXbrl).baseTaxonomyUris == {"http://example.com/filings/pre.xml"}
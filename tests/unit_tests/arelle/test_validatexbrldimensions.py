@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import ValidateXbrlDimensions
+from arelle.PrototypeInstanceObject import ContextPrototype
+from arelle.ValidateXbrlDimensions import factsDimensionalValidityCacheHitRate, isFactDimensionallyValid
+
+
+def _context(segDimValues=None, scenNonDimValues=()):
+    dimValues = {"segment": segDimValues or {}, "scenario": {}}
+    nonDimValues = {"segment": [], "scenario": list(scenNonDimValues)}
+    return Mock(dimValues=dimValues.get, nonDimValues=nonDimValues.get)
+
+
+def _dimValue(member, isTyped=False):
+    return Mock(member=member, isTyped=isTyped)
+
+
+@pytest.fixture
+def findValidity(monkeypatch):
+    findValidity = Mock(return_value=True)
+    monkeypatch.setattr(ValidateXbrlDimensions, "findFactDimensionalValidity", findValidity)
+    return findValidity
+
+
+class TestFactsDimensionalValidityCache:
+
+    def test_no_lookups(self):
+        assert factsDimensionalValidityCacheHitRate(SimpleNamespace()) is None
+
+    def test_hit_rate(self, findValidity):
+        val = SimpleNamespace()
+        concept, dim, member = Mock(), Mock(), Mock()
+        contexts = [_context({dim: _dimValue(member)}) for _i in range(3)] # same dimensional contents
+        for context in contexts:
+            assert isFactDimensionallyValid(val, Mock(concept=concept, context=context))
+        assert findValidity.call_count == 1
+        assert factsDimensionalValidityCacheHitRate(val) == pytest.approx(200.0 / 3)
+
+    @pytest.mark.parametrize("context2", [
+        _context({"dim": _dimValue("otherMember")}),
+        _context({"dim": _dimValue("member")}, scenNonDimValues=["scenario content"]),
+    ])
+    def test_distinct_signatures_not_shared(self, findValidity, context2):
+        val = SimpleNamespace()
+        concept = Mock()
+        isFactDimensionallyValid(val, Mock(concept=concept, context=_context({"dim": _dimValue("member")})))
+        isFactDimensionallyValid(val, Mock(concept=concept, context=context2))
+        assert findValidity.call_count == 2
+        assert factsDimensionalValidityCacheHitRate(val) == 0.0
+
+    def test_typed_dimension_values_share_signature(self, findValidity):
+        val = SimpleNamespace()
+        concept = Mock()
+        for value in ("a", "b"):
+            isFactDimensionallyValid(val, Mock(concept=concept, context=_context({"dim": _dimValue(value, isTyped=True)})))
+        assert findValidity.call_count == 1
+        assert factsDimensionalValidityCacheHitRate(val) == 50.0
+
+    @pytest.mark.parametrize("context, setPrototypeContextElements", [
+        (Mock(spec=ContextPrototype), False),
+        (_context(), True),
+    ])
+    def test_prototype_contexts_bypass_cache(self, findValidity, context, setPrototypeContextElements):
+        val = SimpleNamespace()
+        f = Mock(concept=Mock(), context=context)
+        for _i in range(2):
+            isFactDimensionallyValid(val, f, setPrototypeContextElements)
+        assert findValidity.call_count == 2
+        findValidity.assert_called_with(val, f, setPrototypeContextElements, None)
+        assert not hasattr(val, "factsDimensionalValidity")
+        assert factsDimensionalValidityCacheHitRate(val) is None
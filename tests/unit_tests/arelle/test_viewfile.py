@@ -0,0 +1,97 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import gc
+import json
+import pytest
+
+from arelle import ViewFile
+from arelle.FileSource import FileNamedStringIO
+
+
+def _write_rows(outputType: str) -> str:
+    output = FileNamedStringIO(outputType)
+    view = ViewFile.View(Mock(), output, "Fact List", lang="en")
+    view.treeCols = 2
+    view.addRow(["Concept", "Value"], asHeader=True)
+    view.addRow(["tuple", None], treeIndent=0, xmlRowElementName="tuple")
+    view.addRow(["a", "1 & 2"], treeIndent=1, xmlRowElementName="item")
+    view.addRow(["b", "2"], treeIndent=0, xmlRowElementName="item")
+    assert view.streaming
+    view.close()
+    return output.getvalue()
+
+
+class TestStreamedViews:
+
+    def test_xml_rows_are_nested(self):
+        assert _write_rows("xml") == (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<factList>\n'
+            '    <tuple>\n'
+            '        <concept>tuple</concept>\n'
+            '        <item>\n'
+            '            <concept>a</concept>\n'
+            '            <value>1 &amp;amp; 2</value>\n'
+            '        </item>\n'
+            '    </tuple>\n'
+            '    <item>\n'
+            '        <concept>b</concept>\n'
+            '        <value>2</value>\n'
+            '    </item>\n'
+            '</factList>\n'
+        )
+
+    def test_json_rows_are_nested(self):
+        assert json.loads(_write_rows("json")) == {
+            "factList": [
+                ["tuple", {}, {"concept": "tuple"},
+                 ["item", {}, {"concept": "a", "value": "1 & 2"}]],
+                ["item", {}, {"concept": "b", "value": "2"}],
+            ]
+        }
+
+    def test_html_rows_are_in_table(self):
+        html = _write_rows("html")
+        assert html.count("<tr>") == 4
+        assert html.index("</table>") > html.rindex("</tr>")
+        assert html.endswith("</table></body></html>")
+
+    @pytest.mark.parametrize("outputType, expected", [
+        ("xml", '<?xml version="1.0" encoding="utf-8"?>\n<factList/>\n'),
+        ("json", '{"factList": []}'),
+    ])
+    def test_empty_view(self, outputType: str, expected: str):
+        output = FileNamedStringIO(outputType)
+        view = ViewFile.View(Mock(), output, "Fact List", lang="en")
+        view.close()
+        assert output.getvalue() == expected
+
+
+class TestStreamedOutputFile:
+
+    def _view(self, path):
+        view = ViewFile.View(Mock(), str(path), "Fact List", lang="en")
+        view.addRow(["Concept", "Value"], asHeader=True)
+        view.addRow(["a", "1"], xmlRowElementName="item")
+        view.addRow(["b", "2"], xmlRowElementName="item")
+        return view
+
+    def test_output_saved_on_close(self, tmp_path):
+        view = self._view(tmp_path / "facts.xml")
+        view.close()
+        assert (tmp_path / "facts.xml").read_text(encoding="utf-8").endswith("</factList>\n")
+
+    def test_output_of_unclosed_view_removed(self, tmp_path):
+        view = self._view(tmp_path / "facts.xml")
+        assert (tmp_path / "facts.xml").exists()
+        fh = view.fh
+        del view # as when the view raises before close
+        gc.collect()
+        assert fh.closed
+        assert not (tmp_path / "facts.xml").exists()
+
+    def test_no_write(self, tmp_path):
+        view = self._view(tmp_path / "facts.xml")
+        view.close(noWrite=True)
+        assert not (tmp_path / "facts.xml").exists()
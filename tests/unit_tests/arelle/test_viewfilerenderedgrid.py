@@ -0,0 +1,45 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import pytest
+from lxml import etree
+
+from arelle import ValidateInfoset
+from arelle.ViewFileRenderedGrid import ViewRenderedGrid, viewRenderedGrid
+
+XHTML = "{http://www.w3.org/1999/xhtml}"
+
+
+@pytest.fixture
+def renderedRows(monkeypatch):
+    # a rendering of one z table of one row
+    def view(self, viewTblELR=None):
+        etree.SubElement(etree.SubElement(self.tblElt, XHTML + "tr"), XHTML + "td").text = "cell"
+        if self.streaming:
+            self.writeStreamedRows()
+    monkeypatch.setattr(ViewRenderedGrid, "view", view)
+
+
+def _modelXbrl():
+    return Mock(namespaceDocs={})
+
+
+class TestViewRenderedGrid:
+
+    def test_streamed_rendering(self, tmp_path, renderedRows):
+        outfile = tmp_path / "rendering.html"
+        viewRenderedGrid(_modelXbrl(), str(outfile))
+        assert "<td>cell</td>" in outfile.read_text(encoding="utf-8")
+
+    def test_diff_to_file_not_streamed(self, tmp_path, monkeypatch, renderedRows):
+        outfile = tmp_path / "rendering.html"
+        outfile.write_text("expected rendering", encoding="utf-8")
+        compared = []
+
+        def validateRenderingInfoset(modelXbrl, comparisonFile, xmlDoc):
+            with open(comparisonFile, encoding="utf-8") as fh:
+                compared.append((fh.read(), [elt.text for elt in xmlDoc.iter(XHTML + "td")]))
+        monkeypatch.setattr(ValidateInfoset, "validateRenderingInfoset", validateRenderingInfoset)
+        viewRenderedGrid(_modelXbrl(), str(outfile), diffToFile=True)
+        assert compared == [("expected rendering", ["cell"])]
+        assert outfile.read_text(encoding="utf-8") == "expected rendering"
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from unittest.mock import Mock
+
+import pytest
+
+from arelle import FunctionFn, XbrlConst, XPathContext
+from arelle.ModelFormulaObject import Trace
+from arelle.ModelValue import qname
+from arelle.XPathParser import (OperationDef, ProgHeader, QNameDef, RangeDecl, VariableRef, Expr,
+                                invariantFunctionCalls)
+
+qnParam = qname("param")
+qnFactVar = qname("fact")
+
+
+def _fn(localName, *args):
+    return OperationDef("", 0, QNameDef(0, None, XbrlConst.fn, localName), list(args), False)
+
+
+def _prog(*exprStack):
+    return [ProgHeader(None, "test", None, "", Trace.VARIABLE_SET)] + list(exprStack)
+
+
+@pytest.fixture
+def xpathContext():
+    modelXbrl = Mock(modelCustomFunctionSignatures={})
+    modelXbrl.modelManager.customTransforms = {}
+    xpCtx = XPathContext.create(modelXbrl)
+    xpCtx.inScopeVars[qnParam] = "eba"
+    yield xpCtx
+    xpCtx.close()
+
+
+@pytest.fixture
+def upperCaseCalls(monkeypatch):
+    calls = []
+    upperCase = FunctionFn.fnFunctions["upper-case"]
+
+    def countedUpperCase(xc, p, contextItem, args):
+        calls.append(args)
+        return upperCase(xc, p, contextItem, args)
+    monkeypatch.setitem(FunctionFn.fnFunctions, "upper-case", countedUpperCase)
+    return calls
+
+
+class TestInvariantFunctionCalls:
+
+    def test_dependency_analysis(self):
+        invariantCall = _fn("upper-case", VariableRef(0, qnParam))
+        factCall = _fn("upper-case", VariableRef(0, qnFactVar))
+        contextCall = _fn("string-length")
+        invariantCalls = {}
+        varRefs = invariantFunctionCalls(_prog(_fn("concat", invariantCall, factCall), contextCall),
+                                         {qnParam}, lambda op, hasArgs: hasArgs, invariantCalls)
+        assert varRefs is None
+        assert invariantCalls == {invariantCall: {qnParam}}
+
+    def test_range_variables_are_not_invariant(self):
+        rangeCall = _fn("upper-case", VariableRef(0, qnParam))
+        forOp = OperationDef("", 0, "for", [RangeDecl(0, [VariableRef(0, qnParam), "in", "a"]),
+                                            Expr(0, [Mock(name="return"), rangeCall])], False)
+        invariantCalls = {}
+        assert invariantFunctionCalls([forOp], {qnParam}, lambda op, hasArgs: True, invariantCalls) is None
+        assert rangeCall in invariantCalls  # memoized result is only used when $param is bound to the parameter
+
+    def test_eba_style_rule_set_evaluates_invariant_call_once(self, xpathContext, upperCaseCalls):
+        # a rule such as "$fact = upper-case($param)" evaluated for each fact variable binding
+        upperCaseParam = _fn("upper-case", VariableRef(0, qnParam))
+        prog = _prog(VariableRef(0, qnFactVar), OperationDef("", 0, "=", [upperCaseParam], False))
+        xpathContext.memoizeInvariantFunctionCalls({qnParam})
+        results = []
+        for factValue in ("EBA", "ECB", "EBA"):
+            xpathContext.inScopeVars[qnFactVar] = factValue
+            results.append(xpathContext.evaluateBooleanValue(prog))
+        assert results == [True, False, True]
+        assert len(upperCaseCalls) == 1
+        assert xpathContext.invariantResults == {upperCaseParam: "EBA"}
+
+    def test_rebound_variable_is_not_memoized(self, xpathContext, upperCaseCalls):
+        upperCaseParam = _fn("upper-case", VariableRef(0, qnParam))
+        prog = _prog(upperCaseParam)
+        xpathContext.memoizeInvariantFunctionCalls({qnParam})
+        assert xpathContext.evaluate(prog) == [["EBA"]]
+        xpathContext.inScopeVars[qnParam] = "esef"  # such as a custom function input or range variable of same name
+        assert xpathContext.evaluate(prog) == [["ESEF"]]
+        assert len(upperCaseCalls) == 2
+
+    def test_not_memoized_unless_enabled(self, xpathContext, upperCaseCalls):
+        prog = _prog(_fn("upper-case", VariableRef(0, qnParam)))
+        for _i in range(3):
+            xpathContext.evaluate(prog)
+        assert len(upperCaseCalls) == 3
+        assert not xpathContext.invariantResults